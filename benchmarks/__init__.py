@@ -0,0 +1,10 @@
+"""Benchmarks for cupyimg.
+
+The benchmark modules follow the conventions of airspeed velocity (asv):
+each ``benchmark_*.py`` module defines classes with ``params``,
+``param_names``, a ``setup`` method and ``time_*`` methods. They are run with
+``python -m benchmarks`` (see ``benchmarks/__main__.py``), which times the
+``time_*`` methods with :func:`cupyimg.time.repeat` and, for each
+``time_<name>`` method with a matching ``reference_<name>`` method, also times
+the NumPy/SciPy/scikit-image reference implementation on the CPU.
+"""
@@ -0,0 +1,111 @@
+"""Command line interface for the cupyimg benchmarks.
+
+Run the benchmarks and store the results::
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks run -k ndimage_filters --quick
+    python -m benchmarks run --reference-only -o cpu.json  # no GPU needed
+
+Compare two result files (exits with status 1 if there are regressions)::
+
+    python -m benchmarks compare old.json new.json --factor 1.1
+"""
+import argparse
+import sys
+
+from . import _compare, _runner
+
+
+def _run(args):
+    results = _runner.run(
+        pattern=args.bench,
+        n_repeat=args.n_repeat,
+        n_warmup=args.n_warmup,
+        max_duration=args.max_duration,
+        quick=args.quick,
+        reference=not args.no_reference,
+        reference_only=args.reference_only,
+    )
+    if args.output is not None:
+        _runner.write_results(results, args.output)
+        print("results written to {}".format(args.output))
+    n_failed = sum("error" in r for r in results["benchmarks"])
+    return 1 if n_failed else 0
+
+
+def _compare_cmd(args):
+    old = _runner.load_results(args.old)
+    new = _runner.load_results(args.new)
+    rows = _compare.compare(
+        old, new, factor=args.factor, metric=args.metric, stat=args.stat
+    )
+    print(_compare.format_table(rows, only_changed=args.only_changed))
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command")
+    sub.required = True
+
+    p_run = sub.add_parser("run", help="run benchmarks")
+    p_run.add_argument(
+        "-k",
+        "--bench",
+        default=None,
+        help="only run benchmarks whose name contains/matches this pattern",
+    )
+    p_run.add_argument("-o", "--output", default=None, help="JSON output file")
+    p_run.add_argument("--n-repeat", type=int, default=100)
+    p_run.add_argument("--n-warmup", type=int, default=3)
+    p_run.add_argument(
+        "--max-duration",
+        type=float,
+        default=1.0,
+        help="maximum time in seconds spent repeating each case",
+    )
+    p_run.add_argument(
+        "--quick",
+        action="store_true",
+        help="only run the first value of each parameter",
+    )
+    p_run.add_argument(
+        "--no-reference",
+        action="store_true",
+        help="do not time the NumPy/SciPy reference implementations",
+    )
+    p_run.add_argument(
+        "--reference-only",
+        action="store_true",
+        help="only time the reference implementations (no GPU needed)",
+    )
+    p_run.set_defaults(func=_run)
+
+    p_cmp = sub.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("old", help="baseline results (JSON)")
+    p_cmp.add_argument("new", help="new results (JSON)")
+    p_cmp.add_argument(
+        "--factor",
+        type=float,
+        default=1.1,
+        help="ratio above which a slowdown is reported as a regression",
+    )
+    p_cmp.add_argument(
+        "--metric", choices=["gpu", "cpu", "reference"], default="gpu"
+    )
+    p_cmp.add_argument(
+        "--stat", choices=["median", "mean", "min"], default="median"
+    )
+    p_cmp.add_argument(
+        "--only-changed",
+        action="store_true",
+        help="do not list unchanged benchmarks",
+    )
+    p_cmp.set_defaults(func=_compare_cmd)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
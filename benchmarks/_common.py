@@ -0,0 +1,70 @@
+"""Helpers shared by the benchmark modules."""
+import importlib
+
+import numpy as np
+
+# Set by the runner. When False (``--reference-only``), no device arrays are
+# created so that reference timings can be collected without a GPU.
+use_device = True
+
+
+class _DeviceModule(object):
+    """Stand-in for a cupy/cupyimg module that is imported on first use.
+
+    Benchmark modules must be importable without a GPU (``--reference-only``),
+    so they refer to device modules through this proxy instead of importing
+    them at module level.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            if not use_device:
+                raise RuntimeError(
+                    "{} is not used in reference-only runs".format(self._name)
+                )
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def device_module(name):
+    """Return a proxy of the module ``name``, imported on first access."""
+    return _DeviceModule(name)
+
+
+def to_device(x):
+    """Copy a host array to the GPU (or return None in reference-only runs)."""
+    if not use_device:
+        return None
+    import cupy
+
+    return cupy.asarray(x)
+
+
+def random_image(shape, dtype, seed=0):
+    """Random image of the given shape, scaled to the range of ``dtype``."""
+    rng = np.random.RandomState(seed)
+    dtype = np.dtype(dtype)
+    if dtype.kind == "b":
+        return rng.standard_normal(shape) > 0
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        high = min(info.max, 255) if dtype.kind == "u" else min(info.max, 127)
+        return rng.randint(0, high + 1, size=shape).astype(dtype)
+    return rng.standard_normal(shape).astype(dtype)
+
+
+def blobs(shape, n_blobs=64, seed=0):
+    """Boolean image of random overlapping spheres (for labeling etc.)."""
+    rng = np.random.RandomState(seed)
+    grid = np.ogrid[tuple(slice(0, s) for s in shape)]
+    img = np.zeros(shape, dtype=bool)
+    radius = max(2, min(shape) // 16)
+    for _ in range(n_blobs):
+        center = [rng.randint(0, s) for s in shape]
+        dist2 = sum((g - c) ** 2 for g, c in zip(grid, center))
+        img |= dist2 <= radius ** 2
+    return img
@@ -0,0 +1,107 @@
+"""Comparison of two benchmark result files."""
+
+_METRICS = ("gpu", "cpu", "reference")
+
+
+def compare(old, new, factor=1.1, metric="gpu", stat="median"):
+    """Compare the timings of two results dicts (see ``_runner.run``).
+
+    Parameters
+    ----------
+    old, new : dict
+        Baseline and candidate results.
+    factor : float, optional
+        A benchmark is flagged as a regression when the new time exceeds the
+        old one by more than this factor, and as improved when it is faster
+        by more than this factor.
+    metric : {'gpu', 'cpu', 'reference'}, optional
+        Which timing column to compare.
+    stat : {'median', 'mean', 'min'}, optional
+        Which statistic of the repeated timings to compare.
+
+    Returns
+    -------
+    rows : list of dict
+        One row per benchmark case with keys ``key``, ``old``, ``new``,
+        ``ratio`` and ``status`` (one of ``"regression"``, ``"improved"``,
+        ``"unchanged"``, ``"new"``, ``"removed"`` or ``"failed"``).
+    """
+    if metric not in _METRICS:
+        raise ValueError("metric must be one of {}".format(_METRICS))
+    if factor < 1:
+        raise ValueError("factor must be >= 1")
+
+    def timings(results):
+        out = {}
+        for record in results["benchmarks"]:
+            if "error" in record:
+                out[record["key"]] = "failed"
+            elif record.get(metric) is not None:
+                out[record["key"]] = record[metric][stat]
+        return out
+
+    old_t = timings(old)
+    new_t = timings(new)
+    rows = []
+    for key in sorted(set(old_t) | set(new_t)):
+        t_old = old_t.get(key)
+        t_new = new_t.get(key)
+        ratio = None
+        if t_old is None:
+            status = "new"
+        elif t_new is None:
+            status = "removed"
+        elif "failed" in (t_old, t_new):
+            # a case that newly fails is a regression
+            status = "regression" if t_new == "failed" else "failed"
+        else:
+            ratio = t_new / t_old if t_old > 0 else float("inf")
+            if ratio > factor:
+                status = "regression"
+            elif ratio < 1 / factor:
+                status = "improved"
+            else:
+                status = "unchanged"
+        rows.append(
+            dict(key=key, old=t_old, new=t_new, ratio=ratio, status=status)
+        )
+    return rows
+
+
+def _fmt(t):
+    if t is None:
+        return "-"
+    if isinstance(t, str):
+        return t
+    return "{:.3e}".format(t)
+
+
+def format_table(rows, only_changed=False):
+    """Format comparison rows as an aligned text table."""
+    marks = {"regression": "+", "improved": "-", "failed": "!"}
+    lines = []
+    header = "   {:>11} {:>11} {:>7}  {}".format(
+        "before [s]", "after [s]", "ratio", "benchmark"
+    )
+    lines.append(header)
+    for row in rows:
+        if only_changed and row["status"] in ("unchanged",):
+            continue
+        ratio = "-" if row["ratio"] is None else "{:.2f}".format(row["ratio"])
+        lines.append(
+            "{:2} {:>11} {:>11} {:>7}  {}".format(
+                marks.get(row["status"], ""),
+                _fmt(row["old"]),
+                _fmt(row["new"]),
+                ratio,
+                row["key"],
+            )
+        )
+    n_reg = sum(row["status"] == "regression" for row in rows)
+    n_imp = sum(row["status"] == "improved" for row in rows)
+    lines.append(
+        "{} regression(s), {} improvement(s) out of {} benchmark(s)".format(
+            n_reg, n_imp, len(rows)
+        )
+    )
+    return "\n".join(lines)
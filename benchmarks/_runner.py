@@ -0,0 +1,274 @@
+"""Discovery and timing of the asv-style benchmark classes."""
+import datetime
+import fnmatch
+import importlib
+import inspect
+import itertools
+import json
+import math
+import os
+import pkgutil
+import platform
+import sys
+import time
+
+import numpy as np
+
+from . import _common
+
+RESULTS_VERSION = 1
+
+
+def discover(pattern=None):
+    """Yield ``(name, cls, method_name)`` for each ``time_*`` benchmark.
+
+    ``name`` is ``"<module>.<class>.<method>"`` without the ``benchmark_``
+    prefix of the module. If ``pattern`` is given, only names matching the
+    shell-style wildcard pattern (or containing it as a substring) are
+    returned.
+    """
+    pkg_dir = os.path.dirname(os.path.abspath(__file__))
+    for info in sorted(pkgutil.iter_modules([pkg_dir]), key=lambda m: m.name):
+        if not info.name.startswith("benchmark_"):
+            continue
+        module = importlib.import_module(__package__ + "." + info.name)
+        short_name = info.name[len("benchmark_") :]
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for meth_name in sorted(vars(cls)):
+                if not meth_name.startswith("time_"):
+                    continue
+                name = ".".join([short_name, cls_name, meth_name])
+                if pattern is not None and not (
+                    pattern in name or fnmatch.fnmatch(name, pattern)
+                ):
+                    continue
+                yield name, cls, meth_name
+
+
+def _param_combinations(cls, quick=False):
+    params = getattr(cls, "params", [])
+    param_names = getattr(cls, "param_names", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        # asv allows a single list of values for a single parameter
+        params = [params]
+    if len(param_names) != len(params):
+        param_names = ["param{}".format(i + 1) for i in range(len(params))]
+    if quick:
+        params = [p[:1] for p in params]
+    for values in itertools.product(*params):
+        yield dict(zip(param_names, values)), values
+
+
+def _stats(times):
+    times = np.asarray(times, dtype=np.float64)
+    if times.size == 0:
+        return None
+    return {
+        "mean": float(times.mean()),
+        "median": float(np.median(times)),
+        "min": float(times.min()),
+        "max": float(times.max()),
+        "std": float(times.std()),
+        "n": int(times.size),
+    }
+
+
+def _time_cpu(func, args, n_repeat, n_warmup, max_duration):
+    """Wall-clock timing of a host-only (reference) function."""
+    for _ in range(n_warmup):
+        func(*args)
+    times = []
+    duration = 0
+    for _ in range(n_repeat):
+        t1 = time.perf_counter()
+        func(*args)
+        t = time.perf_counter() - t1
+        times.append(t)
+        duration += t
+        if duration > max_duration:
+            break
+    return times
+
+
+def _machine_info(use_device):
+    info = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+    for mod_name in ["scipy", "skimage", "cupy", "cupyimg"]:
+        try:
+            info[mod_name] = importlib.import_module(mod_name).__version__
+        except ImportError:
+            info[mod_name] = None
+    if use_device:
+        import cupy
+
+        device = cupy.cuda.Device()
+        props = cupy.cuda.runtime.getDeviceProperties(device.id)
+        name = props["name"]
+        info["device"] = name.decode() if isinstance(name, bytes) else name
+    else:
+        info["device"] = None
+    return info
+
+
+def run(
+    pattern=None,
+    n_repeat=100,
+    n_warmup=3,
+    max_duration=1.0,
+    quick=False,
+    reference=True,
+    reference_only=False,
+    file=None,
+):
+    """Run the benchmarks and return the results as a JSON-serializable dict.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Only run benchmarks whose name matches this pattern.
+    n_repeat : int, optional
+        Maximum number of timed repetitions of each case.
+    n_warmup : int, optional
+        Number of untimed calls before timing (includes kernel compilation).
+    max_duration : float, optional
+        Stop repeating a case once this many seconds have been spent on it.
+    quick : bool, optional
+        Only run the first value of each parameter.
+    reference : bool, optional
+        Also time the ``reference_*`` (NumPy/SciPy) counterparts.
+    reference_only : bool, optional
+        Only time the reference implementations. No GPU is needed.
+    file : file-like, optional
+        Where to print progress (default: ``sys.stdout``). Use ``False`` to
+        disable progress output.
+    """
+    if file is None:
+        file = sys.stdout
+    use_device = not reference_only
+    _common.use_device = use_device
+    if use_device:
+        from cupyimg.time import repeat
+    if reference_only:
+        reference = True
+
+    records = []
+    for name, cls, meth_name in discover(pattern):
+        ref_name = "reference_" + meth_name[len("time_") :]
+        has_ref = reference and hasattr(cls, ref_name)
+        if reference_only and not has_ref:
+            continue
+        for params, values in _param_combinations(cls, quick):
+            key = "{}({})".format(
+                name,
+                ", ".join("{}={!r}".format(k, v) for k, v in params.items()),
+            )
+            record = {
+                "name": name,
+                "key": key,
+                "params": {k: repr(v) for k, v in params.items()},
+                "cpu": None,
+                "gpu": None,
+                "reference": None,
+                "speedup": None,
+            }
+            bench = cls()
+            try:
+                if hasattr(bench, "setup"):
+                    bench.setup(*values)
+            except NotImplementedError:
+                # asv convention: the combination is skipped
+                continue
+            except Exception as err:
+                record["error"] = "setup failed: {!r}".format(err)
+                records.append(record)
+                continue
+            try:
+                if use_device:
+                    perf = repeat(
+                        getattr(bench, meth_name),
+                        values,
+                        n_repeat=n_repeat,
+                        n_warmup=n_warmup,
+                        max_duration=max_duration,
+                        name=key,
+                    )
+                    record["cpu"] = _stats(perf.cpu_times)
+                    record["gpu"] = _stats(perf.gpu_times[0])
+                if has_ref:
+                    ref_times = _time_cpu(
+                        getattr(bench, ref_name),
+                        values,
+                        n_repeat,
+                        min(n_warmup, 1),
+                        max_duration,
+                    )
+                    record["reference"] = _stats(ref_times)
+            except Exception as err:
+                record["error"] = repr(err)
+            finally:
+                if hasattr(bench, "teardown"):
+                    bench.teardown(*values)
+            if record["gpu"] is not None and record["reference"] is not None:
+                record["speedup"] = (
+                    record["reference"]["median"] / record["gpu"]["median"]
+                )
+            records.append(record)
+            if file:
+                print(_format_record(record), file=file)
+                file.flush()
+    return {
+        "version": RESULTS_VERSION,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": _machine_info(use_device),
+        "reference_only": reference_only,
+        "benchmarks": records,
+    }
+
+
+def _format_time(stats):
+    if stats is None:
+        return "-"
+    t = stats["median"]
+    if t == 0 or not math.isfinite(t):
+        return "{:g}".format(t)
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if t >= scale:
+            return "{:.3f} {}".format(t / scale, unit)
+    return "{:.3f} ns".format(t / 1e-9)
+
+
+def _format_record(record):
+    if "error" in record:
+        return "{}: {}".format(record["key"], record["error"])
+    text = "{}: gpu {}, cpu {}".format(
+        record["key"],
+        _format_time(record["gpu"]),
+        _format_time(record["cpu"]),
+    )
+    if record["reference"] is not None:
+        text += ", reference {}".format(_format_time(record["reference"]))
+    if record["speedup"] is not None:
+        text += " ({:.1f}x)".format(record["speedup"])
+    return text
+
+
+def write_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+
+
+def load_results(path):
+    with open(path, "r") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(
+            "{}: unsupported results version {!r}".format(
+                path, results.get("version")
+            )
+        )
+    return results
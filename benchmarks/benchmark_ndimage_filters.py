@@ -0,0 +1,115 @@
+import numpy as np
+import scipy.ndimage as ndi_ref
+
+from ._common import device_module, random_image, to_device
+
+ndi = device_module("cupyimg.scipy.ndimage")
+
+_shapes = [(512, 512), (3840, 2160), (128, 128, 128)]
+_dtypes = ["uint8", "float32", "float64"]
+_modes = ["reflect", "constant", "wrap"]
+
+
+class Convolve:
+    params = [_shapes, _dtypes, _modes, [3, 7]]
+    param_names = ["shape", "dtype", "mode", "size"]
+
+    def setup(self, shape, dtype, mode, size):
+        self.x = random_image(shape, dtype)
+        self.w = np.ones((size,) * len(shape), dtype=np.float32) / size
+        self.x_gpu = to_device(self.x)
+        self.w_gpu = to_device(self.w)
+
+    def time_convolve(self, shape, dtype, mode, size):
+        ndi.convolve(self.x_gpu, self.w_gpu, mode=mode)
+
+    def reference_convolve(self, shape, dtype, mode, size):
+        ndi_ref.convolve(self.x, self.w, mode=mode)
+
+    def time_correlate1d(self, shape, dtype, mode, size):
+        ndi.correlate1d(
+            self.x_gpu, self.w_gpu[(0,) * (len(shape) - 1)], axis=0, mode=mode
+        )
+
+    def reference_correlate1d(self, shape, dtype, mode, size):
+        ndi_ref.correlate1d(
+            self.x, self.w[(0,) * (len(shape) - 1)], axis=0, mode=mode
+        )
+
+
+class SeparableFilters:
+    params = [_shapes, _dtypes, _modes]
+    param_names = ["shape", "dtype", "mode"]
+
+    def setup(self, shape, dtype, mode):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+
+    def time_gaussian_filter(self, shape, dtype, mode):
+        ndi.gaussian_filter(self.x_gpu, sigma=3, mode=mode)
+
+    def reference_gaussian_filter(self, shape, dtype, mode):
+        ndi_ref.gaussian_filter(self.x, sigma=3, mode=mode)
+
+    def time_uniform_filter(self, shape, dtype, mode):
+        ndi.uniform_filter(self.x_gpu, size=9, mode=mode)
+
+    def reference_uniform_filter(self, shape, dtype, mode):
+        ndi_ref.uniform_filter(self.x, size=9, mode=mode)
+
+    def time_sobel(self, shape, dtype, mode):
+        ndi.sobel(self.x_gpu, axis=0, mode=mode)
+
+    def reference_sobel(self, shape, dtype, mode):
+        ndi_ref.sobel(self.x, axis=0, mode=mode)
+
+    def time_prewitt(self, shape, dtype, mode):
+        ndi.prewitt(self.x_gpu, axis=0, mode=mode)
+
+    def reference_prewitt(self, shape, dtype, mode):
+        ndi_ref.prewitt(self.x, axis=0, mode=mode)
+
+    def time_laplace(self, shape, dtype, mode):
+        ndi.laplace(self.x_gpu, mode=mode)
+
+    def reference_laplace(self, shape, dtype, mode):
+        ndi_ref.laplace(self.x, mode=mode)
+
+    def time_gaussian_gradient_magnitude(self, shape, dtype, mode):
+        ndi.gaussian_gradient_magnitude(self.x_gpu, sigma=2, mode=mode)
+
+    def reference_gaussian_gradient_magnitude(self, shape, dtype, mode):
+        ndi_ref.gaussian_gradient_magnitude(self.x, sigma=2, mode=mode)
+
+
+class RankFilters:
+    params = [_shapes, _dtypes, ["reflect", "constant"], [3, 5]]
+    param_names = ["shape", "dtype", "mode", "size"]
+
+    def setup(self, shape, dtype, mode, size):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+
+    def time_minimum_filter(self, shape, dtype, mode, size):
+        ndi.minimum_filter(self.x_gpu, size=size, mode=mode)
+
+    def reference_minimum_filter(self, shape, dtype, mode, size):
+        ndi_ref.minimum_filter(self.x, size=size, mode=mode)
+
+    def time_maximum_filter(self, shape, dtype, mode, size):
+        ndi.maximum_filter(self.x_gpu, size=size, mode=mode)
+
+    def reference_maximum_filter(self, shape, dtype, mode, size):
+        ndi_ref.maximum_filter(self.x, size=size, mode=mode)
+
+    def time_median_filter(self, shape, dtype, mode, size):
+        ndi.median_filter(self.x_gpu, size=size, mode=mode)
+
+    def reference_median_filter(self, shape, dtype, mode, size):
+        ndi_ref.median_filter(self.x, size=size, mode=mode)
+
+    def time_percentile_filter(self, shape, dtype, mode, size):
+        ndi.percentile_filter(self.x_gpu, 25, size=size, mode=mode)
+
+    def reference_percentile_filter(self, shape, dtype, mode, size):
+        ndi_ref.percentile_filter(self.x, 25, size=size, mode=mode)
@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import scipy.ndimage as ndi_ref
+
+from ._common import device_module, random_image, to_device
+
+ndi = device_module("cupyimg.scipy.ndimage")
+
+_shapes = [(512, 512), (3840, 2160), (128, 128, 128)]
+_dtypes = ["float32", "float64"]
+_modes = ["constant", "reflect", "mirror", "nearest", "wrap"]
+
+
+def _rotation_matrix(ndim, angle=0.3):
+    matrix = np.eye(ndim)
+    c, s = math.cos(angle), math.sin(angle)
+    matrix[:2, :2] = [[c, -s], [s, c]]
+    return matrix
+
+
+class Interpolation:
+    params = [_shapes, _dtypes, _modes, [0, 1, 3]]
+    param_names = ["shape", "dtype", "mode", "order"]
+
+    def setup(self, shape, dtype, mode, order):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+        ndim = len(shape)
+        self.matrix = _rotation_matrix(ndim)
+        self.matrix_gpu = to_device(self.matrix)
+        coords = np.indices(shape, dtype=dtype).reshape(ndim, -1)
+        coords += 0.25
+        self.coords = coords
+        self.coords_gpu = to_device(coords)
+
+    def time_map_coordinates(self, shape, dtype, mode, order):
+        ndi.map_coordinates(self.x_gpu, self.coords_gpu, order=order, mode=mode)
+
+    def reference_map_coordinates(self, shape, dtype, mode, order):
+        ndi_ref.map_coordinates(self.x, self.coords, order=order, mode=mode)
+
+    def time_affine_transform(self, shape, dtype, mode, order):
+        ndi.affine_transform(
+            self.x_gpu, self.matrix_gpu, order=order, mode=mode
+        )
+
+    def reference_affine_transform(self, shape, dtype, mode, order):
+        ndi_ref.affine_transform(self.x, self.matrix, order=order, mode=mode)
+
+    def time_shift(self, shape, dtype, mode, order):
+        ndi.shift(self.x_gpu, 1.5, order=order, mode=mode)
+
+    def reference_shift(self, shape, dtype, mode, order):
+        ndi_ref.shift(self.x, 1.5, order=order, mode=mode)
+
+    def time_zoom(self, shape, dtype, mode, order):
+        ndi.zoom(self.x_gpu, 1.5, order=order, mode=mode)
+
+    def reference_zoom(self, shape, dtype, mode, order):
+        ndi_ref.zoom(self.x, 1.5, order=order, mode=mode)
+
+    def time_rotate(self, shape, dtype, mode, order):
+        ndi.rotate(self.x_gpu, 15, axes=(0, 1), order=order, mode=mode)
+
+    def reference_rotate(self, shape, dtype, mode, order):
+        ndi_ref.rotate(self.x, 15, axes=(0, 1), order=order, mode=mode)
+
+
+class SplineFilter:
+    params = [_shapes, _dtypes, [2, 3, 5]]
+    param_names = ["shape", "dtype", "order"]
+
+    def setup(self, shape, dtype, order):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+
+    def time_spline_filter(self, shape, dtype, order):
+        ndi.spline_filter(self.x_gpu, order=order)
+
+    def reference_spline_filter(self, shape, dtype, order):
+        ndi_ref.spline_filter(self.x, order=order)
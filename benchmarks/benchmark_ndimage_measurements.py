@@ -0,0 +1,77 @@
+import numpy as np
+import scipy.ndimage as ndi_ref
+
+from ._common import blobs, device_module, random_image, to_device
+
+ndi = device_module("cupyimg.scipy.ndimage")
+
+_shapes = [(512, 512), (3840, 2160), (128, 128, 128)]
+
+
+class Label:
+    params = [_shapes, [1, 2]]
+    param_names = ["shape", "connectivity"]
+
+    def setup(self, shape, connectivity):
+        self.x = blobs(shape)
+        self.x_gpu = to_device(self.x)
+        self.structure = ndi_ref.generate_binary_structure(
+            len(shape), connectivity
+        )
+        self.structure_gpu = to_device(self.structure)
+
+    def time_label(self, shape, connectivity):
+        ndi.label(self.x_gpu, self.structure_gpu)
+
+    def reference_label(self, shape, connectivity):
+        ndi_ref.label(self.x, self.structure)
+
+
+class LabeledStatistics:
+    params = [_shapes, ["float32", "float64"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        labels, n = ndi_ref.label(blobs(shape))
+        self.labels = labels
+        self.index = np.arange(1, n + 1)
+        self.x = random_image(shape, dtype)
+        self.labels_gpu = to_device(labels)
+        self.index_gpu = to_device(self.index)
+        self.x_gpu = to_device(self.x)
+
+    def time_sum(self, shape, dtype):
+        ndi.sum(self.x_gpu, self.labels_gpu, self.index_gpu)
+
+    def reference_sum(self, shape, dtype):
+        ndi_ref.sum(self.x, self.labels, self.index)
+
+    def time_mean(self, shape, dtype):
+        ndi.mean(self.x_gpu, self.labels_gpu, self.index_gpu)
+
+    def reference_mean(self, shape, dtype):
+        ndi_ref.mean(self.x, self.labels, self.index)
+
+    def time_variance(self, shape, dtype):
+        ndi.variance(self.x_gpu, self.labels_gpu, self.index_gpu)
+
+    def reference_variance(self, shape, dtype):
+        ndi_ref.variance(self.x, self.labels, self.index)
+
+    def time_maximum(self, shape, dtype):
+        ndi.maximum(self.x_gpu, self.labels_gpu, self.index_gpu)
+
+    def reference_maximum(self, shape, dtype):
+        ndi_ref.maximum(self.x, self.labels, self.index)
+
+    def time_center_of_mass(self, shape, dtype):
+        ndi.center_of_mass(self.x_gpu, self.labels_gpu, self.index_gpu)
+
+    def reference_center_of_mass(self, shape, dtype):
+        ndi_ref.center_of_mass(self.x, self.labels, self.index)
+
+    def time_find_objects(self, shape, dtype):
+        ndi.find_objects(self.labels_gpu)
+
+    def reference_find_objects(self, shape, dtype):
+        ndi_ref.find_objects(self.labels)
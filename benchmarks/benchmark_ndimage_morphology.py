@@ -0,0 +1,86 @@
+import scipy.ndimage as ndi_ref
+
+from ._common import blobs, device_module, random_image, to_device
+
+ndi = device_module("cupyimg.scipy.ndimage")
+
+_shapes = [(512, 512), (3840, 2160), (128, 128, 128)]
+
+
+class BinaryMorphology:
+    params = [_shapes, [1, 2], [1, 5]]
+    param_names = ["shape", "connectivity", "iterations"]
+
+    def setup(self, shape, connectivity, iterations):
+        self.x = blobs(shape)
+        self.x_gpu = to_device(self.x)
+        self.structure = ndi_ref.generate_binary_structure(
+            len(shape), connectivity
+        )
+        self.structure_gpu = to_device(self.structure)
+
+    def time_binary_erosion(self, shape, connectivity, iterations):
+        ndi.binary_erosion(
+            self.x_gpu, self.structure_gpu, iterations=iterations
+        )
+
+    def reference_binary_erosion(self, shape, connectivity, iterations):
+        ndi_ref.binary_erosion(self.x, self.structure, iterations=iterations)
+
+    def time_binary_dilation(self, shape, connectivity, iterations):
+        ndi.binary_dilation(
+            self.x_gpu, self.structure_gpu, iterations=iterations
+        )
+
+    def reference_binary_dilation(self, shape, connectivity, iterations):
+        ndi_ref.binary_dilation(self.x, self.structure, iterations=iterations)
+
+    def time_binary_opening(self, shape, connectivity, iterations):
+        ndi.binary_opening(
+            self.x_gpu, self.structure_gpu, iterations=iterations
+        )
+
+    def reference_binary_opening(self, shape, connectivity, iterations):
+        ndi_ref.binary_opening(self.x, self.structure, iterations=iterations)
+
+
+class BinaryFill:
+    params = [_shapes]
+    param_names = ["shape"]
+
+    def setup(self, shape):
+        self.x = blobs(shape)
+        self.x_gpu = to_device(self.x)
+
+    def time_binary_fill_holes(self, shape):
+        ndi.binary_fill_holes(self.x_gpu)
+
+    def reference_binary_fill_holes(self, shape):
+        ndi_ref.binary_fill_holes(self.x)
+
+
+class GreyMorphology:
+    params = [_shapes, ["uint8", "float32"], [3, 7]]
+    param_names = ["shape", "dtype", "size"]
+
+    def setup(self, shape, dtype, size):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+
+    def time_grey_erosion(self, shape, dtype, size):
+        ndi.grey_erosion(self.x_gpu, size=size)
+
+    def reference_grey_erosion(self, shape, dtype, size):
+        ndi_ref.grey_erosion(self.x, size=size)
+
+    def time_grey_dilation(self, shape, dtype, size):
+        ndi.grey_dilation(self.x_gpu, size=size)
+
+    def reference_grey_dilation(self, shape, dtype, size):
+        ndi_ref.grey_dilation(self.x, size=size)
+
+    def time_white_tophat(self, shape, dtype, size):
+        ndi.white_tophat(self.x_gpu, size=size)
+
+    def reference_white_tophat(self, shape, dtype, size):
+        ndi_ref.white_tophat(self.x, size=size)
@@ -0,0 +1,122 @@
+import scipy.signal as signal_ref
+
+from ._common import device_module, random_image, to_device
+
+signal = device_module("cupyimg.scipy.signal")
+
+
+class Convolve:
+    params = [
+        [(512, 512), (2048, 2048)],
+        ["float32", "float64", "complex64"],
+        [(5, 5), (31, 31)],
+        ["direct", "fft"],
+    ]
+    param_names = ["shape", "dtype", "kernel_shape", "method"]
+
+    def setup(self, shape, dtype, kernel_shape, method):
+        self.x = random_image(shape, dtype)
+        self.w = random_image(kernel_shape, dtype, seed=1)
+        self.x_gpu = to_device(self.x)
+        self.w_gpu = to_device(self.w)
+
+    def time_convolve(self, shape, dtype, kernel_shape, method):
+        signal.convolve(self.x_gpu, self.w_gpu, mode="same", method=method)
+
+    def reference_convolve(self, shape, dtype, kernel_shape, method):
+        signal_ref.convolve(self.x, self.w, mode="same", method=method)
+
+    def time_correlate(self, shape, dtype, kernel_shape, method):
+        signal.correlate(self.x_gpu, self.w_gpu, mode="same", method=method)
+
+    def reference_correlate(self, shape, dtype, kernel_shape, method):
+        signal_ref.correlate(self.x, self.w, mode="same", method=method)
+
+
+class Convolve2D:
+    params = [
+        [(512, 512), (2048, 2048)],
+        ["float32", "float64"],
+        ["fill", "wrap", "symm"],
+    ]
+    param_names = ["shape", "dtype", "boundary"]
+
+    def setup(self, shape, dtype, boundary):
+        self.x = random_image(shape, dtype)
+        self.w = random_image((7, 7), dtype, seed=1)
+        self.x_gpu = to_device(self.x)
+        self.w_gpu = to_device(self.w)
+
+    def time_convolve2d(self, shape, dtype, boundary):
+        signal.convolve2d(self.x_gpu, self.w_gpu, boundary=boundary)
+
+    def reference_convolve2d(self, shape, dtype, boundary):
+        signal_ref.convolve2d(self.x, self.w, boundary=boundary)
+
+    def time_wiener(self, shape, dtype, boundary):
+        signal.wiener(self.x_gpu, mysize=5)
+
+    def reference_wiener(self, shape, dtype, boundary):
+        signal_ref.wiener(self.x, mysize=5)
+
+
+class FFTConvolve:
+    params = [
+        [(2048, 2048), (128, 128, 128)],
+        ["float32", "complex64"],
+        [15, 63],
+    ]
+    param_names = ["shape", "dtype", "kernel_size"]
+
+    def setup(self, shape, dtype, kernel_size):
+        self.x = random_image(shape, dtype)
+        self.w = random_image((kernel_size,) * len(shape), dtype, seed=1)
+        self.x_gpu = to_device(self.x)
+        self.w_gpu = to_device(self.w)
+
+    def time_fftconvolve(self, shape, dtype, kernel_size):
+        signal.fftconvolve(self.x_gpu, self.w_gpu, mode="same")
+
+    def reference_fftconvolve(self, shape, dtype, kernel_size):
+        signal_ref.fftconvolve(self.x, self.w, mode="same")
+
+    def time_oaconvolve(self, shape, dtype, kernel_size):
+        signal.oaconvolve(self.x_gpu, self.w_gpu, mode="same")
+
+    def reference_oaconvolve(self, shape, dtype, kernel_size):
+        signal_ref.oaconvolve(self.x, self.w, mode="same")
+
+
+class Resample:
+    params = [
+        [(1 << 20,), (2048, 2048)],
+        ["float32", "float64"],
+        [(2, 1), (1, 3), (3, 2)],
+    ]
+    param_names = ["shape", "dtype", "up_down"]
+
+    def setup(self, shape, dtype, up_down):
+        self.x = random_image(shape, dtype)
+        self.h = signal_ref.firwin(31, 0.4).astype(dtype)
+        self.x_gpu = to_device(self.x)
+        self.h_gpu = to_device(self.h)
+
+    def time_upfirdn(self, shape, dtype, up_down):
+        signal.upfirdn(self.h_gpu, self.x_gpu, *up_down, axis=-1)
+
+    def reference_upfirdn(self, shape, dtype, up_down):
+        signal_ref.upfirdn(self.h, self.x, *up_down, axis=-1)
+
+    def time_resample_poly(self, shape, dtype, up_down):
+        signal.resample_poly(self.x_gpu, *up_down, axis=-1)
+
+    def reference_resample_poly(self, shape, dtype, up_down):
+        signal_ref.resample_poly(self.x, *up_down, axis=-1)
+
+    def time_resample(self, shape, dtype, up_down):
+        up, down = up_down
+        signal.resample(self.x_gpu, shape[-1] * up // down, axis=-1)
+
+    def reference_resample(self, shape, dtype, up_down):
+        up, down = up_down
+        signal_ref.resample(self.x, shape[-1] * up // down, axis=-1)
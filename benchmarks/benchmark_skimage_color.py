@@ -0,0 +1,69 @@
+import numpy as np
+import skimage.color as color_ref
+
+from ._common import device_module, random_image, to_device
+
+color = device_module("cupyimg.skimage.color")
+
+_shapes = [(512, 512, 3), (3840, 2160, 3)]
+_dtypes = ["uint8", "float32", "float64"]
+
+
+def _rgb(shape, dtype):
+    img = random_image(shape, "uint8")
+    if np.dtype(dtype).kind == "f":
+        img = (img / 255).astype(dtype)
+    return img
+
+
+class RGBConversions:
+    params = [_shapes, _dtypes]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        self.rgb = _rgb(shape, dtype)
+        self.rgb_gpu = to_device(self.rgb)
+        self.lab = color_ref.rgb2lab(self.rgb)
+        self.lab_gpu = to_device(self.lab)
+
+    def time_rgb2gray(self, shape, dtype):
+        color.rgb2gray(self.rgb_gpu)
+
+    def reference_rgb2gray(self, shape, dtype):
+        color_ref.rgb2gray(self.rgb)
+
+    def time_rgb2hsv(self, shape, dtype):
+        color.rgb2hsv(self.rgb_gpu)
+
+    def reference_rgb2hsv(self, shape, dtype):
+        color_ref.rgb2hsv(self.rgb)
+
+    def time_rgb2lab(self, shape, dtype):
+        color.rgb2lab(self.rgb_gpu)
+
+    def reference_rgb2lab(self, shape, dtype):
+        color_ref.rgb2lab(self.rgb)
+
+    def time_lab2rgb(self, shape, dtype):
+        color.lab2rgb(self.lab_gpu)
+
+    def reference_lab2rgb(self, shape, dtype):
+        color_ref.lab2rgb(self.lab)
+
+    def time_rgb2luv(self, shape, dtype):
+        color.rgb2luv(self.rgb_gpu)
+
+    def reference_rgb2luv(self, shape, dtype):
+        color_ref.rgb2luv(self.rgb)
+
+    def time_rgb2hed(self, shape, dtype):
+        color.rgb2hed(self.rgb_gpu)
+
+    def reference_rgb2hed(self, shape, dtype):
+        color_ref.rgb2hed(self.rgb)
+
+    def time_rgb2ycbcr(self, shape, dtype):
+        color.rgb2ycbcr(self.rgb_gpu)
+
+    def reference_rgb2ycbcr(self, shape, dtype):
+        color_ref.rgb2ycbcr(self.rgb)
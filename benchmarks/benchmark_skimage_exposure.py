@@ -0,0 +1,40 @@
+import skimage.exposure as exposure_ref
+
+from ._common import device_module, random_image, to_device
+
+exposure = device_module("cupyimg.skimage.exposure")
+
+
+class Exposure:
+    params = [[(512, 512), (3840, 2160), (512, 512, 3)], ["uint8", "float32"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        self.x = random_image(shape, dtype)
+        if self.x.dtype.kind == "f":
+            self.x = (self.x - self.x.min()) / (self.x.max() - self.x.min())
+        self.x_gpu = to_device(self.x)
+
+    def time_equalize_hist(self, shape, dtype):
+        exposure.equalize_hist(self.x_gpu)
+
+    def reference_equalize_hist(self, shape, dtype):
+        exposure_ref.equalize_hist(self.x)
+
+    def time_equalize_adapthist(self, shape, dtype):
+        exposure.equalize_adapthist(self.x_gpu, clip_limit=0.03)
+
+    def reference_equalize_adapthist(self, shape, dtype):
+        exposure_ref.equalize_adapthist(self.x, clip_limit=0.03)
+
+    def time_rescale_intensity(self, shape, dtype):
+        exposure.rescale_intensity(self.x_gpu, out_range=(0, 1))
+
+    def reference_rescale_intensity(self, shape, dtype):
+        exposure_ref.rescale_intensity(self.x, out_range=(0, 1))
+
+    def time_histogram(self, shape, dtype):
+        exposure.histogram(self.x_gpu)
+
+    def reference_histogram(self, shape, dtype):
+        exposure_ref.histogram(self.x)
@@ -0,0 +1,83 @@
+import skimage.feature as feature_ref
+
+from ._common import device_module, random_image, to_device
+
+feature = device_module("cupyimg.skimage.feature")
+
+_shapes = [(512, 512), (2048, 2048)]
+
+
+class Corners:
+    params = [_shapes, ["float32", "float64"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        x = random_image(shape, dtype)
+        self.x = x
+        self.x_gpu = to_device(x)
+        # a smooth image with many local maxima for the peak finders
+        self.smooth = feature_ref.corner_harris(x, sigma=3)
+        self.smooth_gpu = to_device(self.smooth)
+
+    def time_corner_harris(self, shape, dtype):
+        feature.corner_harris(self.x_gpu, sigma=3)
+
+    def reference_corner_harris(self, shape, dtype):
+        feature_ref.corner_harris(self.x, sigma=3)
+
+    def time_structure_tensor(self, shape, dtype):
+        feature.structure_tensor(self.x_gpu, sigma=1.5)
+
+    def reference_structure_tensor(self, shape, dtype):
+        feature_ref.structure_tensor(self.x, sigma=1.5)
+
+    def time_hessian_matrix_det(self, shape, dtype):
+        feature.hessian_matrix_det(self.x_gpu, sigma=2)
+
+    def reference_hessian_matrix_det(self, shape, dtype):
+        feature_ref.hessian_matrix_det(self.x, sigma=2)
+
+    def time_peak_local_max(self, shape, dtype):
+        feature.peak_local_max(self.smooth_gpu, min_distance=5)
+
+    def reference_peak_local_max(self, shape, dtype):
+        feature_ref.peak_local_max(self.smooth, min_distance=5)
+
+    def time_corner_peaks(self, shape, dtype):
+        feature.corner_peaks(self.smooth_gpu, min_distance=5)
+
+    def reference_corner_peaks(self, shape, dtype):
+        feature_ref.corner_peaks(self.smooth, min_distance=5)
+
+
+class Canny:
+    params = [_shapes]
+    param_names = ["shape"]
+
+    def setup(self, shape):
+        x = random_image(shape, "float32")
+        self.x = x
+        self.x_gpu = to_device(x)
+
+    def time_canny(self, shape):
+        feature.canny(self.x_gpu, sigma=2)
+
+    def reference_canny(self, shape):
+        feature_ref.canny(self.x, sigma=2)
+
+
+class MatchTemplate:
+    params = [_shapes, [(16, 16), (64, 64)], [False, True]]
+    param_names = ["shape", "template_shape", "pad_input"]
+
+    def setup(self, shape, template_shape, pad_input):
+        self.x = random_image(shape, "float32")
+        self.t = self.x[tuple(slice(10, 10 + s) for s in template_shape)]
+        self.x_gpu = to_device(self.x)
+        self.t_gpu = to_device(self.t)
+
+    def time_match_template(self, shape, template_shape, pad_input):
+        feature.match_template(self.x_gpu, self.t_gpu, pad_input=pad_input)
+
+    def reference_match_template(self, shape, template_shape, pad_input):
+        feature_ref.match_template(self.x, self.t, pad_input=pad_input)
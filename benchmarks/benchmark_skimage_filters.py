@@ -0,0 +1,103 @@
+import skimage.filters as filters_ref
+import skimage.morphology as morphology_ref
+
+from ._common import device_module, random_image, to_device
+
+filters = device_module("cupyimg.skimage.filters")
+
+_shapes = [(512, 512), (3840, 2160)]
+
+
+class Filters:
+    params = [_shapes, ["uint8", "float32"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+
+    def time_gaussian(self, shape, dtype):
+        filters.gaussian(self.x_gpu, sigma=4)
+
+    def reference_gaussian(self, shape, dtype):
+        filters_ref.gaussian(self.x, sigma=4)
+
+    def time_sobel(self, shape, dtype):
+        filters.sobel(self.x_gpu)
+
+    def reference_sobel(self, shape, dtype):
+        filters_ref.sobel(self.x)
+
+    def time_difference_of_gaussians(self, shape, dtype):
+        filters.difference_of_gaussians(self.x_gpu, 1, 4)
+
+    def reference_difference_of_gaussians(self, shape, dtype):
+        filters_ref.difference_of_gaussians(self.x, 1, 4)
+
+    def time_unsharp_mask(self, shape, dtype):
+        filters.unsharp_mask(self.x_gpu, radius=3)
+
+    def reference_unsharp_mask(self, shape, dtype):
+        filters_ref.unsharp_mask(self.x, radius=3)
+
+    def time_frangi(self, shape, dtype):
+        filters.frangi(self.x_gpu)
+
+    def reference_frangi(self, shape, dtype):
+        filters_ref.frangi(self.x)
+
+
+class Median:
+    params = [_shapes, ["uint8", "float32"], [1, 5, 15]]
+    param_names = ["shape", "dtype", "radius"]
+
+    def setup(self, shape, dtype, radius):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+        self.selem = morphology_ref.disk(radius)
+        self.selem_gpu = to_device(self.selem)
+
+    def time_median(self, shape, dtype, radius):
+        filters.median(self.x_gpu, self.selem_gpu)
+
+    def reference_median(self, shape, dtype, radius):
+        filters_ref.median(self.x, self.selem)
+
+
+class Thresholds:
+    params = [_shapes, ["uint8", "float32"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+
+    def time_threshold_otsu(self, shape, dtype):
+        filters.threshold_otsu(self.x_gpu)
+
+    def reference_threshold_otsu(self, shape, dtype):
+        filters_ref.threshold_otsu(self.x)
+
+    def time_threshold_li(self, shape, dtype):
+        filters.threshold_li(self.x_gpu)
+
+    def reference_threshold_li(self, shape, dtype):
+        filters_ref.threshold_li(self.x)
+
+    def time_threshold_multiotsu(self, shape, dtype):
+        filters.threshold_multiotsu(self.x_gpu, classes=3)
+
+    def reference_threshold_multiotsu(self, shape, dtype):
+        filters_ref.threshold_multiotsu(self.x, classes=3)
+
+    def time_threshold_local(self, shape, dtype):
+        filters.threshold_local(self.x_gpu, block_size=35)
+
+    def reference_threshold_local(self, shape, dtype):
+        filters_ref.threshold_local(self.x, block_size=35)
+
+    def time_threshold_sauvola(self, shape, dtype):
+        filters.threshold_sauvola(self.x_gpu, window_size=25)
+
+    def reference_threshold_sauvola(self, shape, dtype):
+        filters_ref.threshold_sauvola(self.x, window_size=25)
@@ -0,0 +1,67 @@
+import numpy as np
+import skimage.measure as measure_ref
+
+from ._common import blobs, device_module, random_image, to_device
+
+cp = device_module("cupy")
+measure = device_module("cupyimg.skimage.measure")
+
+_shapes = [(512, 512), (3840, 2160), (128, 128, 128)]
+
+
+class Label:
+    params = [_shapes, [1, 2]]
+    param_names = ["shape", "connectivity"]
+
+    def setup(self, shape, connectivity):
+        self.x = blobs(shape)
+        self.x_gpu = to_device(self.x)
+
+    def time_label(self, shape, connectivity):
+        measure.label(self.x_gpu, connectivity=connectivity)
+
+    def reference_label(self, shape, connectivity):
+        measure_ref.label(self.x, connectivity=connectivity)
+
+
+class RegionProps:
+    params = [[(512, 512), (3840, 2160)], [64, 512]]
+    param_names = ["shape", "n_blobs"]
+
+    def setup(self, shape, n_blobs):
+        self.labels = measure_ref.label(blobs(shape, n_blobs=n_blobs))
+        self.x = random_image(shape, "float32")
+        self.labels_gpu = to_device(self.labels)
+        self.x_gpu = to_device(self.x)
+        self.properties = [
+            "label",
+            "area",
+            "centroid",
+            "bbox",
+            "mean_intensity",
+        ]
+
+    def time_regionprops_table(self, shape, n_blobs):
+        measure.regionprops_table(
+            self.labels_gpu, self.x_gpu, properties=self.properties
+        )
+
+    def reference_regionprops_table(self, shape, n_blobs):
+        measure_ref.regionprops_table(
+            self.labels, self.x, properties=self.properties
+        )
+
+
+class BlockReduce:
+    params = [[(512, 512), (3840, 2160)], [(2, 2), (4, 4)]]
+    param_names = ["shape", "block_size"]
+
+    def setup(self, shape, block_size):
+        self.x = random_image(shape, "float32")
+        self.x_gpu = to_device(self.x)
+
+    def time_block_reduce(self, shape, block_size):
+        measure.block_reduce(self.x_gpu, block_size, func=cp.mean)
+
+    def reference_block_reduce(self, shape, block_size):
+        measure_ref.block_reduce(self.x, block_size, func=np.mean)
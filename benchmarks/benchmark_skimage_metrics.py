@@ -0,0 +1,41 @@
+import skimage.metrics as metrics_ref
+
+from ._common import device_module, random_image, to_device
+
+metrics = device_module("cupyimg.skimage.metrics")
+
+
+class Metrics:
+    params = [[(512, 512), (3840, 2160), (512, 512, 3)], ["uint8", "float32"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        self.x = random_image(shape, dtype)
+        self.y = random_image(shape, dtype, seed=1)
+        self.x_gpu = to_device(self.x)
+        self.y_gpu = to_device(self.y)
+        self.kwargs = dict(multichannel=len(shape) == 3)
+        if self.x.dtype.kind == "f":
+            self.kwargs["data_range"] = 1.0
+
+    def time_structural_similarity(self, shape, dtype):
+        metrics.structural_similarity(self.x_gpu, self.y_gpu, **self.kwargs)
+
+    def reference_structural_similarity(self, shape, dtype):
+        metrics_ref.structural_similarity(self.x, self.y, **self.kwargs)
+
+    def time_peak_signal_noise_ratio(self, shape, dtype):
+        metrics.peak_signal_noise_ratio(
+            self.x_gpu, self.y_gpu, data_range=self.kwargs.get("data_range")
+        )
+
+    def reference_peak_signal_noise_ratio(self, shape, dtype):
+        metrics_ref.peak_signal_noise_ratio(
+            self.x, self.y, data_range=self.kwargs.get("data_range")
+        )
+
+    def time_mean_squared_error(self, shape, dtype):
+        metrics.mean_squared_error(self.x_gpu, self.y_gpu)
+
+    def reference_mean_squared_error(self, shape, dtype):
+        metrics_ref.mean_squared_error(self.x, self.y)
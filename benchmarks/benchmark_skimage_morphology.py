@@ -0,0 +1,101 @@
+import skimage.morphology as morphology_ref
+
+from ._common import blobs, device_module, random_image, to_device
+
+morphology = device_module("cupyimg.skimage.morphology")
+
+_shapes = [(512, 512), (3840, 2160)]
+
+
+class GreyMorphology:
+    params = [_shapes, ["uint8", "float32"], ["square", "disk"], [1, 7]]
+    param_names = ["shape", "dtype", "selem", "radius"]
+
+    def setup(self, shape, dtype, selem, radius):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+        if selem == "square":
+            self.selem = morphology_ref.square(2 * radius + 1)
+        else:
+            self.selem = morphology_ref.disk(radius)
+        self.selem_gpu = to_device(self.selem)
+
+    def time_erosion(self, shape, dtype, selem, radius):
+        morphology.erosion(self.x_gpu, self.selem_gpu)
+
+    def reference_erosion(self, shape, dtype, selem, radius):
+        morphology_ref.erosion(self.x, self.selem)
+
+    def time_dilation(self, shape, dtype, selem, radius):
+        morphology.dilation(self.x_gpu, self.selem_gpu)
+
+    def reference_dilation(self, shape, dtype, selem, radius):
+        morphology_ref.dilation(self.x, self.selem)
+
+    def time_opening(self, shape, dtype, selem, radius):
+        morphology.opening(self.x_gpu, self.selem_gpu)
+
+    def reference_opening(self, shape, dtype, selem, radius):
+        morphology_ref.opening(self.x, self.selem)
+
+    def time_white_tophat(self, shape, dtype, selem, radius):
+        morphology.white_tophat(self.x_gpu, self.selem_gpu)
+
+    def reference_white_tophat(self, shape, dtype, selem, radius):
+        morphology_ref.white_tophat(self.x, self.selem)
+
+
+class BinaryMorphology:
+    params = [_shapes, ["square", "disk"], [1, 7]]
+    param_names = ["shape", "selem", "radius"]
+
+    def setup(self, shape, selem, radius):
+        self.x = blobs(shape)
+        self.x_gpu = to_device(self.x)
+        if selem == "square":
+            self.selem = morphology_ref.square(2 * radius + 1)
+        else:
+            self.selem = morphology_ref.disk(radius)
+        self.selem_gpu = to_device(self.selem)
+
+    def time_binary_erosion(self, shape, selem, radius):
+        morphology.binary_erosion(self.x_gpu, self.selem_gpu)
+
+    def reference_binary_erosion(self, shape, selem, radius):
+        morphology_ref.binary_erosion(self.x, self.selem)
+
+    def time_binary_dilation(self, shape, selem, radius):
+        morphology.binary_dilation(self.x_gpu, self.selem_gpu)
+
+    def reference_binary_dilation(self, shape, selem, radius):
+        morphology_ref.binary_dilation(self.x, self.selem)
+
+    def time_binary_closing(self, shape, selem, radius):
+        morphology.binary_closing(self.x_gpu, self.selem_gpu)
+
+    def reference_binary_closing(self, shape, selem, radius):
+        morphology_ref.binary_closing(self.x, self.selem)
+
+
+class Objects:
+    params = [_shapes]
+    param_names = ["shape"]
+
+    def setup(self, shape):
+        self.x = blobs(shape, n_blobs=256)
+        self.x_gpu = to_device(self.x)
+        self.seed = self.x.copy()
+        self.seed[1:-1, 1:-1] = False
+        self.seed_gpu = to_device(self.seed)
+
+    def time_remove_small_objects(self, shape):
+        morphology.remove_small_objects(self.x_gpu, min_size=200)
+
+    def reference_remove_small_objects(self, shape):
+        morphology_ref.remove_small_objects(self.x, min_size=200)
+
+    def time_reconstruction(self, shape):
+        morphology.reconstruction(self.seed_gpu, self.x_gpu)
+
+    def reference_reconstruction(self, shape):
+        morphology_ref.reconstruction(self.seed, self.x)
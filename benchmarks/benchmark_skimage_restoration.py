@@ -0,0 +1,60 @@
+import numpy as np
+import skimage.registration as registration_ref
+import skimage.restoration as restoration_ref
+
+from ._common import device_module, random_image, to_device
+
+registration = device_module("cupyimg.skimage.registration")
+restoration = device_module("cupyimg.skimage.restoration")
+
+_shapes = [(512, 512), (2048, 2048)]
+
+
+class Restoration:
+    params = [_shapes, ["float32", "float64"]]
+    param_names = ["shape", "dtype"]
+
+    def setup(self, shape, dtype):
+        self.x = random_image(shape, dtype)
+        self.psf = (np.ones((5, 5)) / 25).astype(dtype)
+        self.x_gpu = to_device(self.x)
+        self.psf_gpu = to_device(self.psf)
+
+    def time_denoise_tv_chambolle(self, shape, dtype):
+        restoration.denoise_tv_chambolle(self.x_gpu, weight=0.1)
+
+    def reference_denoise_tv_chambolle(self, shape, dtype):
+        restoration_ref.denoise_tv_chambolle(self.x, weight=0.1)
+
+    def time_richardson_lucy(self, shape, dtype):
+        restoration.richardson_lucy(self.x_gpu, self.psf_gpu, 5, clip=False)
+
+    def reference_richardson_lucy(self, shape, dtype):
+        restoration_ref.richardson_lucy(self.x, self.psf, 5, clip=False)
+
+    def time_wiener(self, shape, dtype):
+        restoration.wiener(self.x_gpu, self.psf_gpu, 0.1)
+
+    def reference_wiener(self, shape, dtype):
+        restoration_ref.wiener(self.x, self.psf, 0.1)
+
+
+class Registration:
+    params = [_shapes, [1, 10]]
+    param_names = ["shape", "upsample_factor"]
+
+    def setup(self, shape, upsample_factor):
+        self.x = random_image(shape, "float32")
+        self.y = np.roll(self.x, (3, -5), axis=(0, 1))
+        self.x_gpu = to_device(self.x)
+        self.y_gpu = to_device(self.y)
+
+    def time_phase_cross_correlation(self, shape, upsample_factor):
+        registration.phase_cross_correlation(
+            self.x_gpu, self.y_gpu, upsample_factor=upsample_factor
+        )
+
+    def reference_phase_cross_correlation(self, shape, upsample_factor):
+        registration_ref.phase_cross_correlation(
+            self.x, self.y, upsample_factor=upsample_factor
+        )
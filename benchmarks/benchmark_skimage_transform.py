@@ -0,0 +1,114 @@
+import skimage.transform as transform_ref
+
+from ._common import device_module, random_image, to_device
+
+transform = device_module("cupyimg.skimage.transform")
+
+_shapes = [(512, 512), (2048, 2048), (512, 512, 3)]
+
+
+class Warps:
+    params = [_shapes, ["float32", "float64"], [0, 1, 3]]
+    param_names = ["shape", "dtype", "order"]
+
+    def setup(self, shape, dtype, order):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+        self.tform = transform_ref.AffineTransform(
+            scale=(1.1, 0.9), rotation=0.2, translation=(5, -3)
+        )
+        if self.x_gpu is not None:
+            self.tform_gpu = transform.AffineTransform(self.tform.params)
+        self.multichannel = len(shape) == 3
+
+    def time_warp(self, shape, dtype, order):
+        transform.warp(self.x_gpu, self.tform_gpu, order=order)
+
+    def reference_warp(self, shape, dtype, order):
+        transform_ref.warp(self.x, self.tform, order=order)
+
+    def time_rotate(self, shape, dtype, order):
+        transform.rotate(self.x_gpu, 17, order=order)
+
+    def reference_rotate(self, shape, dtype, order):
+        transform_ref.rotate(self.x, 17, order=order)
+
+    def time_swirl(self, shape, dtype, order):
+        transform.swirl(self.x_gpu, strength=5, radius=200, order=order)
+
+    def reference_swirl(self, shape, dtype, order):
+        transform_ref.swirl(self.x, strength=5, radius=200, order=order)
+
+    def time_warp_polar(self, shape, dtype, order):
+        transform.warp_polar(
+            self.x_gpu, multichannel=self.multichannel, order=order
+        )
+
+    def reference_warp_polar(self, shape, dtype, order):
+        transform_ref.warp_polar(
+            self.x, multichannel=self.multichannel, order=order
+        )
+
+
+class Resize:
+    params = [_shapes, ["float32", "float64"], [0.25, 0.5, 2.0], [True, False]]
+    param_names = ["shape", "dtype", "scale", "anti_aliasing"]
+
+    def setup(self, shape, dtype, scale, anti_aliasing):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+        self.multichannel = len(shape) == 3
+        if anti_aliasing and scale > 1:
+            # anti-aliasing only applies to downscaling
+            raise NotImplementedError()
+
+    def time_rescale(self, shape, dtype, scale, anti_aliasing):
+        transform.rescale(
+            self.x_gpu,
+            scale,
+            anti_aliasing=anti_aliasing,
+            multichannel=self.multichannel,
+        )
+
+    def reference_rescale(self, shape, dtype, scale, anti_aliasing):
+        transform_ref.rescale(
+            self.x,
+            scale,
+            anti_aliasing=anti_aliasing,
+            multichannel=self.multichannel,
+        )
+
+    def time_resize(self, shape, dtype, scale, anti_aliasing):
+        output_shape = tuple(round(s * scale) for s in shape[:2])
+        transform.resize(self.x_gpu, output_shape, anti_aliasing=anti_aliasing)
+
+    def reference_resize(self, shape, dtype, scale, anti_aliasing):
+        output_shape = tuple(round(s * scale) for s in shape[:2])
+        transform_ref.resize(self.x, output_shape, anti_aliasing=anti_aliasing)
+
+
+class Pyramids:
+    params = [_shapes, ["float32", "float64"], [2, 4]]
+    param_names = ["shape", "dtype", "factor"]
+
+    def setup(self, shape, dtype, factor):
+        self.x = random_image(shape, dtype)
+        self.x_gpu = to_device(self.x)
+        self.multichannel = len(shape) == 3
+        self.factors = (factor,) * 2 + (1,) * (len(shape) - 2)
+
+    def time_pyramid_reduce(self, shape, dtype, factor):
+        transform.pyramid_reduce(
+            self.x_gpu, downscale=factor, multichannel=self.multichannel
+        )
+
+    def reference_pyramid_reduce(self, shape, dtype, factor):
+        transform_ref.pyramid_reduce(
+            self.x, downscale=factor, multichannel=self.multichannel
+        )
+
+    def time_downscale_local_mean(self, shape, dtype, factor):
+        transform.downscale_local_mean(self.x_gpu, self.factors)
+
+    def reference_downscale_local_mean(self, shape, dtype, factor):
+        transform_ref.downscale_local_mean(self.x, self.factors)
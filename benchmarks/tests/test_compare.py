@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from benchmarks import _common, _compare, _runner
+from benchmarks.__main__ import main
+
+
+def _results(timings, metric="gpu"):
+    records = []
+    for key, t in timings.items():
+        record = {"name": key, "key": key, "gpu": None, "reference": None}
+        if t == "failed":
+            record["error"] = "RuntimeError()"
+        else:
+            record[metric] = {"median": t, "mean": t, "min": t}
+        records.append(record)
+    return {
+        "version": _runner.RESULTS_VERSION,
+        "reference_only": False,
+        "benchmarks": records,
+    }
+
+
+def test_compare_status():
+    old = _results(dict(a=1.0, b=1.0, c=1.0, d=1.0, e=1.0, f="failed"))
+    new = _results(dict(a=1.05, b=1.5, c=0.5, d="failed", f=1.0, g=1.0))
+    rows = _compare.compare(old, new, factor=1.1)
+    status = {row["key"]: row["status"] for row in rows}
+    assert status == dict(
+        a="unchanged",
+        b="regression",
+        c="improved",
+        d="regression",
+        e="removed",
+        f="failed",
+        g="new",
+    )
+    ratios = {row["key"]: row["ratio"] for row in rows}
+    assert ratios["b"] == pytest.approx(1.5)
+    assert ratios["e"] is None
+
+    table = _compare.format_table(rows, only_changed=True)
+    assert "b" in table.split()
+    assert "a" not in table.split()
+
+
+def test_compare_metric():
+    old = _results(dict(a=1.0), metric="reference")
+    new = _results(dict(a=2.0), metric="reference")
+    # no gpu timings were recorded
+    assert _compare.compare(old, new) == []
+    rows = _compare.compare(old, new, metric="reference")
+    assert rows[0]["status"] == "regression"
+    with pytest.raises(ValueError):
+        _compare.compare(old, new, metric="wall")
+    with pytest.raises(ValueError):
+        _compare.compare(old, new, factor=0.9)
+
+
+def test_compare_cmd(tmp_path, capsys):
+    old = str(tmp_path / "old.json")
+    new = str(tmp_path / "new.json")
+    _runner.write_results(_results(dict(a=1.0, b=1.0)), old)
+
+    _runner.write_results(_results(dict(a=1.0, b=1.05)), new)
+    assert main(["compare", old, new]) == 0
+    assert "b" in capsys.readouterr().out
+
+    _runner.write_results(_results(dict(a=1.0, b=1.5)), new)
+    assert main(["compare", old, new]) == 1
+    assert main(["compare", old, new, "--factor", "2"]) == 0
+
+    with open(new, "w") as f:
+        json.dump({"version": -1, "benchmarks": []}, f)
+    with pytest.raises(ValueError):
+        main(["compare", old, new])
+
+
+def test_device_module_reference_only(monkeypatch):
+    monkeypatch.setattr(_common, "use_device", False)
+    module = _common.device_module("cupyimg.scipy.ndimage")
+    # nothing is imported until an attribute is used
+    with pytest.raises(RuntimeError):
+        module.gaussian_filter
+    assert _common.to_device([1, 2]) is None
+
+
+def test_discover_reference_only(monkeypatch):
+    # benchmark modules must be importable on hosts without a GPU
+    pytest.importorskip("scipy")
+    pytest.importorskip("skimage")
+    monkeypatch.setattr(_common, "use_device", False)
+    names = [name for name, _, _ in _runner.discover()]
+    assert "skimage_measure.Label.time_label" in names
@@ -15,20 +15,18 @@ scipy
 skimage
     Functions from scikit-image.
 
+Kernel generation
+-----------------
+Generated CUDA kernels are recorded in a registry (see
+``get_kernel_cache_stats``) with an on-disk index. Run
+``python -m cupyimg.warmup`` to pre-generate and compile kernels ahead of
+time.
+
 Additional documentation and usage examples for the functions can be found
 at the main documentation pages of the various packges:
 
 """
 
-import cupy
-
-try:
-    memoize = cupy.util.memoize
-except AttributeError:
-    memoize = cupy.memoize
-
+from ._kernel_cache import memoize, get_kernel_cache_stats  # noqa
 from ._misc import convolve_separable  # noqa
 from .version import __version__  # noqa
-
-
-del cupy
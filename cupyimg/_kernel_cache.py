@@ -0,0 +1,252 @@
+"""Registry of the kernels generated by cupyimg's kernel factories.
+
+All kernel factories in cupyimg are decorated with :func:`memoize`, which
+behaves like ``cupy.memoize`` but additionally records each call in a
+process-wide :class:`KernelRegistry`. The registry keeps track of:
+
+* memory hits: the kernel was already generated by this process.
+* disk hits: the kernel was generated for the first time in this process, but
+  its source is listed in the on-disk index, so the compiled binary is
+  expected to be found in CuPy's on-disk kernel cache (``CUPY_CACHE_DIR``).
+* misses: the kernel source has not been seen before and will require NVRTC
+  compilation on first launch.
+
+The on-disk index is a JSON file stored in the directory given by the
+``CUPYIMG_CACHE_DIR`` environment variable (default:
+``~/.cupyimg/kernel_cache``). It is written by :func:`save_index`, by the
+``python -m cupyimg.warmup`` command, or automatically at interpreter exit if
+``CUPYIMG_KERNEL_INDEX_AUTOSAVE=1``.
+"""
+import atexit
+import functools
+import hashlib
+import json
+import os
+import threading
+
+import cupy
+
+__all__ = [
+    "memoize",
+    "registry",
+    "get_cache_dir",
+    "get_kernel_cache_stats",
+    "save_index",
+]
+
+_INDEX_VERSION = 1
+
+
+def get_cache_dir():
+    """Directory in which the kernel index is stored."""
+    default = os.path.join(os.path.expanduser("~"), ".cupyimg", "kernel_cache")
+    return os.environ.get("CUPYIMG_CACHE_DIR", default)
+
+
+def _param_signature(param):
+    """String form of a kernel parameter (e.g. ``"raw T x"``)."""
+    if isinstance(param, str):
+        return param
+    parts = []
+    if getattr(param, "raw", False):
+        parts.append("raw")
+    ctype = getattr(param, "ctype", None)
+    parts.append(str(ctype if ctype is not None else param.dtype))
+    parts.append(param.name)
+    return " ".join(parts)
+
+
+def _kernel_source(kernel):
+    """Return the source-defining attributes of a CuPy kernel object.
+
+    Only string-valued attributes and the parameter signatures are used so
+    that the result (and its hash) is identical across processes.
+    """
+    parts = []
+    for attr in ["in_params", "out_params"]:
+        val = getattr(kernel, attr, None)
+        if isinstance(val, str):
+            parts.append(val)
+        elif val is not None:
+            parts.append(", ".join(_param_signature(p) for p in val))
+    for attr in [
+        "name",
+        "operation",
+        "map_expr",
+        "reduce_expr",
+        "post_map_expr",
+        "identity",
+        "reduce_type",
+        "preamble",
+        "code",
+        "options",
+    ]:
+        val = getattr(kernel, attr, None)
+        if isinstance(val, str):
+            parts.append(val)
+        elif isinstance(val, tuple) and all(isinstance(v, str) for v in val):
+            parts.append(" ".join(val))
+    if not parts:
+        return None
+    return "\n".join(parts)
+
+
+class KernelRegistry(object):
+    """Process-wide record of the kernels generated by cupyimg."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None  # lazily loaded on-disk index
+        self._new_entries = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.factory_counts = {}
+
+    def _index_path(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = get_cache_dir()
+        return os.path.join(cache_dir, "index.json")
+
+    def load_index(self, cache_dir=None):
+        """Load (or reload) the on-disk index of generated kernels."""
+        path = self._index_path(cache_dir)
+        index = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == _INDEX_VERSION:
+                    index = data.get("kernels", {})
+            except (OSError, ValueError):
+                # a corrupt or unreadable index is treated as empty
+                index = {}
+        with self._lock:
+            self._index = index
+        return index
+
+    def save_index(self, cache_dir=None):
+        """Merge the kernels generated by this process into the on-disk index.
+
+        Returns the path of the index file.
+        """
+        if cache_dir is None:
+            cache_dir = get_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        path = self._index_path(cache_dir)
+        # re-read to merge with entries written by other processes
+        index = dict(self.load_index(cache_dir))
+        with self._lock:
+            index.update(self._new_entries)
+            self._index = index
+        tmp_path = path + ".{}.tmp".format(os.getpid())
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"version": _INDEX_VERSION, "kernels": index},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    def _record_hit(self, factory):
+        with self._lock:
+            self.memory_hits += 1
+
+    def _record_miss(self, factory, args, kwargs, kernel):
+        source = _kernel_source(kernel)
+        if source is None:
+            # not a kernel (e.g. a memoized helper returning plain values)
+            return
+        if self._index is None:
+            self.load_index()
+        key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        with self._lock:
+            self.factory_counts[factory] = (
+                self.factory_counts.get(factory, 0) + 1
+            )
+            # kernels generated earlier in this process are not disk hits
+            if key in self._index:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            self._new_entries[key] = {
+                "factory": factory,
+                "args": repr(args),
+                "kwargs": repr(sorted(kwargs.items())),
+                "name": getattr(kernel, "name", None),
+            }
+
+    def stats(self):
+        """Dictionary of hit/miss counts for this process."""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "generated": dict(self.factory_counts),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.memory_hits = self.disk_hits = self.misses = 0
+            self.factory_counts = {}
+
+
+registry = KernelRegistry()
+
+
+def get_kernel_cache_stats():
+    """Hit/miss counts of cupyimg's kernel registry for this process.
+
+    Returns
+    -------
+    stats : dict
+        ``memory_hits`` counts factory calls served from the in-process memo,
+        ``disk_hits`` counts newly generated kernels whose source is already
+        in the on-disk index and ``misses`` counts kernels never seen before.
+        ``generated`` gives the number of kernels generated per factory.
+    """
+    return registry.stats()
+
+
+def save_index(cache_dir=None):
+    """Write the kernels generated by this process to the on-disk index."""
+    return registry.save_index(cache_dir)
+
+
+def memoize(for_each_device=False):
+    """Memoize a kernel factory, recording calls in the kernel registry.
+
+    This is a drop-in replacement for ``cupy.memoize``. All arguments to the
+    decorated function must be hashable.
+    """
+
+    def decorator(f):
+        factory = "{}.{}".format(f.__module__, f.__qualname__)
+        memo = {}
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            if for_each_device:
+                key = (cupy.cuda.runtime.getDevice(),) + key
+            try:
+                result = memo[key]
+            except KeyError:
+                result = f(*args, **kwargs)
+                memo[key] = result
+                registry._record_miss(factory, args, kwargs, result)
+            else:
+                registry._record_hit(factory)
+            return result
+
+        wrapper.clear_memo = memo.clear
+        return wrapper
+
+    return decorator
+
+
+if os.environ.get("CUPYIMG_KERNEL_INDEX_AUTOSAVE", "0") == "1":
+    atexit.register(save_index)
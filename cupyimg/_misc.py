@@ -36,7 +36,7 @@ def _prod(iterable):
     return product
 
 
-def convolve_separable(x, w, axes=None, **kwargs):
+def convolve_separable(x, w, axes=None, origin=0, **kwargs):
     """n-dimensional convolution via separable application of convolve1d
 
     Parameters
@@ -51,6 +51,11 @@ def convolve_separable(x, w, axes=None, **kwargs):
     axes : tuple of int or None
         The axes of ``x`` to be filtered. The default (None) is to filter all
         axes of ``x``.
+    origin : int or sequence of int, optional
+        The origin of the filter along each of the filtered axes.
+
+    Additional keyword arguments are passed on to
+    ``cupyimg.scipy.ndimage.convolve1d``.
 
     Returns
     -------
@@ -70,10 +75,15 @@ def convolve_separable(x, w, axes=None, **kwargs):
     elif len(w) != len(axes):
         raise ValueError("user should supply one filter per axis")
 
-    for ax, w0 in zip(axes, w):
+    if numpy.isscalar(origin):
+        origin = [origin] * len(axes)
+    elif len(origin) != len(axes):
+        raise ValueError("user should supply one origin per axis")
+
+    for ax, w0, origin0 in zip(axes, w, origin):
         if not isinstance(w0, cupy.ndarray) or w0.ndim != 1:
             raise ValueError("w must be a 1d array (or sequence of 1d arrays)")
-        x = convolve1d(x, w0, axis=ax, **kwargs)
+        x = convolve1d(x, w0, axis=ax, origin=origin0, **kwargs)
     return x
 
 
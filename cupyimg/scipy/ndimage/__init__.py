@@ -7,6 +7,7 @@ from cupyimg.scipy.ndimage.fourier import fourier_gaussian  # NOQA
 from cupyimg.scipy.ndimage.fourier import fourier_shift  # NOQA
 from cupyimg.scipy.ndimage.fourier import fourier_uniform  # NOQA
 
+from cupyimg.scipy.ndimage.interpolation import SplineCoefficients  # NOQA
 from cupyimg.scipy.ndimage.interpolation import spline_filter  # NOQA
 from cupyimg.scipy.ndimage.interpolation import spline_filter1d  # NOQA
 from cupyimg.scipy.ndimage.interpolation import affine_transform  # NOQA
@@ -14,3 +15,6 @@ from cupyimg.scipy.ndimage.interpolation import map_coordinates  # NOQA
 from cupyimg.scipy.ndimage.interpolation import rotate  # NOQA
 from cupyimg.scipy.ndimage.interpolation import shift  # NOQA
 from cupyimg.scipy.ndimage.interpolation import zoom  # NOQA
+
+from cupyimg.scipy.ndimage.tiling import tiled_filter  # NOQA
+from cupyimg.scipy.ndimage.tiling import tiled_label  # NOQA
@@ -0,0 +1,251 @@
+"""Sliding-histogram rank filter for 8-bit and 16-bit integer images.
+
+Each thread handles a segment of consecutive outputs along the last axis. The
+footprint is decomposed into runs of consecutive elements along that axis, and
+the thread keeps a histogram of the values under the footprint. Moving to the
+next output only removes the first element and adds the element following the
+last one of each run, so the cost of an update depends on the number of runs
+of the footprint (its height for a disk) rather than on its number of
+elements. The requested rank is then found by scanning a coarse histogram
+(one bin per ``2**(bits / 2)`` values) followed by the matching fine bins.
+
+This is the approach of [1]_ with the column histograms replaced by runs, so
+that arbitrary footprints and any number of dimensions are supported.
+
+References
+----------
+.. [1] S. Perreault and P. Hebert, "Median Filtering in Constant Time",
+       IEEE Trans. Image Processing 16(9), 2389-2394 (2007).
+"""
+import itertools
+
+import cupy
+import numpy
+
+from cupyimg import memoize
+from cupyimg.scipy.ndimage import _filters_core, _util
+
+# Smallest footprints for which the histograms beat the sorting kernels. The
+# 16-bit histograms take much longer to clear, so they need larger windows.
+_MIN_FILTER_SIZE = {1: 49, 2: 225}
+# minimum number of outputs computed by each thread
+_MIN_SEGMENT = 32
+# maximum size in bytes of the histograms of all concurrently running threads
+_MAX_HIST_BYTES = 1 << 27
+
+
+def _use_histogram(dtype, filter_size, mode, cval):
+    """Whether ``_rank_filter_hist`` supports and is worth using for a call."""
+    if dtype.kind not in "iu" or dtype.itemsize not in _MIN_FILTER_SIZE:
+        return False
+    if filter_size < _MIN_FILTER_SIZE[dtype.itemsize]:
+        return False
+    if mode in ("constant", "grid-constant"):
+        # the padding must be one of the histogram bins
+        info = numpy.iinfo(dtype)
+        return bool(info.min <= cval < info.max + 1)
+    return True
+
+
+def _footprint_runs(footprint, offsets):
+    """Runs of nonzero elements of ``footprint`` along its last axis.
+
+    Returns an int32 array with one row per run, holding the position of the
+    run along the leading axes followed by its first and last positions along
+    the last axis, all relative to the output element.
+    """
+    ndim = footprint.ndim
+    runs = []
+    for lead in itertools.product(*map(range, footprint.shape[:-1])):
+        row = numpy.concatenate(([False], footprint[lead], [False]))
+        edges = numpy.flatnonzero(row[1:] != row[:-1])
+        rel = [i - o for i, o in zip(lead, offsets[:-1])]
+        for first, stop in zip(edges[::2], edges[1::2]):
+            runs.append(rel + [first - offsets[-1], stop - 1 - offsets[-1]])
+    return numpy.asarray(runs, dtype=numpy.int32).reshape(-1, ndim + 1)
+
+
+def _rank_filter_hist(input, footprint, rank, output, mode, cval, origins):
+    """Rank filter of an 8-bit or 16-bit integer array.
+
+    ``footprint`` must contain more than ``rank`` nonzero elements and, in
+    constant mode, ``cval`` must be within the range of ``input.dtype``.
+    """
+    mode = "grid-wrap" if mode == "wrap" else mode
+    _util._check_mode(mode)
+
+    output = _util._get_output(output, input)
+    x = cupy.ascontiguousarray(input)
+    in_place = output.flags.c_contiguous and not cupy.shares_memory(
+        output, x, "MAY_SHARE_BOUNDS"
+    )
+    y = output if in_place else cupy.empty(output.shape, output.dtype)
+    if x.size == 0:
+        return output
+
+    footprint = cupy.asnumpy(footprint).astype(bool, copy=False)
+    filter_size = int(numpy.count_nonzero(footprint))
+    offsets = _filters_core._origins_to_offsets(origins, footprint.shape)
+    runs = _footprint_runs(footprint, offsets)
+
+    bits = 8 * x.dtype.itemsize
+    n_bins = 1 << bits
+    n_coarse = 1 << (bits // 2)
+    # 16-bit counts halve the memory traffic unless they could overflow
+    count_dtype = numpy.uint16 if filter_size < (1 << 16) else numpy.int32
+    hist_size = n_coarse + n_bins
+    lo = int(numpy.iinfo(x.dtype).min)
+    cval_bin = int(cval) - lo if mode in ("constant", "grid-constant") else 0
+
+    # clearing the histograms and filling them for the first output of a
+    # segment must be amortized over the sliding updates
+    step_cost = 2 * len(runs) + 2 * n_coarse
+    segment = max(_MIN_SEGMENT, -(-(hist_size + filter_size) // step_cost))
+    n = x.shape[-1]
+    n_segments = -(-n // segment)
+    n_threads = (x.size // n) * n_segments
+    hist_bytes = hist_size * numpy.dtype(count_dtype).itemsize
+    chunk = min(n_threads, max(_MAX_HIST_BYTES // hist_bytes, 1))
+    hist = cupy.empty((chunk, hist_size), dtype=count_dtype)
+
+    kernel = _get_rank_hist_kernel(x.ndim, mode, bits, lo)
+    shape = cupy.asarray(x.shape, dtype=cupy.int64)
+    runs = cupy.asarray(runs)
+    for first in range(0, n_threads, chunk):
+        kernel(
+            x.reshape(-1),
+            shape,
+            runs,
+            len(runs),
+            rank,
+            n_segments,
+            segment,
+            first,
+            cval_bin,
+            hist,
+            y.reshape(-1),
+            size=min(chunk, n_threads - first),
+        )
+    if not in_place:
+        output[...] = y
+    return output
+
+
+@memoize(for_each_device=True)
+def _get_rank_hist_kernel(ndim, mode, bits, lo):
+    boundary = _util._generate_boundary_condition_ops(
+        mode, "ix", "n", int_t="ptrdiff_t"
+    )
+    shift = bits // 2
+    n_coarse = 1 << shift
+    preamble = """
+    __device__ ptrdiff_t _rank_hist_map(ptrdiff_t ix, ptrdiff_t n)
+    {{
+        {boundary}
+        return ix;
+    }}
+
+    // offset of the line of a run, or -1 if it is in the constant padding
+    __device__ ptrdiff_t _rank_hist_line(const int* run, const ptrdiff_t* ind,
+                                         const long long* shape)
+    {{
+        ptrdiff_t base = 0;
+        for (int k = 0; k < {ndim} - 1; k++) {{
+            ptrdiff_t ix = _rank_hist_map(ind[k] + run[k], shape[k]);
+            if (ix < 0) return -1;
+            base = base * shape[k] + ix;
+        }}
+        return base * shape[{ndim} - 1];
+    }}
+
+    template <typename X>
+    __device__ int _rank_hist_bin(const X* x, ptrdiff_t base, ptrdiff_t ix,
+                                  ptrdiff_t n, int cval_bin)
+    {{
+        if (base < 0) return cval_bin;
+        ix = _rank_hist_map(ix, n);
+        if (ix < 0) return cval_bin;
+        return (int)x[base + ix] - ({lo});
+    }}
+
+    template <typename C>
+    __device__ void _rank_hist_add(C* h, int v, int count)
+    {{
+        h[v >> {shift}] += count;
+        h[{n_coarse} + v] += count;
+    }}
+    """.format(
+        boundary=boundary, ndim=ndim, lo=lo, shift=shift, n_coarse=n_coarse
+    )
+    code = """
+    ptrdiff_t g = first + i;
+    const long long* shp = &shape[0];
+    ptrdiff_t n = shp[{ndim} - 1];
+    ptrdiff_t start = (g % n_segments) * segment;
+    ptrdiff_t stop = min(start + (ptrdiff_t)segment, n);
+    ptrdiff_t line = g / n_segments;
+    ptrdiff_t ind[{n_lead}];
+    ptrdiff_t rem = line;
+    for (int k = {ndim} - 2; k >= 0; k--) {{
+        ind[k] = rem % shp[k];
+        rem /= shp[k];
+    }}
+    const X* xp = &x[0];
+    C* h = &hist[i * ({n_coarse} + {n_bins})];
+    for (int b = 0; b < {n_coarse} + {n_bins}; b++) {{
+        h[b] = 0;
+    }}
+
+    for (ptrdiff_t j = start; j < stop; j++) {{
+        for (int r = 0; r < n_runs; r++) {{
+            const int* run = &runs[r * ({ndim} + 1)];
+            ptrdiff_t base = _rank_hist_line(run, ind, shp);
+            if (j == start) {{
+                for (ptrdiff_t c = j + run[{ndim} - 1]; c <= j + run[{ndim}];
+                     c++) {{
+                    _rank_hist_add(h, _rank_hist_bin(xp, base, c, n, cval_bin),
+                                   1);
+                }}
+            }} else {{
+                ptrdiff_t c = j - 1 + run[{ndim} - 1];
+                _rank_hist_add(h, _rank_hist_bin(xp, base, c, n, cval_bin),
+                               -1);
+                c = j + run[{ndim}];
+                _rank_hist_add(h, _rank_hist_bin(xp, base, c, n, cval_bin),
+                               1);
+            }}
+        }}
+        // find the bin holding the element of the requested rank
+        int count = rank;
+        int b = 0;
+        while (h[b] <= count) {{
+            count -= h[b++];
+        }}
+        b <<= {shift};
+        while (h[{n_coarse} + b] <= count) {{
+            count -= h[{n_coarse} + b++];
+        }}
+        y[line * n + j] = cast<Y>((X)(b + ({lo})));
+    }}
+    """.format(
+        ndim=ndim,
+        n_lead=max(ndim - 1, 1),
+        n_coarse=n_coarse,
+        n_bins=1 << bits,
+        shift=shift,
+        lo=lo,
+    )
+    name = "cupyimg_ndimage_rank_hist_{}d_{}_{}{}".format(
+        ndim, mode.replace("-", "_"), "int" if lo else "uint", bits
+    )
+    return cupy.ElementwiseKernel(
+        "raw X x, raw int64 shape, raw int32 runs, int32 n_runs, int32 rank, "
+        "int64 n_segments, int64 segment, int64 first, int32 cval_bin",
+        "raw C hist, raw Y y",
+        code,
+        name,
+        preamble=_filters_core.includes
+        + _filters_core._CAST_FUNCTION
+        + preamble,
+        options=("--std=c++11", "-DCUPY_USE_JITIFY"),
+    )
@@ -0,0 +1,240 @@
+"""Separable and low-rank evaluation of n-dimensional correlations.
+
+A weights array ``w`` with multilinear ranks ``(r_0, ..., r_{k-1})`` along
+its ``k`` non-singleton axes can be written (HOSVD / Tucker decomposition) as
+
+    w = sum_{j_0, ..., j_{k-2}} u_0[:, j_0] x ... x u_{k-2}[:, j_{k-2}]
+                                 x v[j_0, ..., j_{k-2}, :]
+
+where the core tensor has been absorbed into the filters ``v`` of the last
+axis. The correlation with ``w`` is then evaluated as a tree of 1D passes that
+share their common prefixes, which for a rank-1 (separable) kernel of shape
+``(n_0, ..., n_{k-1})`` costs ``n_0 + ... + n_{k-1}`` instead of
+``n_0 * ... * n_{k-1}`` multiply-adds per element.
+"""
+import functools
+
+import cupy
+import numpy
+
+from cupyimg import memoize
+from cupyimg.scipy.ndimage import _filters_core, _util
+
+# Small kernels are memory bound: the additional passes over the data cost
+# more than the arithmetic saved, so 'auto' keeps the direct kernel for them.
+_MIN_AUTO_SIZE = 64
+# 'auto' requires the separable evaluation to be at least this much cheaper.
+_MIN_AUTO_GAIN = 3
+# Approximate cost of a 1D pass (memory traffic, launch) in multiply-adds.
+_PASS_OVERHEAD = 4
+
+
+class _Factorization(object):
+    """Low-rank factors of a weights array (all stored on the host).
+
+    Attributes:
+        axes (tuple of int): The non-singleton axes of the weights, in the
+            order in which the 1D passes are applied.
+        factors (list of numpy.ndarray): For each axis but the last one, a
+            ``(n_axis, rank)`` array whose columns are the 1D filters.
+        last (numpy.ndarray): Filters of the last axis, of shape
+            ``ranks[:-1] + (n_last,)``.
+        ranks (tuple of int): The multilinear ranks along ``axes``.
+        error (float): Relative Frobenius norm error of the factorization.
+    """
+
+    def __init__(self, axes, factors, last, ranks, error):
+        self.axes = axes
+        self.factors = factors
+        self.last = last
+        self.ranks = ranks
+        self.error = error
+
+    def cost(self):
+        """Approximate number of operations per output element."""
+        sizes = [f.shape[0] for f in self.factors] + [self.last.shape[-1]]
+        return _separable_cost(sizes, self.ranks)
+
+
+def _separable_cost(sizes, ranks):
+    """Approximate number of operations per output element.
+
+    ``sizes`` and ``ranks`` are given in the order the passes are applied.
+    """
+    cost = 0
+    n_branches = 1
+    for r, n in zip(ranks[:-1], sizes[:-1]):
+        n_branches *= r
+        cost += n_branches * (n + _PASS_OVERHEAD)
+    # passes along the last axis and the accumulation of their results
+    cost += n_branches * (sizes[-1] + _PASS_OVERHEAD + 1)
+    return cost
+
+
+def _factorize(weights, rtol=None):
+    """Compute the truncated HOSVD of ``weights``.
+
+    Returns None if ``weights`` has less than two non-singleton axes or is
+    complex-valued. Factorizations are cached by the values of ``weights``,
+    so repeated calls with the same kernel only pay for the device to host
+    copy.
+    """
+    if weights.dtype.kind == "c":
+        return None
+    axes = tuple(ax for ax, n in enumerate(weights.shape) if n > 1)
+    if len(axes) < 2:
+        return None
+    w = numpy.ascontiguousarray(cupy.asnumpy(weights))
+    return _factorize_host(w.tobytes(), w.shape, w.dtype.str, axes, rtol)
+
+
+@functools.lru_cache(maxsize=64)
+def _factorize_host(data, shape, dtype, axes, rtol):
+    weights_dtype = numpy.dtype(dtype)
+    w = numpy.frombuffer(data, dtype=weights_dtype).reshape(shape)
+    w = w.astype(numpy.float64).squeeze()
+    norm = numpy.linalg.norm(w)
+    if norm == 0:
+        return None
+    if rtol is None:
+        eps_dtype = weights_dtype if weights_dtype.kind == "f" else w.dtype
+        rtol = max(w.shape) * numpy.finfo(eps_dtype).eps
+    # Each mode can discard an error of rtol * norm / sqrt(k) so that the
+    # total relative error of the truncated HOSVD is at most rtol.
+    budget = (rtol * norm) ** 2 / w.ndim
+    factors = []
+    for d in range(w.ndim):
+        unfolded = numpy.moveaxis(w, d, 0).reshape(w.shape[d], -1)
+        u, s, _ = numpy.linalg.svd(unfolded, full_matrices=False)
+        tail = numpy.cumsum((s**2)[::-1])[::-1]  # discarded energy
+        rank = max(int(numpy.count_nonzero(tail > budget)), 1)
+        factors.append(u[:, :rank])
+    ranks = tuple(f.shape[1] for f in factors)
+
+    # apply the lowest ranks first: only the last axis does not branch
+    order = sorted(range(w.ndim), key=lambda d: ranks[d])
+    core = w
+    for d in range(w.ndim):
+        core = numpy.moveaxis(
+            numpy.tensordot(factors[d].T, core, axes=(1, d)), 0, d
+        )
+    approx = core
+    for d in range(w.ndim):
+        approx = numpy.moveaxis(
+            numpy.tensordot(factors[d], approx, axes=(1, d)), 0, d
+        )
+    error = numpy.linalg.norm(approx - w) / norm
+
+    core = numpy.transpose(core, order)
+    last = numpy.tensordot(core, factors[order[-1]], axes=(-1, 1))
+    return _Factorization(
+        axes=tuple(axes[d] for d in order),
+        factors=[factors[d] for d in order[:-1]],
+        last=last,
+        ranks=tuple(ranks[d] for d in order),
+        error=error,
+    )
+
+
+def _choose_method(weights, mode, cval, dtype_mode="ndimage", rtol=None):
+    """Return ('direct', None) or ('separable', factorization)."""
+    if dtype_mode not in ("ndimage", "float"):
+        return "direct", None
+    if mode in ("constant", "grid-constant") and cval != 0:
+        # the padding of intermediate results would differ from cval
+        return "direct", None
+    if weights.size < _MIN_AUTO_SIZE:
+        return "direct", None
+    sizes = [n for n in weights.shape if n > 1]
+    # the separable cost is at least that of rank 1: skip a pointless SVD
+    rank1_cost = _separable_cost(sizes, (1,) * len(sizes))
+    if len(sizes) < 2 or _MIN_AUTO_GAIN * rank1_cost >= weights.size:
+        return "direct", None
+    fact = _factorize(weights, rtol)
+    if fact is None or _MIN_AUTO_GAIN * fact.cost() >= weights.size:
+        return "direct", None
+    return "separable", fact
+
+
+@memoize(for_each_device=True)
+def _get_cast_kernel():
+    # same float -> integer conversion as the direct correlation kernel
+    return cupy.ElementwiseKernel(
+        "W x",
+        "Y y",
+        "y = cast<Y>(x);",
+        "cupyimg_ndimage_separable_cast",
+        preamble=_filters_core.includes + _filters_core._CAST_FUNCTION,
+        options=("--std=c++11", "-DCUPY_USE_JITIFY"),
+    )
+
+
+def _correlate_separable(
+    input, fact, output, mode, cval, origins, weights_dtype, dtype_mode
+):
+    """Correlate input with the factorized weights.
+
+    The 1D passes are run as convolutions via ``convolve_separable``.
+    """
+    from cupyimg._misc import convolve_separable
+
+    k = len(fact.axes)
+    ranks = fact.ranks
+    real_dtype = numpy.finfo(weights_dtype).dtype
+    # correlation by w with origin o is the convolution by w[::-1] with
+    # origin -o, shifted by one more element when the length of w is even
+    sizes = [f.shape[0] for f in fact.factors] + [fact.last.shape[-1]]
+    conv_origins = [
+        -origins[ax] - (1 - n % 2) for ax, n in zip(fact.axes, sizes)
+    ]
+    factors = [
+        cupy.asarray(numpy.ascontiguousarray(f[::-1].T), dtype=real_dtype)
+        for f in fact.factors
+    ]
+    last = cupy.asarray(
+        numpy.ascontiguousarray(fact.last[..., ::-1]), dtype=real_dtype
+    )
+
+    def filt(x, filters, start):
+        return convolve_separable(
+            x,
+            filters,
+            axes=fact.axes[start : start + len(filters)],
+            origin=conv_origins[start : start + len(filters)],
+            mode=mode,
+            cval=cval,
+            dtype_mode=dtype_mode,
+        )
+
+    def run(x, d, idx):
+        if d == k - 1:
+            return filt(x, [last[idx]], d)
+        out = None
+        if all(r == 1 for r in ranks[d + 1 : k - 1]):
+            # no further branching: each term is a single separable call
+            for j in range(ranks[d]):
+                tail = idx + (j,) + (0,) * (k - 2 - d)
+                filters = [factors[d][j]]
+                filters += [factors[e][0] for e in range(d + 1, k - 1)]
+                filters.append(last[tail])
+                y = filt(x, filters, d)
+                if out is None:
+                    out = y
+                else:
+                    out += y
+            return out
+        for j in range(ranks[d]):
+            y = run(filt(x, [factors[d][j]], d), d + 1, idx + (j,))
+            if out is None:
+                out = y
+            else:
+                out += y
+        return out
+
+    result = run(input.astype(weights_dtype, copy=False), 0, ())
+    output = _util._get_output(output, input, None, weights_dtype)
+    if output.dtype == result.dtype:
+        output[...] = result
+    else:
+        _get_cast_kernel()(result, output)
+    return output
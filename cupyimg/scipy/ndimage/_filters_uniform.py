@@ -0,0 +1,163 @@
+"""Running-sum engine for box (uniform) filters.
+
+Each thread handles a segment of at least ``size`` consecutive outputs along
+one line of the filtered axis. It sums the first window directly and then
+slides the window by adding the incoming and subtracting the outgoing
+element, so the cost per output element does not depend on the window size.
+Restarting the sum for each segment also bounds the accumulated rounding
+error of the running sum.
+"""
+import cupy
+import numpy
+
+from cupyimg import _misc, memoize
+from cupyimg.scipy.ndimage import _filters_core, _util
+
+# minimum number of outputs computed by each thread
+_MIN_SEGMENT = 32
+
+
+def _box_filter1d(
+    input,
+    size,
+    axis,
+    output,
+    mode,
+    cval,
+    origin,
+    dtype_mode="ndimage",
+    compensated=False,
+    normalize=True,
+):
+    """Sum (or mean if ``normalize``) over a sliding window along ``axis``.
+
+    The window of output ``i`` covers the input elements
+    ``i - (size // 2 + origin)`` to ``i - (size // 2 + origin) + size - 1``,
+    extended past the array bounds according to ``mode``. ``input`` must be
+    real-valued.
+    """
+    if dtype_mode == "ndimage":
+        acc_dtype = numpy.float64
+    elif dtype_mode == "float":
+        acc_dtype = numpy.promote_types(input.dtype, numpy.float32)
+    else:
+        raise ValueError("unsupported dtype_mode: {}".format(dtype_mode))
+    mode = "grid-wrap" if mode == "wrap" else mode
+    _util._check_mode(mode)
+    axis = axis % input.ndim
+
+    output = _util._get_output(output, input)
+    x = cupy.ascontiguousarray(input)
+    in_place = output.flags.c_contiguous and not cupy.shares_memory(
+        output, x, "MAY_SHARE_BOUNDS"
+    )
+    y = output if in_place else cupy.empty(output.shape, output.dtype)
+    if x.size == 0:
+        return output
+
+    n = x.shape[axis]
+    inner = _misc._prod(x.shape[axis + 1 :])
+    n_lines = x.size // n
+    segment = max(size, _MIN_SEGMENT)
+    n_segments = -(-n // segment)
+    kernel = _get_box_kernel(
+        mode, numpy.dtype(acc_dtype).char, compensated, normalize
+    )
+    kernel(
+        x.reshape(-1),
+        n,
+        inner,
+        n_segments,
+        segment,
+        size // 2 + origin,
+        size,
+        cval,
+        y.reshape(-1),
+        size=n_lines * n_segments,
+    )
+    if not in_place:
+        output[...] = y
+    return output
+
+
+@memoize(for_each_device=True)
+def _get_box_kernel(mode, acc_char, compensated, normalize):
+    acc = "double" if acc_char == "d" else "float"
+    boundary = _util._generate_boundary_condition_ops(
+        mode, "ix", "n", int_t="ptrdiff_t"
+    )
+    if mode in ("constant", "grid-constant"):
+        boundary += "\n        if (ix < 0) return (A)cval;"
+    if compensated:
+        # Neumaier's improved Kahan-Babuska summation
+        add = """
+        A t = s + v;
+        if (fabs(s) >= fabs(v)) {
+            c += (s - t) + v;
+        } else {
+            c += (v - t) + s;
+        }
+        s = t;"""
+    else:
+        add = "s += v;"
+    preamble = """
+    template <typename A, typename X>
+    __device__ A _box_load(const X* x, ptrdiff_t ix, ptrdiff_t n,
+                           ptrdiff_t inner, double cval)
+    {{
+        {boundary}
+        return (A)x[ix * inner];
+    }}
+
+    template <typename A>
+    __device__ void _box_add(A& s, A& c, A v)
+    {{
+        {add}
+    }}
+    """.format(
+        boundary=boundary, add=add
+    )
+    result = "(s + c) / wsize" if normalize else "(s + c)"
+    code = """
+    ptrdiff_t inner_i = i % inner;
+    ptrdiff_t rest = i / inner;
+    ptrdiff_t start = (rest % n_segments) * segment;
+    ptrdiff_t stop = min(start + segment, (ptrdiff_t)n);
+    ptrdiff_t offset = (rest / n_segments) * n * inner + inner_i;
+    const X* xl = &x[offset];
+    Y* yl = &y[offset];
+
+    {acc} s = 0, c = 0;
+    for (ptrdiff_t k = start - left; k < start - left + wsize; k++) {{
+        _box_add<{acc}>(s, c, _box_load<{acc}>(xl, k, n, inner, cval));
+    }}
+    yl[start * inner] = cast<Y>({result});
+    for (ptrdiff_t j = start + 1; j < stop; j++) {{
+        _box_add<{acc}>(
+            s, c, _box_load<{acc}>(xl, j - left + wsize - 1, n, inner, cval)
+        );
+        _box_add<{acc}>(
+            s, c, -_box_load<{acc}>(xl, j - left - 1, n, inner, cval)
+        );
+        yl[j * inner] = cast<Y>({result});
+    }}
+    """.format(
+        acc=acc, result=result
+    )
+    name = "cupyimg_ndimage_box_filter_{}_{}{}{}".format(
+        mode.replace("-", "_"),
+        acc,
+        "_compensated" if compensated else "",
+        "_mean" if normalize else "_sum",
+    )
+    return cupy.ElementwiseKernel(
+        "raw X x, int64 n, int64 inner, int64 n_segments, int64 segment, "
+        "int64 left, int64 wsize, float64 cval",
+        "raw Y y",
+        code,
+        name,
+        preamble=_filters_core.includes
+        + _filters_core._CAST_FUNCTION
+        + preamble,
+        options=("--std=c++11", "-DCUPY_USE_JITIFY"),
+    )
@@ -0,0 +1,137 @@
+"""van Herk/Gil-Werman algorithm for 1D minimum and maximum filters.
+
+The lines are split into blocks of ``size`` outputs. The window of every
+output of a block is the union of a suffix of one block of the (extended)
+input and a prefix of the next one, so each thread computes the suffix
+minima (maxima) of the first block and then combines them with the running
+prefix minimum of the second one. This costs about three comparisons per
+element independently of ``size``.
+
+References
+----------
+.. [1] M. van Herk, "A fast algorithm for local minimum and maximum filters
+       on rectangular and octagonal kernels", Pattern Recognition Letters
+       13(7), 517-521 (1992).
+.. [2] J. Gil and M. Werman, "Computing 2-D min, median, and max filters",
+       IEEE Trans. PAMI 15(5), 504-507 (1993).
+"""
+import cupy
+import numpy
+
+from cupyimg import _misc, memoize
+from cupyimg.scipy.ndimage import _filters_core, _util
+
+# below this size the direct kernel is at least as fast
+_MIN_SIZE = 8
+
+
+def _min_or_max_1d_vhgw(input, size, axis, output, mode, cval, left, func):
+    """Minimum or maximum over a sliding window along ``axis``.
+
+    The window of output ``i`` covers the input elements ``i - left`` to
+    ``i - left + size - 1``, extended past the array bounds according to
+    ``mode``.
+    """
+    mode = "grid-wrap" if mode == "wrap" else mode
+    _util._check_mode(mode)
+    axis = axis % input.ndim
+
+    output = _util._get_output(output, input)
+    x = cupy.ascontiguousarray(input)
+    in_place = output.flags.c_contiguous and not cupy.shares_memory(
+        output, x, "MAY_SHARE_BOUNDS"
+    )
+    y = output if in_place else cupy.empty(output.shape, output.dtype)
+    if x.size == 0:
+        return output
+
+    # Like the direct kernel, compare in double precision when cval is
+    # involved (it need not be representable in the input's dtype).
+    if mode in ("constant", "grid-constant") or x.dtype.char in "?e":
+        tmp_dtype = numpy.dtype(numpy.float64)
+    else:
+        tmp_dtype = x.dtype
+    # the suffix minima can be kept in the output until they are combined
+    tmp = y if y.dtype == tmp_dtype else cupy.empty(x.shape, tmp_dtype)
+
+    n = x.shape[axis]
+    inner = _misc._prod(x.shape[axis + 1 :])
+    n_segments = -(-n // size)
+    kernel = _get_vhgw_kernel(mode, func)
+    kernel(
+        x.reshape(-1),
+        n,
+        inner,
+        n_segments,
+        size,
+        left,
+        float(cval),
+        tmp.reshape(-1),
+        y.reshape(-1),
+        size=(x.size // n) * n_segments,
+    )
+    if not in_place:
+        output[...] = y
+    return output
+
+
+@memoize(for_each_device=True)
+def _get_vhgw_kernel(mode, func):
+    boundary = _util._generate_boundary_condition_ops(
+        mode, "ix", "n", int_t="ptrdiff_t"
+    )
+    if mode in ("constant", "grid-constant"):
+        boundary += "\n        if (ix < 0) return (T)cval;"
+    preamble = """
+    template <typename T, typename X>
+    __device__ T _vhgw_load(const X* x, ptrdiff_t ix, ptrdiff_t n,
+                            ptrdiff_t inner, double cval)
+    {{
+        {boundary}
+        return (T)x[ix * inner];
+    }}
+    """.format(
+        boundary=boundary
+    )
+    code = """
+    ptrdiff_t inner_i = i % inner;
+    ptrdiff_t rest = i / inner;
+    ptrdiff_t start = (rest % n_segments) * wsize;
+    ptrdiff_t n_out = min((ptrdiff_t)wsize, (ptrdiff_t)n - start);
+    ptrdiff_t offset = (rest / n_segments) * n * inner + inner_i;
+    const X* xl = &x[offset];
+    T* tl = &tmp[offset + start * inner];
+    Y* yl = &y[offset + start * inner];
+    ptrdiff_t base = start - left;
+
+    // suffix {func}ima of the block [base, base + wsize)
+    T acc = _vhgw_load<T>(xl, base + wsize - 1, n, inner, cval);
+    for (ptrdiff_t t = wsize - 1; t >= 0; t--) {{
+        if (t < wsize - 1) {{
+            acc = {func}(acc, _vhgw_load<T>(xl, base + t, n, inner, cval));
+        }}
+        if (t < n_out) {{
+            tl[t * inner] = acc;
+        }}
+    }}
+    // combine with the prefix {func}ima of [base + wsize, base + 2 * wsize)
+    yl[0] = cast<Y>(tl[0]);
+    acc = _vhgw_load<T>(xl, base + wsize, n, inner, cval);
+    for (ptrdiff_t t = 1; t < n_out; t++) {{
+        yl[t * inner] = cast<Y>({func}(tl[t * inner], acc));
+        acc = {func}(acc, _vhgw_load<T>(xl, base + wsize + t, n, inner, cval));
+    }}
+    """.format(
+        func=func
+    )
+    return cupy.ElementwiseKernel(
+        "raw X x, int64 n, int64 inner, int64 n_segments, int64 wsize, "
+        "int64 left, float64 cval",
+        "raw T tmp, raw Y y",
+        code,
+        "cupyimg_ndimage_vhgw_{}_{}".format(func, mode.replace("-", "_")),
+        preamble=_filters_core.includes
+        + _filters_core._CAST_FUNCTION
+        + preamble,
+        options=("--std=c++11", "-DCUPY_USE_JITIFY"),
+    )
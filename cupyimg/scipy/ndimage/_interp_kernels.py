@@ -1,3 +1,5 @@
+import functools
+
 import cupy
 import numpy
 
@@ -195,12 +197,13 @@ def _get_coord_shift(ndim, nprepad=0):
     return ops
 
 
-def _get_coord_affine(ndim, nprepad=0):
+def _get_coord_affine(ndim, nprepad=0, batched=False):
     """Compute target coordinate based on a homogeneous transformation matrix.
 
     The homogeneous matrix has shape (ndim, ndim + 1). It corresponds to
     affine matrix where the last row of the affine is assumed to be:
-    ``[0] * ndim + [1]``.
+    ``[0] * ndim + [1]``. If ``batched``, ``mat`` holds one such matrix per
+    frame and the matrix of the current ``frame`` is used.
 
     Notes
     -----
@@ -218,6 +221,15 @@ def _get_coord_affine(ndim, nprepad=0):
     ops = []
     ncol = ndim + 1
     pre = " + {nprepad}".format(nprepad=nprepad) if nprepad > 0 else ""
+    m0 = ""
+    if batched:
+        ops.append(
+            """
+            const ptrdiff_t m0 = frame * {size};""".format(
+                size=ndim * ncol
+            )
+        )
+        m0 = "m0 + "
     for j in range(ndim):
         ops.append(
             """
@@ -229,20 +241,165 @@ def _get_coord_affine(ndim, nprepad=0):
             m_index = ncol * j + k
             ops.append(
                 """
-            c_{j} += mat[{m_index}] * (W)in_coord[{k}];""".format(
-                    j=j, k=k, m_index=m_index
+            c_{j} += mat[{m0}{m_index}] * (W)in_coord[{k}];""".format(
+                    j=j, k=k, m0=m0, m_index=m_index
                 )
             )
         ops.append(
             """
-            c_{j} += mat[{m_index}]{pre};""".format(
-                j=j, m_index=ncol * j + ndim, pre=pre,
+            c_{j} += mat[{m0}{m_index}]{pre};""".format(
+                j=j,
+                m0=m0,
+                m_index=ncol * j + ndim,
+                pre=pre,
             )
         )
     return ops
 
 
-def _unravel_loop_index(shape, uint_t="unsigned int"):
+# coordinate mappings that can be compiled into the interpolation kernel
+_mappings = ("projective", "polynomial", "swirl", "linear_polar", "log_polar")
+
+
+def _get_coord_mapping(mapping, degree=1, batched=False):
+    """Return a coordinate function for an analytic 2D coordinate mapping.
+
+    The mappings follow the conventions of ``skimage.transform.warp``: they
+    act on ``(x, y) = (col, row)`` coordinates of the output and the result
+    is the ``(col, row)`` coordinate in the input. An optional third axis
+    (color channels) is left unchanged.
+
+    Args:
+        mapping (str): One of ``_mappings``.
+        degree (int): The degree of the polynomial for
+            ``mapping='polynomial'``.
+        batched (bool): If True, ``params`` holds the parameters of each
+            frame one after the other, and those of the current ``frame``
+            are used.
+
+    Notes
+    -----
+    The returned function assumes the following variables have been
+    initialized on the device::
+
+        in_coord[ndim]: array containing the output coordinate
+        params(array): array of mapping parameters:
+
+            - projective: the (3, 3) homogeneous matrix.
+            - polynomial: the (2, (degree + 1) * (degree + 2) / 2)
+              coefficients of ``skimage.transform.PolynomialTransform``.
+            - swirl: ``(x0, y0, rotation, strength, radius)``, with the
+              radius already scaled by ``log(2) / 5``.
+            - linear_polar, log_polar: ``(k_angle, k_radius, row0, col0)``.
+
+    """
+    if mapping not in _mappings:
+        raise ValueError("unsupported mapping: {}".format(mapping))
+
+    def _get_coord(ndim, nprepad=0):
+        if ndim not in (2, 3):
+            raise ValueError("coordinate mappings require 2 or 3 dimensions")
+        ops = [
+            """
+            W xo = (W)in_coord[1];
+            W yo = (W)in_coord[0];
+            W xs, ys;"""
+        ]
+        if mapping == "projective":
+            ops.append(
+                """
+            xs = params[0] * xo + params[1] * yo + params[2];
+            ys = params[3] * xo + params[4] * yo + params[5];
+            W zs = params[6] * xo + params[7] * yo + params[8];
+            // avoid a division by zero as ProjectiveTransform does
+            if (zs == (W)0.0) zs = (W)2.220446049250313e-16;
+            xs /= zs;
+            ys /= zs;"""
+            )
+        elif mapping == "polynomial":
+            ncoef = (degree + 1) * (degree + 2) // 2
+            ops.append(
+                """
+            W xpow[{n}], ypow[{n}];
+            xpow[0] = ypow[0] = (W)1.0;
+            for (int p = 1; p < {n}; p++) {{
+                xpow[p] = xpow[p - 1] * xo;
+                ypow[p] = ypow[p - 1] * yo;
+            }}
+            xs = ys = (W)0.0;""".format(
+                    n=degree + 1
+                )
+            )
+            pidx = 0
+            for j in range(degree + 1):
+                for i in range(j + 1):
+                    ops.append(
+                        """
+            xs += params[{p}] * xpow[{jx}] * ypow[{i}];
+            ys += params[{q}] * xpow[{jx}] * ypow[{i}];""".format(
+                            p=pidx, q=ncoef + pidx, jx=j - i, i=i
+                        )
+                    )
+                    pidx += 1
+        elif mapping == "swirl":
+            ops.append(
+                """
+            W xdiff = xo - params[0];
+            W ydiff = yo - params[1];
+            W rho = sqrt(xdiff * xdiff + ydiff * ydiff);
+            W theta = params[2] + params[3] * exp(-rho / params[4]);
+            theta += atan2(ydiff, xdiff);
+            xs = params[0] + rho * cos(theta);
+            ys = params[1] + rho * sin(theta);"""
+            )
+        else:
+            radius = "xo / params[1]"
+            if mapping == "log_polar":
+                radius = "exp({})".format(radius)
+            ops.append(
+                """
+            W angle = yo / params[0];
+            W radius = {radius};
+            xs = radius * cos(angle) + params[3];
+            ys = radius * sin(angle) + params[2];""".format(
+                    radius=radius
+                )
+            )
+        if batched:
+            nparams = {
+                "projective": 9,
+                "polynomial": (degree + 1) * (degree + 2),
+                "swirl": 5,
+            }.get(mapping, 4)
+            ops = [op.replace("params[", "params[p0 + ") for op in ops]
+            ops.insert(
+                0,
+                """
+            const ptrdiff_t p0 = frame * {nparams};""".format(
+                    nparams=nparams
+                ),
+            )
+        pre = " + (W){nprepad}".format(nprepad=nprepad) if nprepad > 0 else ""
+        ops.append(
+            """
+            W c_0 = ys{pre};
+            W c_1 = xs{pre};""".format(
+                pre=pre
+            )
+        )
+        if ndim == 3:
+            ops.append(
+                """
+            W c_2 = (W)in_coord[2]{pre};""".format(
+                    pre=pre
+                )
+            )
+        return ops
+
+    return _get_coord
+
+
+def _unravel_loop_index(shape, uint_t="unsigned int", index="i"):
     """
     declare a multi-index array in_coord and unravel the 1D index, i into it.
     This code assumes that the array is a C-ordered array.
@@ -251,9 +408,9 @@ def _unravel_loop_index(shape, uint_t="unsigned int"):
     code = [
         """
         {uint_t} in_coord[{ndim}];
-        {uint_t} s, t, idx = i;
+        {uint_t} s, t, idx = {index};
         """.format(
-            uint_t=uint_t, ndim=ndim
+            uint_t=uint_t, ndim=ndim, index=index
         )
     ]
     for j in range(ndim - 1, 0, -1):
@@ -286,6 +443,8 @@ def _generate_interp_custom(
     name="",
     integer_output=False,
     nprepad=0,
+    nchannels=0,
+    batched=False,
 ):
     """
     Args:
@@ -300,6 +459,15 @@ def _generate_interp_custom(
         name (str): base name for the interpolation kernel
         integer_output (bool): boolean indicating whether the output has an
             integer type.
+        nprepad (int): number of elements of padding on each side of ``x``.
+        nchannels (int): If nonzero, ``x`` has an extra trailing axis of
+            ``nchannels`` channels, which are all interpolated with the same
+            weights. The kernel then runs once per element of the output
+            without its channel axis, and ``y`` must be a raw output array.
+        batched (bool): If True, ``x`` and ``y`` have an extra leading axis
+            of frames that are interpolated independently, ``yshape`` is the
+            shape of a single output frame and the index of the current frame
+            is available to ``coord_func`` as ``frame``.
 
     Returns:
         operation (str): code body for the ElementwiseKernel
@@ -307,7 +475,24 @@ def _generate_interp_custom(
     """
 
     ops = []
-    ops.append("double out = 0.0;")
+    if nchannels:
+        ops.append(
+            f"""
+        double out[{nchannels}];
+        for (int ch = 0; ch < {nchannels}; ch++) out[ch] = 0.0;"""
+        )
+    else:
+        ops.append("double out = 0.0;")
+
+    def _assign(value=None, index=None, op="="):
+        """Code for ``out op value`` or ``out op x[index] * value``."""
+        if index is not None:
+            xval = f"x[{index} + ch]" if nchannels else f"x[{index}]"
+            value = xval if value is None else f"{xval} * {value}"
+        if nchannels:
+            return f"""
+            for (int ch = 0; ch < {nchannels}; ch++) out[ch] {op} {value};"""
+        return f"out {op} {value};"
 
     if large_int:
         uint_t = "size_t"
@@ -317,14 +502,29 @@ def _generate_interp_custom(
         int_t = "int"
 
     # determine strides of x (in elements, not bytes)
+    axis0 = 1 if batched else 0
     for j in range(ndim):
-        ops.append(f"const {int_t} xsize_{j} = x.shape()[{j}];")
-    ops.append(f"const {uint_t} sx_{ndim - 1} = 1;")
+        ops.append(f"const {int_t} xsize_{j} = x.shape()[{j + axis0}];")
+    # the channels of an element are contiguous
+    ops.append(f"const {uint_t} sx_{ndim - 1} = {max(nchannels, 1)};")
     for j in range(ndim - 1, 0, -1):
         ops.append(f"const {uint_t} sx_{j - 1} = sx_{j} * xsize_{j};")
 
     # create out_coords array to store the unraveled indices into the output
-    ops.append(_unravel_loop_index(yshape, uint_t))
+    if batched:
+        frame_size = 1
+        for extent in yshape:
+            frame_size *= extent
+        ops.append(
+            f"""
+        const {uint_t} frame = i / {frame_size};
+        const {int_t} ic_frame = frame * sx_0 * xsize_0;"""
+        )
+        ops.append(
+            _unravel_loop_index(yshape, uint_t, f"i - frame * {frame_size}")
+        )
+    else:
+        ops.append(_unravel_loop_index(yshape, uint_t))
 
     # compute the transformed (target) coordinates, c_j
     ops = ops + coord_func(ndim, nprepad)
@@ -346,7 +546,7 @@ def _generate_interp_custom(
             f"""
         if ({_cond})
         {{
-            out = (double){cval};
+            {_assign(f"(double){cval}")}
         }}
         else
         {{"""
@@ -387,24 +587,22 @@ def _generate_interp_custom(
             {int_t} ic_{j} = cf_{j} * sx_{j};
             """
             )
-        _coord_idx = " + ".join([f"ic_{j}" for j in range(ndim)])
+        _coord_idx = " + ".join(
+            (["ic_frame"] if batched else []) + [f"ic_{j}" for j in range(ndim)]
+        )
         if mode == "grid-constant":
             _cond = " || ".join([f"(ic_{j} < 0)" for j in range(ndim)])
             ops.append(
                 f"""
             if ({_cond}) {{
-                out = (double){cval};
+                {_assign(f"(double){cval}")}
             }} else {{
-                out = x[{_coord_idx}];
+                {_assign(index=_coord_idx)}
             }}
             """
             )
         else:
-            ops.append(
-                f"""
-                out = x[{_coord_idx}];
-                """
-            )
+            ops.append(_assign(index=_coord_idx))
 
     elif order == 1:
         for j in range(ndim):
@@ -551,33 +749,38 @@ def _generate_interp_custom(
     if order > 0:
 
         _weight = " * ".join([f"w_{j}" for j in range(ndim)])
-        _coord_idx = " + ".join([f"ic_{j}" for j in range(ndim)])
+        _coord_idx = " + ".join(
+            (["ic_frame"] if batched else []) + [f"ic_{j}" for j in range(ndim)]
+        )
         if mode == "grid-constant" or (order > 1 and mode == "constant"):
             _cond = " || ".join([f"(ic_{j} < 0)" for j in range(ndim)])
             ops.append(
                 f"""
+            W wc = {_weight};
             if ({_cond}) {{
-                out += (X){cval} * ({_weight});
+                {_assign(f"(X){cval} * wc", op="+=")}
             }} else {{
-                X val = x[{_coord_idx}];
-                out += val * ({_weight});
+                {_assign("wc", _coord_idx, op="+=")}
             }}
             """
             )
         else:
-            ops.append(
-                f"""
-            X val = x[{_coord_idx}];
-            out += val * ({_weight});
-            """
-            )
+            ops.append(f"W wc = {_weight};")
+            ops.append(_assign("wc", _coord_idx, op="+="))
 
         ops.append("}" * ndim)
 
     if mode == "constant":
         ops.append("}")
 
-    if integer_output:
+    if nchannels:
+        value = "(Y)rint(out[ch])" if integer_output else "(Y)out[ch]"
+        ops.append(
+            f"""
+        for (int ch = 0; ch < {nchannels}; ch++)
+            y[i * {nchannels} + ch] = {value};"""
+        )
+    elif integer_output:
         ops.append("y = (Y)rint((double)out);")
     else:
         ops.append("y = (Y)out;")
@@ -585,8 +788,16 @@ def _generate_interp_custom(
 
     modestr = mode.replace("-", "_")
     name = "interpolate_{}_order{}_{}_{}d_y{}".format(
-        name, order, modestr, ndim, "_".join(["{}".format(j) for j in yshape]),
+        name,
+        order,
+        modestr,
+        ndim,
+        "_".join(["{}".format(j) for j in yshape]),
     )
+    if nchannels:
+        name += "_c{}".format(nchannels)
+    if batched:
+        name += "_batched"
     if uint_t == "size_t":
         name += "_i64"
     return operation, name
@@ -602,9 +813,10 @@ def _get_map_kernel(
     order=1,
     integer_output=False,
     nprepad=0,
+    nchannels=0,
 ):
     in_params = "raw X x, raw W coords"
-    out_params = "Y y"
+    out_params = "raw Y y" if nchannels else "Y y"
     operation, name = _generate_interp_custom(
         in_params=in_params,
         coord_func=_get_coord_map,
@@ -617,6 +829,7 @@ def _get_map_kernel(
         name="map_coordinates",
         integer_output=integer_output,
         nprepad=nprepad,
+        nchannels=nchannels,
     )
     return cupy.ElementwiseKernel(in_params, out_params, operation, name)
 
@@ -699,9 +912,10 @@ def _get_zoom_kernel(
     integer_output=False,
     nprepad=0,
     grid_mode=False,
+    nchannels=0,
 ):
     in_params = "raw X x, raw W zoom"
-    out_params = "Y y"
+    out_params = "raw Y y" if nchannels else "Y y"
     operation, name = _generate_interp_custom(
         in_params=in_params,
         coord_func=_get_coord_zoom_grid if grid_mode else _get_coord_zoom,
@@ -714,6 +928,7 @@ def _get_zoom_kernel(
         name="zoom_grid" if grid_mode else "zoom",
         integer_output=integer_output,
         nprepad=nprepad,
+        nchannels=nchannels,
     )
     return cupy.ElementwiseKernel(
         in_params, out_params, operation, name, preamble=math_constants_preamble
@@ -730,12 +945,14 @@ def _get_affine_kernel(
     order=1,
     integer_output=False,
     nprepad=0,
+    nchannels=0,
+    batched=False,
 ):
     in_params = "raw X x, raw W mat"
-    out_params = "Y y"
+    out_params = "raw Y y" if nchannels else "Y y"
     operation, name = _generate_interp_custom(
         in_params=in_params,
-        coord_func=_get_coord_affine,
+        coord_func=functools.partial(_get_coord_affine, batched=batched),
         ndim=ndim,
         large_int=large_int,
         yshape=yshape,
@@ -745,6 +962,48 @@ def _get_affine_kernel(
         name="affine",
         integer_output=integer_output,
         nprepad=nprepad,
+        nchannels=nchannels,
+        batched=batched,
+    )
+    return cupy.ElementwiseKernel(
+        in_params, out_params, operation, name, preamble=math_constants_preamble
+    )
+
+
+@memoize(for_each_device=True)
+def _get_mapping_kernel(
+    ndim,
+    large_int,
+    yshape,
+    mode,
+    cval=0.0,
+    order=1,
+    integer_output=False,
+    nprepad=0,
+    mapping="projective",
+    degree=1,
+    nchannels=0,
+    batched=False,
+):
+    in_params = "raw X x, raw W params"
+    out_params = "raw Y y" if nchannels else "Y y"
+    name = "mapping_" + mapping
+    if mapping == "polynomial":
+        name += str(degree)
+    operation, name = _generate_interp_custom(
+        in_params=in_params,
+        coord_func=_get_coord_mapping(mapping, degree, batched),
+        ndim=ndim,
+        large_int=large_int,
+        yshape=yshape,
+        mode=mode,
+        cval=cval,
+        order=order,
+        name=name,
+        integer_output=integer_output,
+        nprepad=nprepad,
+        nchannels=nchannels,
+        batched=batched,
     )
     return cupy.ElementwiseKernel(
         in_params, out_params, operation, name, preamble=math_constants_preamble
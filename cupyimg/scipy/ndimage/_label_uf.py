@@ -0,0 +1,359 @@
+"""Block-based union-find labeling of connected components.
+
+The array is split into tiles and labeled by three kernels, following [1]_:
+
+1. Each block of threads labels one tile in shared memory, merging the
+   neighbors that lie within the same tile.
+2. The neighbors lying in different tiles are merged in global memory.
+3. Every element is pointed directly to the root of its tree and the roots
+   are numbered consecutively.
+
+Trees are merged with atomic compare-and-swap operations as in [2]_, always
+linking the larger root to the smaller one. The root of each component is
+thus its first element in C order, and numbering the roots in increasing
+order gives the same labels as ``scipy.ndimage.label``.
+
+References
+----------
+.. [1] D. P. Playne and K. Hawick, "A New Algorithm for Parallel
+       Connected-Component Labelling on GPUs", IEEE Trans. Parallel and
+       Distributed Systems 29(6), 1217-1230 (2018).
+.. [2] Y. Komura, "GPU-based cluster-labeling algorithm without the use of
+       conventional iteration: Application to the Swendsen-Wang multi-cluster
+       spin flip algorithm", Computer Physics Communications 194, 54-58
+       (2015).
+"""
+import cupy
+import numpy
+
+from cupyimg import _misc, memoize
+
+# maximum number of elements of a tile (threads per block)
+_MAX_TILE_SIZE = 256
+# maximum extent of a tile along the last axis and along the other axes
+_MAX_TILE_LAST = 32
+_MAX_TILE_OTHER = 8
+
+
+def _tile_shape(shape):
+    """Shape of the tiles labeled in shared memory for an array of ``shape``.
+
+    The extents are powers of two, at most ``_MAX_TILE_LAST`` along the last
+    axis (``_MAX_TILE_SIZE`` for 1D arrays) and ``_MAX_TILE_OTHER`` along the
+    others, but no larger than needed to cover ``shape``.
+    """
+    remaining = _MAX_TILE_SIZE
+    tile = []
+    for ax in range(len(shape) - 1, -1, -1):
+        if len(shape) == 1:
+            limit = _MAX_TILE_SIZE
+        elif ax == len(shape) - 1:
+            limit = _MAX_TILE_LAST
+        else:
+            limit = _MAX_TILE_OTHER
+        extent = 1
+        while extent < min(shape[ax], limit, remaining):
+            extent *= 2
+        extent = min(extent, limit, remaining)
+        remaining //= extent
+        tile.append(extent)
+    return tuple(tile[::-1])
+
+
+def _structure_directions(structure):
+    """Offsets of the neighbors preceding an element in C order."""
+    elems = numpy.nonzero(structure)
+    vecs = [elems[dm] - 1 for dm in range(structure.ndim)]
+    offset = vecs[0]
+    for dm in range(1, structure.ndim):
+        offset = offset * 3 + vecs[dm]
+    indxs = numpy.nonzero(offset < 0)[0]
+    return numpy.asarray(
+        [[vecs[dm][dr] for dm in range(structure.ndim)] for dr in indxs],
+        dtype=numpy.int32,
+    ).reshape(-1, structure.ndim)
+
+
+def _label_union_find(x, structure, y, greyscale_mode=False):
+    """Label the nonzero elements of ``x`` into ``y`` (int32 or int64).
+
+    ``y`` must be C-contiguous. If ``greyscale_mode``, only neighbors with
+    equal values are connected. Returns the number of labels.
+    """
+    if y.dtype not in (numpy.int32, numpy.int64):
+        raise ValueError("y must have int32 or int64 dtype")
+    if y.dtype == numpy.int32 and y.size >= 2 ** 31:
+        raise ValueError("int32 labels cannot index {} elements".format(y.size))
+    x = cupy.ascontiguousarray(x)
+    ndim = x.ndim
+    dirs = _structure_directions(structure)
+    strides = numpy.cumprod((1,) + x.shape[:0:-1])[::-1]
+    offsets = cupy.asarray(dirs.astype(numpy.int64) @ strides)
+    tile = _tile_shape(x.shape)
+    n_tiles = _misc._prod(-(-n // t) for n, t in zip(x.shape, tile))
+    shape = cupy.asarray(x.shape, dtype=numpy.int64)
+    dirs = cupy.asarray(dirs)
+    int_t = "int" if y.dtype == numpy.int32 else "long long"
+
+    local = _get_label_local_kernel(
+        ndim, tile, _misc.get_typename(x.dtype), int_t, greyscale_mode
+    )
+    local(
+        (n_tiles,),
+        (_misc._prod(tile),),
+        (x, y, shape, dirs, offsets, numpy.int32(len(dirs))),
+    )
+    _get_label_merge_kernel(ndim, tile, int_t, greyscale_mode)(
+        x, shape, dirs, offsets, len(dirs), y, size=y.size
+    )
+    count = cupy.zeros(2, dtype=numpy.int64)
+    _get_label_count_kernel(int_t)(y, count, size=y.size)
+    maxlabel = int(count[0])  # synchronize
+    roots = cupy.empty(maxlabel, dtype=y.dtype)
+    _get_label_roots_kernel(int_t)(y, count, roots, size=y.size)
+    _get_label_finalize_kernel(int_t)(
+        maxlabel, cupy.sort(roots), y, size=y.size
+    )
+    return maxlabel
+
+
+_union_find_preamble = """
+__device__ __forceinline__ int _label_cas(int* addr, int compare, int val)
+{
+    return atomicCAS(addr, compare, val);
+}
+
+__device__ __forceinline__ long long _label_cas(long long* addr,
+                                                long long compare,
+                                                long long val)
+{
+    return (long long)atomicCAS((unsigned long long*)addr,
+                                (unsigned long long)compare,
+                                (unsigned long long)val);
+}
+
+// merge the trees of a and b, linking the larger root to the smaller one
+template <typename T>
+__device__ void _label_union(volatile T* p, T a, T b)
+{
+    while (true) {
+        while (a != p[a]) { a = p[a]; }
+        while (b != p[b]) { b = p[b]; }
+        if (a == b) return;
+        if (a < b) {
+            T old = _label_cas((T*)&p[b], b, a);
+            if (old == b) return;
+            b = old;
+        } else {
+            T old = _label_cas((T*)&p[a], a, b);
+            if (old == a) return;
+            a = old;
+        }
+    }
+}
+"""
+
+
+def _tile_code(ndim):
+    """Code computing the position ``pos`` and tile offset ``loc`` of i."""
+    return """
+    ptrdiff_t pos[{ndim}];
+    int loc[{ndim}];
+    {{
+        ptrdiff_t rest = i;
+        for (int d = {ndim} - 1; d >= 0; d--) {{
+            pos[d] = rest % shape[d];
+            rest /= shape[d];
+            loc[d] = pos[d] % tile[d];
+        }}
+    }}
+    """.format(
+        ndim=ndim
+    )
+
+
+def _tile_decl(tile):
+    return "__device__ const int tile[] = {{{}}};".format(
+        ", ".join(map(str, tile))
+    )
+
+
+@memoize(for_each_device=True)
+def _get_label_local_kernel(ndim, tile, x_type, int_t, greyscale_mode):
+    tile_size = _misc._prod(tile)
+    x_condition = "if (x[k] != x[i]) continue;" if greyscale_mode else ""
+    code = """
+    typedef {x_type} X;
+    typedef {int_t} Y;
+    {tile_decl}
+    {preamble}
+
+    extern "C" __global__
+    __launch_bounds__({tile_size})
+    void cupyimg_label_local(const X* x, Y* y, const long long* shape,
+                             const int* dirs, const long long* offsets,
+                             int ndirs)
+    {{
+        __shared__ int parent[{tile_size}];
+        __shared__ ptrdiff_t index[{tile_size}];
+        const int t = threadIdx.x;
+        // position of the element of this thread in the tile and the array
+        ptrdiff_t i = 0;
+        int loc[{ndim}];
+        bool valid = true;
+        {{
+            ptrdiff_t rest_tile = blockIdx.x;
+            int rest_t = t;
+            ptrdiff_t stride = 1;
+            for (int d = {ndim} - 1; d >= 0; d--) {{
+                ptrdiff_t n_tiles = (shape[d] + tile[d] - 1) / tile[d];
+                loc[d] = rest_t % tile[d];
+                rest_t /= tile[d];
+                ptrdiff_t p = (rest_tile % n_tiles) * tile[d] + loc[d];
+                rest_tile /= n_tiles;
+                valid = valid && p < shape[d];
+                i += p * stride;
+                stride *= shape[d];
+            }}
+        }}
+        const bool fg = valid && x[i] != (X)0;
+        parent[t] = fg ? t : -1;
+        index[t] = i;
+        __syncthreads();
+
+        if (fg) {{
+            for (int dr = 0; dr < ndirs; dr++) {{
+                // merge the neighbors lying in the same tile
+                int kt = 0;
+                bool in_tile = true;
+                for (int d = 0; d < {ndim}; d++) {{
+                    int l = loc[d] + dirs[dr * {ndim} + d];
+                    in_tile = in_tile && l >= 0 && l < tile[d];
+                    kt = kt * tile[d] + l;
+                }}
+                if (!in_tile || parent[kt] < 0) continue;
+                ptrdiff_t k = i + offsets[dr];
+                {x_condition}
+                _label_union<int>(parent, t, kt);
+            }}
+        }}
+        __syncthreads();
+
+        if (valid) {{
+            Y root = -1;
+            if (fg) {{
+                int a = t;
+                while (a != parent[a]) {{ a = parent[a]; }}
+                // tiles are in C order, so their first element comes first
+                root = (Y)index[a];
+            }}
+            y[i] = root;
+        }}
+    }}
+    """.format(
+        x_type=x_type,
+        int_t=int_t,
+        tile_decl=_tile_decl(tile),
+        preamble=_union_find_preamble,
+        tile_size=tile_size,
+        ndim=ndim,
+        x_condition=x_condition,
+    )
+    return cupy.RawKernel(code, "cupyimg_label_local")
+
+
+@memoize(for_each_device=True)
+def _get_label_merge_kernel(ndim, tile, int_t, greyscale_mode):
+    in_params = "raw X x, raw int64 shape, raw int32 dirs, raw int64 offsets, "
+    in_params += "int32 ndirs"
+    x_condition = "if (x[k] != x[i]) continue;" if greyscale_mode else ""
+    code = """
+    if (y[i] < 0) continue;
+    {tile_code}
+    for (int dr = 0; dr < ndirs; dr++) {{
+        // only the neighbors in other tiles remain to be merged
+        bool in_tile = true;
+        bool in_bounds = true;
+        for (int d = 0; d < {ndim}; d++) {{
+            int dd = dirs[dr * {ndim} + d];
+            in_tile = in_tile && loc[d] + dd >= 0 && loc[d] + dd < tile[d];
+            in_bounds = in_bounds && pos[d] + dd >= 0 && pos[d] + dd < shape[d];
+        }}
+        if (in_tile || !in_bounds) continue;
+        ptrdiff_t k = i + offsets[dr];
+        if (y[k] < 0) continue;
+        {x_condition}
+        _label_union<{int_t}>(&y[0], (Y)i, (Y)k);
+    }}
+    """.format(
+        tile_code=_tile_code(ndim),
+        ndim=ndim,
+        int_t=int_t,
+        x_condition=x_condition,
+    )
+    return cupy.ElementwiseKernel(
+        in_params,
+        "raw Y y",
+        code,
+        "cupyimg_label_merge_{}d{}".format(
+            ndim, "_greyscale" if greyscale_mode else ""
+        ),
+        preamble=_tile_decl(tile) + _union_find_preamble,
+    )
+
+
+@memoize(for_each_device=True)
+def _get_label_count_kernel(int_t):
+    return cupy.ElementwiseKernel(
+        "",
+        "raw Y y, raw int64 count",
+        """
+        if (y[i] < 0) continue;
+        Y j = y[i];
+        while (j != y[j]) { j = y[j]; }
+        if (j != i) y[i] = j;
+        else atomicAdd((unsigned long long*)&count[0], 1ULL);
+        """,
+        "cupyimg_label_count",
+    )
+
+
+@memoize(for_each_device=True)
+def _get_label_roots_kernel(int_t):
+    return cupy.ElementwiseKernel(
+        "",
+        "raw Y y, raw int64 count, raw Y roots",
+        """
+        if (y[i] != i) continue;
+        long long j = (long long)atomicAdd(
+            (unsigned long long*)&count[1], 1ULL);
+        roots[j] = i;
+        """,
+        "cupyimg_label_roots",
+    )
+
+
+@memoize(for_each_device=True)
+def _get_label_finalize_kernel(int_t):
+    return cupy.ElementwiseKernel(
+        "int64 maxlabel",
+        "raw Y roots, raw Y y",
+        """
+        if (y[i] < 0) {
+            y[i] = 0;
+            continue;
+        }
+        Y yi = y[i];
+        long long j_min = 0;
+        long long j_max = maxlabel - 1;
+        long long j = (j_min + j_max) / 2;
+        while (j_min < j_max) {
+            if (yi == roots[j]) break;
+            if (yi < roots[j]) j_max = j - 1;
+            else j_min = j + 1;
+            j = (j_min + j_max) / 2;
+        }
+        y[i] = j + 1;
+        """,
+        "cupyimg_label_finalize",
+    )
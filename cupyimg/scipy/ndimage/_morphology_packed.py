@@ -0,0 +1,387 @@
+"""Multi-iteration binary erosion of 2D images packed into 32-bit words.
+
+Each row of the image is packed into words holding 32 consecutive pixels, so
+that a single bitwise operation processes 32 pixels and a shift of the words
+by up to 31 pixels only involves two neighboring words. A block of threads
+loads a tile of words, together with a halo wide enough for ``n_steps``
+iterations, into shared memory and performs all iterations there before
+writing the interior of the tile back. The halo is recomputed redundantly by
+the neighboring blocks, which is much cheaper than a launch per iteration.
+
+When iterating until convergence, each launch raises a flag in device memory
+if any word has changed, so the host only synchronizes once every
+``n_steps`` iterations.
+"""
+import math
+
+import cupy
+import numpy
+
+from cupyimg import memoize
+from cupyimg.scipy.ndimage import _util
+
+# number of iterations performed by each launch
+_STEPS = 16
+# interior of the tile processed by each block (in rows and in words)
+_TILE_ROWS = 64
+_TILE_WORDS = 16
+_BLOCK_SIZE = 256
+# shared memory available to each block
+_MAX_SHARED_BYTES = 48 * 1024
+
+
+def _structure_offsets(structure, offsets):
+    """Offsets ``(dy, dx)`` of the input pixels read for each output pixel."""
+    structure = cupy.asnumpy(structure)
+    return tuple(
+        (int(iy) - offsets[0], int(ix) - offsets[1])
+        for iy, ix in zip(*numpy.nonzero(structure))
+    )
+
+
+def _tile_layout(steps):
+    """Rows and words of the halo above, below, left and right of a tile."""
+    dys = [dy for dy, _ in steps]
+    dxs = [dx for _, dx in steps]
+    up = _STEPS * max(0, -min(dys))
+    down = _STEPS * max(0, max(dys))
+    # a stale edge word corrupts its neighbors by ``|dx|`` pixels per step
+    left = 1 + math.ceil(_STEPS * max(0, -min(dxs)) / 32)
+    right = 1 + math.ceil(_STEPS * max(0, max(dxs)) / 32)
+    return up, down, left, right
+
+
+def _use_packed(ndim, iterations, center_is_true, steps, packed=False):
+    """Whether ``_binary_erosion_packed`` supports a call.
+
+    ``steps`` are the offsets returned by ``_structure_offsets``. Packing an
+    image for a single iteration does not pay off unless it is already
+    ``packed``.
+    """
+    if ndim != 2 or not steps or (iterations == 1 and not packed):
+        return False
+    if iterations < 1 and not center_is_true:
+        # convergence is only guaranteed for monotonic iterations
+        return False
+    if any(abs(dx) > 31 for _, dx in steps):
+        return False
+    up, down, left, right = _tile_layout(steps)
+    n_words = (_TILE_ROWS + up + down) * (_TILE_WORDS + left + right)
+    # two buffers for the image and one for the mask
+    return 3 * 4 * n_words <= _MAX_SHARED_BYTES
+
+
+@memoize(for_each_device=True)
+def _get_pack_kernel(invert):
+    return cupy.ElementwiseKernel(
+        "raw X x, int64 n_cols, int64 n_words",
+        "uint32 w",
+        """
+        ptrdiff_t row = i / n_words;
+        ptrdiff_t c0 = (i % n_words) * 32;
+        int n = (int)min((ptrdiff_t)32, (ptrdiff_t)n_cols - c0);
+        unsigned int v = 0;
+        for (int j = 0; j < n; j++) {{
+            if (x[row * n_cols + c0 + j] != (X)0) {{
+                v |= 1u << j;
+            }}
+        }}
+        w = {result};
+        """.format(
+            result="~v" if invert else "v"
+        ),
+        "cupyimg_ndimage_pack_bits" + ("_invert" if invert else ""),
+    )
+
+
+@memoize(for_each_device=True)
+def _get_unpack_kernel(invert):
+    return cupy.ElementwiseKernel(
+        "raw uint32 w, int64 n_cols, int64 n_words",
+        "Y y",
+        """
+        ptrdiff_t row = i / n_cols;
+        ptrdiff_t col = i % n_cols;
+        unsigned int bit = (w[row * n_words + col / 32] >> (col % 32)) & 1u;
+        y = (Y)(bit {op} 1u);
+        """.format(
+            op="!=" if invert else "=="
+        ),
+        "cupyimg_ndimage_unpack_bits" + ("_invert" if invert else ""),
+    )
+
+
+@memoize(for_each_device=True)
+def _get_copy_words_kernel(invert):
+    return cupy.ElementwiseKernel(
+        "uint32 w, int64 n_words, uint32 last_valid",
+        "uint32 y",
+        """
+        unsigned int v = {op}w;
+        if (i % n_words == n_words - 1) {{
+            v &= last_valid;
+        }}
+        y = v;
+        """.format(
+            op="~" if invert else ""
+        ),
+        "cupyimg_ndimage_copy_words" + ("_invert" if invert else ""),
+    )
+
+
+def _last_valid(n_cols):
+    """Bits of the last word of a line that hold elements."""
+    return (1 << (n_cols % 32)) - 1 if n_cols % 32 else 0xFFFFFFFF
+
+
+def _copy_words(words, n_cols, invert=False, out=None):
+    """Copy (or complement if ``invert``) packed words.
+
+    The unused bits of the last word of each line are cleared. ``out`` may be
+    ``words`` itself.
+    """
+    if out is None:
+        out = cupy.empty_like(words)
+    if words.size:
+        _get_copy_words_kernel(invert)(
+            words, words.shape[-1], _last_valid(n_cols), out
+        )
+    return out
+
+
+def _pack_bits(input, invert=False):
+    """Pack the nonzero elements of ``input`` along its last axis.
+
+    Bit ``j`` of word ``k`` holds element ``32 * k + j`` of each line. The
+    unused bits of the last word of each line are zero (one if ``invert``).
+    """
+    x = cupy.ascontiguousarray(input)
+    n_cols = x.shape[-1]
+    n_words = -(-n_cols // 32)
+    words = cupy.empty(x.shape[:-1] + (n_words,), dtype=cupy.uint32)
+    if words.size:
+        _get_pack_kernel(invert)(x.reshape(-1), n_cols, n_words, words)
+    return words
+
+
+def _unpack_bits(words, n_cols, output, invert=False):
+    """Unpack the bits of ``words`` into ``output`` (of any dtype)."""
+    n_words = words.shape[-1]
+    if output.size:
+        _get_unpack_kernel(invert)(words, n_cols, n_words, output)
+    return output
+
+
+@memoize(for_each_device=True)
+def _get_packed_erosion_kernel(steps, border, masked):
+    row_lo = max(0, -min(dy for dy, _ in steps))
+    row_hi = max(0, max(dy for dy, _ in steps))
+    halo_up, halo_down, halo_left, halo_right = _tile_layout(steps)
+    sh_rows = _TILE_ROWS + halo_up + halo_down
+    sh_words = _TILE_WORDS + halo_left + halo_right
+
+    terms = []
+    for dy, dx in steps:
+        idx = "t + ({}) * SH_WORDS".format(dy)
+        if dx == 0:
+            terms.append("e &= src[{}];".format(idx))
+        elif dx > 0:
+            terms.append(
+                "e &= (src[{idx}] >> {dx}) | (src[{idx} + 1] << {rdx});".format(
+                    idx=idx, dx=dx, rdx=32 - dx
+                )
+            )
+        else:
+            terms.append(
+                "e &= (src[{idx}] << {dx}) | (src[{idx} - 1] >> {rdx});".format(
+                    idx=idx, dx=-dx, rdx=32 + dx
+                )
+            )
+    if masked:
+        mask_load = "mbuf[t] = inside ? mask[gi] : 0u;"
+        mask_apply = "e = (e & mbuf[t]) | (v & ~mbuf[t]);"
+        mask_decl = "__shared__ word_t mbuf[SH_ROWS * SH_WORDS];"
+    else:
+        mask_load = mask_apply = mask_decl = ""
+
+    code = """
+    typedef unsigned int word_t;
+    #define SH_ROWS {sh_rows}
+    #define SH_WORDS {sh_words}
+    #define TILE_ROWS {tile_rows}
+    #define TILE_WORDS {tile_words}
+    #define HALO_UP {halo_up}
+    #define HALO_LEFT {halo_left}
+    #define BORDER_WORD {border_word}
+
+    // the bits past the end of a row are part of the border
+    __device__ __forceinline__ word_t _fix_padding(
+        word_t v, int gw, int n_words, word_t last_valid)
+    {{
+        if (gw == n_words - 1) {{
+            v = (v & last_valid) | (BORDER_WORD & ~last_valid);
+        }}
+        return v;
+    }}
+
+    extern "C" __global__
+    __launch_bounds__({block_size})
+    void cupyimg_binary_erosion_packed(
+        const word_t* __restrict__ x, const word_t* __restrict__ mask,
+        word_t* __restrict__ y, int* changed, int n_rows, int n_words,
+        word_t last_valid, int n_steps)
+    {{
+        __shared__ word_t buf[2][SH_ROWS * SH_WORDS];
+        {mask_decl}
+        __shared__ int block_changed;
+        const int row0 = blockIdx.y * TILE_ROWS - HALO_UP;
+        const int word0 = blockIdx.x * TILE_WORDS - HALO_LEFT;
+        if (threadIdx.x == 0) {{
+            block_changed = 0;
+        }}
+        for (int t = threadIdx.x; t < SH_ROWS * SH_WORDS; t += blockDim.x) {{
+            int gr = row0 + t / SH_WORDS;
+            int gw = word0 + t % SH_WORDS;
+            bool inside = gr >= 0 && gr < n_rows && gw >= 0 && gw < n_words;
+            ptrdiff_t gi = (ptrdiff_t)gr * n_words + gw;
+            buf[0][t] = inside ? _fix_padding(x[gi], gw, n_words, last_valid)
+                               : BORDER_WORD;
+            {mask_load}
+        }}
+        __syncthreads();
+
+        int cur = 0;
+        for (int s = 0; s < n_steps; s++) {{
+            const word_t* src = buf[cur];
+            word_t* dst = buf[1 - cur];
+            for (int t = threadIdx.x; t < SH_ROWS * SH_WORDS;
+                 t += blockDim.x) {{
+                int r = t / SH_WORDS;
+                int w = t % SH_WORDS;
+                int gr = row0 + r;
+                int gw = word0 + w;
+                word_t v = src[t];
+                // words outside of the image keep the border value and the
+                // edges of the tile are left stale (covered by the halo)
+                if (gr >= 0 && gr < n_rows && gw >= 0 && gw < n_words
+                        && r >= {row_lo} && r < SH_ROWS - {row_hi}
+                        && w >= 1 && w < SH_WORDS - 1) {{
+                    word_t e = ~0u;
+                    {terms}
+                    {mask_apply}
+                    v = _fix_padding(e, gw, n_words, last_valid);
+                }}
+                dst[t] = v;
+            }}
+            __syncthreads();
+            cur = 1 - cur;
+        }}
+
+        for (int t = threadIdx.x; t < TILE_ROWS * TILE_WORDS;
+             t += blockDim.x) {{
+            int r = HALO_UP + t / TILE_WORDS;
+            int w = HALO_LEFT + t % TILE_WORDS;
+            int gr = row0 + r;
+            int gw = word0 + w;
+            if (gr < n_rows && gw < n_words) {{
+                ptrdiff_t gi = (ptrdiff_t)gr * n_words + gw;
+                word_t v = buf[cur][r * SH_WORDS + w];
+                y[gi] = v;
+                if (v != _fix_padding(x[gi], gw, n_words, last_valid)) {{
+                    block_changed = 1;
+                }}
+            }}
+        }}
+        __syncthreads();
+        if (threadIdx.x == 0 && block_changed) {{
+            *changed = 1;
+        }}
+    }}
+    """.format(
+        sh_rows=sh_rows,
+        sh_words=sh_words,
+        tile_rows=_TILE_ROWS,
+        tile_words=_TILE_WORDS,
+        halo_up=halo_up,
+        halo_left=halo_left,
+        border_word="0xffffffffu" if border else "0u",
+        block_size=_BLOCK_SIZE,
+        mask_decl=mask_decl,
+        mask_load=mask_load,
+        mask_apply=mask_apply,
+        row_lo=row_lo,
+        row_hi=row_hi,
+        terms="\n                    ".join(terms),
+    )
+    return cupy.RawKernel(code, "cupyimg_binary_erosion_packed")
+
+
+def _erode_words(x, n_cols, steps, iterations, mask, border, center_is_true):
+    """Iterated binary erosion of packed 2D words.
+
+    ``x`` is overwritten. The unused bits of the last word of each row of the
+    result are set to ``border``.
+    """
+    n_rows, n_words = x.shape
+    y = cupy.empty_like(x)
+    kernel = _get_packed_erosion_kernel(steps, border, mask is not None)
+    grid = (-(-n_words // _TILE_WORDS), -(-n_rows // _TILE_ROWS))
+    changed = cupy.zeros((), dtype=cupy.int32)
+    # Once an erosion whose structure contains its center leaves the image
+    # unchanged, further iterations do not change it either.
+    check = iterations < 1 or center_is_true
+    remaining = iterations
+    while x.size:
+        n_steps = _STEPS if iterations < 1 else min(_STEPS, remaining)
+        if check:
+            changed.fill(0)
+        kernel(
+            grid,
+            (_BLOCK_SIZE,),
+            (
+                x,
+                x if mask is None else mask,
+                y,
+                changed,
+                numpy.int32(n_rows),
+                numpy.int32(n_words),
+                numpy.uint32(_last_valid(n_cols)),
+                numpy.int32(n_steps),
+            ),
+        )
+        x, y = y, x
+        remaining -= n_steps
+        if iterations >= 1 and remaining <= 0:
+            break
+        # single synchronization per launch of _STEPS iterations
+        if check and not int(changed):
+            break
+    return x
+
+
+def _binary_erosion_packed(
+    input,
+    steps,
+    iterations,
+    mask,
+    output,
+    border_value,
+    invert,
+    center_is_true,
+):
+    """Iterated binary erosion of a 2D image.
+
+    ``steps`` are the offsets of the structuring element as returned by
+    ``_structure_offsets``. If ``iterations < 1``, the erosion is repeated
+    until the result does not change anymore. As in ``_binary_erosion``,
+    ``invert`` erodes the background instead of the foreground.
+    """
+    n_cols = input.shape[-1]
+    # work on the foreground of the erosion (the background if invert)
+    border = bool(border_value) != bool(invert)
+    x = _pack_bits(input, invert)
+    if mask is not None:
+        mask = _pack_bits(mask)
+    x = _erode_words(x, n_cols, steps, iterations, mask, border, center_is_true)
+    output = _util._get_output(output, input)
+    return _unpack_bits(x, n_cols, output, invert)
@@ -0,0 +1,635 @@
+"""Label-keyed segmented reductions for ``ndimage.measurements``.
+
+The elements having each requested label form a segment, and the statistics
+of all segments are computed together by one of two strategies, chosen by the
+number of segments:
+
+* With few segments, each block of threads accumulates its elements into
+  per-segment accumulators in shared memory with atomic operations, and merges
+  them into the global results once at the end (privatized atomic scatter).
+* With many segments, or when the median is requested, the elements are
+  sorted by segment (and by value if order statistics are requested). Each
+  thread then reduces a contiguous chunk of the sorted elements, flushing a
+  partial result whenever the segment changes, and the order statistics are
+  read off at the segment boundaries.
+
+The count, sum and extrema take one pass over the data. The variance and the
+positions of the extrema take a second pass that uses the mean and the
+extrema found by the first.
+
+Histograms of all segments are accumulated as a dense (segment, bin) array
+of counters, privatized in shared memory when it is small enough. Quantiles
+are read off the segments sorted by value.
+"""
+import cupy
+import numpy
+
+from cupyimg import _misc, memoize
+
+_STATISTICS = (
+    "count",
+    "sum",
+    "mean",
+    "variance",
+    "standard_deviation",
+    "minimum",
+    "maximum",
+    "median",
+    "minimum_position",
+    "maximum_position",
+)
+
+# With at most this many segments the atomic scatter is used. Its four 8-byte
+# accumulators per segment then fit in 32 KiB of shared memory.
+_SCATTER_MAX_SEGMENTS = 1024
+_BLOCK_SIZE = 256
+_MAX_BLOCKS = 1024
+# number of sorted elements reduced by each thread of the sort-based strategy
+_CHUNK_SIZE = 128
+
+# accumulators of the atomic scatter: C type, initial value, update and the
+# atomic operation merging the shared accumulators into the global ones
+_ACCUMULATORS = {
+    "count": ("unsigned long long", "0", "atomicAdd(&{a}[s], 1ULL);", "Add"),
+    "sum": ("double", "0", "atomicAdd(&{a}[s], vd);", "Add"),
+    "minimum": (
+        "unsigned long long",
+        "~0ULL",
+        "atomicMin(&{a}[s], key);",
+        "Min",
+    ),
+    "maximum": ("unsigned long long", "0", "atomicMax(&{a}[s], key);", "Max"),
+    "sqdev": (
+        "double",
+        "0",
+        "{{ double d = vd - mean[s]; atomicAdd(&{a}[s], d * d); }}",
+        "Add",
+    ),
+    "minimum_position": (
+        "unsigned long long",
+        "~0ULL",
+        "if (key == minimum_key[s]) atomicMin(&{a}[s], (unsigned long long)i);",
+        "Min",
+    ),
+    "maximum_position": (
+        "unsigned long long",
+        "~0ULL",
+        "if (key == maximum_key[s]) atomicMin(&{a}[s], (unsigned long long)i);",
+        "Min",
+    ),
+}
+# read-only inputs of the second pass of the atomic scatter
+_PASS2_INPUTS = {
+    "sqdev": "const double* mean",
+    "minimum_position": "const unsigned long long* minimum_key",
+    "maximum_position": "const unsigned long long* maximum_key",
+}
+
+
+def _key_code(dtype):
+    """Code converting ``v`` to an order-preserving 64-bit unsigned key."""
+    if dtype.kind in "bu":
+        return "unsigned long long key = (unsigned long long)v;"
+    if dtype.kind == "i":
+        return (
+            "unsigned long long key = (unsigned long long)(long long)v"
+            " ^ 0x8000000000000000ULL;"
+        )
+    # flip all bits of negative floats and only the sign bit of the others
+    return """
+        unsigned long long key = __double_as_longlong(vd);
+        key = (key >> 63) ? ~key : (key | 0x8000000000000000ULL);"""
+
+
+def _decode_keys(keys, dtype):
+    """Values of ``dtype`` corresponding to keys made by ``_key_code``."""
+    sign = numpy.uint64(1 << 63)
+    if dtype.kind in "bu":
+        return keys.astype(dtype)
+    if dtype.kind == "i":
+        return (keys ^ sign).view(cupy.int64).astype(dtype)
+    bits = cupy.where(keys & sign, keys ^ sign, ~keys)
+    return bits.view(cupy.float64).astype(dtype)
+
+
+def _to_double(dtype):
+    if dtype == numpy.float16:
+        return "(double)(float)v"
+    return "(double)v"
+
+
+@memoize(for_each_device=True)
+def _get_scatter_kernel(x_type, key_code, to_double, accumulators):
+    params = []
+    for name in accumulators:
+        if name in _PASS2_INPUTS:
+            params.append(_PASS2_INPUTS[name])
+    setup = []
+    init = []
+    update = []
+    flush = []
+    for j, name in enumerate(accumulators):
+        c_type, initial, code, op = _ACCUMULATORS[name]
+        params.append("{}* out_{}".format(c_type, name))
+        setup.append(
+            "{0}* acc_{1} = ({0}*)(_smem + {2} * n);".format(c_type, name, j)
+        )
+        init.append("acc_{}[j] = {};".format(name, initial))
+        flush.append(
+            "if (acc_{0}[j] != {1}) atomic{2}(&out_{0}[j], acc_{0}[j]);".format(
+                name, initial, op
+            )
+        )
+        update.append(code.format(a="acc_" + name))
+
+    code = """
+    typedef {x_type} X;
+
+    extern "C" __global__
+    __launch_bounds__({block_size})
+    void cupyimg_segmented_scatter(const X* x, const int* seg, long long size,
+                                   int n, {params})
+    {{
+        // per-segment accumulators of this block
+        extern __shared__ unsigned long long _smem[];
+        {setup}
+        for (int j = threadIdx.x; j < n; j += blockDim.x) {{
+            {init}
+        }}
+        __syncthreads();
+
+        for (long long i = (long long)blockIdx.x * blockDim.x + threadIdx.x;
+             i < size; i += (long long)gridDim.x * blockDim.x) {{
+            const int s = seg[i];
+            if (s >= n) continue;
+            const X v = x[i];
+            const double vd = {to_double};
+            {key_code}
+            {update}
+        }}
+        __syncthreads();
+
+        for (int j = threadIdx.x; j < n; j += blockDim.x) {{
+            {flush}
+        }}
+    }}
+    """.format(
+        x_type=x_type,
+        block_size=_BLOCK_SIZE,
+        params=", ".join(params),
+        setup="\n        ".join(setup),
+        init="\n            ".join(init),
+        to_double=to_double,
+        key_code=key_code,
+        update="\n            ".join(update),
+        flush="\n            ".join(flush),
+    )
+    return cupy.RawKernel(code, "cupyimg_segmented_scatter")
+
+
+def _scatter(x, seg, n, accumulators, inputs=()):
+    """Run one pass of the atomic scatter, returning the accumulators."""
+    outputs = []
+    for name in accumulators:
+        c_type, initial = _ACCUMULATORS[name][:2]
+        dtype = cupy.float64 if c_type == "double" else cupy.uint64
+        if initial == "~0ULL":
+            outputs.append(cupy.full(n, ~numpy.uint64(0), dtype=dtype))
+        else:
+            outputs.append(cupy.zeros(n, dtype=dtype))
+    if x.size == 0 or n == 0:
+        return dict(zip(accumulators, outputs))
+    kern = _get_scatter_kernel(
+        _misc.get_typename(x.dtype),
+        _key_code(x.dtype),
+        _to_double(x.dtype),
+        tuple(accumulators),
+    )
+    n_blocks = max(min(-(-x.size // _BLOCK_SIZE), _MAX_BLOCKS), 1)
+    args = (x, seg, numpy.int64(x.size), numpy.int32(n))
+    kern(
+        (n_blocks,),
+        (_BLOCK_SIZE,),
+        args + tuple(inputs) + tuple(outputs),
+        shared_mem=8 * len(accumulators) * n,
+    )
+    return dict(zip(accumulators, outputs))
+
+
+@memoize(for_each_device=True)
+def _get_segmented_sum_kernel(squared):
+    if squared:
+        in_params = "raw float64 v, raw int32 seg, raw float64 center, "
+        term = "(v[k] - center[cur]) * (v[k] - center[cur])"
+    else:
+        in_params = "raw float64 v, raw int32 seg, "
+        term = "v[k]"
+    return cupy.ElementwiseKernel(
+        in_params + "int64 n_elem, int64 chunk",
+        "raw float64 out",
+        """
+        const ptrdiff_t start = i * chunk;
+        const ptrdiff_t stop = start + chunk < n_elem ? start + chunk : n_elem;
+        int cur = seg[start];
+        double acc = 0;
+        for (ptrdiff_t k = start; k < stop; k++) {{
+            if (seg[k] != cur) {{
+                atomicAdd(&out[cur], acc);
+                acc = 0;
+                cur = seg[k];
+            }}
+            acc += {term};
+        }}
+        atomicAdd(&out[cur], acc);
+        """.format(
+            term=term
+        ),
+        "cupyimg_segmented_sum" + ("_squared" if squared else ""),
+    )
+
+
+def _segmented_sum(v, seg, n, center=None):
+    """Sums of ``v`` (or of its squared deviations from ``center``)."""
+    out = cupy.zeros(n, dtype=cupy.float64)
+    if v.size == 0:
+        return out
+    n_chunks = -(-v.size // _CHUNK_SIZE)
+    if center is None:
+        args = (v, seg)
+    else:
+        args = (v, seg, center)
+    _get_segmented_sum_kernel(center is not None)(
+        *args, v.size, _CHUNK_SIZE, out, size=n_chunks
+    )
+    return out
+
+
+def _scatter_statistics(x, seg, n, stats):
+    """Accumulators of the atomic scatter strategy."""
+    pass1 = ["count"]
+    if {"sum", "mean", "variance", "standard_deviation"} & stats:
+        pass1.append("sum")
+    if {"minimum", "minimum_position"} & stats:
+        pass1.append("minimum")
+    if {"maximum", "maximum_position"} & stats:
+        pass1.append("maximum")
+    acc = _scatter(x, seg, n, pass1)
+    count = acc["count"].astype(cupy.int64)
+    result = {"count": count}
+    if "sum" in acc:
+        result["sum"] = acc["sum"]
+
+    pass2 = []
+    inputs = []
+    if {"variance", "standard_deviation"} & stats:
+        pass2.append("sqdev")
+        inputs.append(acc["sum"] / count)
+    for name in ("minimum_position", "maximum_position"):
+        if name in stats:
+            pass2.append(name)
+            inputs.append(acc[name.split("_")[0]])
+    if pass2:
+        acc.update(_scatter(x, seg, n, pass2, inputs))
+
+    nonempty = count > 0
+    if "sqdev" in acc:
+        result["sqdev"] = acc["sqdev"]
+    for name in ("minimum", "maximum"):
+        if name in stats:
+            values = _decode_keys(acc[name], x.dtype)
+            result[name] = cupy.where(nonempty, values, 0).astype(x.dtype)
+    for name in ("minimum_position", "maximum_position"):
+        if name in stats:
+            positions = cupy.where(nonempty, acc[name], 0)
+            result[name] = positions.astype(cupy.int64)
+    return result
+
+
+def _median_dtype(dtype):
+    # see https://github.com/scipy/scipy/issues/12836 for integer inputs
+    return numpy.dtype(float) if dtype.kind in "biu" else dtype
+
+
+def _empty_statistics(dtype, n):
+    """Accumulators of ``n`` empty segments."""
+    zeros = cupy.zeros(n, dtype=cupy.float64)
+    positions = cupy.zeros(n, dtype=cupy.int64)
+    return {
+        "count": cupy.zeros(n, dtype=cupy.int64),
+        "sum": zeros,
+        "sqdev": zeros,
+        "minimum": cupy.zeros(n, dtype=dtype),
+        "maximum": cupy.zeros(n, dtype=dtype),
+        "median": cupy.zeros(n, dtype=_median_dtype(dtype)),
+        "minimum_position": positions,
+        "maximum_position": positions,
+    }
+
+
+def _sort_segments(x, seg, n, by_value):
+    """Sort the elements of the ``n`` segments by segment.
+
+    If ``by_value``, the elements of each segment are also sorted by value,
+    and equal values remain ordered by position. Returns the sorted values
+    and segments, the positions of the sorted elements in ``x`` and the
+    start and stop of each segment in the sorted arrays.
+    """
+    selected = cupy.flatnonzero(seg < n)
+    seg = seg[selected]
+    x = x[selected]
+    if by_value:
+        # stable sorts, so that equal values remain ordered by position
+        order = cupy.argsort(x)
+        order = order[cupy.argsort(seg[order])]
+    else:
+        order = cupy.argsort(seg)
+    seg = seg[order]
+    x = x[order]
+    selected = selected[order]
+    segments = cupy.arange(n, dtype=cupy.int32)
+    start = cupy.searchsorted(seg, segments, side="left")
+    stop = cupy.searchsorted(seg, segments, side="right")
+    return x, seg, selected, start, stop
+
+
+def _sort_statistics(x, seg, n, stats):
+    """Accumulators of the sort-by-label strategy."""
+    order_stats = {
+        "minimum",
+        "maximum",
+        "median",
+        "minimum_position",
+        "maximum_position",
+    }
+    x, seg, selected, start, stop = _sort_segments(
+        x, seg, n, bool(order_stats & stats)
+    )
+    if x.size == 0:
+        return _empty_statistics(x.dtype, n)
+    segments = cupy.arange(n, dtype=cupy.int32)
+    count = (stop - start).astype(cupy.int64)
+    result = {"count": count}
+    nonempty = count > 0
+    # indices of the smallest and largest value of each nonempty segment
+    first = cupy.minimum(start, x.size - 1)
+    last = cupy.maximum(stop - 1, 0)
+
+    if {"sum", "mean", "variance", "standard_deviation"} & stats:
+        xd = x.astype(cupy.float64, copy=False)
+        result["sum"] = _segmented_sum(xd, seg, n)
+        if {"variance", "standard_deviation"} & stats:
+            mean = result["sum"] / count
+            result["sqdev"] = _segmented_sum(xd, seg, n, mean)
+
+    if "minimum" in stats:
+        result["minimum"] = cupy.where(nonempty, x[first], 0).astype(x.dtype)
+    if "minimum_position" in stats:
+        result["minimum_position"] = cupy.where(nonempty, selected[first], 0)
+    if "maximum" in stats:
+        result["maximum"] = cupy.where(nonempty, x[last], 0).astype(x.dtype)
+    if "maximum_position" in stats:
+        # the first occurrence of the maximum of each segment
+        is_max = cupy.flatnonzero(x == x[last][seg])
+        first_max = cupy.searchsorted(seg[is_max], segments, side="left")
+        first_max = cupy.minimum(first_max, is_max.size - 1)
+        positions = selected[is_max[first_max]]
+        result["maximum_position"] = cupy.where(nonempty, positions, 0)
+    if "median" in stats:
+        lo = cupy.where(nonempty, start + (count - 1) // 2, 0)
+        hi = cupy.where(nonempty, start + count // 2, 0)
+        dtype = _median_dtype(x.dtype)
+        median = (x[lo].astype(dtype) + x[hi].astype(dtype)) / 2.0
+        result["median"] = cupy.where(nonempty, median, 0).astype(dtype)
+    for name in ("minimum_position", "maximum_position"):
+        if name in result:
+            result[name] = result[name].astype(cupy.int64)
+    return result
+
+
+@memoize(for_each_device=True)
+def _get_lookup_kernel():
+    return cupy.ElementwiseKernel(
+        "L label, raw int32 lut, int64 lo, int64 hi, int32 n",
+        "int32 seg",
+        """
+        const long long l = (long long)label;
+        seg = (l < lo || l > hi) ? n : lut[l - lo];
+        """,
+        "cupyimg_segment_lookup",
+    )
+
+
+def _label_segments(labels, index):
+    """Segment of each element of ``labels`` for the labels in ``index``.
+
+    Returns ``(seg, n, inverse)``, where the int32 array ``seg`` holds the
+    position of each label among the ``n`` unique values of ``index`` (or
+    ``n`` for labels not in ``index``), and ``inverse`` gives the position of
+    each element of ``index`` among the unique values.
+    """
+    unique, inverse = cupy.unique(index, return_inverse=True)
+    n = unique.size
+    labels = labels.ravel()
+    if n == 0:
+        return cupy.zeros(labels.size, dtype=cupy.int32), n, inverse
+
+    integer_kinds = "biu"
+    if (
+        labels.dtype.kind in integer_kinds
+        and unique.dtype.kind in integer_kinds
+        and labels.dtype != numpy.uint64
+        and unique.dtype != numpy.uint64
+    ):
+        lo = int(unique[0])
+        hi = int(unique[-1])
+        # a lookup table avoids the binary search if it is not too large
+        if hi - lo < max(labels.size, 4 * _SCATTER_MAX_SEGMENTS):
+            lut = cupy.full(hi - lo + 1, n, dtype=cupy.int32)
+            lut[unique - lo] = cupy.arange(n, dtype=cupy.int32)
+            seg = _get_lookup_kernel()(labels, lut, lo, hi, n)
+            return seg, n, inverse
+
+    seg = cupy.minimum(cupy.searchsorted(unique, labels), n - 1)
+    seg = cupy.where(unique[seg] == labels, seg, n).astype(cupy.int32)
+    return seg, n, inverse
+
+
+def _segments(input, labels, index):
+    """Raveled ``input`` and the segments of its elements.
+
+    See `_labeled_statistics` for the arguments. Returns ``(x, seg, n,
+    inverse)``, where ``seg`` holds the segment of each element of ``x`` (or
+    ``n`` if it is not in any of the ``n`` segments) and ``inverse`` gives
+    the segment of each label of ``index``.
+    """
+    x = cupy.ascontiguousarray(input).ravel()
+    if labels is None:
+        seg = cupy.zeros(x.size, dtype=cupy.int32)
+        return x, seg, 1, cupy.zeros((), dtype=cupy.int64)
+    if index is None:
+        seg = (labels <= 0).astype(cupy.int32).ravel()
+        return x, seg, 1, cupy.zeros((), dtype=cupy.int64)
+    index = cupy.asarray(index)
+    seg, n, inverse = _label_segments(labels, index)
+    return x, seg, n, inverse.reshape(index.shape)
+
+
+def _labeled_statistics(input, labels, index, stats):
+    """Statistics of ``input`` over the regions of ``labels`` in ``index``.
+
+    ``input`` and ``labels`` must have been broadcast to the same shape. As
+    for ``scipy.ndimage.mean``, all elements are used if ``labels`` is None
+    and the elements with positive labels if ``index`` is None.
+
+    Returns a dict mapping each name in ``stats`` to an array of the shape of
+    ``index`` (0-dimensional if ``labels`` or ``index`` is None).
+    """
+    stats = tuple(stats)
+    for name in stats:
+        if name not in _STATISTICS:
+            raise ValueError("unknown statistic: {}".format(name))
+    x, seg, n, inverse = _segments(input, labels, index)
+
+    requested = set(stats)
+    if "median" in requested or n > _SCATTER_MAX_SEGMENTS:
+        acc = _sort_statistics(x, seg, n, requested)
+    else:
+        acc = _scatter_statistics(x, seg, n, requested)
+
+    count = acc["count"]
+    if "sum" in acc:
+        acc["mean"] = acc["sum"] / count
+    if "sqdev" in acc:
+        acc["variance"] = acc["sqdev"] / count
+        acc["standard_deviation"] = cupy.sqrt(acc["variance"])
+    return {name: acc[name][inverse] for name in stats}
+
+
+# With at most this many (segment, bin) counters, the histograms are
+# accumulated in shared memory (32 KiB of 32-bit counters) by each block.
+_HISTOGRAM_MAX_SHARED = 8192
+
+
+@memoize(for_each_device=True)
+def _get_histogram_kernel(x_type, to_double, privatized):
+    if privatized:
+        setup = """
+        // per-block counts of all (segment, bin) pairs
+        extern __shared__ unsigned int counts[];
+        for (int j = threadIdx.x; j < n * bins; j += blockDim.x) {
+            counts[j] = 0;
+        }
+        __syncthreads();"""
+        update = "atomicAdd(&counts[s * bins + b], 1U);"
+        flush = """
+        __syncthreads();
+        for (int j = threadIdx.x; j < n * bins; j += blockDim.x) {
+            if (counts[j]) atomicAdd(&hist[j], (unsigned long long)counts[j]);
+        }"""
+    else:
+        setup = flush = ""
+        update = "atomicAdd(&hist[(long long)s * bins + b], 1ULL);"
+
+    code = """
+    typedef {x_type} X;
+
+    extern "C" __global__
+    __launch_bounds__({block_size})
+    void cupyimg_labeled_histogram(const X* x, const int* seg, long long size,
+                                   int n, int bins, const double* edges,
+                                   double norm, unsigned long long* hist)
+    {{
+        {setup}
+        for (long long i = (long long)blockIdx.x * blockDim.x + threadIdx.x;
+             i < size; i += (long long)gridDim.x * blockDim.x) {{
+            const int s = seg[i];
+            if (s >= n) continue;
+            const X v = x[i];
+            const double vd = {to_double};
+            if (!(vd >= edges[0] && vd <= edges[bins])) continue;
+            int b = (int)((vd - edges[0]) * norm);
+            if (b > bins - 1) b = bins - 1;
+            // correct rounding errors against the bin edges, as
+            // numpy.histogram does for uniform bins
+            if (vd < edges[b]) {{
+                b--;
+            }} else if (b < bins - 1 && vd >= edges[b + 1]) {{
+                b++;
+            }}
+            {update}
+        }}
+        {flush}
+    }}
+    """.format(
+        x_type=x_type,
+        block_size=_BLOCK_SIZE,
+        setup=setup,
+        to_double=to_double,
+        update=update,
+        flush=flush,
+    )
+    return cupy.RawKernel(code, "cupyimg_labeled_histogram")
+
+
+def _labeled_histogram(input, labels, index, edges, return_counts=False):
+    """Histograms of ``input`` over the regions of ``labels`` in ``index``.
+
+    ``edges`` are the ``bins + 1`` uniformly spaced edges of the bins on the
+    host. Returns an int64 array of shape ``index.shape + (bins,)`` and, if
+    ``return_counts``, the number of elements of each region. See
+    `_labeled_statistics` for the other arguments.
+    """
+    x, seg, n, inverse = _segments(input, labels, index)
+    bins = edges.size - 1
+    hist = cupy.zeros((n, bins), dtype=cupy.uint64)
+    if x.size > 0 and n > 0:
+        width = float(edges[-1] - edges[0])
+        norm = bins / width if width > 0 else 0.0
+        privatized = n * bins <= _HISTOGRAM_MAX_SHARED
+        kern = _get_histogram_kernel(
+            _misc.get_typename(x.dtype), _to_double(x.dtype), privatized
+        )
+        n_blocks = max(min(-(-x.size // _BLOCK_SIZE), _MAX_BLOCKS), 1)
+        args = (x, seg, numpy.int64(x.size), numpy.int32(n), numpy.int32(bins))
+        args += (cupy.asarray(edges, dtype=cupy.float64), numpy.float64(norm))
+        kern(
+            (n_blocks,),
+            (_BLOCK_SIZE,),
+            args + (hist,),
+            shared_mem=4 * n * bins if privatized else 0,
+        )
+    hist = hist.view(cupy.int64)[inverse]
+    if return_counts:
+        counts = cupy.bincount(seg, minlength=n + 1)[:n]
+        return hist, counts[inverse]
+    return hist
+
+
+def _labeled_quantiles(input, labels, index, q):
+    """Quantiles of ``input`` over the regions of ``labels`` in ``index``.
+
+    ``q`` is an array of quantiles in ``[0, 1]``. The quantiles are
+    interpolated linearly between the sorted values of each region, as by
+    ``numpy.quantile``. Returns a float64 array of shape ``index.shape +
+    q.shape``, which is NaN for regions without elements. See
+    `_labeled_statistics` for the other arguments.
+    """
+    x, seg, n, inverse = _segments(input, labels, index)
+    x, seg, _, start, stop = _sort_segments(x, seg, n, True)
+    q = cupy.asarray(q, dtype=cupy.float64)
+    out = cupy.full((n, q.size), cupy.nan, dtype=cupy.float64)
+    if x.size > 0:
+        count = stop - start
+        h = (count - 1)[:, cupy.newaxis] * q.ravel()
+        lo = cupy.floor(h)
+        t = h - lo
+        lo = start[:, cupy.newaxis] + lo.astype(cupy.int64)
+        hi = cupy.minimum(lo + 1, (stop - 1)[:, cupy.newaxis])
+        # indices of empty segments are clipped; their quantiles are NaN
+        lo = cupy.clip(lo, 0, x.size - 1)
+        hi = cupy.clip(hi, 0, x.size - 1)
+        xd = x.astype(cupy.float64, copy=False)
+        values = xd[lo] + (xd[hi] - xd[lo]) * t
+        nonempty = (count > 0)[:, cupy.newaxis]
+        out = cupy.where(nonempty, values, cupy.nan)
+    return out.reshape((n,) + q.shape)[inverse]
@@ -10,6 +10,8 @@ import textwrap
 
 import cupy
 
+from cupyimg import memoize
+
 
 def get_poles(order):
     if order == 2:
@@ -253,7 +255,7 @@ void cupyx_spline_filter(T* __restrict__ y, const idx_t* __restrict__ info) {{
 """
 
 
-@cupy.memoize(for_each_device=True)
+@memoize(for_each_device=True)
 def get_raw_spline1d_kernel(
     axis,
     ndim,
@@ -0,0 +1,399 @@
+"""Planning of halo-aware tiled filtering.
+
+This module is pure Python (no NumPy or CuPy imports) so that the tile layout
+can be tested independently of the GPU. A filter whose output at a given
+position only depends on input values within a bounded window can be applied
+block by block: each block of the output is computed from a slab of the input
+consisting of the block plus a halo on either side along each axis. Only the
+interior (the block itself) of each filtered slab is kept.
+
+At the array edges the slab is clipped to the array, so the filter applies its
+own boundary ``mode`` at the true edges. Edge slabs are made long enough to
+contain the values that a reflecting mode mirrors into the halo. The
+exception are the wrapping modes, where the halo at an edge is gathered from
+the opposite side of the array.
+"""
+import collections
+import itertools
+
+__all__ = [
+    "Segment",
+    "Tile",
+    "correlate_halo",
+    "convolve_halo",
+    "gaussian_radius",
+    "filter_halo",
+    "normalize_halo",
+    "choose_block_shape",
+    "plan_tiles",
+    "gather",
+]
+
+_WRAP_MODES = ("wrap", "grid-wrap")
+
+#: A contiguous run of input indices along one axis, copied to position
+#: ``dst_start`` of the slab.
+Segment = collections.namedtuple(
+    "Segment", ["src_start", "src_stop", "dst_start"]
+)
+
+#: One block of work. ``output_slices`` locate the block in the output,
+#: ``input_segments`` gives, per axis, the segments making up the input slab
+#: of shape ``input_shape`` and ``interior_slices`` locate the block within the
+#: filtered slab.
+Tile = collections.namedtuple(
+    "Tile",
+    ["output_slices", "input_segments", "input_shape", "interior_slices"],
+)
+
+
+def _normalize_sequence(value, ndim):
+    if hasattr(value, "__iter__") and not isinstance(value, str):
+        normalized = list(value)
+        if len(normalized) != ndim:
+            raise RuntimeError(
+                "sequence argument must have length equal to input rank"
+            )
+    else:
+        normalized = [value] * ndim
+    return normalized
+
+
+def _normalize_axis(axis, ndim):
+    if axis < -ndim or axis >= ndim:
+        raise ValueError("invalid axis")
+    return axis % ndim
+
+
+def correlate_halo(size, origin=0):
+    """Halo ``(before, after)`` of a correlation with a window of length
+    ``size`` placed according to ``origin`` (as in ``scipy.ndimage``)."""
+    if size < 1:
+        return (0, 0)
+    center = size // 2 + origin
+    return (max(center, 0), max(size - 1 - center, 0))
+
+
+def convolve_halo(size, origin=0):
+    """Halo ``(before, after)`` of a convolution with a window of length
+    ``size``.
+
+    A convolution is a correlation with the flipped window, whose origin is
+    mirrored (and shifted by one for even sizes).
+    """
+    origin = -origin
+    if size % 2 == 0:
+        origin -= 1
+    return correlate_halo(size, origin)
+
+
+def gaussian_radius(sigma, truncate=4.0):
+    """Radius of the 1D Gaussian kernel used by ``gaussian_filter1d``."""
+    sigma = float(sigma)
+    if sigma <= 1e-15:
+        # gaussian_filter skips axes with (near) zero sigma
+        return 0
+    return int(truncate * sigma + 0.5)
+
+
+def _window_halo(ndim, shape, origin, convolution=False):
+    origins = _normalize_sequence(origin, ndim)
+    if len(shape) != ndim:
+        raise RuntimeError("filter weights array has incorrect shape.")
+    halo_func = convolve_halo if convolution else correlate_halo
+    return [halo_func(int(s), int(o)) for s, o in zip(shape, origins)]
+
+
+def _axis_halo(ndim, size, axis, origin, convolution=False):
+    axis = _normalize_axis(axis, ndim)
+    halo = [(0, 0)] * ndim
+    halo_func = convolve_halo if convolution else correlate_halo
+    halo[axis] = halo_func(int(size), int(origin))
+    return halo
+
+
+def _footprint_shape(ndim, params):
+    footprint = params.get("footprint")
+    if footprint is not None:
+        return tuple(footprint)
+    size = params.get("size")
+    if size is None:
+        raise RuntimeError("no footprint provided")
+    return tuple(_normalize_sequence(size, ndim))
+
+
+def _halo_correlate(ndim, params):
+    return _window_halo(ndim, params["weights"], params.get("origin", 0))
+
+
+def _halo_convolve(ndim, params):
+    return _window_halo(
+        ndim, params["weights"], params.get("origin", 0), convolution=True
+    )
+
+
+def _halo_correlate1d(ndim, params):
+    (size,) = params["weights"]
+    return _axis_halo(
+        ndim, size, params.get("axis", -1), params.get("origin", 0)
+    )
+
+
+def _halo_convolve1d(ndim, params):
+    (size,) = params["weights"]
+    return _axis_halo(
+        ndim,
+        size,
+        params.get("axis", -1),
+        params.get("origin", 0),
+        convolution=True,
+    )
+
+
+def _halo_window_filter(ndim, params):
+    return _window_halo(
+        ndim, _footprint_shape(ndim, params), params.get("origin", 0)
+    )
+
+
+def _halo_window_filter1d(ndim, params):
+    return _axis_halo(
+        ndim, params["size"], params.get("axis", -1), params.get("origin", 0)
+    )
+
+
+def _halo_gaussian(ndim, params):
+    truncate = params.get("truncate", 4.0)
+    sigmas = _normalize_sequence(params["sigma"], ndim)
+    return [(gaussian_radius(s, truncate),) * 2 for s in sigmas]
+
+
+def _halo_gaussian1d(ndim, params):
+    axis = _normalize_axis(params.get("axis", -1), ndim)
+    halo = [(0, 0)] * ndim
+    halo[axis] = (
+        gaussian_radius(params["sigma"], params.get("truncate", 4.0)),
+    ) * 2
+    return halo
+
+
+def _halo_3x3(ndim, params):
+    return [(1, 1)] * ndim
+
+
+_halo_funcs = {
+    "correlate": _halo_correlate,
+    "convolve": _halo_convolve,
+    "correlate1d": _halo_correlate1d,
+    "convolve1d": _halo_convolve1d,
+    "uniform_filter": _halo_window_filter,
+    "minimum_filter": _halo_window_filter,
+    "maximum_filter": _halo_window_filter,
+    "median_filter": _halo_window_filter,
+    "rank_filter": _halo_window_filter,
+    "percentile_filter": _halo_window_filter,
+    "uniform_filter1d": _halo_window_filter1d,
+    "minimum_filter1d": _halo_window_filter1d,
+    "maximum_filter1d": _halo_window_filter1d,
+    "gaussian_filter": _halo_gaussian,
+    "gaussian_laplace": _halo_gaussian,
+    "gaussian_gradient_magnitude": _halo_gaussian,
+    "gaussian_filter1d": _halo_gaussian1d,
+    "prewitt": _halo_3x3,
+    "sobel": _halo_3x3,
+    "laplace": _halo_3x3,
+}
+
+
+def filter_halo(name, ndim, **params):
+    """Halo required by the ``scipy.ndimage`` filter called ``name``.
+
+    Parameters
+    ----------
+    name : str
+        Name of the filter function (e.g. ``"gaussian_filter"``).
+    ndim : int
+        Number of dimensions of the input.
+    **params
+        The filter's arguments, except that array arguments ``weights`` and
+        ``footprint`` are given by their shape.
+
+    Returns
+    -------
+    halo : list of tuple
+        ``(before, after)`` halo for each axis.
+    """
+    try:
+        halo_func = _halo_funcs[name]
+    except KeyError:
+        raise ValueError(
+            "halo of filter {!r} cannot be inferred; pass it "
+            "explicitly".format(name)
+        )
+    return halo_func(ndim, params)
+
+
+def normalize_halo(halo, ndim):
+    """Convert an int, a sequence of ints or a sequence of ``(before, after)``
+    pairs into a list of ``(before, after)`` pairs."""
+    halo = _normalize_sequence(halo, ndim)
+    normalized = []
+    for h in halo:
+        if hasattr(h, "__iter__"):
+            before, after = h
+        else:
+            before = after = h
+        if before < 0 or after < 0:
+            raise ValueError("halo must be non-negative")
+        normalized.append((int(before), int(after)))
+    return normalized
+
+
+def _prod(values):
+    p = 1
+    for v in values:
+        p *= v
+    return p
+
+
+def choose_block_shape(shape, halo, itemsize, max_bytes):
+    """Choose a block shape whose input slab fits in ``max_bytes``.
+
+    Blocks are split along the leading axes first so that slabs of a
+    C-contiguous array are read from as few contiguous runs as possible.
+    Along each axis the block is kept at least as large as the halo so that
+    no more than half of each slab is overlap.
+    """
+    ndim = len(shape)
+    halo = normalize_halo(halo, ndim)
+    block = list(shape)
+
+    def slab_length(axis):
+        h0, h1 = halo[axis]
+        return min(block[axis] + h0 + h1, shape[axis])
+
+    for axis in range(ndim):
+        if itemsize * _prod(map(slab_length, range(ndim))) <= max_bytes:
+            break
+        h0, h1 = halo[axis]
+        other = _prod(slab_length(ax) for ax in range(ndim) if ax != axis)
+        # largest block along axis such that the slab fits
+        n = max_bytes // (itemsize * max(other, 1)) - h0 - h1
+        n = min(max(n, h0 + h1, 1), shape[axis])
+        # balance the block sizes along this axis
+        nblocks = -(-shape[axis] // n)
+        block[axis] = -(-shape[axis] // nblocks)
+    return tuple(block)
+
+
+def _axis_segments(start, stop, before, after, n, wrap):
+    """Segments of input indices making up the slab for block [start, stop).
+
+    Returns the segments, the slab length and the offset of the block within
+    the slab.
+    """
+    if start == 0 and stop == n:
+        # the whole axis is in the slab: the filter handles the boundaries
+        return [Segment(0, n, 0)], n, 0
+    if not wrap:
+        src_start = start - before
+        src_stop = stop + after
+        # Where the halo extends past an edge, the slab must also contain
+        # the values the boundary mode reflects into the halo.
+        if src_start < 0:
+            src_stop = max(src_stop, before + 1)
+        if src_stop > n:
+            src_start = min(src_start, n - after - 1)
+        src_start = max(src_start, 0)
+        src_stop = min(src_stop, n)
+        return (
+            [Segment(src_start, src_stop, 0)],
+            src_stop - src_start,
+            start - src_start,
+        )
+    segments = []
+    pos = start - before
+    end = stop + after
+    while pos < end:
+        wrapped = pos % n
+        run = min(end - pos, n - wrapped)
+        segments.append(Segment(wrapped, wrapped + run, pos - start + before))
+        pos += run
+    return segments, end - (start - before), before
+
+
+def plan_tiles(shape, halo, block_shape, mode="reflect"):
+    """List the tiles covering an array of ``shape``.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the input (and output) array.
+    halo : int or sequence
+        Halo size(s), see ``normalize_halo``.
+    block_shape : tuple of int
+        Shape of the output blocks. Blocks at the end of each axis may be
+        smaller.
+    mode : str or sequence of str
+        Boundary mode(s) of the filter. Only the wrapping modes affect the
+        plan.
+
+    Returns
+    -------
+    tiles : list of Tile
+        Tiles in C order of their block positions.
+    """
+    ndim = len(shape)
+    halo = normalize_halo(halo, ndim)
+    modes = _normalize_sequence(mode, ndim)
+    if len(block_shape) != ndim:
+        raise ValueError("block_shape must have one entry per axis")
+    if any(b < 1 for b in block_shape):
+        raise ValueError("block_shape entries must be positive")
+
+    per_axis = []
+    for n, b, (h0, h1), m in zip(shape, block_shape, halo, modes):
+        entries = []
+        for start in range(0, n, b):
+            stop = min(start + b, n)
+            segments, length, offset = _axis_segments(
+                start, stop, h0, h1, n, m in _WRAP_MODES
+            )
+            entries.append(
+                (
+                    slice(start, stop),
+                    segments,
+                    length,
+                    slice(offset, offset + stop - start),
+                )
+            )
+        per_axis.append(entries)
+
+    tiles = []
+    for combo in itertools.product(*per_axis):
+        out_sl, segments, lengths, interior = zip(*combo)
+        tiles.append(
+            Tile(
+                output_slices=tuple(out_sl),
+                input_segments=tuple(segments),
+                input_shape=tuple(lengths),
+                interior_slices=tuple(interior),
+            )
+        )
+    return tiles
+
+
+def gather(source, tile, out):
+    """Copy the input slab of ``tile`` from ``source`` into ``out``.
+
+    ``source`` and ``out`` may be any arrays supporting slice indexing and
+    assignment (e.g. a NumPy array or memory map and a pinned host buffer).
+    """
+    for combo in itertools.product(*tile.input_segments):
+        src = tuple(slice(s.src_start, s.src_stop) for s in combo)
+        dst = tuple(
+            slice(s.dst_start, s.dst_start + s.src_stop - s.src_start)
+            for s in combo
+        )
+        out[dst] = source[src]
+    return out
@@ -1,3 +1,5 @@
+import operator
+
 import cupy
 
 
@@ -151,6 +153,68 @@ def _normalize_sequence(arr, rank):
     return normalized
 
 
+def _check_batch_axes(batch_axes, ndim):
+    """Normalize ``batch_axes`` to a sorted tuple of non-negative axes."""
+    if batch_axes is None:
+        return ()
+    if not hasattr(batch_axes, "__iter__"):
+        batch_axes = (batch_axes,)
+    axes = []
+    for axis in batch_axes:
+        axis = operator.index(axis)
+        if axis < -ndim or axis >= ndim:
+            raise ValueError("invalid axis in batch_axes")
+        axes.append(axis % ndim)
+    if len(set(axes)) != len(axes):
+        raise ValueError("repeated axis in batch_axes")
+    if len(axes) == ndim:
+        raise ValueError("batch_axes must leave at least one axis to filter")
+    return tuple(sorted(axes))
+
+
+def _expand_batch_sequence(arr, rank, batch_axes, fill):
+    """Expand a per-axis argument given for the non-batch axes to all axes.
+
+    The value ``fill`` (e.g. a size of 1 or a sigma of 0) is used for the
+    batch axes so that no filtering is done along them.
+    """
+    if not batch_axes:
+        return arr
+    values = iter(_normalize_sequence(arr, rank - len(batch_axes)))
+    return [fill if ax in batch_axes else next(values) for ax in range(rank)]
+
+
+def _expand_batch_array(arr, rank, batch_axes):
+    """Insert singleton batch axes into a weights or footprint array."""
+    if arr is None or not batch_axes:
+        return arr
+    if arr.ndim != rank - len(batch_axes):
+        raise RuntimeError("filter weights array has incorrect shape.")
+    shape = list(arr.shape)
+    for ax in batch_axes:
+        shape.insert(ax, 1)
+    return arr.reshape(shape)
+
+
+def _batch_footprint_args(rank, batch_axes, size, footprint, origin, mode):
+    """Expand the size, footprint, origin and mode of a footprint filter."""
+    batch_axes = _check_batch_axes(batch_axes, rank)
+    if not batch_axes:
+        return size, footprint, origin, mode
+    if footprint is not None:
+        footprint = _expand_batch_array(
+            cupy.asarray(footprint), rank, batch_axes
+        )
+    elif size is not None:
+        size = _expand_batch_sequence(size, rank, batch_axes, 1)
+    origin = _expand_batch_sequence(origin, rank, batch_axes, 0)
+    if not isinstance(mode, str):
+        # only separable filters accept one mode per axis; a single mode is
+        # kept as is for the n-dimensional kernels
+        mode = _expand_batch_sequence(mode, rank, batch_axes, "reflect")
+    return size, footprint, origin, mode
+
+
 def _get_ndimage_mode_kwargs(mode, cval=0):
     if mode == "reflect":
         mode_kwargs = dict(mode="symmetric")
@@ -27,6 +27,10 @@ from ._kernels.filters_v2 import (
 )
 from cupyimg import _misc, memoize
 from cupyimg.scipy.ndimage import _filters_core
+from cupyimg.scipy.ndimage import _filters_rank_hist
+from cupyimg.scipy.ndimage import _filters_separable
+from cupyimg.scipy.ndimage import _filters_uniform
+from cupyimg.scipy.ndimage import _filters_vhgw
 from cupyimg.scipy.ndimage import _filters_optimal_medians
 
 median_preambles = _filters_optimal_medians._opt_med_preambles
@@ -57,6 +61,8 @@ __all__ = [
     "rank_filter",
     "median_filter",
     "percentile_filter",
+    # cupyimg-specific
+    "choose_filter_method",
 ]
 
 # TODO: grlee77: 'generic_filter1d', 'generic_filter'
@@ -72,6 +78,9 @@ def correlate(
     *,
     use_weights_mask=False,
     dtype_mode="ndimage",
+    batch_axes=None,
+    method="direct",
+    separable_rtol=None,
 ):
     """Multi-dimensional correlate.
 
@@ -97,6 +106,22 @@ def correlate(
             beneficial when there are relatively few non-zero coefficients in
             ``weights``, but does involve some overhead in the fully dense
             case.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``weights``
+            then refer to the remaining axes only.
+        method (str, optional): ``'direct'`` (default) always uses the dense
+            n-dimensional kernel. ``'separable'`` factorizes ``weights``
+            (truncated higher-order SVD) and applies sums of 1D passes.
+            ``'auto'`` picks the separable path when ``weights`` is low-rank
+            and this saves enough work. Deciding this requires copying
+            ``weights`` to the host, so ``'auto'`` is best suited to large
+            kernels. Use :func:`choose_filter_method` to find out which path
+            is taken.
+        separable_rtol (float, optional): Relative (Frobenius norm) error
+            allowed when factorizing ``weights``. The default only discards
+            components at the level of the floating point precision.
 
     Returns:
         cupy.ndarray: The result of correlate.
@@ -116,6 +141,9 @@ def correlate(
         convention used by ``numpy.correlate`` and ``scipy.signal.correlate``.
 
     """
+    batch_axes = _util._check_batch_axes(batch_axes, input.ndim)
+    weights = _util._expand_batch_array(weights, input.ndim, batch_axes)
+    origin = _util._expand_batch_sequence(origin, input.ndim, batch_axes, 0)
     if use_weights_mask:
         return _correlate_or_convolve_legacy(
             input,
@@ -130,7 +158,15 @@ def correlate(
         )
     else:
         return _correlate_or_convolve(
-            input, weights, output, mode, cval, origin, dtype_mode=dtype_mode
+            input,
+            weights,
+            output,
+            mode,
+            cval,
+            origin,
+            dtype_mode=dtype_mode,
+            method=method,
+            separable_rtol=separable_rtol,
         )
 
 
@@ -144,6 +180,9 @@ def convolve(
     *,
     use_weights_mask=False,
     dtype_mode="ndimage",
+    batch_axes=None,
+    method="direct",
+    separable_rtol=None,
 ):
     """Multi-dimensional convolution.
 
@@ -169,6 +208,22 @@ def convolve(
             beneficial when there are relatively few non-zero coefficients in
             ``weights``, but does involve some overhead in the fully dense
             case.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``weights``
+            then refer to the remaining axes only.
+        method (str, optional): ``'direct'`` (default) always uses the dense
+            n-dimensional kernel. ``'separable'`` factorizes ``weights``
+            (truncated higher-order SVD) and applies sums of 1D passes.
+            ``'auto'`` picks the separable path when ``weights`` is low-rank
+            and this saves enough work. Deciding this requires copying
+            ``weights`` to the host, so ``'auto'`` is best suited to large
+            kernels. Use :func:`choose_filter_method` to find out which path
+            is taken.
+        separable_rtol (float, optional): Relative (Frobenius norm) error
+            allowed when factorizing ``weights``. The default only discards
+            components at the level of the floating point precision.
 
     Returns:
         cupy.ndarray: The result of convolution.
@@ -185,6 +240,9 @@ def convolve(
 
     .. seealso:: :func:`scipy.ndimage.convolve`
     """
+    batch_axes = _util._check_batch_axes(batch_axes, input.ndim)
+    weights = _util._expand_batch_array(weights, input.ndim, batch_axes)
+    origin = _util._expand_batch_sequence(origin, input.ndim, batch_axes, 0)
     if use_weights_mask:
         return _correlate_or_convolve_legacy(
             input,
@@ -207,9 +265,48 @@ def convolve(
             origin,
             True,
             dtype_mode=dtype_mode,
+            method=method,
+            separable_rtol=separable_rtol,
         )
 
 
+def choose_filter_method(
+    weights,
+    mode="reflect",
+    cval=0.0,
+    *,
+    dtype_mode="ndimage",
+    separable_rtol=None,
+):
+    """Find the path ``method='auto'`` takes in :func:`correlate`/`convolve`.
+
+    Args:
+        weights (cupy.ndarray): Array of weights.
+        mode (str): The boundary mode that will be used.
+        cval (scalar): The constant value for ``mode='constant'``.
+        dtype_mode (str): The ``dtype_mode`` that will be used.
+        separable_rtol (float, optional): The tolerance that will be used
+            when factorizing ``weights``.
+
+    Returns:
+        str: ``'direct'`` for the dense n-dimensional kernel or
+        ``'separable'`` for sums of 1D passes.
+
+    .. note::
+        The separable path is chosen when ``weights`` has (numerically) low
+        multilinear rank along at least two axes, the kernel is large enough
+        for the saved arithmetic to pay for the additional passes and the
+        boundary mode allows it. With ``mode='constant'`` only ``cval == 0``
+        can be applied separably. Complex-valued weights always use the
+        direct kernel.
+    """
+    _util._check_mode(mode)
+    method, _ = _filters_separable._choose_method(
+        weights, mode, cval, dtype_mode, separable_rtol
+    )
+    return method
+
+
 def correlate1d(
     input,
     weights,
@@ -432,6 +529,7 @@ def convolve1d(
                 input,
                 weights,
                 mode=mode,
+                cval=cval,
                 output=output,
                 origin=origin,
                 dtype_mode=dtype_mode,
@@ -447,7 +545,11 @@ def _correlate_or_convolve(
     origin,
     convolution=False,
     dtype_mode="ndimage",
+    method="direct",
+    separable_rtol=None,
 ):
+    if method not in ("auto", "direct", "separable"):
+        raise ValueError("method must be 'auto', 'direct' or 'separable'")
     origins, int_type = _filters_core._check_nd_args(
         input, weights, mode, origin
     )
@@ -467,6 +569,35 @@ def _correlate_or_convolve(
     elif weights.dtype.kind == "c":
         # numpy.correlate conjugates weights rather than input.
         weights = weights.conj()
+    if method == "auto":
+        method, fact = _filters_separable._choose_method(
+            weights, mode, cval, dtype_mode, separable_rtol
+        )
+    elif method == "separable":
+        if dtype_mode == "numpy" or (
+            mode in ("constant", "grid-constant") and cval != 0
+        ):
+            raise ValueError(
+                "method='separable' requires cval=0 for mode='constant' and "
+                "is not supported for dtype_mode='numpy'"
+            )
+        fact = _filters_separable._factorize(weights, separable_rtol)
+        if fact is None:
+            raise ValueError(
+                "method='separable' requires real-valued weights with at "
+                "least two axes of length > 1"
+            )
+    if method == "separable":
+        return _filters_separable._correlate_separable(
+            input,
+            fact,
+            output,
+            mode,
+            cval,
+            origins,
+            _util._get_weights_dtype(input, weights, dtype_mode),
+            dtype_mode,
+        )
     if dtype_mode == "numpy":
         # This "numpy" mode is used by cupyimg.scipy.signal.signaltools
         # numpy.convolve and correlate do not always cast to floats
@@ -556,6 +687,7 @@ def uniform_filter1d(
     origin=0,
     *,
     dtype_mode="ndimage",
+    compensated=False,
 ):
     """One-dimensional uniform filter along the given axis.
 
@@ -576,6 +708,10 @@ def uniform_filter1d(
         origin (int): The origin parameter controls the placement of the
             filter, relative to the center of the current element of the
             input. Default is ``0``.
+        compensated (bool, optional): Use compensated (Kahan-Babuska)
+            summation in the running sum. Mainly useful with
+            ``dtype_mode='float'``, where the sums are accumulated in single
+            precision for single precision inputs.
 
     Returns:
         cupy.ndarray: The result of the filtering.
@@ -586,6 +722,9 @@ def uniform_filter1d(
         When the output data type is integral (or when no output is provided
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
+
+        For real-valued inputs a running sum is used, so the cost does not
+        depend on ``size``.
     """
     dtype_weights = numpy.promote_types(input.real.dtype, numpy.float32)
     if size < 1:
@@ -593,6 +732,18 @@ def uniform_filter1d(
     output = _util._get_output(output, input)
     if (size // 2 + origin < 0) or (size // 2 + origin >= size):
         raise ValueError("invalid origin")
+    if input.dtype.kind != "c" and output.dtype.kind != "c":
+        return _filters_uniform._box_filter1d(
+            input,
+            size,
+            axis,
+            output,
+            mode,
+            cval,
+            origin,
+            dtype_mode=dtype_mode,
+            compensated=compensated,
+        )
     weights = cupy.full((size,), 1 / size, dtype=dtype_weights)
     return correlate1d(
         input, weights, axis, output, mode, cval, origin, dtype_mode=dtype_mode
@@ -608,6 +759,8 @@ def uniform_filter(
     origin=0,
     *,
     dtype_mode="ndimage",
+    batch_axes=None,
+    compensated=False,
 ):
     """Multi-dimensional uniform filter.
 
@@ -626,6 +779,13 @@ def uniform_filter(
             placement of the filter, relative to the center of the current
             element of the input. Default of ``0`` is equivalent to
             ``(0,)*input.ndim``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments then refer to
+            the remaining axes only.
+        compensated (bool, optional): Use compensated summation (see
+            :func:`uniform_filter1d`).
 
     Returns:
         cupy.ndarray: The result of the filtering.
@@ -637,6 +797,10 @@ def uniform_filter(
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
     """
+    batch_axes = _util._check_batch_axes(batch_axes, input.ndim)
+    size = _util._expand_batch_sequence(size, input.ndim, batch_axes, 1)
+    origin = _util._expand_batch_sequence(origin, input.ndim, batch_axes, 0)
+    mode = _util._expand_batch_sequence(mode, input.ndim, batch_axes, "reflect")
     output = _util._get_output(output, input)
     sizes = _util._normalize_sequence(size, input.ndim)
     origins = _util._normalize_sequence(origin, input.ndim)
@@ -658,6 +822,7 @@ def uniform_filter(
                 cval,
                 origin,
                 dtype_mode=dtype_mode,
+                compensated=compensated,
             )
             input = output
     else:
@@ -732,6 +897,7 @@ def gaussian_filter(
     truncate=4.0,
     *,
     dtype_mode="ndimage",
+    batch_axes=None,
 ):
     """Multi-dimensional Gaussian filter.
 
@@ -752,6 +918,11 @@ def gaussian_filter(
             ``'constant'``. Default is ``0.0``.
         truncate (float): Truncate the filter at this many standard deviations.
             Default is ``4.0``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments then refer to
+            the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
@@ -763,6 +934,10 @@ def gaussian_filter(
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
     """
+    batch_axes = _util._check_batch_axes(batch_axes, input.ndim)
+    sigma = _util._expand_batch_sequence(sigma, input.ndim, batch_axes, 0)
+    order = _util._expand_batch_sequence(order, input.ndim, batch_axes, 0)
+    mode = _util._expand_batch_sequence(mode, input.ndim, batch_axes, "reflect")
     output = _util._get_output(output, input)
     orders = _util._normalize_sequence(order, input.ndim)
     sigmas = _util._normalize_sequence(sigma, input.ndim)
@@ -833,6 +1008,7 @@ def prewitt(
     cval=0.0,
     *,
     dtype_mode="ndimage",
+    batch_axes=None,
 ):
     """Compute a Prewitt filter along the given axis.
 
@@ -846,6 +1022,11 @@ def prewitt(
             ``'wrap'``). Default is ``'reflect'``.
         cval (scalar): Value to fill past edges of input if mode is
             ``'constant'``. Default is ``0.0``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments then refer to
+            the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
@@ -857,6 +1038,8 @@ def prewitt(
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
     """
+    batch_axes = _util._check_batch_axes(batch_axes, input.ndim)
+    mode = _util._expand_batch_sequence(mode, input.ndim, batch_axes, "reflect")
     dtype_weights = numpy.promote_types(input.real.dtype, numpy.float32)
     axis = _misc._normalize_axis_index(axis, input.ndim)
     output = _util._get_output(output, input, None, dtype_weights)
@@ -871,11 +1054,14 @@ def prewitt(
     if axis < -ndim or axis >= ndim:
         raise ValueError("invalid axis")
     axis = axis % ndim
-
+    if axis in batch_axes:
+        raise ValueError("axis must not be one of batch_axes")
     correlate1d(
         input, filt1, axis, output, modes[axis], cval, 0, dtype_mode=dtype_mode
     )
-    axes = [ii for ii in range(input.ndim) if ii != axis]
+    axes = [
+        ii for ii in range(input.ndim) if ii != axis and ii not in batch_axes
+    ]
     for ii in axes:
         correlate1d(
             output, filt2, ii, output, modes[ii], cval, 0, dtype_mode=dtype_mode
@@ -894,6 +1080,7 @@ def sobel(
     cval=0.0,
     *,
     dtype_mode="ndimage",
+    batch_axes=None,
 ):
     """Compute a Sobel filter along the given axis.
 
@@ -907,6 +1094,11 @@ def sobel(
             ``'wrap'``). Default is ``'reflect'``.
         cval (scalar): Value to fill past edges of input if mode is
             ``'constant'``. Default is ``0.0``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments then refer to
+            the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
@@ -918,6 +1110,8 @@ def sobel(
         and input is integral) the results may not perfectly match the results
         from SciPy due to floating-point rounding of intermediate results.
     """
+    batch_axes = _util._check_batch_axes(batch_axes, input.ndim)
+    mode = _util._expand_batch_sequence(mode, input.ndim, batch_axes, "reflect")
     dtype_weights = numpy.promote_types(input.real.dtype, numpy.float32)
     output = _util._get_output(output, input, None, dtype_weights)
     modes = _util._normalize_sequence(mode, input.ndim)
@@ -930,10 +1124,14 @@ def sobel(
     if axis < -ndim or axis >= ndim:
         raise ValueError("invalid axis")
     axis = axis % ndim
+    if axis in batch_axes:
+        raise ValueError("axis must not be one of batch_axes")
     correlate1d(
         input, filt1, axis, output, modes[axis], cval, 0, dtype_mode=dtype_mode
     )
-    axes = [ii for ii in range(input.ndim) if ii != axis]
+    axes = [
+        ii for ii in range(input.ndim) if ii != axis and ii not in batch_axes
+    ]
     for ii in axes:
         correlate1d(
             output, filt2, ii, output, modes[ii], cval, 0, dtype_mode=dtype_mode
@@ -1296,6 +1494,8 @@ def minimum_filter(
     mode="reflect",
     cval=0.0,
     origin=0,
+    *,
+    batch_axes=None,
 ):
     """Multi-dimensional minimum filter.
 
@@ -1318,12 +1518,20 @@ def minimum_filter(
             placement of the filter, relative to the center of the current
             element of the input. Default of 0 is equivalent to
             ``(0,)*input.ndim``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``footprint``
+            then refer to the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
 
     .. seealso:: :func:`scipy.ndimage.minimum_filter`
     """
+    size, footprint, origin, mode = _util._batch_footprint_args(
+        input.ndim, batch_axes, size, footprint, origin, mode
+    )
     return _min_or_max_filter(
         input, size, footprint, None, output, mode, cval, origin, "min"
     )
@@ -1337,6 +1545,8 @@ def maximum_filter(
     mode="reflect",
     cval=0.0,
     origin=0,
+    *,
+    batch_axes=None,
 ):
     """Multi-dimensional maximum filter.
 
@@ -1359,12 +1569,20 @@ def maximum_filter(
             placement of the filter, relative to the center of the current
             element of the input. Default of 0 is equivalent to
             ``(0,)*input.ndim``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``footprint``
+            then refer to the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
 
     .. seealso:: :func:`scipy.ndimage.maximum_filter`
     """
+    size, footprint, origin, mode = _util._batch_footprint_args(
+        input.ndim, batch_axes, size, footprint, origin, mode
+    )
     return _min_or_max_filter(
         input, size, footprint, None, output, mode, cval, origin, "max"
     )
@@ -1382,6 +1600,11 @@ def _min_or_max_filter(
     if cval is cupy.nan:
         raise NotImplementedError("NaN cval is unsupported")
 
+    if sizes is None and (structure is None or not structure.any()):
+        # a flat footprint that is a full box (possibly padded by zeros, e.g.
+        # an even-sized rectangle shifted by skimage) is separable
+        sizes, origin = _box_footprint(ftprnt, origin, input.ndim)
+
     if sizes is not None:
         # Seperable filter, run as a series of 1D filters
         fltr = minimum_filter1d if func == "min" else maximum_filter1d
@@ -1419,6 +1642,34 @@ def _min_or_max_filter(
     )
 
 
+def _box_footprint(footprint, origin, ndim):
+    """Return (sizes, origins) if the nonzero footprint is a full box.
+
+    Returns ``(None, origin)`` otherwise, or when the box would need an
+    origin outside of its extent.
+    """
+    if footprint.ndim != ndim:
+        return None, origin
+    nonzero = numpy.nonzero(cupy.asnumpy(footprint))
+    if len(nonzero[0]) == 0:
+        # empty footprints are handled by the n-dimensional code path
+        return None, origin
+    starts = [int(ax.min()) for ax in nonzero]
+    stops = [int(ax.max()) + 1 for ax in nonzero]
+    sizes = [b - a for a, b in zip(starts, stops)]
+    if _misc._prod(sizes) != len(nonzero[0]):
+        return None, origin
+    origins = _util._fix_sequence_arg(origin, ndim, "origin", int)
+    new_origins = []
+    for n, a, m, o in zip(footprint.shape, starts, sizes, origins):
+        # offset of the center in the cropped box
+        left = n // 2 + o - a
+        if not 0 <= left < m:
+            return None, origin
+        new_origins.append(left - m // 2)
+    return sizes, new_origins
+
+
 def minimum_filter1d(
     input, size, axis=-1, output=None, mode="reflect", cval=0.0, origin=0
 ):
@@ -1492,6 +1743,18 @@ def _min_or_max_1d(
     origins, int_type = _filters_core._check_nd_args(
         input, ftprnt, mode, origin, "footprint"
     )
+    if size >= _filters_vhgw._MIN_SIZE:
+        # van Herk/Gil-Werman: cost independent of size
+        return _filters_vhgw._min_or_max_1d_vhgw(
+            input,
+            size,
+            axis,
+            output,
+            mode,
+            cval,
+            size // 2 + origins[axis % input.ndim],
+            func,
+        )
     offsets = _filters_core._origins_to_offsets(origins, ftprnt.shape)
     kernel = _get_min_or_max_kernel(
         mode,
@@ -1566,6 +1829,8 @@ def rank_filter(
     mode="reflect",
     cval=0.0,
     origin=0,
+    *,
+    batch_axes=None,
 ):
     """Multi-dimensional rank filter.
 
@@ -1590,12 +1855,20 @@ def rank_filter(
             placement of the filter, relative to the center of the current
             element of the input. Default of 0 is equivalent to
             ``(0,)*input.ndim``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``footprint``
+            then refer to the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
 
     .. seealso:: :func:`scipy.ndimage.rank_filter`
     """
+    size, footprint, origin, mode = _util._batch_footprint_args(
+        input.ndim, batch_axes, size, footprint, origin, mode
+    )
     rank = operator.index(rank)
     return _rank_filter(
         input,
@@ -1617,6 +1890,8 @@ def median_filter(
     mode="reflect",
     cval=0.0,
     origin=0,
+    *,
+    batch_axes=None,
 ):
     """Multi-dimensional median filter.
 
@@ -1639,12 +1914,20 @@ def median_filter(
             placement of the filter, relative to the center of the current
             element of the input. Default of 0 is equivalent to
             ``(0,)*input.ndim``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``footprint``
+            then refer to the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
 
     .. seealso:: :func:`scipy.ndimage.median_filter`
     """
+    size, footprint, origin, mode = _util._batch_footprint_args(
+        input.ndim, batch_axes, size, footprint, origin, mode
+    )
     return _rank_filter(
         input, lambda fs: fs // 2, size, footprint, output, mode, cval, origin
     )
@@ -1659,6 +1942,8 @@ def percentile_filter(
     mode="reflect",
     cval=0.0,
     origin=0,
+    *,
+    batch_axes=None,
 ):
     """Multi-dimensional percentile filter.
 
@@ -1683,12 +1968,20 @@ def percentile_filter(
             placement of the filter, relative to the center of the current
             element of the input. Default of 0 is equivalent to
             ``(0,)*input.ndim``.
+        batch_axes (int or sequence of int, optional): Axes of ``input``
+            holding independent images. No filtering is done along these
+            axes, so a stack of images is filtered with the same kernel
+            launches as a single image. Sequence arguments and ``footprint``
+            then refer to the remaining axes only.
 
     Returns:
         cupy.ndarray: The result of the filtering.
 
     .. seealso:: :func:`scipy.ndimage.percentile_filter`
     """
+    size, footprint, origin, mode = _util._batch_footprint_args(
+        input.ndim, batch_axes, size, footprint, origin, mode
+    )
     percentile = float(percentile)
     if percentile < 0.0:
         percentile += 100.0
@@ -1741,6 +2034,10 @@ def _rank_filter(
         return _min_or_max_filter(
             input, None, footprint, None, output, mode, cval, origins, "max"
         )
+    if _filters_rank_hist._use_histogram(input.dtype, filter_size, mode, cval):
+        return _filters_rank_hist._rank_filter_hist(
+            input, footprint, rank, output, mode, cval, origins
+        )
     offsets = _filters_core._origins_to_offsets(origins, footprint.shape)
     kernel = _get_rank_kernel(
         filter_size, rank, mode, footprint.shape, offsets, float(cval), int_type
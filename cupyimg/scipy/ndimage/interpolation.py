@@ -14,6 +14,7 @@ from ._interp_kernels import (
     _get_zoom_kernel,
     _get_zoom_shift_kernel,
     _get_affine_kernel,
+    _get_mapping_kernel,
 )
 
 
@@ -25,6 +26,7 @@ __all__ = [
     "shift",
     "zoom",
     "rotate",
+    "SplineCoefficients",
 ]
 
 
@@ -251,15 +253,20 @@ def spline_filter(
     return output
 
 
-def _prepad_for_spline_filter(input, mode, cval):
+def _prepad_for_spline_filter(input, mode, cval, axes=None):
     if mode in ["nearest", "grid-constant"]:
         npad = 12
+        pad_width = npad
+        if axes is not None:
+            pad_width = [(0, 0)] * input.ndim
+            for axis in axes:
+                pad_width[axis] = (npad, npad)
         if mode == "grid-constant":
             padded = cupy.pad(
-                input, npad, mode="constant", constant_values=cval
+                input, pad_width, mode="constant", constant_values=cval
             )
         elif mode == "nearest":
-            padded = cupy.pad(input, npad, mode="edge")
+            padded = cupy.pad(input, pad_width, mode="edge")
     else:
         # other modes have exact boundary conditions implemented so
         # no prepadding is needed
@@ -268,6 +275,171 @@ def _prepad_for_spline_filter(input, mode, cval):
     return padded, npad
 
 
+def _spline_coefficients(
+    input, order, mode, cval, prefilter, allow_float32, axes=None
+):
+    """C-contiguous interpolation coefficients of ``input`` and their padding.
+
+    Integer inputs are converted to float32. If ``prefilter`` and
+    ``order > 1``, the input is padded as needed by ``mode`` and spline
+    filtered along the interpolated ``axes`` (all axes if None). The cached
+    coefficients of a `SplineCoefficients` are returned as they are.
+    """
+    if axes is not None and len(axes) == input.ndim:
+        axes = None
+    if isinstance(input, SplineCoefficients):
+        if axes is not None:
+            raise ValueError(
+                "SplineCoefficients must be interpolated along all axes"
+            )
+        return input.coefficients, input.npad
+    if input.dtype.kind in "iu":
+        input = input.astype(cupy.float32)
+    if prefilter and order > 1:
+        padded, npad = _prepad_for_spline_filter(input, mode, cval, axes)
+        if axes is not None:
+            filtered = padded
+            for axis in axes:
+                filtered = spline_filter1d(
+                    filtered,
+                    order,
+                    axis,
+                    output=input.dtype,
+                    mode=mode,
+                    allow_float32=allow_float32,
+                )
+        else:
+            filtered = spline_filter(
+                padded,
+                order,
+                output=input.dtype,
+                mode=mode,
+                allow_float32=allow_float32,
+            )
+    else:
+        npad = 0
+        filtered = input
+    return cupy.ascontiguousarray(filtered), npad
+
+
+def _channels(input, channels_last):
+    """Number of channels along the last axis of ``input``, or 0."""
+    if not channels_last:
+        return 0
+    if input.ndim < 2:
+        raise ValueError("channels_last requires at least 2 dimensions")
+    return input.shape[-1]
+
+
+def _run_kernel(kern, filtered, params, output, nchannels):
+    """Launch an interpolation kernel, once per pixel if ``nchannels``."""
+    if not nchannels:
+        kern(filtered, params, output)
+        return
+    # the channels kernel writes to a raw C-contiguous output
+    y = output
+    if not output.flags.c_contiguous:
+        y = cupy.empty(output.shape, dtype=output.dtype)
+    kern(filtered, params, y, size=output.size // nchannels)
+    if y is not output:
+        output[...] = y
+
+
+def _interpolation_parameters(input, order, mode, cval):
+    """The order, mode and cval of a `SplineCoefficients` input."""
+    if isinstance(input, SplineCoefficients):
+        return input.order, input.mode, input.cval
+    return order, mode, cval
+
+
+class SplineCoefficients(object):
+    """Spline coefficients of an array, computed once for many interpolations.
+
+    For spline orders above 1, every call of the interpolation functions
+    pads and prefilters its whole input. When the same array is resampled
+    many times, e.g. with different transforms in a registration loop,
+    computing the coefficients once and passing them in place of the input
+    to :func:`map_coordinates`, :func:`affine_transform`, :func:`rotate`,
+    :func:`shift`, :func:`zoom` or ``cupyimg.skimage.transform.warp``
+    avoids repeating this work.
+
+    The interpolation functions then use the `order`, `mode` and `cval` of
+    the coefficients, and ignore their own ``order``, ``mode``, ``cval``
+    and ``prefilter`` arguments.
+
+    Args:
+        input (cupy.ndarray): The array to interpolate. Integer arrays are
+            converted to float32.
+        order (int): The order of the spline interpolation, in the range
+            0-5.
+        mode (str): The boundary mode of the interpolation, as for
+            :func:`map_coordinates`. The ``'opencv'`` mode is not supported.
+        cval (scalar): Value used for points outside the boundaries of the
+            input if ``mode='constant'``.
+        prefilter (bool): If False, `input` is assumed to be prefiltered
+            already and is used as the coefficients.
+        allow_float32 (bool): If True, single-precision inputs will use
+            single precision computation. If False, double precision is used.
+
+    Attributes:
+        coefficients (cupy.ndarray): The C-contiguous coefficients, padded by
+            `npad` elements on each side of each axis.
+        order (int): The order of the spline interpolation.
+        mode (str): The boundary mode.
+        cval (scalar): The value outside of the boundaries.
+        npad (int): The padding of the coefficients.
+        shape (tuple of ints): The shape of `input`.
+        dtype (cupy.dtype): The dtype of `input`, which is the default dtype
+            of the interpolation outputs.
+        input_range (tuple of cupy.ndarray): The minimum and maximum of
+            `input` as 0-dimensional arrays, used to clip interpolated
+            values.
+
+    Example:
+        >>> coefficients = SplineCoefficients(image, order=3, mode="mirror")
+        >>> for matrix in matrices:
+        ...     out = affine_transform(coefficients, matrix)
+    """
+
+    def __init__(
+        self,
+        input,
+        order=3,
+        mode="constant",
+        cval=0.0,
+        prefilter=True,
+        *,
+        allow_float32=True,
+    ):
+        if not isinstance(input, cupy.ndarray):
+            raise TypeError("input must be cupy.ndarray")
+        _check_parameter("SplineCoefficients", order, mode)
+        if mode in ("opencv", "_opencv_edge"):
+            raise ValueError("SplineCoefficients do not support mode opencv")
+        self.order = order
+        self.mode = mode
+        self.cval = cval
+        self.shape = input.shape
+        self.dtype = input.dtype
+        self.input_range = (input.min(), input.max())
+        self.coefficients, self.npad = _spline_coefficients(
+            input, order, mode, cval, prefilter, allow_float32
+        )
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return _misc._prod(self.shape)
+
+    def __repr__(self):
+        return "SplineCoefficients(shape={}, order={}, mode={!r})".format(
+            self.shape, self.order, self.mode
+        )
+
+
 def map_coordinates(
     input,
     coordinates,
@@ -278,6 +450,7 @@ def map_coordinates(
     prefilter=True,
     *,
     allow_float32=True,
+    channels_last=False,
 ):
     """Map the input array to new coordinates by interpolation.
 
@@ -290,7 +463,8 @@ def map_coordinates(
     the coordinates in the input array at which the output value is found.
 
     Args:
-        input (cupy.ndarray): The input array.
+        input (cupy.ndarray or SplineCoefficients): The input array, or its
+            precomputed spline coefficients.
         coordinates (array_like): The coordinates at which ``input`` is
             evaluated.
         output (cupy.ndarray or ~cupy.dtype): The array in which to place the
@@ -306,6 +480,11 @@ def map_coordinates(
             0.0
         prefilter (bool): It is not used yet. It just exists for compatibility
             with :mod:`scipy.ndimage`.
+        channels_last (bool): If True, the last axis of ``input`` holds
+            channels (e.g. RGB) that are interpolated with the same weights.
+            The coordinates then only refer to the other axes and the channel
+            axis is appended to the output. This option is not present in
+            SciPy.
 
     Returns:
         cupy.ndarray:
@@ -325,21 +504,20 @@ def map_coordinates(
     .. seealso:: :func:`scipy.ndimage.map_coordinates`
     """
 
+    order, mode, cval = _interpolation_parameters(input, order, mode, cval)
     _check_parameter("map_coordinates", order, mode)
+    nchannels = _channels(input, channels_last)
+    ndim = input.ndim - 1 if channels_last else input.ndim
 
     if mode == "opencv" or mode == "_opencv_edge":
-        input = cupy.pad(
-            input, [(1, 1)] * input.ndim, "constant", constant_values=cval
-        )
+        pad_width = [(1, 1)] * ndim + [(0, 0)] * (input.ndim - ndim)
+        input = cupy.pad(input, pad_width, "constant", constant_values=cval)
         coordinates = cupy.add(coordinates, 1)
         mode = "constant"
 
-    ret = _get_output(output, input, coordinates.shape[1:])
+    ret = _get_output(output, input, coordinates.shape[1:] + input.shape[ndim:])
     integer_output = ret.dtype.kind in "iu"
 
-    if input.dtype.kind in "iu":
-        input = input.astype(cupy.float32)
-
     if coordinates.dtype.kind in "iu":
         if order > 1:
             # order > 1 (spline) kernels require floating-point coordinates
@@ -361,22 +539,14 @@ def map_coordinates(
             coord_dtype = cupy.promote_types(coordinates.dtype, cupy.float64)
         coordinates = coordinates.astype(coord_dtype, copy=False)
 
-    if prefilter and order > 1:
-        padded, npad = _prepad_for_spline_filter(input, mode, cval)
-        filtered = spline_filter(
-            padded,
-            order,
-            output=input.dtype,
-            mode=mode,
-            allow_float32=allow_float32,
-        )
-    else:
-        npad = 0
-        filtered = input
+    axes = range(ndim)
+    filtered, npad = _spline_coefficients(
+        input, order, mode, cval, prefilter, allow_float32, axes
+    )
 
     large_int = max(_misc._prod(input.shape), coordinates.shape[0]) > 1 << 31
     kern = _get_map_kernel(
-        filtered.ndim,
+        ndim,
         large_int,
         yshape=coordinates.shape,
         mode=mode,
@@ -384,16 +554,128 @@ def map_coordinates(
         order=order,
         integer_output=integer_output,
         nprepad=npad,
+        nchannels=nchannels,
     )
     # kernel assumes C-contiguous arrays
-    if not filtered.flags.c_contiguous:
-        filtered = cupy.ascontiguousarray(filtered)
     if not coordinates.flags.c_contiguous:
         coordinates = cupy.ascontiguousarray(coordinates)
-    kern(filtered, coordinates, ret)
+    _run_kernel(kern, filtered, coordinates, ret, nchannels)
     return ret
 
 
+def _mapped_transform(
+    input,
+    mapping,
+    params,
+    output_shape,
+    output=None,
+    order=3,
+    mode="constant",
+    cval=0.0,
+    prefilter=True,
+    *,
+    allow_float32=True,
+    channels_last=False,
+    batched=False,
+):
+    """Interpolate at coordinates computed by a compiled coordinate mapping.
+
+    This gives the same result as calling :func:`map_coordinates` with the
+    coordinates produced by ``mapping``, but the coordinates are computed
+    within the interpolation kernel so that no coordinate array is allocated.
+
+    Args:
+        input (cupy.ndarray or SplineCoefficients): The 2D or 3D input
+            array, or its precomputed spline coefficients. A 3D input may
+            also be a 2D image with channels, or a stack of 2D images.
+        mapping (str): The coordinate mapping (``'projective'``,
+            ``'polynomial'``, ``'swirl'``, ``'linear_polar'`` or
+            ``'log_polar'``). See ``_interp_kernels._get_coord_mapping``.
+        params (array_like): The parameters of the mapping.
+        output_shape (tuple of ints): Shape of the output.
+        output (cupy.ndarray or ~cupy.dtype): The array in which to place the
+            output, or the dtype of the returned array.
+        order (int): The order of the spline interpolation.
+        mode (str): Points outside the boundaries of the input are filled
+            according to the given mode.
+        cval (scalar): Value used for points outside the boundaries of
+            the input if ``mode='constant'``.
+        prefilter (bool): Whether to prefilter the input for ``order > 1``.
+        channels_last (bool): If True, the last axis of ``input`` holds
+            channels that are interpolated with the same weights, and
+            ``output_shape`` does not include it.
+        batched (bool): If True, the first axis of ``input`` indexes a stack
+            of frames, transformed with the parameters ``params[t]`` in a
+            single kernel launch. ``output_shape`` then does not include it.
+
+    Returns:
+        cupy.ndarray: The interpolated array of shape ``output_shape``.
+    """
+    order, mode, cval = _interpolation_parameters(input, order, mode, cval)
+    _check_parameter("_mapped_transform", order, mode)
+    if mode == "opencv" or mode == "_opencv_edge":
+        raise ValueError(
+            "opencv modes are not supported by coordinate mappings"
+        )
+    nchannels = _channels(input, channels_last)
+    # axes of input: (frames,) + spatial axes + (channels,)
+    axis0 = 1 if batched else 0
+    ndim = input.ndim - axis0 - (1 if channels_last else 0)
+    output_shape = tuple(int(s) for s in output_shape)
+    if ndim not in (2, 3) or len(output_shape) != ndim:
+        raise ValueError(
+            "coordinate mappings require 2D or 3D input and output shapes"
+        )
+    if (nchannels or batched) and ndim != 2:
+        raise ValueError("channels and frames require 2D images")
+
+    params = cupy.asarray(params, dtype=numpy.float64)
+    if batched:
+        if params.ndim < 1 or params.shape[0] != input.shape[0]:
+            raise ValueError("params must have one entry per frame of input")
+        param_shape = params.shape[1:]
+    else:
+        param_shape = params.shape
+    degree = 1
+    if mapping == "polynomial":
+        if len(param_shape) != 2 or param_shape[0] != 2:
+            raise ValueError("polynomial parameters must have shape (2, n)")
+        degree = int(round((math.sqrt(8 * param_shape[1] + 1) - 3) / 2))
+        if (degree + 1) * (degree + 2) // 2 != param_shape[1]:
+            raise ValueError("invalid number of polynomial coefficients")
+    elif mapping == "projective" and _misc._prod(param_shape) != 9:
+        raise ValueError("projective mappings require a 3x3 matrix")
+    # kernel assumes C-contiguous arrays
+    params = cupy.ascontiguousarray(params.ravel())
+
+    output = _get_output(
+        output,
+        input,
+        shape=input.shape[:axis0] + output_shape + input.shape[axis0 + ndim :],
+    )
+    axes = range(axis0, axis0 + ndim)
+    filtered, npad = _spline_coefficients(
+        input, order, mode, cval, prefilter, allow_float32, axes
+    )
+    large_int = max(_misc._prod(input.shape), output.size) > 1 << 31
+    kern = _get_mapping_kernel(
+        ndim,
+        large_int,
+        output_shape,
+        mode,
+        cval=cval,
+        order=order,
+        integer_output=output.dtype.kind in "iu",
+        nprepad=npad,
+        mapping=mapping,
+        degree=degree,
+        nchannels=nchannels,
+        batched=batched,
+    )
+    _run_kernel(kern, filtered, params, output, nchannels)
+    return output
+
+
 def affine_transform(
     input,
     matrix,
@@ -406,6 +688,7 @@ def affine_transform(
     prefilter=True,
     *,
     allow_float32=True,
+    channels_last=False,
 ):
     """Apply an affine transformation.
 
@@ -414,7 +697,8 @@ def affine_transform(
     ``cupy.dot(matrix, o) + offset``.
 
     Args:
-        input (cupy.ndarray): The input array.
+        input (cupy.ndarray or SplineCoefficients): The input array, or its
+            precomputed spline coefficients.
         matrix (cupy.ndarray): The inverse coordinate transformation matrix,
             mapping output coordinates to input coordinates. If ``ndim`` is the
             number of dimensions of ``input``, the given matrix must have one
@@ -430,6 +714,14 @@ def affine_transform(
                 - ``(ndim, ndim + 1)``: as above, but the bottom row of a
                   homogeneous transformation matrix is always
                   ``[0, 0, ..., 1]``, and may be omitted.
+                - ``(T, ndim + 1, ndim + 1)`` or ``(T, ndim, ndim + 1)``:
+                  one homogeneous matrix per frame of a stack of ``T``
+                  frames. The first axis of ``input`` and of the output
+                  then indexes the frames, which are all transformed in a
+                  single kernel launch, and ``ndim`` and ``output_shape``
+                  refer to a single frame. A ``(T, ndim, ndim)`` array of
+                  linear transformations is combined with ``offset``, of
+                  shape ``(ndim,)`` or ``(T, ndim)``.
 
         offset (float or sequence): The offset into the array where the
             transform is applied. If a float, ``offset`` is the same for each
@@ -449,6 +741,11 @@ def affine_transform(
             0.0
         prefilter (bool): It is not used yet. It just exists for compatibility
             with :mod:`scipy.ndimage`.
+        channels_last (bool): If True, the last axis of ``input`` holds
+            channels (e.g. RGB) that are interpolated with the same weights.
+            ``matrix``, ``offset`` and ``output_shape`` then only refer to the
+            other axes and the channel axis is appended to the output. This
+            option is not present in SciPy.
 
     Returns:
         cupy.ndarray or None:
@@ -468,67 +765,71 @@ def affine_transform(
     .. seealso:: :func:`scipy.ndimage.affine_transform`
     """
 
+    order, mode, cval = _interpolation_parameters(input, order, mode, cval)
     _check_parameter("affine_transform", order, mode)
-
-    if not hasattr(offset, "__iter__") and type(offset) is not cupy.ndarray:
-        offset = [offset] * input.ndim
+    nchannels = _channels(input, channels_last)
 
     matrix = cupy.asarray(matrix, order="C", dtype=float)
-    if matrix.ndim not in [1, 2]:
+    if matrix.ndim not in [1, 2, 3]:
         raise RuntimeError("no proper affine matrix provided")
-    if matrix.ndim == 2:
-        if matrix.shape[0] == matrix.shape[1] - 1:
-            offset = matrix[:, -1]
-            matrix = matrix[:, :-1]
-        elif matrix.shape[0] == input.ndim + 1:
-            offset = matrix[:-1, -1]
-            matrix = matrix[:-1, :-1]
+    batched = matrix.ndim == 3
+    # axes of input: (frames,) + spatial axes + (channels,)
+    axis0 = 1 if batched else 0
+    ndim = input.ndim - axis0 - (1 if channels_last else 0)
+    if batched and (ndim < 1 or matrix.shape[0] != input.shape[0]):
+        raise ValueError("matrix must have one entry per frame of input")
+
+    if not hasattr(offset, "__iter__") and type(offset) is not cupy.ndarray:
+        offset = [offset] * ndim
+
+    if matrix.ndim >= 2:
+        if matrix.shape[-2] == matrix.shape[-1] - 1:
+            offset = matrix[..., -1]
+            matrix = matrix[..., :-1]
+        elif matrix.shape[-2] == ndim + 1:
+            offset = matrix[..., :-1, -1]
+            matrix = matrix[..., :-1, :-1]
+    if batched and matrix.shape[1:] != (ndim, ndim):
+        raise ValueError("matrix must have shape (T, ndim + 1, ndim + 1)")
 
     if mode == "opencv":
-        m = cupy.zeros((input.ndim + 1, input.ndim + 1), dtype=float)
-        m[:-1, :-1] = matrix
-        m[:-1, -1] = offset
-        m[-1, -1] = 1
+        m = cupy.zeros(matrix.shape[:-2] + (ndim + 1, ndim + 1), dtype=float)
+        m[..., :-1, :-1] = matrix
+        m[..., :-1, -1] = cupy.asarray(offset, dtype=float)
+        m[..., -1, -1] = 1
         m = cupy.linalg.inv(m)
-        m[:2] = cupy.roll(m[:2], 1, axis=0)
-        m[:2, :2] = cupy.roll(m[:2, :2], 1, axis=1)
-        matrix = m[:-1, :-1]
-        offset = m[:-1, -1]
+        m[..., :2, :] = cupy.roll(m[..., :2, :], 1, axis=-2)
+        m[..., :2, :2] = cupy.roll(m[..., :2, :2], 1, axis=-1)
+        matrix = m[..., :-1, :-1]
+        offset = m[..., :-1, -1]
 
     if output_shape is None:
-        output_shape = input.shape
+        output_shape = input.shape[axis0 : axis0 + ndim]
+    output_shape = tuple(output_shape)
 
     matrix = matrix.astype(float, copy=False)
     if order is None:
         order = 1
-    ndim = input.ndim
-    output = _get_output(output, input, shape=output_shape)
-    if input.dtype.kind in "iu":
-        input = input.astype(cupy.float32)
-
-    if prefilter and order > 1:
-        padded, npad = _prepad_for_spline_filter(input, mode, cval)
-        filtered = spline_filter(
-            padded,
-            order,
-            output=input.dtype,
-            mode=mode,
-            allow_float32=allow_float32,
-        )
-    else:
-        npad = 0
-        filtered = input
+    output = _get_output(
+        output,
+        input,
+        shape=input.shape[:axis0] + output_shape + input.shape[axis0 + ndim :],
+    )
+    axes = range(axis0, axis0 + ndim)
+    filtered, npad = _spline_coefficients(
+        input, order, mode, cval, prefilter, allow_float32, axes
+    )
 
     # kernel assumes C-contiguous arrays
-    if not filtered.flags.c_contiguous:
-        filtered = cupy.ascontiguousarray(filtered)
     if not matrix.flags.c_contiguous:
         matrix = cupy.ascontiguousarray(matrix)
 
+    if nchannels and matrix.ndim == 1:
+        # only the general affine kernel has a channels variant
+        matrix = cupy.diag(matrix)
+
     integer_output = output.dtype.kind in "iu"
-    large_int = (
-        max(_misc._prod(input.shape), _misc._prod(output_shape)) > 1 << 31
-    )
+    large_int = max(_misc._prod(input.shape), output.size) > 1 << 31
     if matrix.ndim == 1:
         offset = cupy.asarray(offset, dtype=float, order="C")
         offset = -offset / matrix
@@ -553,11 +854,13 @@ def affine_transform(
             order=order,
             integer_output=integer_output,
             nprepad=npad,
+            nchannels=nchannels,
+            batched=batched,
         )
-        m = cupy.zeros((ndim, ndim + 1), dtype=float)
-        m[:, :-1] = matrix
-        m[:, -1] = cupy.asarray(offset, dtype=float)
-        kern(filtered, m, output)
+        m = cupy.zeros(matrix.shape[:-1] + (ndim + 1,), dtype=float)
+        m[..., :-1] = matrix
+        m[..., -1] = cupy.asarray(offset, dtype=float)
+        _run_kernel(kern, filtered, m, output, nchannels)
     return output
 
 
@@ -592,7 +895,8 @@ def rotate(
     ``axes`` parameter using spline interpolation of the requested order.
 
     Args:
-        input (cupy.ndarray): The input array.
+        input (cupy.ndarray or SplineCoefficients): The input array, or its
+            precomputed spline coefficients.
         angle (float): The rotation angle in degrees.
         axes (tuple of 2 ints): The two axes that define the plane of rotation.
             Default is the first two axes.
@@ -716,7 +1020,8 @@ def shift(
     given mode.
 
     Args:
-        input (cupy.ndarray): The input array.
+        input (cupy.ndarray or SplineCoefficients): The input array, or its
+            precomputed spline coefficients.
         shift (float or sequence): The shift along the axes. If a float,
             ``shift`` is the same for each axis. If a sequence, ``shift``
             should contain one value for each axis.
@@ -752,6 +1057,7 @@ def shift(
     .. seealso:: :func:`scipy.ndimage.shift`
     """
 
+    order, mode, cval = _interpolation_parameters(input, order, mode, cval)
     _check_parameter("shift", order, mode)
 
     if not hasattr(shift, "__iter__") and type(shift) is not cupy.ndarray:
@@ -775,25 +1081,9 @@ def shift(
         if order is None:
             order = 1
         output = _get_output(output, input)
-        if input.dtype.kind in "iu":
-            input = input.astype(cupy.float32)
-
-        if prefilter and order > 1:
-            padded, npad = _prepad_for_spline_filter(input, mode, cval)
-            filtered = spline_filter(
-                padded,
-                order,
-                output=input.dtype,
-                mode=mode,
-                allow_float32=allow_float32,
-            )
-        else:
-            npad = 0
-            filtered = input
-
-        # kernel assumes C-contiguous arrays
-        if not filtered.flags.c_contiguous:
-            filtered = cupy.ascontiguousarray(filtered)
+        filtered, npad = _spline_coefficients(
+            input, order, mode, cval, prefilter, allow_float32
+        )
 
         integer_output = output.dtype.kind in "iu"
         large_int = _misc._prod(input.shape) > 1 << 31
@@ -827,13 +1117,15 @@ def zoom(
     *,
     grid_mode=False,
     allow_float32=True,
+    channels_last=False,
 ):
     """Zoom an array.
 
     The array is zoomed using spline interpolation of the requested order.
 
     Args:
-        input (cupy.ndarray): The input array.
+        input (cupy.ndarray or SplineCoefficients): The input array, or its
+            precomputed spline coefficients.
         zoom (float or sequence): The zoom factor along the axes. If a float,
             ``zoom`` is the same for each axis. If a sequence, ``zoom`` should
             contain one value for each axis.
@@ -866,6 +1158,11 @@ def zoom(
             The starting point of the arrow in the diagram above corresponds to
             coordinate location 0 in each mode. This option is unused if
             ``mode='opencv'``.
+        channels_last (bool): If True, the last axis of ``input`` holds
+            channels (e.g. RGB) that are interpolated with the same weights.
+            The zoom factors then only refer to the other axes and the channel
+            axis is appended to the output. This option is not present in
+            SciPy.
 
     Returns:
         cupy.ndarray or None:
@@ -884,12 +1181,15 @@ def zoom(
     .. seealso:: :func:`scipy.ndimage.zoom`
     """
 
+    order, mode, cval = _interpolation_parameters(input, order, mode, cval)
     _check_parameter("zoom", order, mode)
+    nchannels = _channels(input, channels_last)
+    ndim = input.ndim - 1 if channels_last else input.ndim
 
     if not hasattr(zoom, "__iter__") and type(zoom) is not cupy.ndarray:
-        zoom = [zoom] * input.ndim
+        zoom = [zoom] * ndim
     output_shape = []
-    for s, z in zip(input.shape, zoom):
+    for s, z in zip(input.shape[:ndim], zoom):
         output_shape.append(int(round(s * z)))
     output_shape = tuple(output_shape)
 
@@ -915,6 +1215,7 @@ def zoom(
             mode,
             cval,
             prefilter,
+            channels_last=channels_last,
         )
     else:
         if order is None:
@@ -945,33 +1246,18 @@ def zoom(
             else:
                 zoom.append(1)
 
-        output = _get_output(output, input, shape=output_shape)
-        if input.dtype.kind in "iu":
-            input = input.astype(cupy.float32)
-
-        if prefilter and order > 1:
-            padded, npad = _prepad_for_spline_filter(input, mode, cval)
-            filtered = spline_filter(
-                padded,
-                order,
-                output=input.dtype,
-                mode=mode,
-                allow_float32=allow_float32,
-            )
-        else:
-            npad = 0
-            filtered = input
-
-        # kernel assumes C-contiguous arrays
-        if not filtered.flags.c_contiguous:
-            filtered = cupy.ascontiguousarray(filtered)
+        output = _get_output(
+            output, input, shape=output_shape + input.shape[ndim:]
+        )
+        axes = range(ndim)
+        filtered, npad = _spline_coefficients(
+            input, order, mode, cval, prefilter, allow_float32, axes
+        )
 
         integer_output = output.dtype.kind in "iu"
-        large_int = (
-            max(_misc._prod(input.shape), _misc._prod(output_shape)) > 1 << 31
-        )
+        large_int = max(_misc._prod(input.shape), output.size) > 1 << 31
         kern = _get_zoom_kernel(
-            input.ndim,
+            ndim,
             large_int,
             output_shape,
             mode,
@@ -979,12 +1265,13 @@ def zoom(
             integer_output=integer_output,
             nprepad=npad,
             grid_mode=grid_mode,
+            nchannels=nchannels,
         )
 
         zoom = cupy.asarray(zoom, dtype=float, order="C")
         if zoom.ndim != 1:
             raise ValueError("zoom must be 1d")
-        if zoom.size != filtered.ndim:
+        if zoom.size != ndim:
             raise ValueError("len(zoom) must equal input.ndim")
-        kern(filtered, zoom, output)
+        _run_kernel(kern, filtered, zoom, output, nchannels)
     return output
@@ -1,9 +1,8 @@
-import warnings
-
 import cupy
 import numpy
 
-from cupyimg import _misc
+from cupyimg import memoize
+from cupyimg.scipy.ndimage import _label_uf, _segmented_reduction
 
 
 __all__ = [
@@ -20,10 +19,14 @@ __all__ = [
     "extrema",
     "center_of_mass",
     "histogram",
+    "labeled_histogram",
+    "labeled_quantiles",
+    "labeled_statistics",
     "label",
+    "find_objects",
 ]
 
-# TODO: grlee77: 'find_objects', 'watershed_ift'
+# TODO: grlee77: 'watershed_ift'
 
 
 def label(input, structure=None, output=None, *, greyscale_mode=False):
@@ -36,7 +39,8 @@ def label(input, structure=None, output=None, *, greyscale_mode=False):
             None, structure is automatically generated with a squared
             connectivity equal to one.
         output (cupy.ndarray, dtype or None): The array in which to place the
-            output.
+            output. By default, the labels are int32, or int64 if ``input``
+            has ``2 ** 31`` elements or more.
         greyscale_mode (boolean): If True, the function will behave like
             ``skimage.measure.label`` where differening non-background values
             will receive different labels.
@@ -74,7 +78,7 @@ def label(input, structure=None, output=None, *, greyscale_mode=False):
     else:
         caller_provided_output = False
         if output is None:
-            output = cupy.empty(input.shape, numpy.int32)
+            output = cupy.empty(input.shape, _label_dtype(input.size))
         else:
             output = cupy.empty(input.shape, output)
 
@@ -86,12 +90,15 @@ def label(input, structure=None, output=None, *, greyscale_mode=False):
         maxlabel = 0 if input.item() == 0 else 1  # synchronize
         output[...] = maxlabel
     else:
-        if output.dtype != numpy.int32:
-            y = cupy.empty(input.shape, numpy.int32)
-        else:
+        if output.dtype in (numpy.int32, numpy.int64) and (
+            output.flags.c_contiguous
+            and output.dtype.itemsize >= _label_dtype(input.size).itemsize
+        ):
             y = output
+        else:
+            y = cupy.empty(input.shape, _label_dtype(input.size))
         maxlabel = _label(input, structure, y, greyscale_mode=greyscale_mode)
-        if output.dtype != numpy.int32:
+        if y is not output:
             output[...] = y[...]
 
     if caller_provided_output:
@@ -100,6 +107,11 @@ def label(input, structure=None, output=None, *, greyscale_mode=False):
         return output, maxlabel
 
 
+def _label_dtype(size):
+    """Smallest label dtype able to index ``size`` elements."""
+    return numpy.dtype(numpy.int32 if size < 2 ** 31 else numpy.int64)
+
+
 def _generate_binary_structure(rank, connectivity):
     if connectivity < 1:
         connectivity = 1
@@ -111,288 +123,108 @@ def _generate_binary_structure(rank, connectivity):
 
 
 def _label(x, structure, y, greyscale_mode=False):
-    elems = numpy.where(structure != 0)
-    vecs = [elems[dm] - 1 for dm in range(x.ndim)]
-    offset = vecs[0]
-    for dm in range(1, x.ndim):
-        offset = offset * 3 + vecs[dm]
-    indxs = numpy.where(offset < 0)[0]
-    dirs = [[vecs[dm][dr] for dm in range(x.ndim)] for dr in indxs]
-    dirs = cupy.array(dirs, dtype=numpy.int32)
-    ndirs = indxs.shape[0]
-    y_shape = cupy.array(y.shape, dtype=numpy.int32)
-    count = cupy.zeros(2, dtype=numpy.int32)
-    _kernel_init()(x, y)
-    try:
-        int_t = int_types[y.dtype.char]
-    except KeyError:
-        raise ValueError("y must have int32, uint16, uint32 or uint64 dtype")
-    if int_t != "int":
-        raise NotImplementedError(
-            "Currently only 32-bit integer case is implemented"
-        )
-    if greyscale_mode:
-        _kernel_connect(True, int_t)(
-            x, y_shape, dirs, ndirs, x.ndim, y, size=y.size
-        )
-    else:
-        _kernel_connect(False, int_t)(
-            y_shape, dirs, ndirs, x.ndim, y, size=y.size
-        )
-    _kernel_count()(y, count, size=y.size)
-    maxlabel = int(count[0])  # synchronize
-    labels = cupy.empty(maxlabel, dtype=numpy.int32)
-    _kernel_labels()(y, count, labels, size=y.size)
-    _kernel_finalize()(maxlabel, cupy.sort(labels), y, size=y.size)
-    return maxlabel
+    if y.dtype not in (numpy.int32, numpy.int64):
+        raise ValueError("y must have int32 or int64 dtype")
+    if x.dtype.char == "e":
+        # the label kernels do not support half precision
+        x = x.astype(numpy.float32)
+    return _label_uf._label_union_find(
+        x, structure, y, greyscale_mode=greyscale_mode
+    )
 
 
-"""
-Elementwise kernels for use by label
-"""
+def find_objects(input, max_label=0):
+    """Find objects in a labeled array.
 
+    Args:
+        input (cupy.ndarray): Array containing objects defined by different
+            labels. Labels with value 0 are ignored.
+        max_label (int, optional): Maximum label to be searched for in
+            `input`. If max_label is not given, the positions of all objects
+            are returned.
 
-def _kernel_init():
-    return cupy.ElementwiseKernel(
-        "X x",
-        "Y y",
-        "if (x == 0) { y = -1; } else { y = i; }",
-        "cupyimg_nd_label_init",
-    )
+    Returns:
+        object_slices (list of tuples): A list of tuples, with each tuple
+        containing N slices (with N the dimension of the input array). Slices
+        correspond to the minimal parallelepiped that contains the object. If a
+        number is missing, None is returned instead of a slice.
 
+    .. note::
+        The bounding boxes of all labels are computed on the device in a
+        single pass. Only the ``(max_label, ndim)`` array of bounds is
+        transferred to the host in order to build the slices.
 
-def _kernel_connect(greyscale_mode=False, int_t="int"):
-    """
-    Notes
-    -----
-    dirs is a (n_neig//2, ndim) of relative offsets to the neighboring voxels.
-    For example, for structure = np.ones((3, 3)):
-        dirs = array([[-1, -1],
-                      [-1,  0],
-                      [-1,  1],
-                      [ 0, -1]], dtype=int32)
-    (Implementation assumes a centro-symmetric structure)
-    ndirs = dirs.shape[0]
-
-    In the dirs loop below, there is a loop over the ndim neighbors:
-        Here, index j corresponds to the current pixel and k is the current
-        neighbor location.
+    .. seealso:: :func:`scipy.ndimage.find_objects`
     """
-    in_params = "raw int32 shape, raw int32 dirs, int32 ndirs, int32 ndim"
-    if greyscale_mode:
-        # greyscale mode -> different values receive different labels
-        x_condition = "if (x[k] != x[j]) continue;"
-        in_params = "raw X x, " + in_params
-    else:
-        # binary mode -> all non-background voxels treated the same
-        x_condition = ""
-
-    # Note: atomicCAS is implemented for int, unsigned short, unsigned int, and
-    # unsigned long long
-
-    code = """
-        if (y[i] < 0) continue;
-        for (int dr = 0; dr < ndirs; dr++) {{
-            {int_t} j = i;
-            {int_t} rest = j;
-            {int_t} stride = 1;
-            {int_t} k = 0;
-            for (int dm = ndim-1; dm >= 0; dm--) {{
-                int pos = rest % shape[dm] + dirs[dm + dr * ndim];
-                if (pos < 0 || pos >= shape[dm]) {{
-                    k = -1;
-                    break;
-                }}
-                k += pos * stride;
-                rest /= shape[dm];
-                stride *= shape[dm];
-            }}
-            if (k < 0) continue;
-            if (y[k] < 0) continue;
-            {x_condition}
-            while (1) {{
-                while (j != y[j]) {{ j = y[j]; }}
-                while (k != y[k]) {{ k = y[k]; }}
-                if (j == k) break;
-                if (j < k) {{
-                    {int_t} old = atomicCAS( &y[k], (Y)k, (Y)j );
-                    if (old == k) break;
-                    k = old;
-                }}
-                else {{
-                    {int_t} old = atomicCAS( &y[j], (Y)j, (Y)k );
-                    if (old == j) break;
-                    j = old;
-                }}
-            }}
-        }}
-        """.format(
-        x_condition=x_condition, int_t=int_t
-    )
-
-    return cupy.ElementwiseKernel(
-        in_params, "raw Y y", code, "cupyimg_nd_label_connect",
-    )
-
+    if not isinstance(input, cupy.ndarray):
+        raise TypeError("input must be cupy.ndarray")
+    if input.ndim == 0:
+        # 0-dim array
+        value = int(input.item())  # synchronize
+        if max_label < 1:
+            max_label = value
+        return [() if i + 1 == value else None for i in range(max_label)]
+    bbox_min, bbox_max = _find_objects_bounds(input, max_label)
+    bbox_min = cupy.asnumpy(bbox_min)  # synchronize
+    bbox_max = cupy.asnumpy(bbox_max)
+    objects = []
+    for lo, hi in zip(bbox_min, bbox_max):
+        if hi[0] == 0:
+            objects.append(None)
+        else:
+            objects.append(tuple(slice(int(a), int(b)) for a, b in zip(lo, hi)))
+    return objects
 
-def _kernel_count():
-    return cupy.ElementwiseKernel(
-        "",
-        "raw Y y, raw int32 count",
-        """
-        if (y[i] < 0) continue;
-        int j = i;
-        while (j != y[j]) { j = y[j]; }
-        if (j != i) y[i] = j;
-        else atomicAdd(&count[0], 1);
-        """,
-        "cupyimg_nd_label_count",
-    )
 
+def _find_objects_bounds(input, max_label=0):
+    """Device-side bounding boxes of each label in ``1...max_label``.
 
-def _kernel_labels():
-    return cupy.ElementwiseKernel(
-        "",
-        "raw Y y, raw int32 count, raw int32 labels",
-        """
-        if (y[i] != i) continue;
-        int j = atomicAdd(&count[1], 1);
-        labels[j] = i;
-        """,
-        "cupyimg_nd_label_labels",
+    Returns ``(bbox_min, bbox_max)``, two int32 arrays of shape
+    ``(max_label, input.ndim)`` holding the (inclusive) start and (exclusive)
+    stop of each object along each axis. Labels that are not present have
+    ``bbox_max == 0`` along all axes.
+    """
+    if not isinstance(input, cupy.ndarray):
+        raise TypeError("input must be cupy.ndarray")
+    if input.dtype.kind not in "iub":
+        raise TypeError("input must have an integer dtype")
+    if input.ndim == 0:
+        raise RuntimeError("input must have at least one dimension")
+    if any(s >= (1 << 31) for s in input.shape):
+        raise ValueError("array dimensions must be < 2**31")
+    max_label = int(max_label)
+    if max_label < 1:
+        max_label = int(input.max()) if input.size else 0  # synchronize
+    ndim = input.ndim
+    bbox_min = cupy.full((max(max_label, 0), ndim), 2**31 - 1, numpy.int32)
+    bbox_max = cupy.zeros((max(max_label, 0), ndim), numpy.int32)
+    if max_label < 1 or input.size == 0:
+        return bbox_min, bbox_max
+    shape = cupy.asarray(input.shape, dtype=numpy.int32)
+    _get_find_objects_kernel()(
+        input, shape, ndim, max_label, bbox_min, bbox_max
     )
+    return bbox_min, bbox_max
 
 
-def _kernel_finalize():
+@memoize(for_each_device=True)
+def _get_find_objects_kernel():
     return cupy.ElementwiseKernel(
-        "int32 maxlabel",
-        "raw int32 labels, raw Y y",
+        "X x, raw int32 shape, int32 ndim, int32 max_label",
+        "raw int32 bbox_min, raw int32 bbox_max",
         """
-        if (y[i] < 0) {
-            y[i] = 0;
-            continue;
-        }
-        int yi = y[i];
-        int j_min = 0;
-        int j_max = maxlabel - 1;
-        int j = (j_min + j_max) / 2;
-        while (j_min < j_max) {
-            if (yi == labels[j]) break;
-            if (yi < labels[j]) j_max = j - 1;
-            else j_min = j + 1;
-            j = (j_min + j_max) / 2;
+        if (x <= 0 || x > max_label) continue;
+        ptrdiff_t offset = ((ptrdiff_t)x - 1) * ndim;
+        ptrdiff_t _i = i;
+        for (int d = ndim - 1; d >= 0; d--) {
+            int c = _i % shape[d];
+            _i /= shape[d];
+            atomicMin(&bbox_min[offset + d], c);
+            atomicMax(&bbox_max[offset + d], c + 1);
         }
-        y[i] = j + 1;
         """,
-        "cupyimg_nd_label_finalize",
-    )
-
-
-int_types = {
-    "i": "int",
-    "H": "unsigned short",
-    "I": "unsigned int",
-    "L": "unsigned long long",
-}
-
-
-def _safely_castable_to_int(dt):
-    """Test whether the NumPy data type `dt` can be safely cast to an int."""
-    int_size = cupy.dtype(int).itemsize
-    safe = (
-        cupy.issubdtype(dt, cupy.signedinteger) and dt.itemsize <= int_size
-    ) or (cupy.issubdtype(dt, cupy.unsignedinteger) and dt.itemsize < int_size)
-    return safe
-
-
-_ndimage_variance_kernel = cupy.ElementwiseKernel(
-    "T input, R labels, raw X index, uint64 size, raw float64 mean",
-    "raw float64 out",
-    """
-    for (ptrdiff_t j = 0; j < size; j++) {
-      if (labels == index[j]) {
-        atomicAdd(&out[j], (input - mean[j]) * (input - mean[j]));
-        break;
-      }
-    }
-    """,
-)
-
-
-_ndimage_sum_kernel = cupy.ElementwiseKernel(
-    "T input, R labels, raw X index, uint64 size",
-    "raw float64 out",
-    """
-    for (ptrdiff_t j = 0; j < size; j++) {
-      if (labels == index[j]) {
-        atomicAdd(&out[j], input);
-        break;
-      }
-    }
-    """,
-)
-
-
-def _ndimage_sum_kernel_2(input, labels, index, sum_val, batch_size=4):
-    for i in range(0, index.size, batch_size):
-        matched = labels == index[i : i + batch_size].reshape(
-            (-1,) + (1,) * input.ndim
-        )
-        sum_axes = tuple(range(1, 1 + input.ndim))
-        sum_val[i : i + batch_size] = cupy.where(matched, input, 0).sum(
-            axis=sum_axes
-        )
-    return sum_val
-
-
-_ndimage_mean_kernel = cupy.ElementwiseKernel(
-    "T input, R labels, raw X index, uint64 size",
-    "raw float64 out, raw uint64 count",
-    """
-    for (ptrdiff_t j = 0; j < size; j++) {
-      if (labels == index[j]) {
-        atomicAdd(&out[j], input);
-        atomicAdd(&count[j], 1);
-        break;
-      }
-    }
-    """,
-)
-
-
-def _ndimage_mean_kernel_2(
-    input, labels, index, batch_size=4, return_count=False
-):
-    sum_val = cupy.empty_like(index, dtype=cupy.float64)
-    count = cupy.empty_like(index, dtype=cupy.uint64)
-    for i in range(0, index.size, batch_size):
-        matched = labels == index[i : i + batch_size].reshape(
-            (-1,) + (1,) * input.ndim
-        )
-        mean_axes = tuple(range(1, 1 + input.ndim))
-        count[i : i + batch_size] = matched.sum(axis=mean_axes)
-        sum_val[i : i + batch_size] = cupy.where(matched, input, 0).sum(
-            axis=mean_axes
-        )
-    if return_count:
-        return sum_val / count, count
-    return sum_val / count
-
-
-def _mean_driver(input, labels, index, return_count=False, use_kern=False):
-    if use_kern:
-        return _ndimage_mean_kernel_2(
-            input, labels, index, return_count=return_count
-        )
-
-    out = cupy.zeros_like(index, cupy.float64)
-    count = cupy.zeros_like(index, dtype=cupy.uint64)
-    sum, count = _ndimage_mean_kernel(
-        input, labels, index, index.size, out, count
+        "cupyimg_nd_find_objects",
     )
-    if return_count:
-        return sum / count, count
-    return sum / count
 
 
 def variance(input, labels=None, index=None):
@@ -421,26 +253,6 @@ def variance(input, labels=None, index=None):
             "".format(input.dtype.type)
         )
 
-    use_kern = False
-    # There is constraints on types because of atomicAdd() in CUDA.
-    if input.dtype not in [
-        cupy.int32,
-        cupy.float16,
-        cupy.float32,
-        cupy.float64,
-        cupy.uint32,
-        cupy.uint64,
-        cupy.ulonglong,
-    ]:
-        warnings.warn(
-            "Using the slower implmentation as "
-            "cupyx.scipy.ndimage.sum supports int32, float16, "
-            "float32, float64, uint32, uint64 as data types"
-            "for the fast implmentation",
-            _misc.PerformanceWarning,
-        )
-        use_kern = True
-
     def calc_var_with_intermediate_float(input):
         vals_c = input - input.mean()
         count = vals_c.size
@@ -470,24 +282,9 @@ def variance(input, labels=None, index=None):
                 (input[labels == index]).var().astype(cupy.float64, copy=False)
             )
 
-    mean_val, count = _mean_driver(input, labels, index, True, use_kern)
-    if use_kern:
-        new_axis = (..., *(cupy.newaxis for _ in range(input.ndim)))
-        return (
-            cupy.where(
-                labels[None, ...] == index[new_axis],
-                cupy.square(input - mean_val[new_axis]),
-                0,
-            ).sum(tuple(range(1, input.ndim + 1)))
-            / count
-        )
-    out = cupy.zeros_like(index, dtype=cupy.float64)
-    return (
-        _ndimage_variance_kernel(
-            input, labels, index, index.size, mean_val, out
-        )
-        / count
-    )
+    return _segmented_reduction._labeled_statistics(
+        input, labels, index, ("variance",)
+    )["variance"]
 
 
 def sum(input, labels=None, index=None):
@@ -517,26 +314,6 @@ def sum(input, labels=None, index=None):
             )
         )
 
-    use_kern = False
-    # There is constraints on types because of atomicAdd() in CUDA.
-    if input.dtype not in [
-        cupy.int32,
-        cupy.float16,
-        cupy.float32,
-        cupy.float64,
-        cupy.uint32,
-        cupy.uint64,
-        cupy.ulonglong,
-    ]:
-        warnings.warn(
-            "Using the slower implmentation as "
-            "cupyx.scipy.ndimage.sum supports int32, float16, "
-            "float32, float64, uint32, uint64 as data types"
-            "for the fast implmentation",
-            _misc.PerformanceWarning,
-        )
-        use_kern = True
-
     if labels is None:
         return input.sum()
 
@@ -557,12 +334,9 @@ def sum(input, labels=None, index=None):
     if index.size == 0:
         return cupy.array([], dtype=cupy.int64)
 
-    out = cupy.zeros_like(index, dtype=cupy.float64)
-
-    # The following parameters for sum where determined using a Tesla P100.
-    if (input.size >= 262144 and index.size <= 4) or use_kern:
-        return _ndimage_sum_kernel_2(input, labels, index, out)
-    return _ndimage_sum_kernel(input, labels, index, index.size, out)
+    return _segmented_reduction._labeled_statistics(
+        input, labels, index, ("sum",)
+    )["sum"]
 
 
 def mean(input, labels=None, index=None):
@@ -593,26 +367,6 @@ def mean(input, labels=None, index=None):
             )
         )
 
-    use_kern = False
-    # There is constraints on types because of atomicAdd() in CUDA.
-    if input.dtype not in [
-        cupy.int32,
-        cupy.float16,
-        cupy.float32,
-        cupy.float64,
-        cupy.uint32,
-        cupy.uint64,
-        cupy.ulonglong,
-    ]:
-        warnings.warn(
-            "Using the slower implmentation as "
-            "cupyx.scipy.ndimage.mean supports int32, float16, "
-            "float32, float64, uint32, uint64 as data types "
-            "for the fast implmentation",
-            _misc.PerformanceWarning,
-        )
-        use_kern = True
-
     def calc_mean_with_intermediate_float(input):
         sum = input.sum()
         count = input.size
@@ -640,7 +394,9 @@ def mean(input, labels=None, index=None):
         else:
             return (input[labels == index]).mean(dtype=cupy.float64)
 
-    return _mean_driver(input, labels, index, use_kern=use_kern)
+    return _segmented_reduction._labeled_statistics(
+        input, labels, index, ("mean",)
+    )["mean"]
 
 
 def standard_deviation(input, labels=None, index=None):
@@ -663,79 +419,6 @@ def standard_deviation(input, labels=None, index=None):
     return cupy.sqrt(variance(input, labels, index))
 
 
-def _get_values(arrays, func):
-    """Concatenated result of applying func to a list of arrays.
-
-    func should be cupy.min, cupy.max or cupy.median
-    """
-    dtype = arrays[0].dtype
-    return cupy.concatenate(
-        [
-            func(a, keepdims=True)
-            if a.size != 0
-            else cupy.asarray([0], dtype=dtype)
-            for a in arrays
-        ]
-    )
-
-
-def _get_positions(arrays, position_arrays, arg_func):
-    """Concatenated positions from applying arg_func to arrays.
-
-    arg_func should be cupy.argmin or cupy.argmax
-    """
-    return cupy.concatenate(
-        [
-            pos[arg_func(a, keepdims=True)]
-            if a.size != 0
-            else cupy.asarray([0], dtype=int)
-            for pos, a in zip(position_arrays, arrays)
-        ]
-    )
-
-
-def _select_via_looping(
-    input,
-    labels,
-    idxs,
-    positions,
-    find_min,
-    find_min_positions,
-    find_max,
-    find_max_positions,
-    find_median,
-):
-    """Internal helper routine for _select.
-
-    With relatively few labels it is faster to call this function rather than
-    using the implementation based on cupy.lexsort.
-    """
-    find_positions = find_min_positions or find_max_positions
-
-    # extract labeled regions into separate arrays
-    arrays = []
-    position_arrays = []
-    for i in idxs:
-        label_idx = labels == i
-        arrays.append(input[label_idx])
-        if find_positions:
-            position_arrays.append(positions[label_idx])
-
-    result = []
-    # the order below matches the order expected by cupy.ndimage.extrema
-    if find_min:
-        result += [_get_values(arrays, cupy.min)]
-    if find_min_positions:
-        result += [_get_positions(arrays, position_arrays, cupy.argmin)]
-    if find_max:
-        result += [_get_values(arrays, cupy.max)]
-    if find_max_positions:
-        result += [_get_positions(arrays, position_arrays, cupy.argmax)]
-    if find_median:
-        result += [_get_values(arrays, cupy.median)]
-    return result
-
-
 def _select(
     input,
     labels=None,
@@ -759,7 +442,8 @@ def _select(
     """
     find_positions = find_min_positions or find_max_positions
     positions = None
-    if find_positions:
+    single = labels is None or index is None or cupy.isscalar(index)
+    if find_positions and single:
         positions = cupy.arange(input.size).reshape(input.shape)
 
     def single_group(vals, positions):
@@ -796,127 +480,22 @@ def _select(
             masked_positions = positions[mask]
         return single_group(input[mask], masked_positions)
 
-    index = cupy.asarray(index)
-
-    safe_int = _safely_castable_to_int(labels.dtype)
-    min_label = labels.min()
-    max_label = labels.max()
-
-    # Remap labels to unique integers if necessary, or if the largest label is
-    # larger than the number of values.
-    if not safe_int or min_label < 0 or max_label > labels.size:
-        # Remap labels, and indexes
-        unique_labels, labels = cupy.unique(labels, return_inverse=True)
-        idxs = cupy.searchsorted(unique_labels, index)
-
-        # Make all of idxs valid
-        idxs[idxs >= unique_labels.size] = 0
-        found = unique_labels[idxs] == index
-    else:
-        # Labels are an integer type, and there aren't too many
-        idxs = cupy.asanyarray(index, cupy.int).copy()
-        found = (idxs >= 0) & (idxs <= max_label)
-
-    idxs[~found] = max_label + 1
-
-    input = input.ravel()
-    labels = labels.ravel()
-    if find_positions:
-        positions = positions.ravel()
-
-    if hasattr(cupy, "_core"):
-        using_cub = (
-            cupy._core._accelerator.ACCELERATOR_CUB
-            in cupy._core.get_routine_accelerators()
-        )
-    else:
-        using_cub = (
-            cupy.core._accelerator.ACCELERATOR_CUB
-            in cupy.core.get_routine_accelerators()
-        )
-
-    if using_cub:
-        # Cutoff values below were determined empirically for relatively large
-        # input arrays.
-        if find_positions or find_median:
-            n_label_cutoff = 15
-        else:
-            n_label_cutoff = 30
-    else:
-        n_label_cutoff = 0
-
-    if n_label_cutoff and len(idxs) <= n_label_cutoff:
-        return _select_via_looping(
-            input,
-            labels,
-            idxs,
-            positions,
-            find_min,
-            find_min_positions,
-            find_max,
-            find_max_positions,
-            find_median,
-        )
-
-    order = cupy.lexsort(cupy.stack((input.ravel(), labels.ravel())))
-    input = input[order]
-    labels = labels[order]
-    if find_positions:
-        positions = positions[order]
-
-    # Determine indices corresponding to the min or max value for each label
-    label_change_index = cupy.searchsorted(
-        labels, cupy.arange(1, max_label + 2)
-    )
-    if find_min or find_min_positions or find_median:
-        # index corresponding to the minimum value at each label
-        min_index = label_change_index[:-1]
-    if find_max or find_max_positions or find_median:
-        # index corresponding to the maximum value at each label
-        max_index = label_change_index[1:] - 1
-
-    result = []
     # the order below matches the order expected by cupy.ndimage.extrema
+    stats = []
     if find_min:
-        mins = cupy.zeros(int(labels.max()) + 2, input.dtype)
-        mins[labels[min_index]] = input[min_index]
-        result += [mins[idxs]]
+        stats.append("minimum")
     if find_min_positions:
-        minpos = cupy.zeros(labels.max().item() + 2, int)
-        minpos[labels[min_index]] = positions[min_index]
-        result += [minpos[idxs]]
+        stats.append("minimum_position")
     if find_max:
-        maxs = cupy.zeros(int(labels.max()) + 2, input.dtype)
-        maxs[labels[max_index]] = input[max_index]
-        result += [maxs[idxs]]
+        stats.append("maximum")
     if find_max_positions:
-        maxpos = cupy.zeros(labels.max().item() + 2, int)
-        maxpos[labels[max_index]] = positions[max_index]
-        result += [maxpos[idxs]]
+        stats.append("maximum_position")
     if find_median:
-        locs = cupy.arange(len(labels))
-        lo = cupy.zeros(int(labels.max()) + 2, cupy.int)
-        lo[labels[min_index]] = locs[min_index]
-        hi = cupy.zeros(int(labels.max()) + 2, cupy.int)
-        hi[labels[max_index]] = locs[max_index]
-        lo = lo[idxs]
-        hi = hi[idxs]
-        # lo is an index to the lowest value in input for each label,
-        # hi is an index to the largest value.
-        # move them to be either the same ((hi - lo) % 2 == 0) or next
-        # to each other ((hi - lo) % 2 == 1), then average.
-        step = (hi - lo) // 2
-        lo += step
-        hi -= step
-        if input.dtype.kind in "iub":
-            # fix for https://github.com/scipy/scipy/issues/12836
-            result += [
-                (input[lo].astype(float) + input[hi].astype(float)) / 2.0
-            ]
-        else:
-            result += [(input[lo] + input[hi]) / 2.0]
-
-    return result
+        stats.append("median")
+    result = _segmented_reduction._labeled_statistics(
+        input, labels, cupy.asarray(index), stats
+    )
+    return [result[name] for name in stats]
 
 
 def minimum(input, labels=None, index=None):
@@ -1181,6 +760,63 @@ def extrema(input, labels=None, index=None):
     return minimums, maximums, min_positions, max_positions
 
 
+def labeled_statistics(
+    input,
+    labels=None,
+    index=None,
+    stats=("count", "sum", "mean", "variance", "minimum", "maximum"),
+):
+    """Calculate several statistics of an array over labeled regions at once.
+
+    All requested statistics are computed together by a single segmented
+    reduction. With few regions, the elements are accumulated per region
+    with atomic operations in shared memory; with many regions, or when the
+    median is requested, the elements are sorted by label. The variance and
+    the positions of the extrema take a second pass over the data.
+
+    Args:
+        input (cupy.ndarray): N-D image data to process.
+        labels (cupy.ndarray or None): Labels defining sub-regions in
+            `input`. If not None, must be broadcastable to the shape of
+            `input`.
+        index (int, array_like or None): Labels of the regions to include in
+            the output. If None (default), all values where `labels` is
+            greater than zero are used. Ignored if `labels` is None.
+        stats (sequence of str): The statistics to compute, any of
+            ``"count"``, ``"sum"``, ``"mean"``, ``"variance"``,
+            ``"standard_deviation"``, ``"minimum"``, ``"maximum"``,
+            ``"median"``, ``"minimum_position"`` and ``"maximum_position"``.
+
+    Returns:
+        dict: Maps each name in `stats` to a cupy.ndarray holding the value
+        for each label in `index`, which is 0-dimensional if `labels` or
+        `index` is None or `index` is a scalar. Counts are int64 and sums,
+        means, variances and standard deviations are float64. Minima and
+        maxima have the dtype of `input` and the positions of the first
+        minimum and maximum are int64 indices into the raveled `input`.
+        Regions without elements have NaN mean, variance and standard
+        deviation and a zero value for the other statistics.
+
+    .. seealso:: :func:`scipy.ndimage.sum`, :func:`scipy.ndimage.mean`,
+        :func:`scipy.ndimage.extrema`
+    """
+    if not isinstance(input, cupy.ndarray):
+        raise TypeError("input must be cupy.ndarray")
+    if input.dtype.kind == "c":
+        raise TypeError(
+            "labeled_statistics does not support {}".format(input.dtype.type)
+        )
+    if isinstance(stats, str):
+        stats = (stats,)
+    if labels is not None:
+        if not isinstance(labels, cupy.ndarray):
+            raise TypeError("labels must be cupy.ndarray")
+        input, labels = cupy.broadcast_arrays(input, labels)
+    else:
+        index = None
+    return _segmented_reduction._labeled_statistics(input, labels, index, stats)
+
+
 def center_of_mass(input, labels=None, index=None):
     """
     Calculate the center of mass of the values of an array at labels.
@@ -1262,6 +898,25 @@ def center_of_mass(input, labels=None, index=None):
     # return [tuple(v) for v in cupy.asnumpy(cupy.stack(results, axis=-1))]
 
 
+# functions that labeled_comprehension evaluates with a segmented reduction
+_comprehension_reductions = [
+    (getattr(module, func), stat)
+    for module in (cupy, numpy)
+    for func, stat in (
+        ("sum", "sum"),
+        ("mean", "mean"),
+        ("var", "variance"),
+        ("std", "standard_deviation"),
+        ("amin", "minimum"),
+        ("min", "minimum"),
+        ("amax", "maximum"),
+        ("max", "maximum"),
+        ("median", "median"),
+    )
+    if hasattr(module, func)
+]
+
+
 def labeled_comprehension(
     input, labels, index, func, out_dtype, default, pass_positions=False
 ):
@@ -1273,6 +928,11 @@ def labeled_comprehension(
     The option exists to provide the function with positional parameters as the
     second argument.
 
+    When `func` is the ``sum``, ``mean``, ``var``, ``std``, ``min``, ``max``
+    or ``median`` function of CuPy or NumPy and `pass_positions` is False,
+    the result is computed for all labels at once by a segmented reduction
+    (see :func:`labeled_statistics`) instead of calling `func` per label.
+
     Parameters
     ----------
     input : array_like
@@ -1372,6 +1032,22 @@ def labeled_comprehension(
 
     index = index.astype(labels.dtype)
 
+    stat = None
+    if not pass_positions and input.dtype.kind != "c":
+        stat = next(
+            (s for f, s in _comprehension_reductions if f is func), None
+        )
+    if stat is not None:
+        # a single segmented reduction instead of one call of func per label
+        result = _segmented_reduction._labeled_statistics(
+            input, labels, index, ("count", stat)
+        )
+        output = cupy.asnumpy(result[stat]).astype(out_dtype)
+        output[cupy.asnumpy(result["count"]) == 0] = default
+        if as_scalar:
+            output = output[0]
+        return output
+
     # optimization: find min/max in index, and select those parts of labels, input, and positions
     lo = index.min()
     hi = index.max()
@@ -1429,7 +1105,8 @@ def histogram(input, min, max, bins, labels=None, index=None):
     Histogram calculates the frequency of values in an array within bins
     determined by `min`, `max`, and `bins`. The `labels` and `index`
     keywords can limit the scope of the histogram to specified sub-regions
-    within the array.
+    within the array. The histograms of all regions are counted at once (see
+    :func:`labeled_histogram`).
 
     Parameters
     ----------
@@ -1474,11 +1151,120 @@ def histogram(input, min, max, bins, labels=None, index=None):
     array([0, 0, 1, 1, 0, 0, 1, 1, 0, 0])
 
     """
-    _bins = cupy.linspace(min, max, bins + 1)
-
-    def _hist(vals):
-        return cupy.histogram(vals, _bins)[0]
+    if not isinstance(input, cupy.ndarray):
+        input = cupy.asarray(input)
+    if labels is not None:
+        input, labels = cupy.broadcast_arrays(input, labels)
+    edges = numpy.linspace(min, max, bins + 1)
+    if labels is None or index is None:
+        return _segmented_reduction._labeled_histogram(
+            input, labels, None, edges
+        )
 
-    return labeled_comprehension(
-        input, labels, index, _hist, object, None, pass_positions=False
+    # for compatibility with SciPy, return an object array of histograms,
+    # with None for the labels that are not present
+    as_scalar = cupy.isscalar(index)
+    index = cupy.atleast_1d(cupy.asarray(index))
+    hist, counts = _segmented_reduction._labeled_histogram(
+        input, labels, index, edges, return_counts=True
     )
+    hist = cupy.asnumpy(hist)
+    counts = cupy.asnumpy(counts)
+    output = numpy.empty(index.shape, dtype=object)
+    for i in numpy.ndindex(index.shape):
+        output[i] = hist[i] if counts[i] else None
+    if as_scalar:
+        output = output[0]
+    return output
+
+
+def labeled_histogram(input, min, max, bins, labels=None, index=None):
+    """Calculate the histograms of the values of an array over labeled regions.
+
+    The histograms of all regions are computed by a single kernel, which
+    counts into a dense (label, bin) array held in shared memory when there
+    are few enough labels and bins.
+
+    Args:
+        input (cupy.ndarray): N-D image data to process.
+        min, max (scalar): Minimum and maximum values of range of histogram
+            bins. Values outside of this range are ignored.
+        bins (int): Number of bins.
+        labels (cupy.ndarray or None): Labels defining sub-regions in
+            `input`. If not None, must be broadcastable to the shape of
+            `input`.
+        index (int, array_like or None): Labels of the regions to include in
+            the output. If None (default), all values where `labels` is
+            greater than zero are used. Ignored if `labels` is None.
+
+    Returns:
+        cupy.ndarray: int64 histogram counts of shape ``(len(index), bins)``,
+        or ``(bins,)`` if `labels` or `index` is None or `index` is a scalar.
+        The bins are the same as those of :func:`histogram`, and regions
+        without elements have all counts zero.
+
+    .. seealso:: :func:`histogram`, :func:`labeled_quantiles`
+    """
+    if not isinstance(input, cupy.ndarray):
+        raise TypeError("input must be cupy.ndarray")
+    if input.dtype.kind == "c":
+        raise TypeError(
+            "labeled_histogram does not support {}".format(input.dtype.type)
+        )
+    if bins < 1:
+        raise ValueError("bins must be a positive integer")
+    if labels is not None:
+        if not isinstance(labels, cupy.ndarray):
+            raise TypeError("labels must be cupy.ndarray")
+        input, labels = cupy.broadcast_arrays(input, labels)
+    else:
+        index = None
+    edges = numpy.linspace(min, max, bins + 1)
+    return _segmented_reduction._labeled_histogram(input, labels, index, edges)
+
+
+def labeled_quantiles(input, q, labels=None, index=None):
+    """Calculate quantiles of the values of an array over labeled regions.
+
+    The values are sorted once by label and value, and the quantiles of all
+    regions are interpolated from the sorted values at the same time.
+
+    Args:
+        input (cupy.ndarray): N-D image data to process.
+        q (float or array_like): Quantiles to compute, in the range
+            ``[0, 1]``. For example, ``(0.05, 0.5, 0.95)`` gives the 5th,
+            50th and 95th percentiles.
+        labels (cupy.ndarray or None): Labels defining sub-regions in
+            `input`. If not None, must be broadcastable to the shape of
+            `input`.
+        index (int, array_like or None): Labels of the regions to include in
+            the output. If None (default), all values where `labels` is
+            greater than zero are used. Ignored if `labels` is None.
+
+    Returns:
+        cupy.ndarray: float64 quantiles of shape ``(len(index), len(q))``.
+        The dimension of `index` is omitted if `labels` or `index` is None
+        or `index` is a scalar, and that of `q` if `q` is a scalar. The
+        quantiles are linearly interpolated as by :func:`numpy.quantile` and
+        are NaN for regions without elements.
+
+    .. seealso:: :func:`median`, :func:`labeled_histogram`
+    """
+    if not isinstance(input, cupy.ndarray):
+        raise TypeError("input must be cupy.ndarray")
+    if input.dtype.kind == "c":
+        raise TypeError(
+            "labeled_quantiles does not support {}".format(input.dtype.type)
+        )
+    q = numpy.asarray(q, dtype=numpy.float64)
+    if q.ndim > 1:
+        raise ValueError("q must be a scalar or 1-dimensional")
+    if numpy.any((q < 0) | (q > 1)):
+        raise ValueError("Quantiles must be in the range [0, 1]")
+    if labels is not None:
+        if not isinstance(labels, cupy.ndarray):
+            raise TypeError("labels must be cupy.ndarray")
+        input, labels = cupy.broadcast_arrays(input, labels)
+    else:
+        index = None
+    return _segmented_reduction._labeled_quantiles(input, labels, index, q)
@@ -4,7 +4,9 @@ import warnings
 import cupy
 import numpy
 
+from cupyimg import memoize
 from cupyimg.scipy.ndimage import _filters_core
+from cupyimg.scipy.ndimage import _morphology_packed
 from cupyimg.scipy.ndimage import _util
 from cupyimg.scipy.ndimage import filters
 
@@ -38,7 +40,7 @@ __all__ = [
 # There is also a Jump-Flooding Centroidal Voronoi Code (BSD 3-clause) here:
 
 
-@cupy.memoize(for_each_device=True)
+@memoize(for_each_device=True)
 def _get_binary_erosion_kernel(
     w_shape,
     int_type,
@@ -201,6 +203,91 @@ def generate_binary_structure(rank, connectivity):
     return cupy.asarray(output)
 
 
+def _binary_erosion_of_packed(
+    input,
+    structure,
+    iterations,
+    mask,
+    output,
+    border_value,
+    origin,
+    invert,
+    brute_force,
+):
+    """``_binary_erosion`` when any of the arrays is a ``PackedMask``.
+
+    The result is packed if ``output`` is a ``PackedMask``, or if ``output``
+    is None and ``input`` is packed.
+    """
+    from cupyimg.skimage.util._packed import PackedMask, pack_mask
+
+    packed_output = isinstance(output, PackedMask) or (
+        output is None and isinstance(input, PackedMask)
+    )
+    steps = None
+    if (
+        isinstance(input, PackedMask)
+        and input.ndim == 2
+        and (mask is None or mask.shape == input.shape)
+    ):
+        if structure is None:
+            structure = generate_binary_structure(input.ndim, 1)
+        structure = structure.astype(dtype=bool, copy=False)
+        if structure.ndim == input.ndim and structure.size > 0:
+            origin = _util._fix_sequence_arg(origin, input.ndim, "origin", int)
+            offsets = _filters_core._origins_to_offsets(origin, structure.shape)
+            steps = _morphology_packed._structure_offsets(structure, offsets)
+            center_is_true = _center_is_true(structure, origin)
+            if not _morphology_packed._use_packed(
+                input.ndim, iterations, center_is_true, steps, packed=True
+            ):
+                steps = None
+
+    if steps is not None:
+        # erode the packed words directly
+        n_cols = input.shape[-1]
+        x = _morphology_packed._copy_words(input.words, n_cols, invert)
+        if mask is not None:
+            mask = pack_mask(mask).words
+        border = bool(border_value) != bool(invert)
+        words = _morphology_packed._erode_words(
+            x, n_cols, steps, iterations, mask, border, center_is_true
+        )
+        result = PackedMask(
+            _morphology_packed._copy_words(words, n_cols, invert, out=words),
+            input.shape,
+        )
+    else:
+        if isinstance(input, PackedMask):
+            input = input.unpack()
+        if isinstance(mask, PackedMask):
+            mask = mask.unpack()
+        result = _binary_erosion(
+            input,
+            structure,
+            iterations,
+            mask,
+            None if packed_output else output,
+            border_value,
+            origin,
+            invert,
+            brute_force,
+        )
+        if not packed_output:
+            return result
+
+    if not packed_output:
+        output = _util._get_output(bool if output is None else output, result)
+        return result.unpack(output)
+    result = pack_mask(result)
+    if isinstance(output, PackedMask):
+        if output.shape != result.shape:
+            raise ValueError("output shape is not correct")
+        output.words[...] = result.words
+        return output
+    return result
+
+
 def _binary_erosion(
     input,
     structure,
@@ -217,6 +304,22 @@ def _binary_erosion(
     except TypeError:
         raise TypeError("iterations parameter should be an integer")
 
+    # deferred import: cupyimg.skimage.util depends on this package
+    from cupyimg.skimage.util._packed import PackedMask
+
+    if any(isinstance(a, PackedMask) for a in (input, mask, output)):
+        return _binary_erosion_of_packed(
+            input,
+            structure,
+            iterations,
+            mask,
+            output,
+            border_value,
+            origin,
+            invert,
+            brute_force,
+        )
+
     if input.dtype.kind == "c":
         raise TypeError("Complex type not supported")
     if any(s < 0 for s in input.strides):
@@ -278,6 +381,27 @@ def _binary_erosion(
         else:
             center_is_true = _center_is_true(structure, origin)
 
+    if input.ndim == 2 and iterations != 1:
+        steps = _morphology_packed._structure_offsets(structure, offsets)
+        if _morphology_packed._use_packed(
+            input.ndim, iterations, center_is_true, steps
+        ):
+            # all iterations on bit-packed words, several per launch
+            output = _morphology_packed._binary_erosion_packed(
+                input,
+                steps,
+                iterations,
+                mask if masked else None,
+                output,
+                border_value,
+                invert,
+                center_is_true,
+            )
+            if temp_needed:
+                temp[...] = output
+                output = temp
+            return output
+
     erode_kernel = _get_binary_erosion_kernel(
         structure.shape,
         int_type,
@@ -378,6 +502,12 @@ def binary_erosion(
 
         This function may synchronize the device.
 
+    .. note::
+
+        ``input``, ``mask`` and ``output`` may also be given as
+        :class:`cupyimg.skimage.util.PackedMask`. The result is packed if
+        ``output`` is packed, or if ``input`` is packed and ``output`` is None.
+
     .. seealso:: :func:`scipy.ndimage.binary_erosion`
     """
     return _binary_erosion(
@@ -438,6 +568,12 @@ def binary_dilation(
 
         This function may synchronize the device.
 
+    .. note::
+
+        ``input``, ``mask`` and ``output`` may also be given as
+        :class:`cupyimg.skimage.util.PackedMask`. The result is packed if
+        ``output`` is packed, or if ``input`` is packed and ``output`` is None.
+
     .. seealso:: :func:`scipy.ndimage.binary_dilation`
     """
     if structure is None:
@@ -510,6 +646,12 @@ def binary_opening(
 
         This function may synchronize the device.
 
+    .. note::
+
+        ``input``, ``mask`` and ``output`` may also be given as
+        :class:`cupyimg.skimage.util.PackedMask`. The result is packed if
+        ``output`` is packed, or if ``input`` is packed and ``output`` is None.
+
     .. seealso:: :func:`scipy.ndimage.binary_opening`
     """
     if structure is None:
@@ -586,6 +728,12 @@ def binary_closing(
 
         This function may synchronize the device.
 
+    .. note::
+
+        ``input``, ``mask`` and ``output`` may also be given as
+        :class:`cupyimg.skimage.util.PackedMask`. The result is packed if
+        ``output`` is packed, or if ``input`` is packed and ``output`` is None.
+
     .. seealso:: :func:`scipy.ndimage.binary_closing`
     """
     if structure is None:
@@ -709,6 +857,12 @@ def binary_propagation(
 
         This function may synchronize the device.
 
+    .. note::
+
+        ``input``, ``mask`` and ``output`` may also be given as
+        :class:`cupyimg.skimage.util.PackedMask`. The result is packed if
+        ``output`` is packed, or if ``input`` is packed and ``output`` is None.
+
     .. seealso:: :func:`scipy.ndimage.binary_propagation`
     """
     return binary_dilation(
@@ -747,12 +901,33 @@ def binary_fill_holes(input, structure=None, output=None, origin=0):
 
         This function may synchronize the device.
 
+    .. note::
+
+        ``input`` and ``output`` may also be given as
+        :class:`cupyimg.skimage.util.PackedMask`. The result is packed if
+        ``output`` is packed, or if ``input`` is packed and ``output`` is None.
+
     .. seealso:: :func:`scipy.ndimage.binary_fill_holes`
     """
+    from cupyimg.skimage.util._packed import PackedMask, pack_mask
+
+    if isinstance(input, PackedMask) or isinstance(output, PackedMask):
+        mask = ~pack_mask(input)
+        tmp = PackedMask.zeros(mask.shape)
+        result = binary_dilation(
+            tmp, structure, -1, mask, output, 1, origin, brute_force=True
+        )
+        if isinstance(result, PackedMask):
+            _morphology_packed._copy_words(
+                result.words, result.shape[-1], invert=True, out=result.words
+            )
+        else:
+            cupy.logical_not(result, result)
+        return result
     mask = cupy.logical_not(input)
     tmp = cupy.zeros(mask.shape, bool)
     inplace = isinstance(output, cupy.ndarray)
-    # TODO (grlee77): set brute_force=False below once implemented
+    # 2D inputs are propagated on bit-packed words (see _morphology_packed)
     if inplace:
         binary_dilation(
             tmp, structure, -1, mask, output, 1, origin, brute_force=True
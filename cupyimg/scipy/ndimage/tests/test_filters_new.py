@@ -4,7 +4,11 @@ import itertools
 import cupy as cp
 import pytest
 
+from cupy.testing import assert_allclose, assert_array_equal
+
+from cupyimg.scipy import ndimage as ndi
 from cupyimg.scipy.ndimage import correlate, convolve, correlate1d, convolve1d
+from cupyimg.scipy.ndimage._filters_rank_hist import _use_histogram
 
 try:
     import scipy.ndimage  # NOQA
@@ -77,3 +81,455 @@ def test_convolve1d_precision(dtype, func):
 
     # not identical due to differing internal precision used above
     cp.testing.assert_allclose(y1, y2, rtol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "func, kwargs",
+    [
+        (ndi.gaussian_filter, dict(sigma=(1.5, 2))),
+        (ndi.uniform_filter, dict(size=(3, 5), origin=(0, 1))),
+        (ndi.sobel, dict(axis=-1)),
+        (ndi.prewitt, dict(axis=-2)),
+        (ndi.median_filter, dict(size=(3, 5))),
+        (ndi.minimum_filter, dict(size=3)),
+        (ndi.maximum_filter, dict(footprint=cp.eye(3, dtype=bool))),
+        (ndi.rank_filter, dict(rank=1, size=3)),
+        (ndi.percentile_filter, dict(percentile=30, size=(3, 2))),
+        (ndi.correlate, dict(weights=cp.arange(6.0).reshape(2, 3))),
+        (ndi.convolve, dict(weights=cp.arange(6.0).reshape(3, 2))),
+    ],
+)
+@pytest.mark.parametrize("mode", ["reflect", "constant", "wrap"])
+def test_batch_axes(func, kwargs, mode):
+    rng = cp.random.RandomState(0)
+    batch = rng.standard_normal((4, 24, 31)).astype(cp.float32)
+    result = func(batch, mode=mode, batch_axes=0, **kwargs)
+    for n in range(batch.shape[0]):
+        expected = func(batch[n], mode=mode, **kwargs)
+        assert_allclose(result[n], expected, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "func, kwargs",
+    [
+        (ndi.minimum_filter, dict(size=(3, 5))),
+        (ndi.maximum_filter, dict(footprint=cp.ones((4, 3), dtype=bool))),
+        (ndi.uniform_filter, dict(size=(3, 5))),
+        (ndi.gaussian_filter, dict(sigma=(1.5, 2))),
+    ],
+)
+def test_batch_axes_mode_sequence(func, kwargs):
+    rng = cp.random.RandomState(0)
+    batch = rng.standard_normal((24, 3, 31)).astype(cp.float32)
+    mode = ["wrap", "constant"]
+    result = func(batch, mode=mode, cval=1.5, batch_axes=1, **kwargs)
+    for n in range(batch.shape[1]):
+        expected = func(batch[:, n], mode=mode, cval=1.5, **kwargs)
+        assert_allclose(result[:, n], expected, rtol=1e-5, atol=1e-5)
+
+
+def test_batch_axes_multiple():
+    rng = cp.random.RandomState(0)
+    batch = rng.standard_normal((3, 16, 2, 17)).astype(cp.float32)
+    result = ndi.gaussian_filter(batch, sigma=2, batch_axes=(0, -2))
+    for n, c in itertools.product(range(3), range(2)):
+        expected = ndi.gaussian_filter(batch[n, :, c], sigma=2)
+        assert_allclose(result[n, :, c], expected, rtol=1e-5, atol=1e-5)
+
+
+def test_batch_axes_invalid():
+    x = cp.zeros((2, 8, 8))
+    with pytest.raises(ValueError):
+        ndi.gaussian_filter(x, 1, batch_axes=(0, 0))
+    with pytest.raises(ValueError):
+        ndi.gaussian_filter(x, 1, batch_axes=3)
+    with pytest.raises(ValueError):
+        ndi.gaussian_filter(x, 1, batch_axes=(0, 1, 2))
+    with pytest.raises(ValueError):
+        ndi.sobel(x, axis=0, batch_axes=0)
+    with pytest.raises(RuntimeError):
+        # footprint must have one dimension per non-batch axis
+        ndi.median_filter(x, footprint=cp.ones((3, 3, 3)), batch_axes=0)
+    # no batch axes: identical to the default
+    assert_array_equal(
+        ndi.median_filter(x, size=3, batch_axes=()),
+        ndi.median_filter(x, size=3),
+    )
+
+
+def _low_rank_weights(shape, rank, seed=0):
+    rng = cp.random.RandomState(seed)
+    w = cp.zeros(shape)
+    for _ in range(rank):
+        term = 1
+        for n in shape:
+            term = cp.multiply.outer(term, rng.standard_normal(n))
+        w += term
+    return w
+
+
+@pytest.mark.parametrize("func", [correlate, convolve])
+@pytest.mark.parametrize(
+    "mode", ["reflect", "constant", "nearest", "mirror", "wrap"]
+)
+@pytest.mark.parametrize(
+    "shape, rank, origin",
+    [
+        ((9, 12), 1, 0),
+        ((11, 10), 2, (1, -2)),
+        ((5, 7, 8), 1, (0, 1, -1)),
+        ((6, 5, 7), 2, 0),
+    ],
+)
+def test_separable_vs_direct(func, mode, shape, rank, origin):
+    rng = cp.random.RandomState(0)
+    x = rng.standard_normal((32,) * len(shape))
+    w = _low_rank_weights(shape, rank)
+    expected = func(x, w, mode=mode, origin=origin, method="direct")
+    result = func(x, w, mode=mode, origin=origin, method="separable")
+    assert_allclose(result, expected, rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.int16, cp.float32])
+def test_separable_output_dtype(dtype):
+    rng = cp.random.RandomState(0)
+    x = (rng.uniform(0, 100, (40, 30))).astype(dtype)
+    w = cp.ones((9, 9)) / 81
+    expected = correlate(x, w, method="direct")
+    result = correlate(x, w, method="separable")
+    assert result.dtype == expected.dtype
+    assert_allclose(result, expected, atol=1)
+
+
+def test_separable_full_rank():
+    # the factorization of a full-rank kernel is exact, just not faster
+    rng = cp.random.RandomState(0)
+    x = rng.standard_normal((20, 20))
+    w = rng.standard_normal((5, 6))
+    assert_allclose(
+        correlate(x, w, method="separable"),
+        correlate(x, w, method="direct"),
+        rtol=1e-10,
+        atol=1e-10,
+    )
+
+
+def test_choose_filter_method():
+    w = _low_rank_weights((31, 31, 31), 1)
+    assert ndi.choose_filter_method(w) == "separable"
+    assert ndi.choose_filter_method(w, mode="constant") == "separable"
+    # separable padding differs from a nonzero cval
+    assert ndi.choose_filter_method(w, mode="constant", cval=1) == "direct"
+    # small kernels, including sizes where even rank 1 would not pay off
+    assert ndi.choose_filter_method(cp.ones((3, 3))) == "direct"
+    assert ndi.choose_filter_method(cp.ones((9, 9))) == "direct"
+    # full rank
+    w = cp.random.RandomState(0).standard_normal((15, 15))
+    assert ndi.choose_filter_method(w) == "direct"
+    # approximately low-rank within the requested tolerance
+    w = _low_rank_weights((15, 15), 1) + 1e-8 * w
+    assert ndi.choose_filter_method(w) == "direct"
+    assert ndi.choose_filter_method(w, separable_rtol=1e-6) == "separable"
+    # 1D kernels and complex weights
+    assert ndi.choose_filter_method(cp.ones((1, 101))) == "direct"
+    assert ndi.choose_filter_method(cp.ones((15, 15), complex)) == "direct"
+
+
+def test_separable_factorization_cached():
+    from cupyimg.scipy.ndimage import _filters_separable
+
+    w = _low_rank_weights((15, 15), 1)
+    fact = _filters_separable._factorize(w)
+    assert _filters_separable._factorize(w.copy()) is fact
+    assert _filters_separable._factorize(w, 1e-6) is not fact
+
+
+def test_separable_batch_axes():
+    rng = cp.random.RandomState(0)
+    x = rng.standard_normal((3, 32, 32))
+    w = _low_rank_weights((15, 15), 1)
+    result = correlate(x, w, batch_axes=0, method="auto")
+    for n in range(x.shape[0]):
+        expected = correlate(x[n], w, method="direct")
+        assert_allclose(result[n], expected, rtol=1e-10, atol=1e-10)
+
+
+def test_separable_invalid():
+    x = cp.zeros((16, 16))
+    with pytest.raises(ValueError):
+        correlate(x, cp.ones((9, 9)), method="fft")
+    with pytest.raises(ValueError):
+        correlate(
+            x, cp.ones((9, 9)), mode="constant", cval=1, method="separable"
+        )
+    with pytest.raises(ValueError):
+        correlate(x, cp.ones((1, 9)), method="separable")
+
+
+@pytest.mark.parametrize(
+    "mode", ["reflect", "constant", "nearest", "mirror", "wrap"]
+)
+@pytest.mark.parametrize("size", [1, 2, 5, 31, 101])
+@pytest.mark.parametrize("axis", [0, 1, -1])
+def test_uniform_filter1d_running_sum(mode, size, axis):
+    rng = cp.random.RandomState(0)
+    x = rng.standard_normal((40, 57, 3))
+    for origin in {-(size // 2), 0, (size - 1) // 2}:
+        expected = scipy.ndimage.uniform_filter1d(
+            cp.asnumpy(x), size, axis, mode=mode, cval=1.5, origin=origin
+        )
+        result = ndi.uniform_filter1d(
+            x, size, axis, mode=mode, cval=1.5, origin=origin
+        )
+        assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.int16, cp.float32])
+def test_uniform_filter_running_sum_dtypes(dtype):
+    rng = cp.random.RandomState(0)
+    x = rng.uniform(0, 100, (64, 48)).astype(dtype)
+    expected = scipy.ndimage.uniform_filter(cp.asnumpy(x), (15, 7))
+    result = ndi.uniform_filter(x, (15, 7))
+    assert result.dtype == x.dtype
+    assert_allclose(result, expected, atol=1 if dtype != cp.float32 else 1e-4)
+    # in-place
+    ndi.uniform_filter(x, (15, 7), output=x)
+    assert_array_equal(x, result)
+
+
+def test_uniform_filter1d_compensated():
+    rng = cp.random.RandomState(0)
+    x = (1000 + rng.standard_normal(100000)).astype(cp.float32)
+    expected = scipy.ndimage.uniform_filter1d(cp.asnumpy(x).astype(float), 201)
+    plain = ndi.uniform_filter1d(x, 201, dtype_mode="float")
+    comp = ndi.uniform_filter1d(x, 201, dtype_mode="float", compensated=True)
+    assert comp.dtype == cp.float32
+    err_plain = float(abs(plain - cp.asarray(expected)).max())
+    err_comp = float(abs(comp - cp.asarray(expected)).max())
+    assert err_comp <= err_plain
+    assert_allclose(comp, expected, rtol=1e-6)
+
+
+def test_uniform_filter1d_complex():
+    rng = cp.random.RandomState(0)
+    x = rng.standard_normal((16, 9)) + 1j * rng.standard_normal((16, 9))
+    result = ndi.uniform_filter1d(x, 4, axis=0)
+    expected = ndi.uniform_filter1d(x.real, 4, axis=0)
+    expected = expected + 1j * ndi.uniform_filter1d(x.imag, 4, axis=0)
+    assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "mode", ["reflect", "constant", "nearest", "mirror", "wrap"]
+)
+@pytest.mark.parametrize("size", [8, 9, 51, 201])
+@pytest.mark.parametrize("func", ["minimum_filter1d", "maximum_filter1d"])
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.int32, cp.float64])
+def test_min_max_filter1d_vhgw(mode, size, func, dtype):
+    rng = cp.random.RandomState(0)
+    x = rng.uniform(0, 200, (67, 45)).astype(dtype)
+    x_cpu = cp.asnumpy(x)
+    for axis in [0, 1]:
+        for origin in {-(size // 2), 0, (size - 1) // 2}:
+            expected = getattr(scipy.ndimage, func)(
+                x_cpu, size, axis, mode=mode, cval=3.5, origin=origin
+            )
+            result = getattr(ndi, func)(
+                x, size, axis, mode=mode, cval=3.5, origin=origin
+            )
+            assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("func", ["minimum_filter", "maximum_filter"])
+@pytest.mark.parametrize("mode", ["reflect", "constant", "wrap"])
+def test_min_max_filter_box_footprint(func, mode):
+    rng = cp.random.RandomState(0)
+    x = rng.standard_normal((40, 50))
+    # a box padded by zeros (as produced by shifting even-sized selems)
+    footprint = cp.zeros((12, 11), dtype=bool)
+    footprint[1:11, 2:11] = True
+    for origin in [0, (1, -2)]:
+        expected = getattr(scipy.ndimage, func)(
+            cp.asnumpy(x),
+            footprint=cp.asnumpy(footprint),
+            mode=mode,
+            origin=origin,
+        )
+        result = getattr(ndi, func)(
+            x, footprint=footprint, mode=mode, origin=origin
+        )
+        assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("func", ["grey_erosion", "grey_dilation"])
+def test_grey_morphology_empty_structure(func):
+    x = cp.arange(20, dtype=float).reshape(4, 5)
+    result = getattr(ndi, func)(x, structure=cp.zeros((0, 3)))
+    assert_array_equal(result, cp.zeros_like(x))
+
+
+@pytest.mark.parametrize("func", ["grey_erosion", "grey_dilation"])
+def test_grey_morphology_flat_structure(func):
+    rng = cp.random.RandomState(0)
+    x = rng.randint(0, 255, (40, 50)).astype(cp.uint8)
+    structure = cp.zeros((15, 21))
+    expected = getattr(scipy.ndimage, func)(
+        cp.asnumpy(x), structure=cp.asnumpy(structure)
+    )
+    result = getattr(ndi, func)(x, structure=structure)
+    assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "mode", ["reflect", "constant", "nearest", "mirror", "wrap"]
+)
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.int8, cp.uint16, cp.int16])
+@pytest.mark.parametrize("origin", [0, (2, -1)])
+def test_rank_filter_histogram(mode, dtype, origin):
+    rng = cp.random.RandomState(0)
+    info = cp.iinfo(dtype)
+    x = rng.randint(info.min, info.max + 1, (40, 50)).astype(dtype)
+    x_cpu = cp.asnumpy(x)
+    # a disk, large enough for the sliding histogram to be used
+    yy, xx = cp.mgrid[-9:10, -9:10]
+    footprint = (yy * yy + xx * xx) <= 81
+    footprint_cpu = cp.asnumpy(footprint)
+    kwargs = dict(mode=mode, cval=7, origin=origin)
+    assert _use_histogram(x.dtype, int(footprint.sum()), mode, 7)
+    expected = scipy.ndimage.median_filter(
+        x_cpu, footprint=footprint_cpu, **kwargs
+    )
+    result = ndi.median_filter(x, footprint=footprint, **kwargs)
+    assert_array_equal(result, expected)
+    expected = scipy.ndimage.rank_filter(
+        x_cpu, 15, footprint=footprint_cpu, **kwargs
+    )
+    result = ndi.rank_filter(x, 15, footprint=footprint, **kwargs)
+    assert_array_equal(result, expected)
+    expected = scipy.ndimage.percentile_filter(
+        x_cpu, 80, size=(16, 15), **kwargs
+    )
+    result = ndi.percentile_filter(x, 80, size=(16, 15), **kwargs)
+    assert_array_equal(result, expected)
+
+
+def test_rank_filter_histogram_3d():
+    rng = cp.random.RandomState(0)
+    x = rng.randint(0, 256, (9, 30, 31)).astype(cp.uint8)
+    footprint = rng.rand(3, 7, 8) > 0.3
+    expected = scipy.ndimage.median_filter(
+        cp.asnumpy(x), footprint=cp.asnumpy(footprint)
+    )
+    result = ndi.median_filter(x, footprint=footprint)
+    assert_array_equal(result, expected)
+    # float output
+    expected = scipy.ndimage.median_filter(
+        cp.asnumpy(x),
+        footprint=cp.asnumpy(footprint),
+        output=float,
+        mode="constant",
+        cval=7,
+    )
+    result = ndi.median_filter(
+        x, footprint=footprint, output=float, mode="constant", cval=7
+    )
+    assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("func", ["binary_erosion", "binary_dilation"])
+@pytest.mark.parametrize("shape", [(5, 7), (70, 33), (130, 100), (3, 300)])
+@pytest.mark.parametrize("iterations", [2, 17, 0])
+@pytest.mark.parametrize("masked", [False, True])
+@pytest.mark.parametrize("border_value", [0, 1])
+def test_binary_morphology_packed(
+    func, shape, iterations, masked, border_value
+):
+    rng = cp.random.RandomState(0)
+    x = rng.rand(*shape) > 0.3
+    mask = rng.rand(*shape) > 0.2 if masked else None
+    for structure, origin in [
+        (None, 0),
+        (ndi.generate_binary_structure(2, 2), (0, 1)),
+        (cp.ones((2, 3), dtype=bool), 0),
+        (rng.rand(3, 9) > 0.4, (1, -2)),
+    ]:
+        if structure is not None and iterations < 1:
+            # iterating until convergence requires the center
+            structure = structure.copy()
+            center = [n // 2 for n in structure.shape]
+            if origin:
+                center = [c + o for c, o in zip(center, origin)]
+            structure[tuple(center)] = True
+        kwargs = dict(
+            structure=structure,
+            iterations=iterations,
+            border_value=border_value,
+            origin=origin,
+        )
+        expected = getattr(scipy.ndimage, func)(
+            cp.asnumpy(x),
+            mask=None if mask is None else cp.asnumpy(mask),
+            **{
+                k: cp.asnumpy(v) if isinstance(v, cp.ndarray) else v
+                for k, v in kwargs.items()
+            },
+        )
+        result = getattr(ndi, func)(x, mask=mask, **kwargs)
+        assert_array_equal(result, expected)
+
+
+def test_binary_fill_holes_packed():
+    rng = cp.random.RandomState(0)
+    x = cp.zeros((150, 200), dtype=bool)
+    x[10:140, 20:180] = True
+    x[30:60, 40:90] = False
+    x[100:120, 150:170] = False
+    x |= rng.rand(150, 200) > 0.9
+    expected = scipy.ndimage.binary_fill_holes(cp.asnumpy(x))
+    assert_array_equal(ndi.binary_fill_holes(x), expected)
+    seed = cp.zeros_like(x)
+    seed[45, 60] = True
+    expected = scipy.ndimage.binary_propagation(
+        cp.asnumpy(seed), mask=cp.asnumpy(~x)
+    )
+    assert_array_equal(ndi.binary_propagation(seed, mask=~x), expected)
+
+
+@pytest.mark.parametrize("func", ["binary_erosion", "binary_dilation"])
+@pytest.mark.parametrize("iterations", [1, 3, 0])
+@pytest.mark.parametrize("masked", [False, True])
+def test_binary_morphology_packed_mask(func, iterations, masked):
+    from cupyimg.skimage.util import PackedMask, pack_mask
+
+    rng = cp.random.RandomState(0)
+    x = rng.rand(70, 45) > 0.3
+    mask = rng.rand(70, 45) > 0.2 if masked else None
+    structure = ndi.generate_binary_structure(2, 2)
+    kwargs = dict(
+        structure=structure, iterations=iterations, border_value=1, origin=1
+    )
+    expected = getattr(ndi, func)(x, mask=mask, **kwargs)
+    packed_mask = None if mask is None else pack_mask(mask)
+    result = getattr(ndi, func)(pack_mask(x), mask=packed_mask, **kwargs)
+    assert isinstance(result, PackedMask)
+    assert_array_equal(result.unpack(), expected)
+    # packed input with an unpacked output
+    out = cp.zeros(x.shape, dtype=cp.uint8)
+    getattr(ndi, func)(pack_mask(x), mask=mask, output=out, **kwargs)
+    assert_array_equal(out, expected)
+
+
+def test_binary_fill_holes_packed_mask():
+    from cupyimg.skimage.util import PackedMask, pack_mask
+
+    x = cp.zeros((40, 70), dtype=bool)
+    x[5:35, 10:60] = True
+    x[10:20, 20:30] = False
+    expected = ndi.binary_fill_holes(x)
+    result = ndi.binary_fill_holes(pack_mask(x))
+    assert isinstance(result, PackedMask)
+    assert_array_equal(result.unpack(), expected)
+    # 3D images go through the unpacked kernels
+    x3 = cp.stack([x] * 3)
+    expected = ndi.binary_fill_holes(x3)
+    assert_array_equal(ndi.binary_fill_holes(pack_mask(x3)).unpack(), expected)
@@ -1,9 +1,11 @@
+import math
 import unittest
 
 import numpy
 
 import cupy
 from cupy import testing
+import pytest
 from cupyimg.testing import numpy_cupyimg_allclose
 import cupyimg.scipy.ndimage
 
@@ -22,8 +24,8 @@ except ImportError:
 
 
 @testing.parameterize(
-    (
-        *testing.product(
+    *(
+        testing.product(
             {
                 "output": [None, numpy.float64, "f", float, "empty"],
                 "order": [0, 1, 3],
@@ -693,3 +695,165 @@ class TestZoomOpenCV(unittest.TestCase):
         else:
             output_shape = numpy.rint(numpy.multiply(a.shape, self.zoom))
             return cv2.resize(a, tuple(output_shape.astype(int)))
+
+
+@pytest.mark.parametrize("mode", ["nearest", "mirror", "grid-constant"])
+@pytest.mark.parametrize("order", [1, 3, 5])
+@pytest.mark.parametrize("dtype", [cupy.uint8, cupy.float32, cupy.float64])
+def test_spline_coefficients(mode, order, dtype):
+    rng = cupy.random.RandomState(0)
+    x = (rng.standard_normal((24, 31)) * 100).astype(dtype)
+    coefficients = cupyimg.scipy.ndimage.SplineCoefficients(
+        x, order=order, mode=mode, cval=1.5
+    )
+    assert coefficients.shape == x.shape
+    assert coefficients.dtype == x.dtype
+    kwargs = dict(order=order, mode=mode, cval=1.5)
+
+    coords = rng.uniform(-3, 34, (2, 17, 19))
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.map_coordinates(coefficients, coords),
+        cupyimg.scipy.ndimage.map_coordinates(x, coords, **kwargs),
+    )
+    matrix = cupy.asarray([[0.9, 0.2, 1.5], [-0.1, 1.1, -2.0], [0, 0, 1]])
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.affine_transform(
+            coefficients, matrix, output_shape=(30, 20)
+        ),
+        cupyimg.scipy.ndimage.affine_transform(
+            x, matrix, output_shape=(30, 20), **kwargs
+        ),
+    )
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.rotate(coefficients, 25),
+        cupyimg.scipy.ndimage.rotate(x, 25, **kwargs),
+    )
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.shift(coefficients, (1.5, -2.25)),
+        cupyimg.scipy.ndimage.shift(x, (1.5, -2.25), **kwargs),
+    )
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.zoom(coefficients, (1.7, 0.6)),
+        cupyimg.scipy.ndimage.zoom(x, (1.7, 0.6), **kwargs),
+    )
+
+
+def test_spline_coefficients_invalid():
+    x = cupy.ones((8, 8))
+    with pytest.raises(ValueError):
+        cupyimg.scipy.ndimage.SplineCoefficients(x, mode="opencv")
+    with pytest.raises(ValueError):
+        cupyimg.scipy.ndimage.SplineCoefficients(x, order=6)
+    with pytest.raises(TypeError):
+        cupyimg.scipy.ndimage.SplineCoefficients(numpy.ones((8, 8)))
+
+
+@pytest.mark.parametrize("mode", ["constant", "nearest", "mirror", "wrap"])
+@pytest.mark.parametrize("order", [0, 1, 3])
+@pytest.mark.parametrize("dtype", [cupy.uint8, cupy.float32, cupy.float64])
+def test_interpolation_channels_last(mode, order, dtype):
+    rng = cupy.random.RandomState(0)
+    x = (rng.standard_normal((21, 18, 3)) * 50 + 100).astype(dtype)
+    kwargs = dict(order=order, mode=mode, cval=2)
+
+    def _per_channel(func, *args, **kw):
+        kw.update(kwargs)
+        out = [func(x[..., c], *args, **kw) for c in range(x.shape[-1])]
+        return cupy.stack(out, axis=-1)
+
+    coords = rng.uniform(-3, 24, (2, 13, 11))
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.map_coordinates(
+            x, coords, channels_last=True, **kwargs
+        ),
+        _per_channel(cupyimg.scipy.ndimage.map_coordinates, coords),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+    matrix = cupy.asarray([[0.9, 0.2, 1.5], [-0.1, 1.1, -2.0], [0, 0, 1]])
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.affine_transform(
+            x, matrix, output_shape=(15, 25), channels_last=True, **kwargs
+        ),
+        _per_channel(
+            cupyimg.scipy.ndimage.affine_transform,
+            matrix,
+            output_shape=(15, 25),
+        ),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+    testing.assert_allclose(
+        cupyimg.scipy.ndimage.affine_transform(
+            x,
+            cupy.asarray([0.713, 1.317]),
+            (1.1, -2.3),
+            channels_last=True,
+            **kwargs,
+        ),
+        _per_channel(
+            cupyimg.scipy.ndimage.affine_transform,
+            cupy.asarray([0.713, 1.317]),
+            (1.1, -2.3),
+        ),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+    zoomed = cupyimg.scipy.ndimage.zoom(
+        x, (1.6, 0.7), channels_last=True, **kwargs
+    )
+    assert zoomed.shape == (34, 13, 3)
+    testing.assert_allclose(
+        zoomed,
+        _per_channel(cupyimg.scipy.ndimage.zoom, (1.6, 0.7)),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+
+
+@pytest.mark.parametrize("mode", ["constant", "nearest", "mirror", "opencv"])
+@pytest.mark.parametrize("order", [0, 1, 3])
+@pytest.mark.parametrize("channels_last", [False, True])
+def test_affine_transform_batched(mode, order, channels_last):
+    rng = cupy.random.RandomState(0)
+    shape = (4, 19, 23, 3) if channels_last else (4, 19, 23)
+    x = rng.standard_normal(shape)
+    matrices = cupy.zeros((4, 3, 3))
+    for t in range(4):
+        angle = 0.1 + 0.2 * t
+        matrices[t, :2, :2] = cupy.asarray(
+            [
+                [math.cos(angle), -math.sin(angle)],
+                [math.sin(angle), math.cos(angle)],
+            ]
+        ) * (0.9 + 0.05 * t)
+        matrices[t, :2, 2] = cupy.asarray([1.3 * t - 2, 0.7 - t])
+        matrices[t, 2, 2] = 1
+    kwargs = dict(
+        order=order,
+        mode=mode,
+        cval=0.5,
+        output_shape=(17, 25),
+        channels_last=channels_last,
+    )
+    out = cupyimg.scipy.ndimage.affine_transform(x, matrices, **kwargs)
+    assert out.shape == (4, 17, 25) + shape[3:]
+    for t in range(4):
+        expected = cupyimg.scipy.ndimage.affine_transform(
+            x[t], matrices[t], **kwargs
+        )
+        testing.assert_allclose(out[t], expected, rtol=1e-6, atol=1e-6)
+
+    # (T, ndim, ndim) linear transformations with an offset per frame
+    offsets = rng.uniform(-2, 2, (4, 2))
+    out = cupyimg.scipy.ndimage.affine_transform(
+        x, matrices[:, :2, :2], offsets, **kwargs
+    )
+    for t in range(4):
+        expected = cupyimg.scipy.ndimage.affine_transform(
+            x[t], matrices[t, :2, :2], offsets[t], **kwargs
+        )
+        testing.assert_allclose(out[t], expected, rtol=1e-6, atol=1e-6)
+
+    with pytest.raises(ValueError):
+        cupyimg.scipy.ndimage.affine_transform(x[:3], matrices, **kwargs)
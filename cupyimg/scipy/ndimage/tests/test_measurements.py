@@ -8,9 +8,14 @@ from numpy.testing import (
     assert_almost_equal,
     assert_raises,
 )
-from cupy.testing import assert_array_equal, assert_array_almost_equal
+from cupy.testing import (
+    assert_allclose,
+    assert_array_equal,
+    assert_array_almost_equal,
+)
 from numpy.testing import suppress_warnings
 import pytest
+from scipy import ndimage as scipy_ndimage
 
 import cupyimg.scipy.ndimage as ndimage
 
@@ -378,86 +383,109 @@ def test_label_default_dtype():
     test_array = cp.random.rand(10, 10)
     label, no_features = ndimage.label(test_array > 0.5)
     assert_(label.dtype in (cp.int32, cp.int64))
-    # TODO: uncomment once find_objects is implemented
     # Shouldn't raise an exception
-    # ndimage.find_objects(label)
-
-
-# def test_find_objects01():
-#     data = cp.ones([], dtype=int)
-#     out = ndimage.find_objects(data)
-#     assert_(out == [()])
-
-
-# def test_find_objects02():
-#     data = cp.zeros([], dtype=int)
-#     out = ndimage.find_objects(data)
-#     assert_(out == [])
-
-
-# def test_find_objects03():
-#     data = cp.ones([1], dtype=int)
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [(slice(0, 1, None),)])
-
-
-# def test_find_objects04():
-#     data = cp.zeros([1], dtype=int)
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [])
-
-
-# def test_find_objects05():
-#     data = cp.ones([5], dtype=int)
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [(slice(0, 5, None),)])
-
-
-# def test_find_objects06():
-#     data = cp.asarray([1, 0, 2, 2, 0, 3])
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [(slice(0, 1, None),),
-#                        (slice(2, 4, None),),
-#                        (slice(5, 6, None),)])
-
-
-# def test_find_objects07():
-#     data = cp.asarray([[0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 0, 0, 0]])
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [])
-
-
-# def test_find_objects08():
-#     data = cp.asarray([[1, 0, 0, 0, 0, 0],
-#                        [0, 0, 2, 2, 0, 0],
-#                        [0, 0, 2, 2, 2, 0],
-#                        [3, 3, 0, 0, 0, 0],
-#                        [3, 3, 0, 0, 0, 0],
-#                        [0, 0, 0, 4, 4, 0]])
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [(slice(0, 1, None), slice(0, 1, None)),
-#                        (slice(1, 3, None), slice(2, 5, None)),
-#                        (slice(3, 5, None), slice(0, 2, None)),
-#                        (slice(5, 6, None), slice(3, 5, None))])
-
-
-# def test_find_objects09():
-#     data = cp.asarray([[1, 0, 0, 0, 0, 0],
-#                        [0, 0, 2, 2, 0, 0],
-#                        [0, 0, 2, 2, 2, 0],
-#                        [0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 0, 0, 0],
-#                        [0, 0, 0, 4, 4, 0]])
-#     out = ndimage.find_objects(data)
-#     assert_equal(out, [(slice(0, 1, None), slice(0, 1, None)),
-#                        (slice(1, 3, None), slice(2, 5, None)),
-#                        None,
-#                        (slice(5, 6, None), slice(3, 5, None))])
+    ndimage.find_objects(label)
+
+
+def test_find_objects01():
+    data = cp.ones([], dtype=int)
+    out = ndimage.find_objects(data)
+    assert_(out == [()])
+
+
+def test_find_objects02():
+    data = cp.zeros([], dtype=int)
+    out = ndimage.find_objects(data)
+    assert_(out == [])
+
+
+def test_find_objects03():
+    data = cp.ones([1], dtype=int)
+    out = ndimage.find_objects(data)
+    assert_equal(out, [(slice(0, 1, None),)])
+
+
+def test_find_objects04():
+    data = cp.zeros([1], dtype=int)
+    out = ndimage.find_objects(data)
+    assert_equal(out, [])
+
+
+def test_find_objects05():
+    data = cp.ones([5], dtype=int)
+    out = ndimage.find_objects(data)
+    assert_equal(out, [(slice(0, 5, None),)])
+
+
+def test_find_objects06():
+    # fmt: off
+    data = cp.asarray([1, 0, 2, 2, 0, 3])
+    out = ndimage.find_objects(data)
+    assert_equal(out, [(slice(0, 1, None),),
+                       (slice(2, 4, None),),
+                       (slice(5, 6, None),)])
+    # fmt: on
+
+
+def test_find_objects07():
+    # fmt: off
+    data = cp.asarray([[0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0]])
+    # fmt: on
+    out = ndimage.find_objects(data)
+    assert_equal(out, [])
+
+
+def test_find_objects08():
+    # fmt: off
+    data = cp.asarray([[1, 0, 0, 0, 0, 0],
+                       [0, 0, 2, 2, 0, 0],
+                       [0, 0, 2, 2, 2, 0],
+                       [3, 3, 0, 0, 0, 0],
+                       [3, 3, 0, 0, 0, 0],
+                       [0, 0, 0, 4, 4, 0]])
+    out = ndimage.find_objects(data)
+    assert_equal(out, [(slice(0, 1, None), slice(0, 1, None)),
+                       (slice(1, 3, None), slice(2, 5, None)),
+                       (slice(3, 5, None), slice(0, 2, None)),
+                       (slice(5, 6, None), slice(3, 5, None))])
+    # fmt: on
+
+
+def test_find_objects09():
+    # fmt: off
+    data = cp.asarray([[1, 0, 0, 0, 0, 0],
+                       [0, 0, 2, 2, 0, 0],
+                       [0, 0, 2, 2, 2, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 0, 0, 0],
+                       [0, 0, 0, 4, 4, 0]])
+    out = ndimage.find_objects(data)
+    assert_equal(out, [(slice(0, 1, None), slice(0, 1, None)),
+                       (slice(1, 3, None), slice(2, 5, None)),
+                       None,
+                       (slice(5, 6, None), slice(3, 5, None))])
+    # fmt: on
+
+
+def test_find_objects_max_label():
+    data = cp.asarray([1, 0, 2, 2, 0, 3])
+    out = ndimage.find_objects(data, max_label=2)
+    assert_equal(out, [(slice(0, 1, None),), (slice(2, 4, None),)])
+    out = ndimage.find_objects(data, max_label=5)
+    assert_equal(out[3:], [None, None])
+
+
+def test_find_objects_3d():
+    rng = np.random.RandomState(0)
+    data = rng.randint(0, 20, (9, 10, 11))
+    expected = scipy_ndimage.find_objects(data)
+    out = ndimage.find_objects(cp.asarray(data))
+    assert_equal(out, expected)
 
 
 def test_sum01():
@@ -1085,3 +1113,228 @@ def test_stat_funcs_2d():
 
     max = ndimage.maximum(a, labels=lbl, index=index)
     assert_array_equal(max, [9, 5])
+
+
+@pytest.mark.parametrize(
+    "shape", [(300,), (5, 7), (40, 70), (9, 33, 17), (3, 4, 5, 6)]
+)
+@pytest.mark.parametrize("output", [None, cp.int32, cp.int64, cp.uint16])
+def test_label_union_find(shape, output):
+    rng = cp.random.RandomState(0)
+    x = rng.rand(*shape) > 0.5
+    for connectivity in range(1, len(shape) + 1):
+        structure = ndimage.generate_binary_structure(len(shape), connectivity)
+        expected, n_expected = scipy_ndimage.label(
+            cp.asnumpy(x), cp.asnumpy(structure)
+        )
+        labels, n = ndimage.label(x, structure, output=output)
+        assert n == n_expected
+        assert labels.dtype == (cp.int32 if output is None else output)
+        assert_array_equal(labels, expected)
+
+
+@pytest.mark.parametrize("shape", [(5, 7), (40, 70), (9, 33, 17)])
+def test_label_union_find_greyscale(shape):
+    rng = cp.random.RandomState(0)
+    x = rng.randint(0, 3, shape)
+    structure = ndimage.generate_binary_structure(len(shape), len(shape))
+    labels, n = ndimage.label(
+        x, structure, output=cp.int64, greyscale_mode=True
+    )
+    # label each value separately and number the components in C order
+    x_cpu = cp.asnumpy(x)
+    components = []
+    for v in (1, 2):
+        lab, n_v = scipy_ndimage.label(x_cpu == v, cp.asnumpy(structure))
+        components += [np.flatnonzero(lab == j) for j in range(1, n_v + 1)]
+    components.sort(key=lambda c: c[0])
+    expected = np.zeros(x.size, dtype=np.int64)
+    for j, c in enumerate(components):
+        expected[c] = j + 1
+    assert n == len(components)
+    assert_array_equal(labels, expected.reshape(shape))
+
+
+def test_label_union_find_kernels_memoized():
+    from cupyimg.scipy.ndimage import _label_uf
+
+    x = cp.ones((20, 20), dtype=bool)
+    ndimage.label(x)
+    kernel = _label_uf._get_label_merge_kernel(
+        2, _label_uf._tile_shape(x.shape), "int", False
+    )
+    ndimage.label(~x)
+    assert kernel is _label_uf._get_label_merge_kernel(
+        2, _label_uf._tile_shape(x.shape), "int", False
+    )
+
+
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.int32, cp.float32, cp.float64])
+@pytest.mark.parametrize("n_labels", [4, 3000])
+@pytest.mark.parametrize("median", [False, True])
+def test_labeled_statistics(dtype, n_labels, median):
+    # n_labels above _SCATTER_MAX_SEGMENTS selects the sort-based strategy
+    rng = np.random.RandomState(0)
+    shape = (60, 70)
+    x = (rng.permutation(shape[0] * shape[1]).reshape(shape) % 251).astype(
+        dtype
+    )
+    labels = rng.randint(0, n_labels, shape)
+    index = np.arange(1, n_labels + 2)[::3]  # includes a missing label
+    stats = ["count", "sum", "mean", "variance", "standard_deviation"]
+    stats += ["minimum", "maximum"]
+    if median:
+        stats += ["median"]
+    result = ndimage.labeled_statistics(
+        cp.asarray(x), cp.asarray(labels), cp.asarray(index), stats
+    )
+    present = np.isin(index, labels)
+    count = np.asarray([(labels == i).sum() for i in index])
+    assert_array_equal(result["count"], count)
+    for name in stats[1:]:
+        expected = getattr(scipy_ndimage, name)(x, labels, index[present])
+        assert_allclose(result[name][cp.asarray(present)], expected, rtol=1e-6)
+    missing = cp.asarray(~present)
+    for name in ["sum", "minimum", "maximum"]:
+        assert_array_equal(result[name][missing], 0)
+    assert cp.isnan(result["mean"][missing]).all()
+    assert result["minimum"].dtype == result["maximum"].dtype == dtype
+
+
+@pytest.mark.parametrize("n_labels", [4, 3000])
+def test_labeled_statistics_positions(n_labels):
+    rng = np.random.RandomState(0)
+    shape = (60, 70)
+    x = rng.standard_normal(shape)
+    x[5:10, 5:10] = 0  # repeated extrema
+    labels = rng.randint(1, n_labels, shape)
+    labels[5:10, 5:10] = n_labels
+    index = np.arange(1, n_labels + 1)
+    result = ndimage.labeled_statistics(
+        cp.asarray(x),
+        cp.asarray(labels),
+        cp.asarray(index),
+        ["minimum_position", "maximum_position"],
+    )
+    # the first occurrence of each extremum
+    for name, func in [
+        ("minimum_position", np.argmin),
+        ("maximum_position", np.argmax),
+    ]:
+        expected = []
+        for i in index:
+            positions = np.flatnonzero(labels == i)
+            if positions.size == 0:
+                expected.append(0)
+            else:
+                expected.append(positions[func(x.ravel()[positions])])
+        assert_array_equal(result[name], expected)
+
+
+def test_labeled_statistics_scalar():
+    rng = np.random.RandomState(0)
+    x = rng.standard_normal((30, 40))
+    labels = rng.randint(0, 4, x.shape)
+    x_gpu, labels_gpu = cp.asarray(x), cp.asarray(labels)
+    result = ndimage.labeled_statistics(
+        x_gpu, labels_gpu, 2, ["mean", "median"]
+    )
+    assert result["mean"].ndim == 0
+    assert_allclose(result["mean"], scipy_ndimage.mean(x, labels, 2))
+    assert_allclose(result["median"], scipy_ndimage.median(x, labels, 2))
+    result = ndimage.labeled_statistics(x_gpu, labels_gpu, stats=["variance"])
+    assert_allclose(result["variance"], scipy_ndimage.variance(x, labels))
+    result = ndimage.labeled_statistics(x_gpu, stats="sum")
+    assert_allclose(result["sum"], x.sum())
+    with pytest.raises(ValueError):
+        ndimage.labeled_statistics(x_gpu, labels_gpu, stats=["mode"])
+
+
+@pytest.mark.parametrize("func", [cp.mean, cp.median, cp.max, np.std, np.sum])
+def test_labeled_comprehension_reduction(func):
+    rng = np.random.RandomState(0)
+    x = rng.standard_normal((30, 40))
+    labels = rng.randint(0, 5, x.shape)
+    index = np.arange(1, 7)
+    result = ndimage.labeled_comprehension(
+        cp.asarray(x), cp.asarray(labels), cp.asarray(index), func, float, -1
+    )
+    np_func = getattr(np, func.__name__)
+    expected = scipy_ndimage.labeled_comprehension(
+        x, labels, index, np_func, float, -1
+    )
+    assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.int16, cp.float32])
+@pytest.mark.parametrize("n_labels", [5, 2000])
+def test_labeled_histogram(dtype, n_labels):
+    # n_labels * bins above _HISTOGRAM_MAX_SHARED counts in global memory
+    rng = np.random.RandomState(0)
+    shape = (100, 80)
+    x = rng.randint(0, 100, shape).astype(dtype)
+    labels = rng.randint(0, n_labels, shape)
+    index = np.arange(1, n_labels + 2)  # includes a missing label
+    bins = 16
+    hist = ndimage.labeled_histogram(
+        cp.asarray(x), 10, 90, bins, cp.asarray(labels), cp.asarray(index)
+    )
+    assert hist.shape == (index.size, bins)
+    assert hist.dtype == cp.int64
+    expected = np.stack(
+        [
+            np.histogram(x[labels == i], np.linspace(10, 90, bins + 1))[0]
+            for i in index
+        ]
+    )
+    assert_array_equal(hist, expected)
+
+    hist = ndimage.labeled_histogram(cp.asarray(x), 10, 90, bins)
+    assert_array_equal(hist, scipy_ndimage.histogram(x, 10, 90, bins))
+
+
+def test_histogram_labels():
+    rng = np.random.RandomState(0)
+    x = rng.standard_normal((30, 40))
+    labels = rng.randint(0, 4, x.shape)
+    x_gpu, labels_gpu = cp.asarray(x), cp.asarray(labels)
+    index = [1, 3, 5]
+    hist = ndimage.histogram(x_gpu, -2, 2, 10, labels_gpu, cp.asarray(index))
+    expected = scipy_ndimage.histogram(x, -2, 2, 10, labels, index)
+    assert hist.dtype == object
+    assert hist[2] is None and expected[2] is None
+    for h, e in zip(hist[:2], expected[:2]):
+        assert_array_equal(h, e)
+    assert_array_equal(
+        ndimage.histogram(x_gpu, -2, 2, 10, labels_gpu),
+        scipy_ndimage.histogram(x, -2, 2, 10, labels),
+    )
+
+
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.float32, cp.float64])
+def test_labeled_quantiles(dtype):
+    rng = np.random.RandomState(0)
+    shape = (50, 60)
+    x = rng.randint(0, 200, shape).astype(dtype)
+    labels = rng.randint(0, 50, shape)
+    index = np.arange(1, 52)  # includes a missing label
+    q = [0.05, 0.5, 0.95]
+    result = ndimage.labeled_quantiles(
+        cp.asarray(x), q, cp.asarray(labels), cp.asarray(index)
+    )
+    assert result.shape == (index.size, len(q))
+    expected = np.stack(
+        [
+            np.quantile(x[labels == i].astype(float), q)
+            if (labels == i).any()
+            else np.full(len(q), np.nan)
+            for i in index
+        ]
+    )
+    assert_allclose(result, expected)
+
+    median = ndimage.labeled_quantiles(cp.asarray(x), 0.5, cp.asarray(labels))
+    assert median.ndim == 0
+    assert_allclose(median, scipy_ndimage.median(x, labels))
+    with pytest.raises(ValueError):
+        ndimage.labeled_quantiles(cp.asarray(x), [0.5, 1.5], cp.asarray(labels))
@@ -0,0 +1,228 @@
+import cupy as cp
+import numpy as np
+import pytest
+from cupy.testing import assert_allclose, assert_array_equal
+from scipy import ndimage as scipy_ndimage
+
+import cupyimg.scipy.ndimage as sndi
+from cupyimg.scipy.ndimage import _tile_plan
+
+modes = ["reflect", "constant", "nearest", "mirror", "wrap"]
+
+
+def _tiled_reference(func, x, halo, block_shape, mode, **kwargs):
+    """Apply a SciPy filter tile by tile according to the plan."""
+    out = np.empty_like(x)
+    for tile in _tile_plan.plan_tiles(x.shape, halo, block_shape, mode):
+        slab = np.empty(tile.input_shape, dtype=x.dtype)
+        _tile_plan.gather(x, tile, slab)
+        out[tile.output_slices] = func(slab, mode=mode, **kwargs)[
+            tile.interior_slices
+        ]
+    return out
+
+
+@pytest.mark.parametrize("mode", modes)
+@pytest.mark.parametrize("origin", [-1, 0, (1, -1)])
+@pytest.mark.parametrize("block_shape", [(1, 4), (5, 3), (7, 11)])
+@pytest.mark.parametrize("convolution", [False, True])
+def test_plan_correlate_vs_scipy(mode, origin, block_shape, convolution):
+    rng = np.random.RandomState(0)
+    x = rng.randn(13, 17)
+    weights = rng.randn(4, 3)
+    func = scipy_ndimage.convolve if convolution else scipy_ndimage.correlate
+    halo = _tile_plan.filter_halo(
+        func.__name__, x.ndim, weights=weights.shape, origin=origin
+    )
+    expected = func(x, weights, mode=mode, origin=origin)
+    result = _tiled_reference(
+        func, x, halo, block_shape, mode, weights=weights, origin=origin
+    )
+    assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("mode", modes)
+@pytest.mark.parametrize(
+    "name, kwargs",
+    [
+        ("gaussian_filter", dict(sigma=(1.5, 0.7))),
+        ("uniform_filter", dict(size=(4, 5), origin=(1, -2))),
+        ("median_filter", dict(size=3)),
+        ("minimum_filter", dict(size=(2, 5))),
+        ("minimum_filter1d", dict(size=4, axis=0, origin=1)),
+        ("sobel", dict(axis=0)),
+    ],
+)
+def test_plan_filters_vs_scipy(mode, name, kwargs):
+    rng = np.random.RandomState(0)
+    x = rng.randn(16, 21)
+    func = getattr(scipy_ndimage, name)
+    halo = _tile_plan.filter_halo(name, x.ndim, **kwargs)
+    expected = func(x, mode=mode, **kwargs)
+    result = _tiled_reference(func, x, halo, (3, 4), mode, **kwargs)
+    assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_plan_halo_larger_than_array():
+    x = np.arange(5, dtype=float)
+    weights = np.ones(15)
+    for mode in modes:
+        halo = _tile_plan.filter_halo("correlate1d", 1, weights=(15,))
+        expected = scipy_ndimage.correlate1d(x, weights, mode=mode)
+        result = _tiled_reference(
+            scipy_ndimage.correlate1d, x, halo, (2,), mode, weights=weights
+        )
+        assert_allclose(result, expected)
+
+
+def test_plan_covers_output():
+    shape = (10, 7, 3)
+    tiles = _tile_plan.plan_tiles(shape, 2, (4, 3, 3))
+    assert len(tiles) == 3 * 3 * 1
+    covered = np.zeros(shape, dtype=int)
+    for tile in tiles:
+        covered[tile.output_slices] += 1
+    assert_array_equal(covered, 1)
+
+
+def test_choose_block_shape():
+    shape = (1000, 800)
+    halo = [(3, 3), (3, 3)]
+    block = _tile_plan.choose_block_shape(shape, halo, 4, 400000)
+    assert block[1] == 800
+    assert (block[0] + 6) * 800 * 4 <= 400000
+    # everything fits: a single block
+    assert _tile_plan.choose_block_shape(shape, halo, 4, 2 ** 30) == shape
+
+
+def test_filter_halo_unknown():
+    with pytest.raises(ValueError):
+        _tile_plan.filter_halo("generic_filter", 2)
+
+
+@pytest.mark.parametrize("mode", ["reflect", "constant", "wrap"])
+@pytest.mark.parametrize(
+    "func, kwargs",
+    [
+        (sndi.gaussian_filter, dict(sigma=2)),
+        (sndi.uniform_filter, dict(size=(3, 6), origin=(0, 1))),
+        (sndi.median_filter, dict(size=5)),
+        (sndi.minimum_filter, dict(footprint=np.eye(3, dtype=bool))),
+        (sndi.rank_filter, dict(rank=2, size=3)),
+    ],
+)
+def test_tiled_filter(mode, func, kwargs):
+    rng = np.random.RandomState(5)
+    x = rng.randn(64, 48).astype(np.float32)
+    expected = func(cp.asarray(x), mode=mode, **kwargs)
+    result = sndi.tiled_filter(
+        func, x, mode=mode, block_shape=(10, 20), **kwargs
+    )
+    assert isinstance(result, np.ndarray)
+    assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("n_buffers", [1, 2, 3])
+def test_tiled_filter_memmap(tmp_path, n_buffers):
+    rng = np.random.RandomState(5)
+    shape = (100, 30)
+    x = np.lib.format.open_memmap(
+        str(tmp_path / "x.npy"), mode="w+", dtype=np.uint8, shape=shape
+    )
+    x[...] = rng.randint(0, 255, shape)
+    out = np.lib.format.open_memmap(
+        str(tmp_path / "out.npy"), mode="w+", dtype=np.float32, shape=shape
+    )
+    weights = cp.asarray(rng.randn(5, 3))
+    result = sndi.tiled_filter(
+        sndi.correlate,
+        x,
+        weights,
+        output=out,
+        max_block_bytes=1000,
+        n_buffers=n_buffers,
+    )
+    assert result is out
+    expected = sndi.correlate(cp.asarray(x), weights, output=cp.float32)
+    assert_allclose(out, expected, rtol=1e-5, atol=1e-4)
+
+
+def test_tiled_filter_explicit_halo():
+    x = np.arange(200, dtype=np.float32).reshape(20, 10)
+
+    def func(block):
+        return sndi.uniform_filter1d(block, 3, axis=0)
+
+    with pytest.raises(ValueError):
+        sndi.tiled_filter(lambda a: a, x)
+    result = sndi.tiled_filter(func, x, halo=[1, 0], block_shape=(3, 10))
+    assert_allclose(result, func(cp.asarray(x)), rtol=1e-6)
+
+
+def test_tiled_filter_device_input():
+    with pytest.raises(TypeError):
+        sndi.tiled_filter(sndi.gaussian_filter, cp.zeros((4, 4)), sigma=1)
+
+
+def _first_occurrence_labels(labels):
+    """Renumber labels in the order of their first element."""
+    flat = labels.ravel()
+    values, first = np.unique(flat, return_index=True)
+    order = np.argsort(first)
+    lookup = np.zeros(values.max() + 1, dtype=np.int64)
+    lookup[values[order]] = np.arange(len(values))
+    return lookup[flat].reshape(labels.shape)
+
+
+@pytest.mark.parametrize(
+    "shape, block_shape",
+    [((50, 60), (7, 9)), ((20, 21, 22), (5, 6, 7)), ((100,), (13,))],
+)
+def test_tiled_label(shape, block_shape):
+    rng = np.random.RandomState(0)
+    x = rng.rand(*shape) > 0.45
+    for connectivity in range(1, len(shape) + 1):
+        structure = scipy_ndimage.generate_binary_structure(
+            len(shape), connectivity
+        )
+        expected, n_expected = scipy_ndimage.label(x, structure)
+        labels, n, counts = sndi.tiled_label(
+            x, structure, block_shape=block_shape, return_counts=True
+        )
+        assert labels.dtype == np.int64
+        assert n == n_expected
+        assert_array_equal(
+            _first_occurrence_labels(labels),
+            _first_occurrence_labels(expected),
+        )
+        assert_array_equal(counts, np.bincount(labels.ravel()))
+
+
+def test_tiled_label_greyscale_memmap(tmp_path):
+    rng = np.random.RandomState(0)
+    x = rng.randint(0, 3, (40, 50))
+    expected, n_expected = sndi.label(
+        cp.asarray(x), np.ones((3, 3)), greyscale_mode=True
+    )
+    path = str(tmp_path / "labels.npy")
+    labels, n = sndi.tiled_label(
+        x,
+        np.ones((3, 3)),
+        output=path,
+        greyscale_mode=True,
+        block_shape=(6, 11),
+    )
+    assert isinstance(labels, np.memmap)
+    assert n == n_expected
+    assert_array_equal(
+        _first_occurrence_labels(labels),
+        _first_occurrence_labels(cp.asnumpy(expected)),
+    )
+    assert_array_equal(np.load(path), labels)
+
+
+def test_tiled_label_invalid():
+    with pytest.raises(TypeError):
+        sndi.tiled_label(cp.zeros((4, 4)))
+    with pytest.raises(ValueError):
+        sndi.tiled_label(np.zeros((4, 4)), output=np.zeros((4, 4)))
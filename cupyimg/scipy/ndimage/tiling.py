@@ -0,0 +1,436 @@
+"""Tiled execution of filters on host arrays that do not fit on the GPU."""
+import ctypes
+import inspect
+
+import cupy
+import numpy
+
+from cupyimg.scipy.ndimage import _tile_plan
+from cupyimg.scipy.ndimage.measurements import _generate_binary_structure, label
+
+__all__ = ["tiled_filter", "tiled_label"]
+
+
+def _filter_params(function, ndim, args, kwargs):
+    """Bind the filter arguments by name, replacing arrays by their shape."""
+    try:
+        sig = inspect.signature(function)
+        bound = sig.bind(None, *args, **kwargs)
+    except (TypeError, ValueError):
+        return None, {}
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    params.pop(next(iter(sig.parameters)))  # the input argument
+    for key in ["weights", "footprint"]:
+        val = params.get(key)
+        if val is not None:
+            params[key] = tuple(numpy.shape(val))
+    return getattr(function, "__name__", None), params
+
+
+def _pinned_empty(size, dtype):
+    dtype = numpy.dtype(dtype)
+    mem = cupy.cuda.alloc_pinned_memory(max(size, 1) * dtype.itemsize)
+    return numpy.frombuffer(mem, dtype, size)
+
+
+class _Slot(object):
+    """Stream and pinned staging buffers for one block in flight."""
+
+    def __init__(self, in_size, in_dtype, out_size, out_dtype):
+        self.stream = cupy.cuda.Stream(non_blocking=True)
+        self.host_in = _pinned_empty(in_size, in_dtype)
+        self.host_out = _pinned_empty(out_size, out_dtype)
+        self.pending = None
+
+    def finish(self, output):
+        """Wait for the block in flight and store its result in output."""
+        if self.pending is None:
+            return
+        output_slices, host_out, _ = self.pending
+        self.stream.synchronize()
+        output[output_slices] = host_out
+        # the device arrays of the block are released here, after the
+        # stream is done with them
+        self.pending = None
+
+
+def tiled_filter(
+    function,
+    input,
+    *args,
+    halo=None,
+    block_shape=None,
+    max_block_bytes=64 * 1024 * 1024,
+    output=None,
+    n_buffers=2,
+    **kwargs,
+):
+    """Apply a filter to a host array one overlapping block at a time.
+
+    The input is split into blocks that are extended by a halo sized from the
+    filter's footprint and ``origin``. The extended blocks are copied to the
+    GPU, filtered with ``function`` and the interior of each result is copied
+    back into the output. Transfers of one block overlap with the filtering
+    of the previous one by cycling through ``n_buffers`` CUDA streams with
+    pinned staging buffers.
+
+    Parameters
+    ----------
+    function : callable
+        Filter to apply, called as ``function(block, *args, **kwargs)`` on a
+        ``cupy.ndarray``. The output at each position must only depend on
+        the input within the halo around it.
+    input : numpy.ndarray or numpy.memmap
+        Host array to filter.
+    *args, **kwargs
+        Additional arguments to ``function``.
+    halo : int or sequence, optional
+        Halo size: an int, one int per axis or one ``(before, after)`` pair
+        per axis. If None, it is inferred from the arguments for the filters
+        of ``cupyimg.scipy.ndimage`` (``correlate``, ``convolve``,
+        ``gaussian_filter``, ``uniform_filter``, ``median_filter``,
+        ``rank_filter``, ``minimum_filter``, ... and their 1D variants).
+    block_shape : tuple of int, optional
+        Shape of the output blocks. If None, it is chosen so that each input
+        block including its halo takes at most ``max_block_bytes``.
+    max_block_bytes : int, optional
+        Maximum size of an input block when ``block_shape`` is None.
+    output : numpy.ndarray, numpy.memmap or dtype, optional
+        Host array in which to place the output (e.g. a writable memory map),
+        or its dtype. By default a new array of the input's dtype is created.
+    n_buffers : int, optional
+        Number of blocks in flight. The default of 2 corresponds to double
+        buffering.
+
+    Returns
+    -------
+    output : numpy.ndarray
+        The filtered array.
+
+    Notes
+    -----
+    At the array edges each block is clipped to the array, so the boundary
+    ``mode`` of the filter is applied as if the whole array had been
+    filtered at once. For ``mode='wrap'`` the halo is gathered from the
+    opposite side of the array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from cupyimg.scipy import ndimage as ndi
+    >>> x = np.lib.format.open_memmap(
+    ...     'x.npy', mode='w+', dtype=np.float32, shape=(16384, 16384))
+    >>> y = ndi.tiled_filter(ndi.gaussian_filter, x, sigma=4,
+    ...                      max_block_bytes=2**28)
+    """
+    if isinstance(input, cupy.ndarray):
+        raise TypeError(
+            "input must be a host array; call the filter directly on "
+            "device arrays"
+        )
+    if not hasattr(input, "shape") or not hasattr(input, "dtype"):
+        input = numpy.asarray(input)
+    if n_buffers < 1:
+        raise ValueError("n_buffers must be at least 1")
+    ndim = input.ndim
+    name, params = _filter_params(function, ndim, args, kwargs)
+
+    if halo is None:
+        if name is None:
+            raise ValueError(
+                "halo cannot be inferred for this function; pass it "
+                "explicitly"
+            )
+        halo = _tile_plan.filter_halo(name, ndim, **params)
+    halo = _tile_plan.normalize_halo(halo, ndim)
+    mode = params.get("mode", "reflect")
+
+    if output is None or not hasattr(output, "shape"):
+        out_dtype = input.dtype if output is None else numpy.dtype(output)
+        output = numpy.empty(input.shape, dtype=out_dtype)
+    elif output.shape != input.shape:
+        raise RuntimeError("output shape not correct")
+    if "output" in params and output.dtype != input.dtype:
+        # let the filter compute directly in the requested output dtype
+        kwargs["output"] = output.dtype
+    if input.size == 0:
+        return output
+
+    if block_shape is None:
+        block_shape = _tile_plan.choose_block_shape(
+            input.shape, halo, input.dtype.itemsize, max_block_bytes
+        )
+    elif len(block_shape) != ndim:
+        raise ValueError("block_shape must have one entry per axis")
+    tiles = _tile_plan.plan_tiles(input.shape, halo, block_shape, mode)
+
+    max_in = max(int(numpy.prod(t.input_shape)) for t in tiles)
+    max_out = int(
+        numpy.prod([min(b, s) for b, s in zip(block_shape, input.shape)])
+    )
+    slots = [
+        _Slot(max_in, input.dtype, max_out, output.dtype)
+        for _ in range(min(n_buffers, len(tiles)))
+    ]
+    try:
+        for i, tile in enumerate(tiles):
+            slot = slots[i % len(slots)]
+            slot.finish(output)
+
+            # staging on the host overlaps with the other blocks in flight
+            n_in = int(numpy.prod(tile.input_shape))
+            host_in = slot.host_in[:n_in].reshape(tile.input_shape)
+            _tile_plan.gather(input, tile, host_in)
+
+            with slot.stream:
+                block = cupy.empty(tile.input_shape, dtype=input.dtype)
+                block.set(host_in, stream=slot.stream)
+                result = function(block, *args, **kwargs)
+                result = cupy.ascontiguousarray(
+                    result[tile.interior_slices]
+                ).astype(output.dtype, copy=False)
+                host_out = slot.host_out[: result.size].reshape(result.shape)
+                result.data.copy_to_host_async(
+                    host_out.ctypes.data_as(ctypes.c_void_p),
+                    result.nbytes,
+                    slot.stream,
+                )
+            slot.pending = (tile.output_slices, host_out, (block, result))
+        for slot in slots:
+            slot.finish(output)
+    finally:
+        for slot in slots:
+            slot.stream.synchronize()
+    return output
+
+
+def _merge_equivalences(n_labels, pairs):
+    """Resolve label equivalences with a union-find on the host.
+
+    Labels ``1...n_labels`` are merged according to the ``(n_pairs, 2)``
+    array ``pairs``. Returns the array mapping each label to its final label:
+    the merged components are numbered consecutively, in the order of their
+    smallest label, and label 0 is kept.
+    """
+    parent = numpy.arange(n_labels + 1, dtype=numpy.int64)
+    a = pairs[:, 0]
+    b = pairs[:, 1]
+    while True:
+        # point every label directly to its root
+        while True:
+            grand = parent[parent]
+            if numpy.array_equal(grand, parent):
+                break
+            parent = grand
+        ra = parent[a]
+        rb = parent[b]
+        differ = ra != rb
+        if not differ.any():
+            break
+        # link the larger roots to the smaller ones
+        numpy.minimum.at(
+            parent,
+            numpy.maximum(ra[differ], rb[differ]),
+            numpy.minimum(ra[differ], rb[differ]),
+        )
+    is_root = parent == numpy.arange(n_labels + 1)
+    new_labels = numpy.cumsum(is_root) - 1
+    return new_labels[parent]
+
+
+def _boundary_pairs(before, after, directions, values=None):
+    """Pairs of labels connected across the plane between two slices.
+
+    ``before`` and ``after`` are adjacent slices of the labels along an axis
+    and ``directions`` the offsets of the neighbors in ``after`` (along the
+    remaining axes). If ``values`` (the corresponding slices of the input) are
+    given, only elements with equal values are connected.
+    """
+    pairs = [cupy.zeros((0, 2), dtype=before.dtype)]
+    for direction in directions:
+        sl_before = []
+        sl_after = []
+        for step in direction:
+            if step > 0:
+                sl_before.append(slice(None, -1))
+                sl_after.append(slice(1, None))
+            elif step < 0:
+                sl_before.append(slice(1, None))
+                sl_after.append(slice(None, -1))
+            else:
+                sl_before.append(slice(None))
+                sl_after.append(slice(None))
+        a = before[tuple(sl_before)]
+        b = after[tuple(sl_after)]
+        connected = (a > 0) & (b > 0)
+        if values is not None:
+            connected &= (
+                values[0][tuple(sl_before)] == values[1][tuple(sl_after)]
+            )
+        pairs.append(cupy.stack([a[connected], b[connected]], axis=-1))
+    pairs = cupy.asnumpy(cupy.concatenate(pairs))
+    return numpy.unique(pairs, axis=0)
+
+
+def tiled_label(
+    input,
+    structure=None,
+    output=None,
+    *,
+    greyscale_mode=False,
+    block_shape=None,
+    max_block_bytes=256 * 1024 * 1024,
+    return_counts=False,
+):
+    """Label the features of a host array one block at a time.
+
+    Each block is copied to the GPU and labeled with
+    :func:`cupyimg.scipy.ndimage.label`. The labels of the blocks are offset
+    so that they are unique and written to ``output``. The labels facing
+    each other across the boundaries between blocks are then recorded as
+    equivalent and merged with a union-find on the host. A second pass over
+    the blocks replaces each label by its final one.
+
+    Parameters
+    ----------
+    input : numpy.ndarray or numpy.memmap
+        Host array to label. Nonzero elements are features.
+    structure : array_like, optional
+        Structuring element defining feature connections, as for
+        :func:`cupyimg.scipy.ndimage.label`. By default, a squared
+        connectivity of one is used.
+    output : numpy.ndarray, numpy.memmap or str, optional
+        Host int64 array in which to place the labels (e.g. a writable memory
+        map), or the path of a ``.npy`` file to create as a memory map. By
+        default a new int64 array is created.
+    greyscale_mode : bool, optional
+        If True, neighbors are only connected if their values are equal, as
+        for ``skimage.measure.label``.
+    block_shape : tuple of int, optional
+        Shape of the blocks. If None, it is chosen so that a block of input
+        and labels takes at most ``max_block_bytes``.
+    max_block_bytes : int, optional
+        Maximum device memory of a block when ``block_shape`` is None.
+    return_counts : bool, optional
+        If True, also return the number of elements of each label.
+
+    Returns
+    -------
+    output : numpy.ndarray
+        The int64 labels. The features are numbered consecutively but,
+        unlike :func:`cupyimg.scipy.ndimage.label`, not necessarily in the
+        order of their first element.
+    num_features : int
+        Number of features found.
+    counts : numpy.ndarray
+        Only if ``return_counts``: the int64 array of length
+        ``num_features + 1`` holding the number of elements of each label
+        (``counts[0]`` is the size of the background).
+
+    Notes
+    -----
+    The equivalences are determined from the whole slices of the labels on
+    either side of each boundary, which must fit on the GPU.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from cupyimg.scipy import ndimage as ndi
+    >>> x = np.lib.format.open_memmap(
+    ...     'mask.npy', mode='r', dtype=bool, shape=(2048, 4096, 4096))
+    >>> labels, n, counts = ndi.tiled_label(
+    ...     x, output='labels.npy', return_counts=True)
+    """
+    if isinstance(input, cupy.ndarray):
+        raise TypeError(
+            "input must be a host array; call label directly on device arrays"
+        )
+    if not hasattr(input, "shape") or not hasattr(input, "dtype"):
+        input = numpy.asarray(input)
+    if input.dtype.kind == "c":
+        raise TypeError("Complex type not supported")
+    ndim = input.ndim
+    if ndim < 1:
+        raise ValueError("input must have at least one dimension")
+    if structure is None:
+        structure = _generate_binary_structure(ndim, 1)
+    structure = numpy.asarray(cupy.asnumpy(structure), dtype=bool)
+    if structure.ndim != ndim:
+        raise RuntimeError("structure and input must have equal rank")
+    if structure.shape != (3,) * ndim:
+        raise ValueError("structure dimensions must be equal to 3")
+
+    if output is None:
+        output = numpy.empty(input.shape, dtype=numpy.int64)
+    elif isinstance(output, str):
+        output = numpy.lib.format.open_memmap(
+            output, mode="w+", dtype=numpy.int64, shape=input.shape
+        )
+    elif output.shape != input.shape:
+        raise RuntimeError("output shape not correct")
+    elif output.dtype != numpy.int64:
+        raise ValueError("output must have dtype int64")
+    if block_shape is None:
+        block_shape = _tile_plan.choose_block_shape(
+            input.shape, 0, input.dtype.itemsize + 8, max_block_bytes
+        )
+    elif len(block_shape) != ndim:
+        raise ValueError("block_shape must have one entry per axis")
+    tiles = _tile_plan.plan_tiles(input.shape, 0, block_shape)
+
+    # first pass: label each block, offsetting its labels
+    n_labels = 0
+    counts = [numpy.zeros(1, dtype=numpy.int64)]
+    for tile in tiles:
+        block = cupy.asarray(input[tile.output_slices])
+        labels, n = label(block, structure, greyscale_mode=greyscale_mode)
+        block_counts = cupy.bincount(labels.ravel(), minlength=n + 1)
+        counts[0] += int(block_counts[0])
+        counts.append(cupy.asnumpy(block_counts[1:]).astype(numpy.int64))
+        labels = labels.astype(numpy.int64)
+        labels[labels > 0] += n_labels
+        output[tile.output_slices] = cupy.asnumpy(labels)
+        n_labels += n
+    counts = numpy.concatenate(counts)
+
+    # equivalences across the boundaries between blocks
+    pairs = [numpy.zeros((0, 2), dtype=numpy.int64)]
+    for axis in range(ndim):
+        others = [ax for ax in range(ndim) if ax != axis]
+        directions = [
+            tuple(idx[ax] - 1 for ax in others)
+            for idx in zip(*numpy.nonzero(structure))
+            if idx[axis] == 2
+        ]
+        for p in range(block_shape[axis], input.shape[axis], block_shape[axis]):
+            before = (slice(None),) * axis + (p - 1,)
+            after = (slice(None),) * axis + (p,)
+            values = None
+            if greyscale_mode:
+                values = (
+                    cupy.asarray(input[before]),
+                    cupy.asarray(input[after]),
+                )
+            pairs.append(
+                _boundary_pairs(
+                    cupy.asarray(output[before]),
+                    cupy.asarray(output[after]),
+                    directions,
+                    values,
+                )
+            )
+    new_labels = _merge_equivalences(n_labels, numpy.concatenate(pairs))
+    num_features = int(new_labels.max())
+
+    # second pass: replace the labels by their final value
+    lookup = cupy.asarray(new_labels)
+    for tile in tiles:
+        block = cupy.asarray(output[tile.output_slices])
+        output[tile.output_slices] = cupy.asnumpy(lookup[block])
+
+    if return_counts:
+        final_counts = numpy.zeros(num_features + 1, dtype=numpy.int64)
+        numpy.add.at(final_counts, new_labels, counts)
+        return output, num_features, final_counts
+    return output, num_features
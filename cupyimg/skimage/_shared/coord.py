@@ -1,10 +1,16 @@
+import math
+
 import cupy as cp
 import numpy as np
-from scipy.spatial import cKDTree, distance
+
+from cupyimg import memoize
+
+_UNDECIDED, _KEPT, _REJECTED = 0, 1, 2
 
 
-# TODO: avoid host/device transfers (currently needed for cKDTree)
-def ensure_spacing(coord, spacing=1, p_norm=np.inf):
+def ensure_spacing(
+    coord, spacing=1, p_norm=np.inf, *, inclusive=False, check_every=4
+):
     """Returns a subset of coord where a minimum spacing is guaranteed.
 
     Parameters
@@ -18,41 +24,172 @@ def ensure_spacing(coord, spacing=1, p_norm=np.inf):
         A finite large p may cause a ValueError if overflow can occur.
         ``inf`` corresponds to the Chebyshev distance and 2 to the
         Euclidean distance.
+    inclusive : bool, optional
+        If True, points at a distance of exactly `spacing` from a retained
+        point are also removed.
+    check_every : int, optional
+        Number of suppression passes run between two checks for convergence
+        (each check synchronizes the device).
 
     Returns
     -------
     output : ndarray
         A subset of coord where a minimum spacing is guaranteed.
 
+    Notes
+    -----
+    The points are visited in order and a point is retained if no previously
+    retained point is closer than `spacing`. This greedy suppression runs on
+    the GPU: the points are bucketed on a grid with cells of size `spacing`,
+    so that only the points of neighboring cells have to be compared, and all
+    points whose fate is determined by the points preceding them are decided
+    in parallel in each pass.
+    """
+    coord = cp.asarray(coord)
+    if len(coord) < 2 or not spacing > 0:
+        return coord
+    if p_norm < 1:
+        raise ValueError("p_norm must be in the range [1, inf]")
+    if coord.ndim != 2:
+        raise ValueError("coord must be a 2D array of shape (n_points, ndim)")
+    n_points, ndim = coord.shape
+
+    # Bucket the points on a grid of cells of size `spacing`. Since any
+    # p-norm is at least the Chebyshev distance, points closer than
+    # `spacing` lie in the same or in adjacent cells.
+    fcoord = coord.astype(cp.float64, copy=False)
+    origin = fcoord.min(axis=0)
+    if math.isinf(spacing):
+        cells = cp.zeros(coord.shape, dtype=cp.int64)
+    else:
+        cells = cp.floor((fcoord - origin) / spacing).astype(cp.int64)
+    grid_shape = cells.max(axis=0) + 1
+    strides = cp.concatenate(
+        (cp.cumprod(grid_shape[:0:-1])[::-1], cp.ones(1, dtype=cp.int64))
+    )
+    keys = cells @ strides
+    order = cp.argsort(keys)
+    sorted_keys = keys[order]
+
+    if math.isinf(p_norm):
+        threshold = float(spacing)
+    else:
+        threshold = float(spacing) ** p_norm
+
+    fcoord = cp.ascontiguousarray(fcoord)
+    state = cp.zeros(n_points, dtype=cp.int8)
+    remaining = cp.zeros((1,), dtype=cp.int32)
+    kernel = _get_ensure_spacing_kernel(ndim, float(p_norm), inclusive)
+    check_every = max(int(check_every), 1)
+    while True:
+        remaining[0] = 0
+        for _ in range(check_every):
+            kernel(
+                fcoord,
+                cells,
+                grid_shape,
+                strides,
+                sorted_keys,
+                order,
+                threshold,
+                state,
+                remaining,
+                size=n_points,
+            )
+        if not int(remaining[0]):  # synchronize!
+            break
+    return coord[state == _KEPT]
+
+
+@memoize(for_each_device=True)
+def _get_ensure_spacing_kernel(ndim, p_norm, inclusive):
+    """Kernel performing one pass of the greedy spacing suppression.
+
+    A point that is still undecided is rejected if a retained point with a
+    lower index is too close, and retained if all of the close points with a
+    lower index are rejected. Otherwise it stays undecided until the next
+    pass. Decisions are final, so ``state`` is updated in place.
     """
+    if math.isinf(p_norm):
+        accumulate = "dist = max(dist, diff);"
+    elif p_norm == 1:
+        accumulate = "dist += diff;"
+    elif p_norm == 2:
+        accumulate = "dist += diff * diff;"
+    else:
+        accumulate = "dist += pow(diff, {!r});".format(p_norm)
+    compare = "<=" if inclusive else "<"
 
-    output = coord
-    if len(coord):
-        coord = cp.asnumpy(coord)
-        # Use KDtree to find the peaks that are too close to each other
-        tree = cKDTree(coord)
-
-        indices = tree.query_ball_point(coord, r=spacing, p=p_norm)
-        rejected_peaks_indices = set()
-        for idx, candidates in enumerate(indices):
-            if idx not in rejected_peaks_indices:
-                # keep current point and the points at exactly spacing from it
-                candidates.remove(idx)
-                dist = distance.cdist(
-                    [coord[idx]],
-                    coord[candidates],
-                    distance.minkowski,
-                    p=p_norm,
-                ).reshape(-1)
-                candidates = [
-                    c for c, d in zip(candidates, dist) if d < spacing
-                ]
-
-                # candidates.remove(keep)
-                rejected_peaks_indices.update(candidates)
-
-        # Remove the peaks that are too close to each other
-        output = np.delete(coord, tuple(rejected_peaks_indices), axis=0)
-        output = cp.asarray(output)
-
-    return output
+    code = """
+    if (state[i] != {undecided}) continue;
+    const ptrdiff_t n = sorted_keys.size();
+    bool blocked = false;
+    bool rejected = false;
+    for (int nb = 0; nb < {n_neighbors} && !rejected; nb++) {{
+        // key of the neighboring cell
+        ptrdiff_t key = 0;
+        bool valid = true;
+        int rem = nb;
+        for (int d = {ndim} - 1; d >= 0; d--) {{
+            ptrdiff_t c = cells[i * {ndim} + d] + (rem % 3) - 1;
+            rem /= 3;
+            if (c < 0 || c >= grid_shape[d]) {{
+                valid = false;
+            }}
+            key += c * strides[d];
+        }}
+        if (!valid) continue;
+        // first point of the cell (lower bound in the sorted keys)
+        ptrdiff_t lo = 0, hi = n;
+        while (lo < hi) {{
+            ptrdiff_t mid = (lo + hi) / 2;
+            if (sorted_keys[mid] < key) {{
+                lo = mid + 1;
+            }} else {{
+                hi = mid;
+            }}
+        }}
+        for (ptrdiff_t k = lo; k < n && sorted_keys[k] == key; k++) {{
+            ptrdiff_t j = order[k];
+            if (j >= i) continue;
+            signed char s = state[j];
+            if (s == {rejected_state}) continue;
+            double dist = 0;
+            for (int d = 0; d < {ndim}; d++) {{
+                double diff = coord[i * {ndim} + d] - coord[j * {ndim} + d];
+                diff = diff < 0 ? -diff : diff;
+                {accumulate}
+            }}
+            if (dist {compare} threshold) {{
+                if (s == {kept}) {{
+                    rejected = true;
+                    break;
+                }}
+                blocked = true;
+            }}
+        }}
+    }}
+    if (rejected) {{
+        state[i] = {rejected_state};
+    }} else if (!blocked) {{
+        state[i] = {kept};
+    }} else {{
+        remaining[0] = 1;
+    }}
+    """.format(
+        ndim=ndim,
+        n_neighbors=3**ndim,
+        undecided=_UNDECIDED,
+        kept=_KEPT,
+        rejected_state=_REJECTED,
+        accumulate=accumulate,
+        compare=compare,
+    )
+    return cp.ElementwiseKernel(
+        "raw float64 coord, raw int64 cells, raw int64 grid_shape, "
+        "raw int64 strides, raw int64 sorted_keys, raw I order, "
+        "float64 threshold",
+        "raw int8 state, raw int32 remaining",
+        code,
+        "cupyimg_skimage_ensure_spacing_{}d".format(ndim),
+    )
@@ -0,0 +1,89 @@
+import cupy as cp
+import numpy as np
+import pytest
+from cupy.testing import assert_array_equal
+from scipy.spatial.distance import minkowski
+
+from cupyimg.skimage._shared.coord import ensure_spacing
+
+
+def _ensure_spacing_reference(coord, spacing, p_norm, inclusive=False):
+    """Brute-force greedy suppression on the host."""
+    kept = []
+    for point in coord:
+        too_close = False
+        for other in kept:
+            dist = minkowski(point, other, p_norm)
+            if dist < spacing or (inclusive and dist == spacing):
+                too_close = True
+                break
+        if not too_close:
+            kept.append(point)
+    return np.asarray(kept).reshape(-1, coord.shape[1])
+
+
+@pytest.mark.parametrize("p_norm", [1, 2, 3, np.inf])
+@pytest.mark.parametrize("size", [30, 50, 70])
+@pytest.mark.parametrize("spacing", [1, 2, 5.5, 10])
+@pytest.mark.parametrize("ndim", [2, 3])
+def test_ensure_spacing_trivial(p_norm, size, spacing, ndim):
+    # --- Empty input
+    assert ensure_spacing(cp.empty((0, ndim)), spacing, p_norm).size == 0
+
+    # --- A unique point
+    coord = cp.random.randn(1, ndim)
+    assert_array_equal(coord, ensure_spacing(coord, spacing, p_norm))
+
+    # --- Verified spacing
+    rng = np.random.RandomState(0)
+    coord = rng.randn(100, ndim)
+    # --- 0 spacing
+    assert_array_equal(coord, ensure_spacing(cp.asarray(coord), 0, p_norm))
+    # Spacing is chosen to be half the minimum distance
+    spacing = 0.5 * min(
+        minkowski(coord[i], coord[j], p_norm)
+        for i in range(len(coord))
+        for j in range(i)
+    )
+    out = ensure_spacing(cp.asarray(coord), spacing, p_norm)
+    assert_array_equal(coord, out)
+
+
+@pytest.mark.parametrize("p_norm", [1, 2, 3, np.inf])
+@pytest.mark.parametrize("spacing", [0.5, 1, 2.5, 10])
+@pytest.mark.parametrize("inclusive", [False, True])
+@pytest.mark.parametrize("ndim", [1, 2, 3])
+def test_ensure_spacing_vs_reference(p_norm, spacing, inclusive, ndim):
+    rng = np.random.RandomState(0)
+    # integer coordinates produce many ties at exactly `spacing`
+    coord = rng.randint(0, 12, size=(200, ndim))
+    expected = _ensure_spacing_reference(coord, spacing, p_norm, inclusive)
+    out = ensure_spacing(
+        cp.asarray(coord), spacing, p_norm, inclusive=inclusive
+    )
+    assert out.dtype == coord.dtype
+    assert_array_equal(out, expected)
+
+    coord = rng.randn(300, ndim) * 5
+    expected = _ensure_spacing_reference(coord, spacing, p_norm, inclusive)
+    out = ensure_spacing(
+        cp.asarray(coord), spacing, p_norm, inclusive=inclusive
+    )
+    assert_array_equal(out, expected)
+
+
+@pytest.mark.parametrize("check_every", [1, 3, 100])
+def test_ensure_spacing_chain(check_every):
+    # a chain of points in which each point only suppresses the next one
+    # needs many passes to be resolved
+    coord = cp.arange(40, dtype=float)[:, cp.newaxis] * 0.75
+    out = ensure_spacing(coord, 1, check_every=check_every)
+    assert_array_equal(out, coord[::2])
+
+
+def test_ensure_spacing_p_norm():
+    coord = cp.asarray([[0, 0], [1, 1]])
+    assert len(ensure_spacing(coord, 1.5, 1)) == 1
+    assert len(ensure_spacing(coord, 1.5, np.inf)) == 2
+    with pytest.raises(ValueError):
+        ensure_spacing(coord, 1.5, 0.5)
@@ -56,6 +56,8 @@ from warnings import warn
 import cupy as cp
 import numpy as np
 from scipy import linalg
+
+from cupyimg import memoize
 from ..util import dtype, dtype_limits
 
 
@@ -63,7 +65,8 @@ def convert_colorspace(arr, fromspace, tospace):
     """Convert an image array to a new color space.
 
     Valid color spaces are:
-        'RGB', 'HSV', 'RGB CIE', 'XYZ', 'YUV', 'YIQ', 'YPbPr', 'YCbCr', 'YDbDr'
+        'RGB', 'HSV', 'RGB CIE', 'XYZ', 'YUV', 'YIQ', 'YPbPr', 'YCbCr', 'YDbDr',
+        'LAB', 'LUV', 'HED'
 
     Parameters
     ----------
@@ -90,7 +93,8 @@ def convert_colorspace(arr, fromspace, tospace):
     -----
     Conversion is performed through the "central" RGB color space,
     i.e. conversion from XYZ to HSV is implemented as ``XYZ -> RGB -> HSV``
-    instead of directly.
+    instead of directly. Conversions between RGB and LAB, LUV or HED are each
+    computed by a single kernel, without intermediate arrays.
 
     Examples
     --------
@@ -108,6 +112,9 @@ def convert_colorspace(arr, fromspace, tospace):
         "ypbpr": ypbpr2rgb,
         "ycbcr": ycbcr2rgb,
         "ydbdr": ydbdr2rgb,
+        "lab": lab2rgb,
+        "luv": luv2rgb,
+        "hed": hed2rgb,
     }
     todict = {
         "rgb": lambda im: im,
@@ -119,6 +126,9 @@ def convert_colorspace(arr, fromspace, tospace):
         "ypbpr": rgb2ypbpr,
         "ycbcr": rgb2ycbcr,
         "ydbdr": rgb2ydbdr,
+        "lab": rgb2lab,
+        "luv": rgb2luv,
+        "hed": rgb2hed,
     }
 
     fromspace = fromspace.lower()
@@ -717,6 +727,234 @@ def _convert(matrix, arr):
     return arr @ matrix.T
 
 
+def _prepare_colorarray_fused(arr, float_dtype=None):
+    """Check the shape of the array and determine its floating point scaling.
+
+    Unlike `_prepare_colorarray`, the array is not converted. Instead the
+    scale and offset that `img_as_float` would apply are returned so that the
+    conversion kernels can apply them while reading the input.
+
+    Returns
+    -------
+    arr : (..., 3) ndarray
+        C-contiguous input array.
+    float_dtype : dtype
+        Floating point type of the computation and of the output.
+    scale, offset : float
+        ``arr * scale + offset`` is ``img_as_float(arr)``.
+    """
+    arr = cp.asarray(arr)
+
+    if arr.shape[-1] != 3:
+        raise ValueError(
+            "Input array must have a shape == (..., 3)), " f"got {arr.shape}"
+        )
+
+    kind = arr.dtype.kind
+    if kind not in "biuf":
+        # raises the appropriate error for unsupported types
+        arr = dtype.img_as_float(arr)
+        kind = arr.dtype.kind
+    if float_dtype is None:
+        if kind == "f" and arr.dtype.itemsize <= 4:
+            float_dtype = cp.float32
+        else:
+            float_dtype = cp.float64
+    float_dtype = cp.dtype(float_dtype)
+    if float_dtype not in (cp.float32, cp.float64):
+        raise ValueError("float_dtype must be float32 or float64")
+
+    scale, offset = 1.0, 0.0
+    if kind == "u":
+        scale = 1.0 / dtype_limits(arr)[1]
+    elif kind == "i":
+        imin, imax = np.iinfo(arr.dtype).min, np.iinfo(arr.dtype).max
+        scale = 2.0 / (imax - imin)
+        offset = 0.5 * scale
+    return cp.ascontiguousarray(arr), float_dtype, scale, offset
+
+
+_colorconv_preamble = """
+template <typename F>
+__device__ F _srgb_to_linear(F c)
+{
+    return c > (F)0.04045 ? pow((c + (F)0.055) / (F)1.055, (F)2.4)
+                          : c / (F)12.92;
+}
+
+template <typename F>
+__device__ F _linear_to_srgb(F c)
+{
+    c = c > (F)0.0031308 ? (F)1.055 * pow(c, (F)(1 / 2.4)) - (F)0.055
+                         : c * (F)12.92;
+    return min(max(c, (F)0), (F)1);
+}
+
+template <typename F>
+__device__ F _lab_f(F t)
+{
+    return t > (F)0.008856 ? cbrt(t) : (F)7.787 * t + (F)(16.0 / 116.0);
+}
+
+template <typename F>
+__device__ F _lab_finv(F t)
+{
+    return t > (F)0.2068966 ? t * t * t : (t - (F)(16.0 / 116.0)) / (F)7.787;
+}
+"""
+
+# Reads the pixel i from the (..., 3) input as floating point values c0, c1,
+# c2 scaled as done by img_as_float.
+_read_pixel = """
+F c0 = static_cast<F>(src[3 * i]) * scale + offset;
+F c1 = static_cast<F>(src[3 * i + 1]) * scale + offset;
+F c2 = static_cast<F>(src[3 * i + 2]) * scale + offset;
+"""
+
+_colorconv_ops = {
+    # m: xyz_from_rgb with each row divided by the reference white
+    "rgb2lab": (
+        "",
+        """
+        c0 = _srgb_to_linear(c0);
+        c1 = _srgb_to_linear(c1);
+        c2 = _srgb_to_linear(c2);
+        F fx = _lab_f(m[0] * c0 + m[1] * c1 + m[2] * c2);
+        F fy = _lab_f(m[3] * c0 + m[4] * c1 + m[5] * c2);
+        F fz = _lab_f(m[6] * c0 + m[7] * c1 + m[8] * c2);
+        dst[3 * i] = (F)116 * fy - (F)16;
+        dst[3 * i + 1] = (F)500 * (fx - fy);
+        dst[3 * i + 2] = (F)200 * (fy - fz);
+        """,
+    ),
+    # m: rgb_from_xyz with each column multiplied by the reference white
+    "lab2rgb": (
+        ", raw int32 n_invalid",
+        """
+        F fy = (c0 + (F)16) / (F)116;
+        F fx = c1 / (F)500 + fy;
+        F fz = fy - c2 / (F)200;
+        if (fz < 0) {
+            fz = 0;
+            atomicAdd(&n_invalid[0], 1);
+        }
+        F x = _lab_finv(fx);
+        F y = _lab_finv(fy);
+        F z = _lab_finv(fz);
+        dst[3 * i] = _linear_to_srgb(m[0] * x + m[1] * y + m[2] * z);
+        dst[3 * i + 1] = _linear_to_srgb(m[3] * x + m[4] * y + m[5] * z);
+        dst[3 * i + 2] = _linear_to_srgb(m[6] * x + m[7] * y + m[8] * z);
+        """,
+    ),
+    # m: xyz_from_rgb
+    "rgb2luv": (
+        ", F y_white, F u0, F v0, F eps",
+        """
+        c0 = _srgb_to_linear(c0);
+        c1 = _srgb_to_linear(c1);
+        c2 = _srgb_to_linear(c2);
+        F x = m[0] * c0 + m[1] * c1 + m[2] * c2;
+        F y = m[3] * c0 + m[4] * c1 + m[5] * c2;
+        F z = m[6] * c0 + m[7] * c1 + m[8] * c2;
+        F yr = y / y_white;
+        F L = yr > (F)0.008856 ? (F)116 * cbrt(yr) - (F)16 : (F)903.3 * yr;
+        F denom = x + (F)15 * y + (F)3 * z + eps;
+        dst[3 * i] = L;
+        dst[3 * i + 1] = (F)13 * L * ((F)4 * x / denom - u0);
+        dst[3 * i + 2] = (F)13 * L * ((F)9 * y / denom - v0);
+        """,
+    ),
+    # m: rgb_from_xyz
+    "luv2rgb": (
+        ", F y_white, F u0, F v0, F eps",
+        """
+        F y;
+        if (c0 > (F)7.999625) {
+            y = (c0 + (F)16) / (F)116;
+            y = y * y * y;
+        } else {
+            y = c0 / (F)903.3;
+        }
+        y *= y_white;
+        F a = u0 + c1 / ((F)13 * c0 + eps);
+        F b = v0 + c2 / ((F)13 * c0 + eps);
+        F c = (F)3 * y * ((F)5 * b - (F)3);
+        F z = ((a - (F)4) * c - (F)15 * a * b * y) / ((F)12 * b);
+        F x = -(c / b + (F)3 * z);
+        dst[3 * i] = _linear_to_srgb(m[0] * x + m[1] * y + m[2] * z);
+        dst[3 * i + 1] = _linear_to_srgb(m[3] * x + m[4] * y + m[5] * z);
+        dst[3 * i + 2] = _linear_to_srgb(m[6] * x + m[7] * y + m[8] * z);
+        """,
+    ),
+    # m: conv_matrix (applied as ``stains = log_rgb @ m``)
+    "separate_stains": (
+        ", F log_adjust",
+        """
+        c0 = log(max(c0, (F)1e-6)) / log_adjust;
+        c1 = log(max(c1, (F)1e-6)) / log_adjust;
+        c2 = log(max(c2, (F)1e-6)) / log_adjust;
+        dst[3 * i] = c0 * m[0] + c1 * m[3] + c2 * m[6];
+        dst[3 * i + 1] = c0 * m[1] + c1 * m[4] + c2 * m[7];
+        dst[3 * i + 2] = c0 * m[2] + c1 * m[5] + c2 * m[8];
+        """,
+    ),
+    # m: conv_matrix (applied as ``rgb = exp(-log_adjust * stains @ m)``)
+    "combine_stains": (
+        ", F log_adjust",
+        """
+        for (int j = 0; j < 3; j++) {
+            F v = c0 * m[j] + c1 * m[3 + j] + c2 * m[6 + j];
+            v = exp(-v * log_adjust);
+            dst[3 * i + j] = min(max(v, (F)0), (F)1);
+        }
+        """,
+    ),
+}
+
+
+@memoize(for_each_device=True)
+def _get_colorconv_kernel(name):
+    """Kernel performing a whole color space conversion in a single pass.
+
+    The input is read once, converted to floating point, transformed in
+    registers and written once, without any intermediate arrays.
+    """
+    extra_params, operation = _colorconv_ops[name]
+    return cp.ElementwiseKernel(
+        "raw I src, raw F m, F scale, F offset" + extra_params,
+        "raw F dst",
+        _read_pixel + operation,
+        "cupyimg_skimage_color_" + name,
+        preamble=_colorconv_preamble,
+    )
+
+
+def _fused_convert(name, arr, matrix, float_dtype, *args):
+    """Run the single-pass conversion kernel ``name`` on ``arr``.
+
+    ``args`` are the additional kernel parameters of the conversion (see
+    ``_colorconv_ops``).
+    """
+    arr, float_dtype, scale, offset = _prepare_colorarray_fused(
+        arr, float_dtype
+    )
+    matrix = cp.asarray(matrix, dtype=float_dtype)
+    if matrix.shape != (3, 3):
+        raise ValueError("conversion matrix must have shape (3, 3)")
+    out = cp.empty(arr.shape, dtype=float_dtype)
+    if out.size:
+        kern = _get_colorconv_kernel(name)
+        kern(arr, matrix, scale, offset, *args, out, size=arr.size // 3)
+    return out
+
+
+def _luv_white_point(illuminant, observer):
+    """Reference white Y and (u', v') chromaticity used by the LUV kernels."""
+    white = cp.asnumpy(get_xyz_coords(illuminant, observer, np.float64))
+    denom = white @ np.asarray([1, 15, 3], dtype=np.float64)
+    return white[1], 4 * white[0] / denom, 9 * white[1] / denom
+
+
 def xyz2rgb(xyz):
     """XYZ to RGB color space conversion.
 
@@ -1207,7 +1445,7 @@ def lab2xyz(lab, illuminant="D65", observer="2"):
     return out
 
 
-def rgb2lab(rgb, illuminant="D65", observer="2"):
+def rgb2lab(rgb, illuminant="D65", observer="2", *, float_dtype=None):
     """RGB to lab color space conversion.
 
     Parameters
@@ -1218,6 +1456,11 @@ def rgb2lab(rgb, illuminant="D65", observer="2"):
         The name of the illuminant (the function is NOT case sensitive).
     observer : {"2", "10"}, optional
         The aperture angle of the observer.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1231,7 +1474,8 @@ def rgb2lab(rgb, illuminant="D65", observer="2"):
 
     Notes
     -----
-    This function uses rgb2xyz and xyz2lab.
+    The result is that of ``xyz2lab(rgb2xyz(rgb))``, computed by a single
+    kernel that reads the input once and writes the output once.
     By default Observer= 2A, Illuminant= D65. CIE XYZ tristimulus values
     x_ref=95.047, y_ref=100., z_ref=108.883. See function `get_xyz_coords` for
     a list of supported illuminants.
@@ -1240,10 +1484,12 @@ def rgb2lab(rgb, illuminant="D65", observer="2"):
     ----------
     .. [1] https://en.wikipedia.org/wiki/Standard_illuminant
     """
-    return xyz2lab(rgb2xyz(rgb), illuminant, observer)
+    white = cp.asnumpy(get_xyz_coords(illuminant, observer, np.float64))
+    matrix = xyz_from_rgb / white[:, np.newaxis]
+    return _fused_convert("rgb2lab", rgb, matrix, float_dtype)
 
 
-def lab2rgb(lab, illuminant="D65", observer="2"):
+def lab2rgb(lab, illuminant="D65", observer="2", *, float_dtype=None):
     """Lab to RGB color space conversion.
 
     Parameters
@@ -1254,6 +1500,11 @@ def lab2rgb(lab, illuminant="D65", observer="2"):
         The name of the illuminant (the function is NOT case sensitive).
     observer : {"2", "10"}, optional
         The aperture angle of the observer.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1264,10 +1515,13 @@ def lab2rgb(lab, illuminant="D65", observer="2"):
     ------
     ValueError
         If `lab` is not at least 2-D with shape (..., 3).
+    UserWarning
+        If any of the pixels are invalid (Z < 0).
 
     Notes
     -----
-    This function uses lab2xyz and xyz2rgb.
+    The result is that of ``xyz2rgb(lab2xyz(lab))``, computed by a single
+    kernel that reads the input once and writes the output once.
     By default Observer= 2A, Illuminant= D65. CIE XYZ tristimulus values
     x_ref=95.047, y_ref=100., z_ref=108.883. See function `get_xyz_coords` for
     a list of supported illuminants.
@@ -1276,7 +1530,17 @@ def lab2rgb(lab, illuminant="D65", observer="2"):
     ----------
     .. [1] https://en.wikipedia.org/wiki/Standard_illuminant
     """
-    return xyz2rgb(lab2xyz(lab, illuminant, observer))
+    white = cp.asnumpy(get_xyz_coords(illuminant, observer, np.float64))
+    matrix = rgb_from_xyz * white[np.newaxis, :]
+    n_invalid = cp.zeros(1, dtype=cp.int32)
+    out = _fused_convert("lab2rgb", lab, matrix, float_dtype, n_invalid)
+    n_invalid = int(n_invalid[0])
+    if n_invalid:
+        warn(
+            "Color data out of range: Z < 0 in %s pixels" % n_invalid,
+            stacklevel=2,
+        )
+    return out
 
 
 def xyz2luv(xyz, illuminant="D65", observer="2"):
@@ -1432,13 +1696,18 @@ def luv2xyz(luv, illuminant="D65", observer="2"):
     return cp.concatenate([q[..., np.newaxis] for q in [x, y, z]], axis=-1)
 
 
-def rgb2luv(rgb):
+def rgb2luv(rgb, *, float_dtype=None):
     """RGB to CIE-Luv color space conversion.
 
     Parameters
     ----------
     rgb : (..., 3) array_like
         The image in RGB format. Final dimension denotes channels.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1452,7 +1721,8 @@ def rgb2luv(rgb):
 
     Notes
     -----
-    This function uses rgb2xyz and xyz2luv.
+    The result is that of ``xyz2luv(rgb2xyz(rgb))``, computed by a single
+    kernel that reads the input once and writes the output once.
 
     References
     ----------
@@ -1460,16 +1730,25 @@ def rgb2luv(rgb):
     .. [2] http://www.easyrgb.com/index.php?X=MATH&H=02#text2
     .. [3] https://en.wikipedia.org/wiki/CIELUV
     """
-    return xyz2luv(rgb2xyz(rgb))
+    y_white, u0, v0 = _luv_white_point("D65", "2")
+    eps = np.finfo(np.float64).eps
+    return _fused_convert(
+        "rgb2luv", rgb, xyz_from_rgb, float_dtype, y_white, u0, v0, eps
+    )
 
 
-def luv2rgb(luv):
+def luv2rgb(luv, *, float_dtype=None):
     """Luv to RGB color space conversion.
 
     Parameters
     ----------
     luv : (..., 3) array_like
         The image in CIE Luv format. Final dimension denotes channels.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1483,18 +1762,28 @@ def luv2rgb(luv):
 
     Notes
     -----
-    This function uses luv2xyz and xyz2rgb.
+    The result is that of ``xyz2rgb(luv2xyz(luv))``, computed by a single
+    kernel that reads the input once and writes the output once.
     """
-    return xyz2rgb(luv2xyz(luv))
+    y_white, u0, v0 = _luv_white_point("D65", "2")
+    eps = np.finfo(np.float64).eps
+    return _fused_convert(
+        "luv2rgb", luv, rgb_from_xyz, float_dtype, y_white, u0, v0, eps
+    )
 
 
-def rgb2hed(rgb):
+def rgb2hed(rgb, *, float_dtype=None):
     """RGB to Haematoxylin-Eosin-DAB (HED) color space conversion.
 
     Parameters
     ----------
     rgb : (..., 3) array_like
         The image in RGB format. Final dimension denotes channels.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1520,16 +1809,21 @@ def rgb2hed(rgb):
     >>> ihc = data.immunohistochemistry()
     >>> ihc_hed = rgb2hed(ihc)
     """
-    return separate_stains(rgb, hed_from_rgb)
+    return separate_stains(rgb, hed_from_rgb, float_dtype=float_dtype)
 
 
-def hed2rgb(hed):
+def hed2rgb(hed, *, float_dtype=None):
     """Haematoxylin-Eosin-DAB (HED) to RGB color space conversion.
 
     Parameters
     ----------
     hed : (..., 3) array_like
         The image in the HED color space. Final dimension denotes channels.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1556,10 +1850,10 @@ def hed2rgb(hed):
     >>> ihc_hed = rgb2hed(ihc)
     >>> ihc_rgb = hed2rgb(ihc_hed)
     """
-    return combine_stains(hed, rgb_from_hed)
+    return combine_stains(hed, rgb_from_hed, float_dtype=float_dtype)
 
 
-def separate_stains(rgb, conv_matrix):
+def separate_stains(rgb, conv_matrix, *, float_dtype=None):
     """RGB to stain color space conversion.
 
     Parameters
@@ -1568,6 +1862,11 @@ def separate_stains(rgb, conv_matrix):
         The image in RGB format. Final dimension denotes channels.
     conv_matrix: ndarray
         The stain separation matrix as described by G. Landini [1]_.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1616,16 +1915,14 @@ def separate_stains(rgb, conv_matrix):
     >>> ihc = data.immunohistochemistry()
     >>> ihc_hdx = separate_stains(ihc, hdx_from_rgb)
     """
-    rgb = _prepare_colorarray(rgb, force_copy=True)
-    cp.maximum(rgb, 1e-6, out=rgb)  # avoiding log artifacts
-    log_adjust = np.log(1e-6)  # used to compensate the sum above
-
-    conv_matrix = cp.asarray(conv_matrix)
-    stains = (cp.log(rgb) / log_adjust) @ conv_matrix
-    return stains
+    # rgb is clipped to >= 1e-6 within the kernel to avoid log artifacts
+    log_adjust = np.log(1e-6)  # used to compensate the clipping
+    return _fused_convert(
+        "separate_stains", rgb, conv_matrix, float_dtype, log_adjust
+    )
 
 
-def combine_stains(stains, conv_matrix):
+def combine_stains(stains, conv_matrix, *, float_dtype=None):
     """Stain to RGB color space conversion.
 
     Parameters
@@ -1634,6 +1931,11 @@ def combine_stains(stains, conv_matrix):
         The image in stain color space. Final dimension denotes channels.
     conv_matrix: ndarray
         The stain separation matrix as described by G. Landini [1]_.
+    float_dtype : {None, numpy.float32, numpy.float64}, optional
+        Floating point type of the computation and of the output. By default
+        float32 is used for single (or half) precision input and float64
+        otherwise. Integer input (e.g. uint8) is scaled as by `img_as_float`
+        while it is read, without an intermediate floating point copy.
 
     Returns
     -------
@@ -1679,15 +1981,11 @@ def combine_stains(stains, conv_matrix):
     >>> ihc_hdx = separate_stains(ihc, hdx_from_rgb)
     >>> ihc_rgb = combine_stains(ihc_hdx, rgb_from_hdx)
     """
-    stains = _prepare_colorarray(stains)
-    conv_matrix = cp.asarray(conv_matrix)
-
     # log_adjust here is used to compensate the sum within separate_stains()
     log_adjust = -np.log(1e-6)
-    log_rgb = -(stains * log_adjust) @ conv_matrix
-    rgb = cp.exp(log_rgb)
-
-    return cp.clip(rgb, a_min=0, a_max=1)
+    return _fused_convert(
+        "combine_stains", stains, conv_matrix, float_dtype, log_adjust
+    )
 
 
 def lab2lch(lab):
@@ -1002,3 +1002,78 @@ def test_rgba2rgb_nD(shape):
     expected_shape = shape[:-1] + (3,)
 
     assert out.shape == expected_shape
+
+
+@pytest.mark.parametrize(
+    "func, inverse",
+    [
+        (rgb2lab, lab2rgb),
+        (rgb2luv, luv2rgb),
+        (rgb2hed, hed2rgb),
+    ],
+)
+@pytest.mark.parametrize("float_dtype", [None, np.float32, np.float64])
+def test_fused_conversions_integer_input(func, inverse, float_dtype):
+    rng = cp.random.RandomState(5)
+    img = rng.randint(0, 256, size=(16, 12, 3)).astype(np.uint8)
+    expected = func(img_as_float(img))
+    out = func(img, float_dtype=float_dtype)
+    if float_dtype is None:
+        assert out.dtype == np.float64
+    else:
+        assert out.dtype == float_dtype
+    decimal = 3 if float_dtype == np.float32 else 10
+    assert_array_almost_equal(out, expected, decimal=decimal)
+
+    roundtrip = inverse(out, float_dtype=float_dtype)
+    assert roundtrip.dtype == out.dtype
+    assert_array_almost_equal(roundtrip, img_as_float(img), decimal=3)
+
+
+@pytest.mark.parametrize("dtype", [np.uint16, np.int16, np.float32])
+def test_fused_conversions_vs_skimage(dtype):
+    from skimage import color as color_cpu
+
+    rng = np.random.RandomState(0)
+    img = rng.rand(8, 9, 3)
+    if dtype == np.uint16:
+        img = (img * 65535).astype(dtype)
+    elif dtype == np.int16:
+        img = (img * 32767).astype(dtype)
+    else:
+        img = img.astype(dtype)
+    img_gpu = cp.asarray(img)
+    decimal = 4 if dtype == np.float32 else 8
+    for func in ["rgb2lab", "rgb2luv"]:
+        expected = getattr(color_cpu, func)(img)
+        assert_array_almost_equal(
+            globals()[func](img_gpu), expected, decimal=decimal
+        )
+
+
+def test_fused_conversions_non_contiguous():
+    img = cp.random.rand(10, 3, 8).transpose(0, 2, 1)
+    assert_array_almost_equal(rgb2lab(img), rgb2lab(cp.ascontiguousarray(img)))
+
+
+def test_lab2rgb_out_of_range_warning():
+    lab = cp.asarray([[[50.0, 0.0, 250.0], [50.0, 0.0, 0.0]]])
+    with expected_warnings(["Z < 0 in 1 pixels"]):
+        lab2rgb(lab)
+
+
+def test_separate_stains_matrix_shape():
+    with pytest.raises(ValueError):
+        separate_stains(cp.random.rand(4, 4, 3), np.eye(2))
+
+
+@pytest.mark.parametrize("space", ["LAB", "LUV", "HED"])
+def test_convert_colorspace_fused(space):
+    img = cp.random.rand(6, 5, 3)
+    to_func = {"LAB": rgb2lab, "LUV": rgb2luv, "HED": rgb2hed}[space]
+    from_func = {"LAB": lab2rgb, "LUV": luv2rgb, "HED": hed2rgb}[space]
+    converted = convert_colorspace(img, "RGB", space)
+    assert_array_almost_equal(converted, to_func(img))
+    assert_array_almost_equal(
+        convert_colorspace(converted, space, "RGB"), from_func(converted)
+    )
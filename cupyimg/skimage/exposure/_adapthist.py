@@ -13,27 +13,26 @@ Gems - authors, editors, publishers, or webmasters - are to be held
 responsible.  Basically, don't be a jerk, and remember that anything free
 comes with no guarantee.
 """
-import functools
-import itertools
 import math
 import numbers
-import operator
 
 import cupy as cp
 import numpy as np
 
+from cupyimg import memoize
+from cupyimg._misc import _prod
+from cupyimg.scipy.ndimage._util import _check_batch_axes
 from ..util import img_as_float, img_as_uint
 from ..color.adapt_rgb import adapt_rgb, hsv_value
-from ..exposure import rescale_intensity
-from cupyimg._misc import _prod
-from cupyimg import numpy as cnp
 
 
 NR_OF_GRAY = 2 ** 14  # number of grayscale levels to use in CLAHE algorithm
 
 
 @adapt_rgb(hsv_value)
-def equalize_adapthist(image, kernel_size=None, clip_limit=0.01, nbins=256):
+def equalize_adapthist(
+    image, kernel_size=None, clip_limit=0.01, nbins=256, *, batch_axes=None
+):
     """Contrast Limited Adaptive Histogram Equalization (CLAHE).
 
     An algorithm for local contrast enhancement, that uses histograms computed
@@ -47,14 +46,18 @@ def equalize_adapthist(image, kernel_size=None, clip_limit=0.01, nbins=256):
     kernel_size: int or array_like, optional
         Defines the shape of contextual regions used in the algorithm. If
         iterable is passed, it must have the same number of elements as
-        ``image.ndim`` (without color channel). If integer, it is broadcasted
-        to each `image` dimension. By default, ``kernel_size`` is 1/8 of
-        ``image`` height by 1/8 of its width.
+        ``image.ndim`` (without color channel and batch axes). If integer, it
+        is broadcasted to each `image` dimension. By default, ``kernel_size``
+        is 1/8 of ``image`` height by 1/8 of its width.
     clip_limit : float, optional
         Clipping limit, normalized between 0 and 1 (higher values give more
         contrast).
     nbins : int, optional
         Number of gray bins for histogram ("data range").
+    batch_axes : int or sequence of int, optional
+        Axes of a grayscale ``image`` holding independent images. Each image
+        is equalized (and rescaled) on its own, but the whole batch is
+        processed by the same kernel launches.
 
     Returns
     -------
@@ -72,6 +75,8 @@ def equalize_adapthist(image, kernel_size=None, clip_limit=0.01, nbins=256):
        - The CLAHE algorithm is run on the V (Value) channel
        - The image is converted back to RGB space and returned
     * For RGBA images, the original alpha channel is removed.
+    * The tile histograms, their clipping and the interpolated mapping are
+      all computed on the GPU.
 
     .. versionchanged:: 0.17
         The values returned by this function are slightly shifted upwards
@@ -82,26 +87,52 @@ def equalize_adapthist(image, kernel_size=None, clip_limit=0.01, nbins=256):
     .. [1] http://tog.acm.org/resources/GraphicsGems/
     .. [2] https://en.wikipedia.org/wiki/CLAHE#CLAHE
     """
+    image = cp.asarray(image)
+    batch_axes = _check_batch_axes(batch_axes, image.ndim)
+    image_axes = [ax for ax in range(image.ndim) if ax not in batch_axes]
+    ndim = len(image_axes)
+
+    # stack the independent images along a single leading axis
+    image = image.transpose(batch_axes + tuple(image_axes))
+    batch_shape = image.shape[: len(batch_axes)]
+    image = image.reshape(
+        (_prod(batch_shape),) + image.shape[len(batch_axes) :]
+    )
 
     image = img_as_uint(image)
-    image = cp.around(
-        rescale_intensity(image, out_range=(0, NR_OF_GRAY - 1))
-    ).astype(cp.uint16)
+    image = cp.around(_rescale_each(image, NR_OF_GRAY - 1)).astype(cp.uint16)
 
     if kernel_size is None:
-        kernel_size = tuple(
-            [image.shape[dim] // 8 for dim in range(image.ndim)]
-        )
+        kernel_size = tuple([image.shape[dim + 1] // 8 for dim in range(ndim)])
     elif isinstance(kernel_size, numbers.Number):
-        kernel_size = (kernel_size,) * image.ndim
-    elif len(kernel_size) != image.ndim:
-        ValueError("Incorrect value of `kernel_size`: {}".format(kernel_size))
+        kernel_size = (kernel_size,) * ndim
+    elif len(kernel_size) != ndim:
+        raise ValueError(
+            "Incorrect value of `kernel_size`: {}".format(kernel_size)
+        )
 
     kernel_size = [int(k) for k in kernel_size]
 
     image = _clahe(image, kernel_size, clip_limit, nbins)
     image = img_as_float(image)
-    return rescale_intensity(image)
+    image = _rescale_each(image, 1.0)
+
+    image = image.reshape(batch_shape + image.shape[1:])
+    return image.transpose(tuple(np.argsort(batch_axes + tuple(image_axes))))
+
+
+def _rescale_each(image, out_max):
+    """Apply ``rescale_intensity(im, out_range=(0, out_max))`` to each image.
+
+    The images are stacked along the first axis of ``image``.
+    """
+    axes = tuple(range(1, image.ndim))
+    imin = image.min(axis=axes, keepdims=True).astype(cp.float64)
+    imax = image.max(axis=axes, keepdims=True).astype(cp.float64)
+    constant = imin == imax
+    scaled = (image - imin) / cp.where(constant, 1.0, imax - imin)
+    scaled *= out_max
+    return cp.where(constant, cp.clip(image, 0, out_max), scaled)
 
 
 def _clahe(image, kernel_size, clip_limit, nbins):
@@ -109,8 +140,8 @@ def _clahe(image, kernel_size, clip_limit, nbins):
 
     Parameters
     ----------
-    image : (N1,...,NN) ndarray
-        Input image.
+    image : (B, N1,...,NN) ndarray
+        Batch of ``B`` uint16 images with values in ``[0, NR_OF_GRAY)``.
     kernel_size: int or N-tuple of int
         Defines the shape of contextual regions used in the algorithm.
     clip_limit : float
@@ -121,172 +152,84 @@ def _clahe(image, kernel_size, clip_limit, nbins):
 
     Returns
     -------
-    out : (N1,...,NN) ndarray
-        Equalized image.
+    out : (B, N1,...,NN) ndarray
+        Equalized images.
 
     The number of "effective" graylevels in the output image is set by `nbins`;
     selecting a small value (e.g. 128) speeds up processing and still produces
     an output image of good quality. A clip limit of 0 or larger than or equal
     to 1 results in standard (non-contrast limited) AHE.
     """
-    ndim = image.ndim
-    dtype = image.dtype
+    image = cp.ascontiguousarray(image)
+    ndim = image.ndim - 1
+    batch_size = image.shape[0]
+    shape = image.shape[1:]
 
-    # pad the image such that the shape in each dimension
+    # The image is (virtually) padded such that the shape in each dimension
     # - is a multiple of the kernel_size and
     # - is preceded by half a kernel size
+    # The padding is never materialized: the kernels below reflect the
+    # coordinates that fall outside of the image.
     pad_start_per_dim = [k // 2 for k in kernel_size]
-
     pad_end_per_dim = [
-        (k - s % k) % k + math.ceil(k / 2.0)
-        for k, s in zip(kernel_size, image.shape)
+        (k - s % k) % k + math.ceil(k / 2.0) for k, s in zip(kernel_size, shape)
+    ]
+    padded_shape = [
+        s + p_i + p_f
+        for s, p_i, p_f in zip(shape, pad_start_per_dim, pad_end_per_dim)
     ]
-
-    image = cp.pad(
-        image,
-        [(p_i, p_f) for p_i, p_f in zip(pad_start_per_dim, pad_end_per_dim)],
-        mode="reflect",
-    )
 
     bin_size = 1 + NR_OF_GRAY // nbins
-    if True:
-        lut = cp.arange(NR_OF_GRAY)
-        lut //= bin_size
-
-        image = lut[image]
-    else:
-        lut = np.arange(NR_OF_GRAY)
-        lut //= bin_size
-        image = cp.asarray(lut[image.get()])
 
     # calculate graylevel mappings for each contextual region
-    # rearrange image into flattened contextual regions
-    ns_hist = [int(s / k) - 1 for s, k in zip(image.shape, kernel_size)]
-    hist_blocks_shape = functools.reduce(
-        operator.add, [(s, k) for s, k in zip(ns_hist, kernel_size)]
+    # (the regions start half a kernel size into the padded image, i.e. at
+    # the image origin)
+    ns_hist = [int(s / k) - 1 for s, k in zip(padded_shape, kernel_size)]
+    n_tiles = batch_size * _prod(ns_hist)
+    geometry = cp.asarray(
+        list(shape) + kernel_size + ns_hist + pad_start_per_dim,
+        dtype=cp.int64,
     )
-    hist_blocks_axis_order = tuple(range(0, ndim * 2, 2)) + tuple(
-        range(1, ndim * 2, 2)
+    hist = cp.zeros((n_tiles, nbins), dtype=cp.int32)
+    region_size = batch_size * _prod(
+        [n * k for n, k in zip(ns_hist, kernel_size)]
     )
-    hist_slices = [
-        slice(k // 2, k // 2 + n * k) for k, n in zip(kernel_size, ns_hist)
-    ]
-    hist_blocks = image[tuple(hist_slices)].reshape(hist_blocks_shape)
-    hist_blocks = hist_blocks.transpose(hist_blocks_axis_order)
-    hist_block_assembled_shape = hist_blocks.shape
-    hist_blocks = hist_blocks.reshape((_prod(ns_hist), -1))
+    if region_size:
+        kern = _get_tile_histogram_kernel(ndim)
+        kern(image, geometry, bin_size, nbins, hist, size=region_size)
 
     # Calculate actual clip limit
     if clip_limit > 0.0:
         clim = int(max(clip_limit * _prod(kernel_size), 1))
     else:
         # largest possible value, i.e., do not clip (AHE)
-        clim = np.product(kernel_size)
+        clim = _prod(kernel_size)
 
-    if True:
-        # faster to loop over the arrays on the host
-        hist_blocks = cp.asnumpy(hist_blocks)
-        hist = np.apply_along_axis(
-            np.bincount, -1, hist_blocks, minlength=nbins
-        )
-        hist = np.apply_along_axis(
-            clip_histogram, -1, hist, clip_limit=clim, xp=np
-        )
-        hist = cp.asarray(hist)
-    else:
-        hist = cnp.apply_along_axis(
-            cp.bincount, -1, hist_blocks, minlength=nbins
-        )
-        hist = cnp.apply_along_axis(clip_histogram, -1, hist, clip_limit=clim)
+    hist = clip_histogram(hist, clim)
     hist = map_histogram(hist, 0, NR_OF_GRAY - 1, _prod(kernel_size))
-    hist = hist.reshape(hist_block_assembled_shape[:ndim] + (-1,))
-
-    # duplicate leading mappings in each dim
-    map_array = cp.pad(
-        hist, [(1, 1) for _ in range(ndim)] + [(0, 0)], mode="edge"
-    )
 
     # Perform multilinear interpolation of graylevel mappings
     # using the convention described here:
     # https://en.wikipedia.org/w/index.php?title=Adaptive_histogram_
     # equalization&oldid=936814673#Efficient_computation_by_interpolation
-
-    # rearrange image into blocks for vectorized processing
-    ns_proc = [int(s / k) for s, k in zip(image.shape, kernel_size)]
-    blocks_shape = functools.reduce(
-        operator.add, [(s, k) for s, k in zip(ns_proc, kernel_size)]
-    )
-    blocks_axis_order = hist_blocks_axis_order
-
-    blocks = image.reshape(blocks_shape)
-    blocks = blocks.transpose(blocks_axis_order)
-    blocks_flattened_shape = blocks.shape
-    blocks = blocks.reshape((_prod(ns_proc), _prod(blocks.shape[ndim:])))
-
-    # calculate interpolation coefficients
-    coeffs = cp.meshgrid(
-        *tuple([cp.arange(k) / k for k in kernel_size[::-1]]), indexing="ij"
-    )
-    coeffs = [cp.transpose(c).flatten() for c in coeffs]
-    inv_coeffs = [1 - c for c in coeffs]
-
-    # sum over contributions of neighboring contextual
-    # regions in each direction
-    result = cp.zeros(blocks.shape, dtype=cp.float32)
-    for iedge, edge in enumerate(itertools.product(*((range(2),) * ndim))):
-        edge_maps = map_array[
-            tuple([slice(e, e + n) for e, n in zip(edge, ns_proc)])
-        ]
-        edge_maps = edge_maps.reshape((_prod(ns_proc), -1))
-        # apply map
-        # edge_mapped = cp.asarray(np.take_along_axis(edge_maps.get(), blocks.get(), axis=-1))
-        edge_mapped = cp.take_along_axis(edge_maps, blocks, axis=-1)
-
-        # interpolate
-        edge_coeffs = functools.reduce(
-            operator.mul,
-            [[inv_coeffs, coeffs][e][d] for d, e in enumerate(edge[::-1])],
-        )
-
-        result += (edge_mapped * edge_coeffs).astype(result.dtype)
-
-    result = result.astype(dtype)
-
-    # rebuild result image from blocks
-    result = result.reshape(blocks_flattened_shape)
-    blocks_axis_rebuild_order = functools.reduce(
-        operator.add,
-        [(s, k) for s, k in zip(range(0, ndim), range(ndim, ndim * 2))],
-    )
-    result = result.transpose(blocks_axis_rebuild_order)
-    result = result.reshape(image.shape)
-
-    # undo padding
-    unpad_slices = tuple(
-        [
-            slice(p_i, s - p_f)
-            for p_i, p_f, s in zip(
-                pad_start_per_dim, pad_end_per_dim, image.shape
-            )
-        ]
-    )
-    result = result[unpad_slices]
-
+    result = cp.empty(image.shape, dtype=image.dtype)
+    kern = _get_clahe_map_kernel(ndim)
+    kern(image, hist, geometry, bin_size, nbins, result)
     return result
 
 
-# TODO: refactor this clip_histogram bottleneck.
-def clip_histogram(hist, clip_limit, xp=cp):
-    """Perform clipping of the histogram and redistribution of bins.
+def clip_histogram(hist, clip_limit):
+    """Perform clipping of the histograms and redistribution of bins.
 
-    The histogram is clipped and the number of excess pixels is counted.
+    The histograms are clipped and the number of excess pixels is counted.
     Afterwards the excess pixels are equally redistributed across the
     whole histogram (providing the bin count is smaller than the cliplimit).
 
     Parameters
     ----------
     hist : ndarray
-        Histogram array.
+        Histogram array. Histogram bins are assumed to be represented by the
+        last array dimension. All histograms are clipped at once.
     clip_limit : int
         Maximum allowed bin count.
 
@@ -295,39 +238,32 @@ def clip_histogram(hist, clip_limit, xp=cp):
     hist : ndarray
         Clipped histogram.
     """
+    hist_shape = hist.shape
+    nbins = hist_shape[-1]
+    hist = hist.reshape(-1, nbins).astype(cp.int64)
+
     # calculate total number of excess pixels
-    excess_mask = hist > clip_limit
-    excess = hist[excess_mask]
-    n_excess = excess.sum() - excess.size * clip_limit
-    hist[excess_mask] = clip_limit
+    n_excess = cp.maximum(hist - clip_limit, 0).sum(axis=-1)
+    cp.minimum(hist, clip_limit, out=hist)
 
     # Second part: clip histogram and redistribute excess pixels in each bin
-    bin_incr = n_excess // hist.size  # average binincrement
+    bin_incr = n_excess // nbins  # average binincrement
     upper = clip_limit - bin_incr  # Bins larger than upper set to cliplimit
 
-    low_mask = hist < upper
-    n_excess -= hist[low_mask].size * bin_incr
-    hist[low_mask] += bin_incr
+    low_mask = hist < upper[:, np.newaxis]
+    n_excess -= low_mask.sum(axis=-1) * bin_incr
+    hist += low_mask * bin_incr[:, np.newaxis]
 
-    mid_mask = xp.logical_and(hist >= upper, hist < clip_limit)
-    mid = hist[mid_mask]
-    n_excess += mid.sum() - mid.size * clip_limit
+    mid_mask = cp.logical_and(hist >= upper[:, np.newaxis], hist < clip_limit)
+    n_excess -= (mid_mask * (clip_limit - hist)).sum(axis=-1)
     hist[mid_mask] = clip_limit
 
-    while n_excess > 0:  # Redistribute remaining excess
-        prev_n_excess = n_excess
-        for index in range(hist.size):
-            under_mask = hist < clip_limit
-            step_size = max(1, xp.count_nonzero(under_mask) // n_excess)
-            under_mask = under_mask[index::step_size]
-            hist[index::step_size][under_mask] += 1
-            n_excess -= xp.count_nonzero(under_mask)
-            if n_excess <= 0:
-                break
-        if prev_n_excess == n_excess:
-            break
+    # Redistribute the remaining excess (at most a few per bin). This is
+    # sequential within a histogram, so one thread handles each histogram.
+    kern = _get_redistribute_excess_kernel()
+    kern(n_excess, clip_limit, nbins, hist)
 
-    return hist
+    return hist.reshape(hist_shape)
 
 
 def map_histogram(hist, min_val, max_val, n_pixels, xp=cp):
@@ -358,3 +294,155 @@ def map_histogram(hist, min_val, max_val, n_pixels, xp=cp):
     cp.clip(out, a_min=None, a_max=max_val, out=out)
 
     return out.astype(int)
+
+
+_reflect_coordinate = """
+// reflect a coordinate beyond the image end (numpy.pad's 'reflect' mode)
+if (q >= s) {{
+    if (s == 1) {{
+        q = 0;
+    }} else {{
+        ptrdiff_t period = 2 * (s - 1);
+        q %= period;
+        if (q >= s) {{
+            q = period - q;
+        }}
+    }}
+}}
+"""
+
+
+@memoize(for_each_device=True)
+def _get_tile_histogram_kernel(ndim):
+    """Kernel computing the histograms of all contextual regions at once.
+
+    Each thread handles one pixel of the (padded) contextual regions and
+    increments the bin of its region. ``geometry`` holds the image shape,
+    the kernel size and the number of regions along each axis.
+    """
+    code = """
+    ptrdiff_t rem = i;
+    ptrdiff_t src = 0, stride = 1, tile = 0, tile_stride = 1;
+    for (int d = {ndim} - 1; d >= 0; d--) {{
+        ptrdiff_t s = geometry[d];
+        ptrdiff_t k = geometry[{ndim} + d];
+        ptrdiff_t n = geometry[2 * {ndim} + d];
+        ptrdiff_t q = rem % (n * k);
+        rem /= n * k;
+        tile += (q / k) * tile_stride;
+        tile_stride *= n;
+        {reflect}
+        src += q * stride;
+        stride *= s;
+    }}
+    // rem is the index of the image within the batch
+    src += rem * stride;
+    tile += rem * tile_stride;
+    int v = image[src] / bin_size;
+    atomicAdd(&hist[tile * nbins + v], 1);
+    """.format(
+        ndim=ndim, reflect=_reflect_coordinate.format()
+    )
+    return cp.ElementwiseKernel(
+        "raw X image, raw int64 geometry, int32 bin_size, int32 nbins",
+        "raw int32 hist",
+        code,
+        "cupyimg_skimage_clahe_histogram_{}d".format(ndim),
+    )
+
+
+@memoize(for_each_device=True)
+def _get_redistribute_excess_kernel():
+    """Kernel redistributing the residual excess of each clipped histogram.
+
+    This is the final loop of the sequential CLAHE algorithm, with one
+    thread per histogram.
+    """
+    code = """
+    H* h = &hist[i * nbins];
+    long long n_under = 0;
+    for (int b = 0; b < nbins; b++) {
+        n_under += h[b] < clip_limit;
+    }
+    long long excess = n_excess;
+    while (excess > 0) {
+        long long prev_excess = excess;
+        for (int index = 0; index < nbins; index++) {
+            long long step = n_under / excess;
+            if (step < 1) {
+                step = 1;
+            }
+            long long n_incr = 0;
+            for (long long b = index; b < nbins; b += step) {
+                if (h[b] < clip_limit) {
+                    h[b]++;
+                    n_incr++;
+                    if (h[b] == clip_limit) {
+                        n_under--;
+                    }
+                }
+            }
+            excess -= n_incr;
+            if (excess <= 0) {
+                break;
+            }
+        }
+        if (prev_excess == excess) {
+            break;
+        }
+    }
+    """
+    return cp.ElementwiseKernel(
+        "int64 n_excess, int64 clip_limit, int32 nbins",
+        "raw H hist",
+        code,
+        "cupyimg_skimage_clahe_redistribute_excess",
+    )
+
+
+@memoize(for_each_device=True)
+def _get_clahe_map_kernel(ndim):
+    """Kernel mapping each pixel through the interpolated region mappings.
+
+    The mappings of the ``2 ** ndim`` contextual regions surrounding a pixel
+    are multilinearly interpolated. Regions beyond the image edges reuse the
+    mapping of the nearest region.
+    """
+    code = """
+    ptrdiff_t rem = i;
+    ptrdiff_t lo[{ndim}], hi[{ndim}];
+    double c[{ndim}];
+    for (int d = {ndim} - 1; d >= 0; d--) {{
+        ptrdiff_t s = geometry[d];
+        ptrdiff_t k = geometry[{ndim} + d];
+        ptrdiff_t n = geometry[2 * {ndim} + d];
+        ptrdiff_t p = rem % s + geometry[3 * {ndim} + d];  // padded coord.
+        rem /= s;
+        ptrdiff_t block = p / k;
+        c[d] = (double)(p - block * k) / k;
+        lo[d] = min(max(block - 1, (ptrdiff_t)0), n - 1);
+        hi[d] = min(block, n - 1);
+    }}
+    // rem is the index of the image within the batch
+    int v = image / bin_size;
+    float acc = 0;
+    for (int corner = 0; corner < (1 << {ndim}); corner++) {{
+        ptrdiff_t tile = rem;
+        double w = 1.0;
+        for (int d = 0; d < {ndim}; d++) {{
+            int e = (corner >> ({ndim} - 1 - d)) & 1;
+            tile = tile * geometry[2 * {ndim} + d] + (e ? hi[d] : lo[d]);
+            w *= e ? c[d] : 1.0 - c[d];
+        }}
+        acc += (float)(lut[tile * nbins + v] * w);
+    }}
+    out = (X)acc;
+    """.format(
+        ndim=ndim
+    )
+    return cp.ElementwiseKernel(
+        "X image, raw L lut, raw int64 geometry, int32 bin_size, int32 nbins",
+        "X out",
+        code,
+        "cupyimg_skimage_clahe_map_{}d".format(ndim),
+    )
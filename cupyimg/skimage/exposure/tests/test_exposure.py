@@ -10,6 +10,7 @@ from skimage._shared._warnings import expected_warnings
 
 from cupyimg.skimage import util
 from cupyimg.skimage import exposure
+from cupyimg.skimage.exposure import _adapthist
 from cupyimg.skimage.exposure.exposure import intensity_range
 from cupyimg.skimage.color import rgb2gray
 from cupyimg.skimage.util.dtype import dtype_range
@@ -487,6 +488,82 @@ def test_adapthist_clip_limit():
     assert_array_equal(img_clahe0, img_clahe1)
 
 
+def _clip_histogram_reference(hist, clip_limit):
+    """Sequential clipping of a single histogram (scikit-image algorithm)."""
+    hist = hist.copy()
+    excess_mask = hist > clip_limit
+    excess = hist[excess_mask]
+    n_excess = excess.sum() - excess.size * clip_limit
+    hist[excess_mask] = clip_limit
+
+    bin_incr = n_excess // hist.size
+    upper = clip_limit - bin_incr
+    low_mask = hist < upper
+    n_excess -= hist[low_mask].size * bin_incr
+    hist[low_mask] += bin_incr
+    mid_mask = np.logical_and(hist >= upper, hist < clip_limit)
+    mid = hist[mid_mask]
+    n_excess += mid.sum() - mid.size * clip_limit
+    hist[mid_mask] = clip_limit
+
+    while n_excess > 0:
+        prev_n_excess = n_excess
+        for index in range(hist.size):
+            under_mask = hist < clip_limit
+            step_size = max(1, np.count_nonzero(under_mask) // n_excess)
+            under_mask = under_mask[index::step_size]
+            hist[index::step_size][under_mask] += 1
+            n_excess -= np.count_nonzero(under_mask)
+            if n_excess <= 0:
+                break
+        if prev_n_excess == n_excess:
+            break
+    return hist
+
+
+@pytest.mark.parametrize("clip_limit", [1, 7, 40, 1000])
+def test_adapthist_clip_histogram(clip_limit):
+    rng = np.random.RandomState(0)
+    hist = rng.geometric(0.05, size=(12, 64)).astype(np.int64)
+    hist[:, ::9] += 200
+    expected = np.stack(
+        [_clip_histogram_reference(h, clip_limit) for h in hist]
+    )
+    result = _adapthist.clip_histogram(cp.asarray(hist), clip_limit)
+    assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("batch_axes", [0, 2, (0, 1)])
+def test_adapthist_batch(batch_axes):
+    rng = np.random.RandomState(0)
+    img = cp.asarray(rng.rand(3, 40, 4, 36))
+    if batch_axes == 2:
+        img = img[0]
+    adapted = exposure.equalize_adapthist(
+        img, kernel_size=8, clip_limit=0.02, batch_axes=batch_axes
+    )
+    assert adapted.shape == img.shape
+    batch = (batch_axes,) if isinstance(batch_axes, int) else batch_axes
+    moved = cp.moveaxis(img, batch, range(len(batch)))
+    moved_adapted = cp.moveaxis(adapted, batch, range(len(batch)))
+    for idx in np.ndindex(moved.shape[: len(batch)]):
+        expected = exposure.equalize_adapthist(
+            moved[idx], kernel_size=8, clip_limit=0.02
+        )
+        assert_array_almost_equal(moved_adapted[idx], expected)
+
+
+def test_adapthist_kernel_size_3d():
+    rng = np.random.RandomState(0)
+    img = cp.asarray(rng.rand(20, 24, 28))
+    adapted = exposure.equalize_adapthist(img, kernel_size=(5, 6, 7))
+    assert adapted.shape == img.shape
+    assert float(adapted.min()) == 0
+    assert float(adapted.max()) == 1
+    with pytest.raises(ValueError):
+        exposure.equalize_adapthist(img, kernel_size=(5, 6))
+
+
 def peak_snr(img1, img2):
     """Peak signal to noise ratio of two images
 
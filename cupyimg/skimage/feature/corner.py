@@ -4,11 +4,11 @@ from itertools import combinations_with_replacement
 
 import cupy as cp
 import numpy as np
-from scipy import spatial  # TODO: use RAPIDS cuSpatial?
 
 import cupyimg.numpy as cnp
 from cupyimg.scipy import ndimage as ndi
 from .peak import peak_local_max
+from .._shared.coord import ensure_spacing
 from .util import _prepare_grayscale_input_nD
 
 # from ..transform import integral_image
@@ -922,27 +922,10 @@ def corner_peaks(
         num_peaks_per_label=num_peaks_per_label,
     )
 
-    if len(coords):
-        # TODO: modify to do KDTree on the GPU (cuSpatial?)
-        coords = cp.asnumpy(coords)
-
-        # Use KDtree to find the peaks that are too close to each other
-        tree = spatial.cKDTree(coords)
-
-        rejected_peaks_indices = set()
-        for idx, point in enumerate(coords):
-            if idx not in rejected_peaks_indices:
-                candidates = tree.query_ball_point(
-                    point, r=min_distance, p=p_norm
-                )
-                candidates.remove(idx)
-                rejected_peaks_indices.update(candidates)
-
-        # Remove the peaks that are too close to each other
-        coords = np.delete(coords, tuple(rejected_peaks_indices), axis=0)[
-            :num_peaks
-        ]
-        coords = cp.asarray(coords)
+    # Remove the peaks that are too close to each other (on the GPU)
+    coords = ensure_spacing(
+        coords, spacing=min_distance, p_norm=p_norm, inclusive=True
+    )[:num_peaks]
 
     if indices:
         return coords
@@ -2,11 +2,9 @@ import warnings
 
 import cupy as cp
 import numpy as np
-from scipy.ndimage import find_objects as cpu_find_objects
 from cupyimg.skimage import measure
 
 import cupyimg.scipy.ndimage as ndi
-from cupyx.scipy import ndimage as cupyx_ndi
 
 # from .. import measure
 # from ..filters import rank_order
@@ -296,11 +294,7 @@ def peak_local_max(
         # For each label, extract a smaller image enclosing the object of
         # interest, identify num_peaks_per_label peaks and mark them in
         # variable out.
-        # TODO: use GPU version of find_objects
-        try:
-            objects = cupyx_ndi.find_objects(_labels)
-        except AttributeError:
-            objects = cpu_find_objects(cp.asnumpy(_labels))
+        objects = ndi.find_objects(_labels)
 
         for label_idx, roi in enumerate(objects):
             if roi is None:
@@ -1,38 +1,27 @@
 import cupy as cp
 import numpy as np
 from cupyimg._misc import _prod
+from cupyimg.scipy.ndimage._filters_uniform import _box_filter1d
 from cupyimg.scipy.signal import fftconvolve
 
 from .._shared.utils import check_nD
 
 
-def _window_sum_2d(image, window_shape):
+def _window_sum(image, window_shape):
+    """Sums over the windows shifted by one along each axis.
 
-    window_sum = cp.cumsum(image, axis=0)
-    window_sum = (
-        window_sum[window_shape[0] : -1] - window_sum[: -window_shape[0] - 1]
-    )
-
-    window_sum = cp.cumsum(window_sum, axis=1)
-    window_sum = (
-        window_sum[:, window_shape[1] : -1]
-        - window_sum[:, : -window_shape[1] - 1]
-    )
-
-    return window_sum
-
-
-def _window_sum_3d(image, window_shape):
-
-    window_sum = _window_sum_2d(image, window_shape)
-
-    window_sum = cp.cumsum(window_sum, axis=2)
-    window_sum = (
-        window_sum[:, :, window_shape[2] : -1]
-        - window_sum[:, :, : -window_shape[2] - 1]
-    )
-
-    return window_sum
+    Matches the cumulative-sum based implementation of scikit-image, but uses
+    running sums so that the cost does not depend on the window size.
+    """
+    for axis, width in enumerate(window_shape):
+        window_sum = _box_filter1d(
+            image, width, axis, None, "constant", 0, 0, normalize=False
+        )
+        # window of output j: [j - width // 2, j - width // 2 + width - 1]
+        start = width // 2 + 1
+        stop = start + image.shape[axis] - width - 1
+        image = window_sum[(slice(None),) * axis + (slice(start, stop),)]
+    return image
 
 
 def match_template(
@@ -149,14 +138,8 @@ def match_template(
     else:
         image = cp.pad(image, pad_width=pad_width, mode=mode)
 
-    # Use special case for 2-D images for much better performance in
-    # computation of integral images
-    if image.ndim == 2:
-        image_window_sum = _window_sum_2d(image, template.shape)
-        image_window_sum2 = _window_sum_2d(image * image, template.shape)
-    elif image.ndim == 3:
-        image_window_sum = _window_sum_3d(image, template.shape)
-        image_window_sum2 = _window_sum_3d(image * image, template.shape)
+    image_window_sum = _window_sum(image, template.shape)
+    image_window_sum2 = _window_sum(image * image, template.shape)
 
     template_mean = template.mean()
     template_volume = _prod(template.shape)
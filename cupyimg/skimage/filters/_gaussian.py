@@ -2,6 +2,7 @@ from collections.abc import Iterable
 import cupy as cp
 import numpy as np
 from cupyimg.scipy import ndimage as ndi
+from cupyimg.scipy.ndimage._util import _check_batch_axes
 
 from ..util import img_as_float
 from .._shared.utils import warn, convert_to_float
@@ -19,6 +20,8 @@ def gaussian(
     multichannel=None,
     preserve_range=False,
     truncate=4.0,
+    *,
+    batch_axes=None,
 ):
     """Multi-dimensional Gaussian filter.
 
@@ -54,6 +57,12 @@ def gaussian(
         https://scikit-image.org/docs/dev/user_guide/data_types.html
     truncate : float, optional
         Truncate the filter at this many standard deviations.
+    batch_axes : int or sequence of int, optional
+        Axes of ``image`` holding independent images (e.g. the leading axis
+        of a stack of 2D images). No filtering is done along these axes, so
+        the whole stack is filtered with the same kernel launches as a single
+        image. ``sigma`` and ``multichannel`` then refer to the remaining
+        axes.
 
     Returns
     -------
@@ -107,11 +116,16 @@ def gaussian(
 
     """
 
+    batch_axes = _check_batch_axes(batch_axes, image.ndim)
+    # number of axes of each individual image
+    ndim = image.ndim - len(batch_axes)
     spatial_dims = None
     try:
-        spatial_dims = _guess_spatial_dimensions(image)
+        spatial_dims = _guess_spatial_dimensions(
+            _first_in_batch(image, batch_axes)
+        )
     except ValueError:
-        spatial_dims = image.ndim
+        spatial_dims = ndim
     if spatial_dims is None and multichannel is None:
         msg = (
             "Images with dimensions (M, N, 3) are interpreted as 2D+RGB "
@@ -130,8 +144,8 @@ def gaussian(
     if multichannel:
         # do not filter across channels
         if not isinstance(sigma, Iterable):
-            sigma = [sigma] * (image.ndim - 1)
-        if len(sigma) != image.ndim:
+            sigma = [sigma] * (ndim - 1)
+        if len(sigma) != ndim:
             sigma = tuple(sigma) + (0,)  # zero on channels axis
         sigma = tuple(sigma)
     image = convert_to_float(image, preserve_range)
@@ -140,11 +154,28 @@ def gaussian(
     elif not np.issubdtype(output.dtype, np.floating):
         raise ValueError("Provided output data type is not float")
     ndi.gaussian_filter(
-        image, sigma, output=output, mode=mode, cval=cval, truncate=truncate
+        image,
+        sigma,
+        output=output,
+        mode=mode,
+        cval=cval,
+        truncate=truncate,
+        batch_axes=batch_axes,
     )
     return output
 
 
+def _first_in_batch(image, batch_axes):
+    """View of the first image of a batch (used to inspect its shape)."""
+    if not batch_axes:
+        return image
+    return image[
+        tuple(
+            0 if ax in batch_axes else slice(None) for ax in range(image.ndim)
+        )
+    ]
+
+
 def _guess_spatial_dimensions(image):
     """Make an educated guess about whether an image has a channels dimension.
 
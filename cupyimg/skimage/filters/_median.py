@@ -2,10 +2,18 @@ from warnings import warn
 
 import numpy as np
 from cupyimg.scipy import ndimage as ndi
+from cupyimg.scipy.ndimage._util import _check_batch_axes
 
 
 def median(
-    image, selem=None, out=None, mode="nearest", cval=0.0, behavior="ndimage"
+    image,
+    selem=None,
+    out=None,
+    mode="nearest",
+    cval=0.0,
+    behavior="ndimage",
+    *,
+    batch_axes=None,
 ):
     """Return local median of an image.
 
@@ -43,6 +51,11 @@ def median(
            ``behavior`` is introduced in 0.15
         .. versionchanged:: 0.16
            Default ``behavior`` has been changed from 'rank' to 'ndimage'
+    batch_axes : int or sequence of int, optional
+        Axes of ``image`` holding independent images (e.g. the leading axis
+        of a stack of 2D images). No filtering is done along these axes, so
+        the whole stack is filtered in a single kernel launch. ``selem`` then
+        has one dimension per remaining axis.
 
     Returns
     -------
@@ -75,8 +88,15 @@ def median(
         # TODO: implement median rank filter
         # return generic.median(image, selem=selem, out=out)
 
+    batch_axes = _check_batch_axes(batch_axes, image.ndim)
     if selem is None:
-        selem = ndi.generate_binary_structure(image.ndim, image.ndim)
+        ndim = image.ndim - len(batch_axes)
+        selem = ndi.generate_binary_structure(ndim, ndim)
     return ndi.median_filter(
-        image, footprint=selem, output=out, mode=mode, cval=cval
+        image,
+        footprint=selem,
+        output=out,
+        mode=mode,
+        cval=cval,
+        batch_axes=batch_axes,
     )
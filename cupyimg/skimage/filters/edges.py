@@ -16,6 +16,11 @@ import numpy as np
 from .. import img_as_float
 from .._shared.utils import check_nD
 from cupyimg.scipy import ndimage as ndi
+from cupyimg.scipy.ndimage._util import (
+    _check_axis,
+    _check_batch_axes,
+    _expand_batch_array,
+)
 
 from ..restoration.uft import laplacian
 
@@ -52,14 +57,18 @@ HFARID_WEIGHTS = d1.T * p
 VFARID_WEIGHTS = np.copy(HFARID_WEIGHTS.T)
 
 
-def _mask_filter_result(result, mask):
+def _mask_filter_result(result, mask, batch_axes=()):
     """Return result after masking.
 
     Input masks are eroded so that mask areas in the original image don't
     affect values in the result.
     """
     if mask is not None:
-        erosion_selem = ndi.generate_binary_structure(mask.ndim, mask.ndim)
+        ndim = mask.ndim - len(batch_axes)
+        erosion_selem = ndi.generate_binary_structure(ndim, ndim)
+        erosion_selem = _expand_batch_array(
+            erosion_selem, mask.ndim, batch_axes
+        )
         mask = ndi.binary_erosion(mask, erosion_selem, border_value=0)
         result *= mask
     return result
@@ -134,6 +143,7 @@ def _generic_edge_filter(
     mode="reflect",
     cval=0.0,
     mask=None,
+    batch_axes=None,
 ):
     """Apply a generic, n-dimensional edge filter.
 
@@ -167,14 +177,23 @@ def _generic_edge_filter(
     cval : float, optional
         When `mode` is ``'constant'``, this is the constant used in values
         outside the boundary of the image data.
+    batch_axes : int or sequence of int, optional
+        Axes of ``image`` holding independent images. No filtering is done
+        along these axes and they are excluded from the magnitude.
     """
-    ndim = image.ndim
+    batch_axes = _check_batch_axes(batch_axes, image.ndim)
+    # axes of the individual images
+    image_axes = [ax for ax in range(image.ndim) if ax not in batch_axes]
+    ndim = len(image_axes)
     if axis is None:
-        axes = list(range(ndim))
+        axes = image_axes
     elif np.isscalar(axis):
         axes = [axis]
     else:
         axes = axis
+    axes = [_check_axis(ax, image.ndim) for ax in axes]
+    if any(ax in batch_axes for ax in axes):
+        raise ValueError("axis must not be one of batch_axes")
     return_magnitude = len(axes) > 1
 
     output = cp.zeros(image.shape, dtype=float)
@@ -185,11 +204,14 @@ def _generic_edge_filter(
     smooth_weights = cp.asarray(smooth_weights)
 
     for edge_dim in axes:
+        edge_dim = image_axes.index(edge_dim)
         kernel = _reshape_nd(edge_weights, ndim, edge_dim)
         smooth_axes = list(set(range(ndim)) - {edge_dim})
         for smooth_dim in smooth_axes:
             kernel = kernel * _reshape_nd(smooth_weights, ndim, smooth_dim)
-        ax_output = ndi.convolve(image, kernel, mode=mode)
+        ax_output = ndi.convolve(
+            image, kernel, mode=mode, batch_axes=batch_axes
+        )
         if return_magnitude:
             ax_output *= ax_output
         output += ax_output
@@ -200,7 +222,9 @@ def _generic_edge_filter(
     return output
 
 
-def sobel(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
+def sobel(
+    image, mask=None, *, axis=None, mode="reflect", cval=0.0, batch_axes=None
+):
     """Find edges in an image using the Sobel filter.
 
     Parameters
@@ -225,6 +249,11 @@ def sobel(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
     cval : float, optional
         When `mode` is ``'constant'``, this is the constant used in values
         outside the boundary of the image data.
+    batch_axes : int or sequence of int, optional
+        Axes of ``image`` holding independent images (e.g. the leading axis
+        of a stack of 2D images). No filtering is done along these axes, so
+        the whole stack is processed with the same kernel launches as a
+        single image. ``axis`` refers to the axes of ``image``.
 
     Returns
     -------
@@ -251,9 +280,16 @@ def sobel(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
     """
     image = img_as_float(image)
     output = _generic_edge_filter(
-        image, smooth_weights=SOBEL_SMOOTH, axis=axis, mode=mode, cval=cval
+        image,
+        smooth_weights=SOBEL_SMOOTH,
+        axis=axis,
+        mode=mode,
+        cval=cval,
+        batch_axes=batch_axes,
+    )
+    output = _mask_filter_result(
+        output, mask, _check_batch_axes(batch_axes, image.ndim)
     )
-    output = _mask_filter_result(output, mask)
     return output
 
 
@@ -317,7 +353,9 @@ def sobel_v(image, mask=None):
     return sobel(image, mask=mask, axis=1)
 
 
-def scharr(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
+def scharr(
+    image, mask=None, *, axis=None, mode="reflect", cval=0.0, batch_axes=None
+):
     """Find the edge magnitude using the Scharr transform.
 
     Parameters
@@ -342,6 +380,11 @@ def scharr(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
     cval : float, optional
         When `mode` is ``'constant'``, this is the constant used in values
         outside the boundary of the image data.
+    batch_axes : int or sequence of int, optional
+        Axes of ``image`` holding independent images (e.g. the leading axis
+        of a stack of 2D images). No filtering is done along these axes, so
+        the whole stack is processed with the same kernel launches as a
+        single image. ``axis`` refers to the axes of ``image``.
 
     Returns
     -------
@@ -373,9 +416,16 @@ def scharr(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
     """
     image = img_as_float(image)
     output = _generic_edge_filter(
-        image, smooth_weights=SCHARR_SMOOTH, axis=axis, mode=mode, cval=cval
+        image,
+        smooth_weights=SCHARR_SMOOTH,
+        axis=axis,
+        mode=mode,
+        cval=cval,
+        batch_axes=batch_axes,
+    )
+    output = _mask_filter_result(
+        output, mask, _check_batch_axes(batch_axes, image.ndim)
     )
-    output = _mask_filter_result(output, mask)
     return output
 
 
@@ -448,7 +498,9 @@ def scharr_v(image, mask=None):
     return scharr(image, mask=mask, axis=1)
 
 
-def prewitt(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
+def prewitt(
+    image, mask=None, *, axis=None, mode="reflect", cval=0.0, batch_axes=None
+):
     """Find the edge magnitude using the Prewitt transform.
 
     Parameters
@@ -473,6 +525,11 @@ def prewitt(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
     cval : float, optional
         When `mode` is ``'constant'``, this is the constant used in values
         outside the boundary of the image data.
+    batch_axes : int or sequence of int, optional
+        Axes of ``image`` holding independent images (e.g. the leading axis
+        of a stack of 2D images). No filtering is done along these axes, so
+        the whole stack is processed with the same kernel launches as a
+        single image. ``axis`` refers to the axes of ``image``.
 
     Returns
     -------
@@ -501,9 +558,16 @@ def prewitt(image, mask=None, *, axis=None, mode="reflect", cval=0.0):
     """
     image = img_as_float(image)
     output = _generic_edge_filter(
-        image, smooth_weights=PREWITT_SMOOTH, axis=axis, mode=mode, cval=cval
+        image,
+        smooth_weights=PREWITT_SMOOTH,
+        axis=axis,
+        mode=mode,
+        cval=cval,
+        batch_axes=batch_axes,
+    )
+    output = _mask_filter_result(
+        output, mask, _check_batch_axes(batch_axes, image.ndim)
     )
-    output = _mask_filter_result(output, mask)
     return output
 
 
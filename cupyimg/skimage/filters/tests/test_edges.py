@@ -602,3 +602,19 @@ def test_range(detector):
     assert_(
         out.max() <= 1, f"Maximum of `{detector.__name__}` is larger than 1."
     )
+
+
+@pytest.mark.parametrize(
+    "func", [filters.sobel, filters.scharr, filters.prewitt]
+)
+@pytest.mark.parametrize("axis", [None, 1, 2])
+def test_edges_batch_axes(func, axis):
+    rng = cp.random.RandomState(0)
+    stack = rng.standard_normal((3, 20, 21))
+    mask = rng.standard_normal((3, 20, 21)) > -1
+    result = func(stack, mask=mask, axis=axis, batch_axes=0)
+    # axis of a single image from the stack
+    image_axis = None if axis is None else axis - 1
+    for n in range(stack.shape[0]):
+        expected = func(stack[n], mask=mask[n], axis=image_axis)
+        assert_allclose(result[n], expected, atol=1e-7)
@@ -150,3 +150,12 @@ def test_dog_invalid_sigma2():
         difference_of_gaussians(image, 3, 2)
     with pytest.raises(ValueError):
         difference_of_gaussians(image, (1, 5), (2, 4))
+
+
+def test_batch_axes():
+    rng = cp.random.RandomState(0)
+    stack = rng.standard_normal((3, 16, 15, 3))
+    result = gaussian(stack, sigma=1.5, multichannel=True, batch_axes=0)
+    for n in range(stack.shape[0]):
+        expected = gaussian(stack[n], sigma=1.5, multichannel=True)
+        cp.testing.assert_allclose(result[n], expected, atol=1e-6)
@@ -78,3 +78,11 @@ def test_median_preserve_dtype(image, dtype):
 )
 def test_median(img, behavior):
     median(img, behavior=behavior)
+
+
+def test_median_batch_axes():
+    rng = cp.random.RandomState(0)
+    stack = rng.randint(0, 255, (4, 20, 21)).astype(cp.uint8)
+    result = median(stack, batch_axes=0)
+    for n in range(stack.shape[0]):
+        assert_allclose(result[n], median(stack[n]))
@@ -1,6 +1,5 @@
 from collections import OrderedDict
 from collections.abc import Iterable
-import itertools
 import math
 
 import cupy as cp
@@ -10,8 +9,7 @@ from cupyimg import numpy as cnp
 
 from ..exposure import histogram
 from .._shared.utils import check_nD, warn
-from ..transform import integral_image
-from ..util import crop, dtype_limits
+from ..util import dtype_limits
 
 
 __all__ = [
@@ -247,18 +245,9 @@ def threshold_local(
             image, sigma, output=thresh_image, mode=mode, cval=cval
         )
     elif method == "mean":
-        mask = 1.0 / block_size * cp.ones((block_size,))
-        # separation of filters to speedup convolution
-        ndi.convolve1d(
-            image, mask, axis=0, output=thresh_image, mode=mode, cval=cval
-        )
-        ndi.convolve1d(
-            thresh_image,
-            mask,
-            axis=1,
-            output=thresh_image,
-            mode=mode,
-            cval=cval,
+        # running sums: the cost does not depend on block_size
+        ndi.uniform_filter(
+            image, block_size, output=thresh_image, mode=mode, cval=cval
         )
     elif method == "median":
         ndi.median_filter(
@@ -1003,8 +992,8 @@ def _validate_window_size(axis_sizes):
 def _mean_std(image, w):
     """Return local mean and standard deviation of each pixel using a
     neighborhood defined by a rectangular window size ``w``.
-    The algorithm uses integral images to speedup computation. This is
-    used by :func:`threshold_niblack` and :func:`threshold_sauvola`.
+    The algorithm uses running sums (box filters) to speedup computation.
+    This is used by :func:`threshold_niblack` and :func:`threshold_sauvola`.
 
     Parameters
     ----------
@@ -1034,22 +1023,11 @@ def _mean_std(image, w):
         w = (w,) * image.ndim
     _validate_window_size(w)
 
-    pad_width = tuple((k // 2 + 1, k // 2) for k in w)
-    padded = cp.pad(image.astype("float"), pad_width, mode="reflect")
-    padded_sq = padded * padded
-
-    integral = integral_image(padded)
-    integral_sq = integral_image(padded_sq)
-
-    kern = cp.zeros(tuple(k + 1 for k in w))
-    for indices in itertools.product(*([[0, -1]] * image.ndim)):
-        kern[indices] = (-1) ** (image.ndim % 2 != np.sum(indices) % 2)
-
-    total_window_size = np.prod(w)
-    sum_full = ndi.correlate(integral, kern, mode="constant")
-    m = crop(sum_full, pad_width) / total_window_size
-    sum_sq_full = ndi.correlate(integral_sq, kern, mode="constant")
-    g2 = crop(sum_sq_full, pad_width) / total_window_size
+    # mode="mirror" is the equivalent of numpy.pad's "reflect" mode used by
+    # the integral image implementation of scikit-image
+    image = image.astype(float, copy=False)
+    m = ndi.uniform_filter(image, w, mode="mirror")
+    g2 = ndi.uniform_filter(image * image, w, mode="mirror")
     # Note: we use cp.clip because g2 is not guaranteed to be greater than
     # m*m when floating point error is considered
     s = cp.sqrt(cp.clip(g2 - m * m, 0, None))
@@ -1,7 +1,7 @@
 import cupy as cp
 import scipy.ndimage as cpu_ndi
 
-from cupyimg.scipy.ndimage.measurements import _label
+from cupyimg.scipy.ndimage.measurements import _label, _label_dtype
 
 
 def _get_structure(ndim, connectivity):
@@ -13,8 +13,6 @@ def _get_structure(ndim, connectivity):
     return cpu_ndi.generate_binary_structure(ndim, connectivity)
 
 
-# TODO: grlee77
-#       currently uses int32 for the labels. should add int64 option as well
 def label(input, background=None, return_num=False, connectivity=None):
     r"""Label connected regions of an integer array.
 
@@ -73,9 +71,9 @@ def label(input, background=None, return_num=False, connectivity=None):
 
     Notes
     -----
-    Currently the cupyimg implementation of this function always uses 32-bit
-    integers for the label array. This is done for performance. In the future
-    64-bit integer support may also be added for better skimage compatibility.
+    For performance, the cupyimg implementation of this function uses 32-bit
+    integers for the label array unless the image has ``2 ** 31`` pixels or
+    more, in which case 64-bit integers are used.
 
     Examples
     --------
@@ -118,7 +116,7 @@ def label(input, background=None, return_num=False, connectivity=None):
         # same here for non-integer dtypes.
         input = input.astype(cp.intp)
 
-    labels = cp.empty(input.shape, order="C", dtype=cp.int32)
+    labels = cp.empty(input.shape, order="C", dtype=_label_dtype(input.size))
     num = _label(input, structure, labels, greyscale_mode=True)
 
     if return_num:
@@ -5,10 +5,10 @@ from warnings import warn
 
 import cupy as cp
 import numpy as np
-from scipy.ndimage import find_objects as cpu_find_objects
 
 from cupyimg.scipy import ndimage as ndi
 from . import _moments
+from ._regionprops_vectorized import VECTORIZED_PROPS, regionprops_vectorized
 from ._regionprops_utils import euler_number, perimeter, perimeter_crofton
 
 
@@ -764,6 +764,42 @@ def _props_to_dict(regions, properties=("label", "bbox"), separator="-"):
     return out
 
 
+def _vectorized_props_to_dict(props, separator="-"):
+    """Convert the output of ``regionprops_vectorized`` to a column dict.
+
+    Columns follow the same naming and dtype conventions as
+    :func:`_props_to_dict`, but each column is obtained by slicing the
+    batched device arrays rather than by looping over regions.
+    """
+    out = {}
+    for prop, values in props.items():
+        dtype = COL_DTYPES[prop]
+        if values.ndim == 1:
+            out[prop] = values.astype(dtype)
+            continue
+        for ind in np.ndindex(values.shape[1:]):
+            modified_prop = separator.join(map(str, (prop,) + ind))
+            out[modified_prop] = values[(slice(None),) + ind].astype(dtype)
+    return out
+
+
+def _check_label_image(label_image):
+    if label_image.ndim not in (2, 3):
+        raise TypeError("Only 2-D and 3-D images supported.")
+
+    if not cp.issubdtype(label_image.dtype, cp.integer):
+        if cp.issubdtype(label_image.dtype, cp.bool_):
+            raise TypeError(
+                "Non-integer image types are ambiguous: "
+                "use skimage.measure.label to label the connected"
+                "components of label_image,"
+                "or label_image.astype(np.uint8) to interpret"
+                "the True values as a single label."
+            )
+        else:
+            raise TypeError("Non-integer label_image types are ambiguous")
+
+
 def regionprops_table(
     label_image,
     intensity_image=None,
@@ -772,6 +808,7 @@ def regionprops_table(
     cache=True,
     separator="-",
     extra_properties=None,
+    vectorized=True,
 ):
     """Compute image properties and return them as a pandas-compatible table.
 
@@ -820,6 +857,12 @@ def regionprops_table(
         issued. A property computation function must take a region mask as its
         first argument. If the property requires an intensity image, it must
         accept the intensity image as the second argument.
+    vectorized : bool, optional
+        If True and all requested ``properties`` are in
+        ``VECTORIZED_PROPS`` (and no ``extra_properties`` are given), the
+        properties of all regions are computed at once via label-keyed
+        reductions on the device instead of one ``RegionProperties`` object
+        per region. This option does not exist in scikit-image.
 
     Returns
     -------
@@ -904,6 +947,17 @@ def regionprops_table(
     4      5       112.50        113.0        114.0
 
     """
+    if (
+        vectorized
+        and extra_properties is None
+        and VECTORIZED_PROPS.issuperset(properties)
+    ):
+        _check_label_image(label_image)
+        props = regionprops_vectorized(
+            label_image, intensity_image, properties=properties
+        )
+        return _vectorized_props_to_dict(props, separator=separator)
+
     regions = regionprops(
         label_image,
         intensity_image=intensity_image,
@@ -1192,21 +1246,7 @@ def regionprops(
     42
 
     """
-
-    if label_image.ndim not in (2, 3):
-        raise TypeError("Only 2-D and 3-D images supported.")
-
-    if not cp.issubdtype(label_image.dtype, cp.integer):
-        if cp.issubdtype(label_image.dtype, cp.bool_):
-            raise TypeError(
-                "Non-integer image types are ambiguous: "
-                "use skimage.measure.label to label the connected"
-                "components of label_image,"
-                "or label_image.astype(np.uint8) to interpret"
-                "the True values as a single label."
-            )
-        else:
-            raise TypeError("Non-integer label_image types are ambiguous")
+    _check_label_image(label_image)
 
     if coordinates is not None:
         if coordinates == "rc":
@@ -1230,9 +1270,7 @@ def regionprops(
 
     regions = []
 
-    # warn("host/device transfer required: ndimage.find_objects not implemented "
-    #     " on the GPU.")
-    objects = cpu_find_objects(cp.asnumpy(label_image))
+    objects = ndi.find_objects(label_image)
     for i, sl in enumerate(objects):
         if sl is None:
             continue
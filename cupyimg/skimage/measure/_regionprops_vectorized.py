@@ -0,0 +1,330 @@
+"""Vectorized computation of region properties for all labels at once.
+
+Rather than creating one ``RegionProperties`` object per label and launching
+small kernels for each of them, the properties supported here are computed
+for every label simultaneously via segmented (label-keyed) reductions.
+"""
+import math
+
+import cupy as cp
+import numpy as np
+
+from cupyimg import memoize
+from cupyimg.scipy.ndimage.measurements import _find_objects_bounds
+
+# properties that can be computed by the vectorized engine
+VECTORIZED_PROPS = {
+    "area",
+    "bbox",
+    "bbox_area",
+    "centroid",
+    "equivalent_diameter",
+    "extent",
+    "inertia_tensor",
+    "inertia_tensor_eigvals",
+    "label",
+    "local_centroid",
+    "max_intensity",
+    "mean_intensity",
+    "min_intensity",
+    "moments",
+    "moments_central",
+}
+
+# properties requiring an intensity image
+_INTENSITY_PROPS = {"max_intensity", "mean_intensity", "min_intensity"}
+
+
+@memoize(for_each_device=True)
+def _get_label_moments_kernel(ndim, order):
+    """Accumulate moments of each label about a per-label reference point.
+
+    For the label at row ``r``, ``m[r, p0, p1, ...]`` accumulates the product
+    ``prod_d (coord_d - ref[r, d]) ** p_d`` over all pixels of the label.
+    """
+    nterms = (order + 1) ** ndim
+    loops = []
+    indent = "    "
+    for d in range(ndim):
+        loops.append(
+            indent * (d + 1)
+            + "for (int a{d} = 0; a{d} <= {order}; a{d}++) {{".format(
+                d=d, order=order
+            )
+        )
+    prod = " * ".join("p[{d}][a{d}]".format(d=d) for d in range(ndim))
+    inner = indent * (ndim + 1) + (
+        "atomicAdd(&m[r * {nterms} + k], {prod});\n".format(
+            nterms=nterms, prod=prod
+        )
+        + indent * (ndim + 1)
+        + "k++;"
+    )
+    loops = "\n".join(loops) + "\n" + inner + "\n" + "}" * ndim
+
+    code = """
+    if (x <= 0 || x > max_label) continue;
+    int r = row[(ptrdiff_t)x];
+    if (r < 0) continue;
+    double p[{ndim}][{order} + 1];
+    ptrdiff_t _i = i;
+    for (int d = {ndim} - 1; d >= 0; d--) {{
+        double delta = (double)(_i % shape[d]) - ref[r * {ndim} + d];
+        _i /= shape[d];
+        p[d][0] = 1.0;
+        for (int k = 1; k <= {order}; k++) {{
+            p[d][k] = p[d][k - 1] * delta;
+        }}
+    }}
+    int k = 0;
+    {loops}
+    """.format(
+        ndim=ndim, order=order, loops=loops
+    )
+    return cp.ElementwiseKernel(
+        "X x, raw int32 row, raw int32 shape, raw float64 ref, int32 max_label",
+        "raw float64 m",
+        code,
+        "cupyimg_label_moments_{}d_order{}".format(ndim, order),
+    )
+
+
+def _label_moments(label_image, row, ref, n_labels, max_label, order=3):
+    ndim = label_image.ndim
+    m = cp.zeros((n_labels,) + (order + 1,) * ndim, dtype=cp.float64)
+    if n_labels == 0:
+        return m
+    shape = cp.asarray(label_image.shape, dtype=cp.int32)
+    kernel = _get_label_moments_kernel(ndim, order)
+    kernel(
+        label_image,
+        row,
+        shape,
+        cp.ascontiguousarray(ref, dtype=cp.float64),
+        max_label,
+        m,
+    )
+    return m
+
+
+def _inertia_tensor(mu):
+    """Inertia tensors from a stack of central moments of shape (n, ...)."""
+    n = mu.shape[0]
+    ndim = mu.ndim - 1
+    mu0 = mu[(slice(None),) + (0,) * ndim]
+    # second order moments along each axis
+    corners2 = 2 * np.eye(ndim, dtype=int)
+    mu2 = cp.stack(
+        [mu[(slice(None),) + tuple(corners2[d])] for d in range(ndim)],
+        axis=-1,
+    )
+    result = cp.zeros((n, ndim, ndim), dtype=cp.float64)
+    diag = (mu2.sum(axis=-1, keepdims=True) - mu2) / mu0[:, np.newaxis]
+    for d in range(ndim):
+        result[:, d, d] = diag[:, d]
+        for d2 in range(d + 1, ndim):
+            mu_index = np.zeros(ndim, dtype=int)
+            mu_index[[d, d2]] = 1
+            val = -mu[(slice(None),) + tuple(mu_index)] / mu0
+            result[:, d, d2] = val
+            result[:, d2, d] = val
+    return result
+
+
+def _symmetric_eigvals(T):
+    """Eigenvalues, in descending order, of a stack of 2x2 or 3x3 symmetric
+    matrices, computed in closed form and clipped to be non-negative."""
+    ndim = T.shape[-1]
+    if ndim == 2:
+        a, b, c = T[:, 0, 0], T[:, 0, 1], T[:, 1, 1]
+        mean = (a + c) / 2
+        radius = cp.sqrt(((a - c) / 2) ** 2 + b * b)
+        eigvals = cp.stack((mean + radius, mean - radius), axis=-1)
+    elif ndim == 3:
+        # trigonometric solution for the eigenvalues of a symmetric 3x3 matrix
+        q = cp.trace(T, axis1=1, axis2=2) / 3
+        p1 = T[:, 0, 1] ** 2 + T[:, 0, 2] ** 2 + T[:, 1, 2] ** 2
+        p2 = (
+            (T[:, 0, 0] - q) ** 2
+            + (T[:, 1, 1] - q) ** 2
+            + (T[:, 2, 2] - q) ** 2
+            + 2 * p1
+        )
+        p = cp.sqrt(p2 / 6)
+        degenerate = p == 0
+        p_safe = cp.where(degenerate, 1, p)
+        B = (T - q[:, np.newaxis, np.newaxis] * cp.eye(3)) / p_safe[
+            :, np.newaxis, np.newaxis
+        ]
+        r = cp.clip(cp.linalg.det(B) / 2, -1, 1)
+        phi = cp.arccos(r) / 3
+        e1 = q + 2 * p * cp.cos(phi)
+        e3 = q + 2 * p * cp.cos(phi + 2 * math.pi / 3)
+        e2 = 3 * q - e1 - e3
+        eigvals = cp.stack((e1, e2, e3), axis=-1)
+        eigvals[degenerate] = q[degenerate, np.newaxis]
+    else:
+        raise NotImplementedError("only 2D and 3D inertia tensors supported")
+    return cp.clip(eigvals, 0, None)
+
+
+def _labeled_min_max(values, labels, mask, label_values):
+    """Per-label minimum and maximum via a single (value, label) lexsort."""
+    if label_values.size == 0:
+        empty = cp.empty((0,), dtype=values.dtype)
+        return empty, empty
+    values = values.ravel()[mask]
+    labels = labels[mask]
+    order = cp.lexsort(cp.stack((values, labels)))
+    values = values[order]
+    labels = labels[order]
+    first = cp.searchsorted(labels, label_values, side="left")
+    last = cp.searchsorted(labels, label_values, side="right") - 1
+    return values[first], values[last]
+
+
+def regionprops_vectorized(label_image, intensity_image=None, properties=()):
+    """Compute the requested region properties for all labels at once.
+
+    Parameters
+    ----------
+    label_image : (M, N[, P]) cupy.ndarray
+        Labeled input image. Labels with value 0 are ignored.
+    intensity_image : (M, N[, P][, C]) cupy.ndarray, optional
+        Intensity image with same size as the labeled image, plus optionally
+        an extra dimension for multichannel data.
+    properties : sequence of str
+        The properties to compute. Each must be in ``VECTORIZED_PROPS``.
+
+    Returns
+    -------
+    props : dict
+        Dictionary mapping each requested property to a device array whose
+        first axis corresponds to the labels present in ``label_image``, in
+        increasing order.
+    """
+    unsupported = set(properties) - VECTORIZED_PROPS
+    if unsupported:
+        raise ValueError(
+            "properties {} are not supported by the vectorized "
+            "engine".format(sorted(unsupported))
+        )
+    ndim = label_image.ndim
+    if intensity_image is None:
+        if _INTENSITY_PROPS.intersection(properties):
+            raise AttributeError("No intensity image specified.")
+    elif not (
+        intensity_image.shape[:ndim] == label_image.shape
+        and intensity_image.ndim in [ndim, ndim + 1]
+    ):
+        raise ValueError(
+            "Label and intensity image shapes must match,"
+            " except for channel (last) axis."
+        )
+
+    # bounding boxes of all labels in a single pass
+    bbox_min, bbox_max = _find_objects_bounds(label_image)
+    max_label = bbox_min.shape[0]
+    present = bbox_max[:, 0] > 0
+    label_values = cp.nonzero(present)[0] + 1
+    n_labels = int(label_values.size)  # synchronize
+    bbox_min = bbox_min[present]
+    bbox_max = bbox_max[present]
+
+    # dense map from label value to output row
+    row = cp.full((max_label + 1,), -1, dtype=cp.int32)
+    row[label_values] = cp.arange(n_labels, dtype=cp.int32)
+
+    labels_flat = label_image.ravel()
+    fg = (labels_flat > 0) & (labels_flat <= max_label)
+    labels_idx = cp.where(fg, labels_flat, 0).astype(cp.intp, copy=False)
+
+    cache = {}
+
+    def get(prop):
+        if prop in cache:
+            return cache[prop]
+        if prop == "label":
+            val = label_values
+        elif prop == "area":
+            counts = cp.bincount(labels_idx, minlength=max_label + 1)
+            val = counts[label_values]
+        elif prop == "bbox":
+            val = cp.concatenate((bbox_min, bbox_max), axis=1)
+        elif prop == "bbox_area":
+            val = cp.prod(bbox_max - bbox_min, axis=1, dtype=cp.int64)
+        elif prop == "extent":
+            val = get("area") / get("bbox_area")
+        elif prop == "equivalent_diameter":
+            area = get("area").astype(cp.float64)
+            if ndim == 2:
+                val = cp.sqrt(4 * area / math.pi)
+            else:
+                val = (2 * ndim * area / math.pi) ** (1 / ndim)
+        elif prop == "moments":
+            val = _label_moments(
+                label_image, row, bbox_min, n_labels, max_label
+            )
+        elif prop == "local_centroid":
+            M = get("moments")
+            m0 = M[(slice(None),) + (0,) * ndim]
+            val = cp.stack(
+                [
+                    M[(slice(None),) + tuple(np.eye(ndim, dtype=int)[d])] / m0
+                    for d in range(ndim)
+                ],
+                axis=-1,
+            )
+        elif prop == "centroid":
+            val = get("local_centroid") + bbox_min
+        elif prop == "moments_central":
+            val = _label_moments(
+                label_image, row, get("centroid"), n_labels, max_label
+            )
+        elif prop == "inertia_tensor":
+            val = _inertia_tensor(get("moments_central"))
+        elif prop == "inertia_tensor_eigvals":
+            val = _symmetric_eigvals(get("inertia_tensor"))
+        elif prop in ["min_intensity", "max_intensity"]:
+            channels = _channels(intensity_image, ndim)
+            mins, maxs = zip(
+                *[
+                    _labeled_min_max(ch, labels_flat, fg, label_values)
+                    for ch in channels
+                ]
+            )
+            cache["min_intensity"] = _stack_channels(
+                mins, intensity_image, ndim
+            )
+            cache["max_intensity"] = _stack_channels(
+                maxs, intensity_image, ndim
+            )
+            val = cache[prop]
+        elif prop == "mean_intensity":
+            area = get("area")
+            means = [
+                cp.bincount(
+                    labels_idx,
+                    weights=cp.where(fg, ch.ravel(), 0).astype(cp.float64),
+                    minlength=max_label + 1,
+                )[label_values]
+                / area
+                for ch in _channels(intensity_image, ndim)
+            ]
+            val = _stack_channels(means, intensity_image, ndim)
+        cache[prop] = val
+        return val
+
+    return {prop: get(prop) for prop in properties}
+
+
+def _channels(intensity_image, ndim):
+    if intensity_image.ndim == ndim:
+        return [intensity_image]
+    return [intensity_image[..., c] for c in range(intensity_image.shape[-1])]
+
+
+def _stack_channels(values, intensity_image, ndim):
+    if intensity_image.ndim == ndim:
+        return values[0]
+    return cp.stack(values, axis=-1)
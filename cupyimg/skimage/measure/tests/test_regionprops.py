@@ -792,3 +792,65 @@ def test_multichannel():
             # property uses multiple channels, returns props stacked along
             # final axis
             assert_array_equal(p, p_multi[..., 1])
+
+
+@pytest.mark.parametrize(
+    "label_image, intensity_image",
+    [
+        (SAMPLE, INTENSITY_SAMPLE),
+        (SAMPLE_MULTIPLE, INTENSITY_SAMPLE_MULTIPLE),
+        (SAMPLE_3D, INTENSITY_SAMPLE_3D),
+    ],
+)
+def test_regionprops_table_vectorized(label_image, intensity_image):
+    properties = (
+        "label",
+        "area",
+        "bbox",
+        "bbox_area",
+        "centroid",
+        "local_centroid",
+        "moments",
+        "moments_central",
+        "inertia_tensor",
+        "inertia_tensor_eigvals",
+        "equivalent_diameter",
+        "extent",
+        "min_intensity",
+        "mean_intensity",
+        "max_intensity",
+    )
+    expected = regionprops_table(
+        label_image, intensity_image, properties, vectorized=False
+    )
+    out = regionprops_table(
+        label_image, intensity_image, properties, vectorized=True
+    )
+    assert out.keys() == expected.keys()
+    for key in expected:
+        assert out[key].dtype == expected[key].dtype
+        assert_array_almost_equal(out[key], expected[key], decimal=6)
+
+
+def test_regionprops_table_vectorized_multichannel():
+    rng = np.random.RandomState(0)
+    label_image = cp.asarray(rng.randint(0, 6, (20, 24)))
+    intensity_image = cp.asarray(rng.standard_normal((20, 24, 3)))
+    properties = ("label", "area", "mean_intensity", "max_intensity")
+    expected = regionprops_table(
+        label_image, intensity_image, properties, vectorized=False
+    )
+    out = regionprops_table(label_image, intensity_image, properties)
+    assert out.keys() == expected.keys()
+    for key in expected:
+        assert_array_almost_equal(out[key], expected[key])
+
+
+def test_regionprops_table_vectorized_no_regions():
+    out = regionprops_table(
+        cp.zeros((2, 2), dtype=int),
+        properties=("label", "area", "centroid"),
+        vectorized=True,
+    )
+    assert len(out) == 4
+    assert all(len(v) == 0 for v in out.values())
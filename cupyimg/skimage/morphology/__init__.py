@@ -22,6 +22,7 @@ from .selem import (
     ball,
     octagon,
     star,
+    selem_from_sequence,
 )
 from .greyreconstruct import reconstruction
 from .misc import remove_small_objects, remove_small_holes
@@ -46,6 +47,7 @@ __all__ = [
     "ball",
     "octagon",
     "star",
+    "selem_from_sequence",
     "reconstruction",
     "remove_small_objects",
     "remove_small_holes",
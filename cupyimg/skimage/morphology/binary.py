@@ -3,7 +3,31 @@ Binary morphological operations
 """
 import cupy as cp
 from cupyimg.scipy import ndimage as ndi
+from ..util._packed import PackedMask
 from .misc import default_selem
+from .selem import _selem_is_sequence
+
+
+def _iterate_binary_func(binary_func, image, selems, out, border_value):
+    """Apply ``binary_func`` with each ``(selem, num_iter)`` of a sequence."""
+    src = image
+    for selem, num_iter in selems:
+        binary_func(
+            src,
+            structure=selem,
+            iterations=num_iter,
+            output=out,
+            border_value=border_value,
+        )
+        src = out.copy()
+    return out
+
+
+def _empty_like_mask(image):
+    """New output array, packed if ``image`` is a `PackedMask`."""
+    if isinstance(image, PackedMask):
+        return PackedMask.zeros(image.shape)
+    return cp.empty(image.shape, dtype=cp.bool_)
 
 
 # The default_selem decorator provides a diamond structuring element as default
@@ -21,14 +45,17 @@ def binary_erosion(image, selem=None, out=None):
 
     Parameters
     ----------
-    image : ndarray
+    image : ndarray or PackedMask
         Binary input image.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as a 2-D array of 1's and 0's.
         If None, use a cross-shaped structuring element (connectivity=1).
-    out : ndarray of bool, optional
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
+    out : ndarray of bool or PackedMask, optional
         The array to store the result of the morphology. If None is
-        passed, a new array will be allocated.
+        passed, a new array (packed if `image` is packed) will be allocated.
 
     Returns
     -------
@@ -38,7 +65,11 @@ def binary_erosion(image, selem=None, out=None):
 
     """
     if out is None:
-        out = cp.empty(image.shape, dtype=cp.bool_)
+        out = _empty_like_mask(image)
+    if _selem_is_sequence(selem):
+        return _iterate_binary_func(
+            ndi.binary_erosion, image, selem, out, border_value=True
+        )
     ndi.binary_erosion(image, structure=selem, output=out, border_value=True)
     return out
 
@@ -57,14 +88,17 @@ def binary_dilation(image, selem=None, out=None):
     Parameters
     ----------
 
-    image : ndarray
+    image : ndarray or PackedMask
         Binary input image.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as a 2-D array of 1's and 0's.
         If None, use a cross-shaped structuring element (connectivity=1).
-    out : ndarray of bool, optional
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
+    out : ndarray of bool or PackedMask, optional
         The array to store the result of the morphology. If None is
-        passed, a new array will be allocated.
+        passed, a new array (packed if `image` is packed) will be allocated.
 
     Returns
     -------
@@ -73,7 +107,11 @@ def binary_dilation(image, selem=None, out=None):
         ``[False, True]``.
     """
     if out is None:
-        out = cp.empty(image.shape, dtype=cp.bool_)
+        out = _empty_like_mask(image)
+    if _selem_is_sequence(selem):
+        return _iterate_binary_func(
+            ndi.binary_dilation, image, selem, out, border_value=False
+        )
     ndi.binary_dilation(image, structure=selem, output=out)
     return out
 
@@ -92,14 +130,18 @@ def binary_opening(image, selem=None, out=None):
 
     Parameters
     ----------
-    image : ndarray
+    image : ndarray or PackedMask
         Binary input image.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as a 2-D array of 1's and 0's.
         If None, use a cross-shaped structuring element (connectivity=1).
-    out : ndarray of bool, optional
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
+    out : ndarray of bool or PackedMask, optional
         The array to store the result of the morphology. If None
-        is passed, a new array will be allocated.
+        is passed, a new array (packed if `image` is packed) will be
+        allocated.
 
     Returns
     -------
@@ -126,14 +168,18 @@ def binary_closing(image, selem=None, out=None):
 
     Parameters
     ----------
-    image : ndarray
+    image : ndarray or PackedMask
         Binary input image.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as a 2-D array of 1's and 0's.
         If None, use a cross-shaped structuring element (connectivity=1).
-    out : ndarray of bool, optional
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
+    out : ndarray of bool or PackedMask, optional
         The array to store the result of the morphology. If None,
-        is passed, a new array will be allocated.
+        is passed, a new array (packed if `image` is packed) will be
+        allocated.
 
     Returns
     -------
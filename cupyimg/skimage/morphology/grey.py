@@ -6,6 +6,7 @@ import cupy as cp
 from cupyimg.scipy import ndimage as ndi
 
 from .misc import default_selem
+from .selem import _selem_is_sequence, _shape_from_sequence
 from ..util import crop
 
 __all__ = [
@@ -115,7 +116,11 @@ def pad_for_eccentric_selems(func):
         padding = False
         if out is None:
             out = cp.empty_like(image)
-        for axis_len in selem.shape:
+        if _selem_is_sequence(selem):
+            shape = _shape_from_sequence(selem)
+        else:
+            shape = selem.shape
+        for axis_len in shape:
             if axis_len % 2 == 0:
                 axis_pad_width = axis_len - 1
                 padding = True
@@ -137,6 +142,20 @@ def pad_for_eccentric_selems(func):
     return func_out
 
 
+def _iterate_grey_func(grey_func, image, selems, out):
+    """Apply ``grey_func`` with each ``(selem, num_iter)`` of a sequence."""
+    steps = [selem for selem, num_iter in selems for _ in range(num_iter)]
+    # alternate between out and a single temporary array, ordered so that the
+    # last step writes to out
+    buffers = (out, cp.empty_like(out)) if len(steps) > 1 else (out,)
+    src = image
+    for n, selem in enumerate(steps):
+        dst = buffers[(len(steps) - 1 - n) % len(buffers)]
+        grey_func(src, footprint=selem, output=dst)
+        src = dst
+    return out
+
+
 @default_selem
 def erosion(image, selem=None, out=None, shift_x=False, shift_y=False):
     """Return greyscale morphological erosion of an image.
@@ -149,9 +168,12 @@ def erosion(image, selem=None, out=None, shift_x=False, shift_y=False):
     ----------
     image : ndarray
         Image array.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as an array of 1's and 0's.
         If None, use cross-shaped structuring element (connectivity=1).
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
     out : ndarrays, optional
         The array to store the result of the morphology. If None is
         passed, a new array will be allocated.
@@ -188,10 +210,15 @@ def erosion(image, selem=None, out=None, shift_x=False, shift_y=False):
            [0, 0, 0, 0, 0]], dtype=uint8)
 
     """
-    selem = cp.asarray(selem)
-    selem = _shift_selem(selem, shift_x, shift_y)
     if out is None:
         out = cp.empty_like(image)
+    if _selem_is_sequence(selem):
+        selems = tuple(
+            (_shift_selem(cp.asarray(s), shift_x, shift_y), n) for s, n in selem
+        )
+        return _iterate_grey_func(ndi.grey_erosion, image, selems, out)
+    selem = cp.asarray(selem)
+    selem = _shift_selem(selem, shift_x, shift_y)
     ndi.grey_erosion(image, footprint=selem, output=out)
     return out
 
@@ -209,9 +236,12 @@ def dilation(image, selem=None, out=None, shift_x=False, shift_y=False):
 
     image : ndarray
         Image array.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as a 2-D array of 1's and 0's.
         If None, use cross-shaped structuring element (connectivity=1).
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
     out : ndarray, optional
         The array to store the result of the morphology. If None, is
         passed, a new array will be allocated.
@@ -248,6 +278,14 @@ def dilation(image, selem=None, out=None, shift_x=False, shift_y=False):
            [0, 0, 0, 0, 0]], dtype=uint8)
 
     """
+    if out is None:
+        out = cp.empty_like(image)
+    if _selem_is_sequence(selem):
+        selems = tuple(
+            (_invert_selem(_shift_selem(cp.asarray(s), shift_x, shift_y)), n)
+            for s, n in selem
+        )
+        return _iterate_grey_func(ndi.grey_dilation, image, selems, out)
     selem = cp.asarray(selem)
     selem = _shift_selem(selem, shift_x, shift_y)
     # Inside ndimage.grey_dilation, the structuring element is inverted,
@@ -256,8 +294,6 @@ def dilation(image, selem=None, out=None, shift_x=False, shift_y=False):
     # selem before passing it to `ndi.grey_dilation`.
     # [1] https://github.com/scipy/scipy/blob/ec20ababa400e39ac3ffc9148c01ef86d5349332/scipy/ndimage/morphology.py#L1285
     selem = _invert_selem(selem)
-    if out is None:
-        out = cp.empty_like(image)
     ndi.grey_dilation(image, footprint=selem, output=out)
     return out
 
@@ -276,9 +312,12 @@ def opening(image, selem=None, out=None):
     ----------
     image : ndarray
         Image array.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as an array of 1's and 0's.
         If None, use cross-shaped structuring element (connectivity=1).
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
     out : ndarray, optional
         The array to store the result of the morphology. If None
         is passed, a new array will be allocated.
@@ -326,9 +365,12 @@ def closing(image, selem=None, out=None):
     ----------
     image : ndarray
         Image array.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as an array of 1's and 0's.
         If None, use cross-shaped structuring element (connectivity=1).
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
     out : ndarray, optional
         The array to store the result of the morphology. If None,
         is passed, a new array will be allocated.
@@ -374,9 +416,12 @@ def white_tophat(image, selem=None, out=None):
     ----------
     image : ndarray
         Image array.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as an array of 1's and 0's.
         If None, use cross-shaped structuring element (connectivity=1).
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
     out : ndarray, optional
         The array to store the result of the morphology. If None
         is passed, a new array will be allocated.
@@ -412,6 +457,15 @@ def white_tophat(image, selem=None, out=None):
            [0, 0, 0, 0, 0]], dtype=uint8)
 
     """
+    if _selem_is_sequence(selem):
+        opened = opening(image, selem)
+        if out is None:
+            out = cp.empty_like(image)
+        if cp.issubdtype(opened.dtype, cp.bool_):
+            cp.logical_xor(image, opened, out=out)
+        else:
+            cp.subtract(image, opened, out=out)
+        return out
     selem = cp.asarray(selem)
     if out is image:
         opened = opening(image, selem)
@@ -449,9 +503,12 @@ def black_tophat(image, selem=None, out=None):
     ----------
     image : ndarray
         Image array.
-    selem : ndarray, optional
+    selem : ndarray or tuple, optional
         The neighborhood expressed as a 2-D array of 1's and 0's.
         If None, use cross-shaped structuring element (connectivity=1).
+        Alternatively, a sequence of ``(selem, num_iter)`` tuples as
+        returned by the structuring element functions with a
+        `decomposition`, which are applied one after the other.
     out : ndarray, optional
         The array to store the result of the morphology. If None
         is passed, a new array will be allocated.
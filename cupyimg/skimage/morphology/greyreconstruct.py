@@ -12,10 +12,20 @@ Original author: Lee Kamentsky
 import cupy as cp
 import numpy as np
 
+from cupyimg import memoize
 from ..filters._rank_order import rank_order
 
 
-def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
+def reconstruction(
+    seed,
+    mask,
+    method="dilation",
+    selem=None,
+    offset=None,
+    *,
+    method_impl="iterative",
+    check_every=8,
+):
     """Perform a morphological reconstruction of an image.
 
     Morphological reconstruction by dilation is similar to basic morphological
@@ -57,6 +67,15 @@ def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
         The coordinates of the center of the structuring element.
         Default is located on the geometrical center of the selem, in that case
         selem dimensions must be odd.
+    method_impl : {'iterative', 'sequential'}, optional
+        The reconstruction engine to use. 'iterative' runs geodesic
+        dilations (or erosions) in-place on the device until convergence.
+        'sequential' sorts the pixels on the device, but runs the downhill
+        filter of [1]_ on the host via scikit-image's ``reconstruction_loop``.
+        Both give identical results.
+    check_every : int, optional
+        For ``method_impl='iterative'``, the number of kernel launches
+        between successive (synchronizing) checks for convergence.
 
     Returns
     -------
@@ -111,7 +130,10 @@ def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
 
     Notes
     -----
-    The algorithm is taken from [1]_. Applications for greyscale reconstruction
+    The 'sequential' algorithm is taken from [1]_. The 'iterative' algorithm
+    is the parallel geodesic reconstruction described in [2]_, with each pass
+    updating the reconstruction in-place so that values can propagate across
+    many pixels per launch. Applications for greyscale reconstruction
     are discussed in [2]_ and [3]_.
 
     References
@@ -135,10 +157,11 @@ def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
             "Intensity of seed image must be greater than that "
             "of the mask image for reconstruction by erosion."
         )
-    try:
-        from skimage.morphology._greyreconstruct import reconstruction_loop
-    except ImportError:
-        raise ImportError("_greyreconstruct extension not available.")
+    if method_impl not in ["iterative", "sequential"]:
+        raise ValueError(
+            "method_impl must be one of 'iterative' or 'sequential'. Got "
+            "'{}'.".format(method_impl)
+        )
 
     if selem is None:
         selem = np.ones([3] * seed.ndim, dtype=bool)
@@ -162,6 +185,22 @@ def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
     # Cross out the center of the selem
     selem[tuple(slice(d, d + 1) for d in offset)] = False
 
+    if method not in ["dilation", "erosion"]:
+        raise ValueError(
+            "Reconstruction method can be one of 'erosion' "
+            "or 'dilation'. Got '%s'." % method
+        )
+
+    if method_impl == "iterative":
+        return _reconstruction_iterative(
+            seed, mask, method, selem, offset, check_every
+        )
+
+    try:
+        from skimage.morphology._greyreconstruct import reconstruction_loop
+    except ImportError:
+        raise ImportError("_greyreconstruct extension not available.")
+
     # Make padding for edges of reconstructed image so we can ignore boundaries
     dims = np.zeros(seed.ndim + 1, dtype=int)
     dims[1:] = np.array(seed.shape) + (np.array(selem.shape) - 1)
@@ -171,13 +210,8 @@ def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
     # we can interleave image and mask pixels when sorting.
     if method == "dilation":
         pad_value = int(cp.min(seed))
-    elif method == "erosion":
-        pad_value = int(cp.max(seed))
     else:
-        raise ValueError(
-            "Reconstruction method can be one of 'erosion' "
-            "or 'dilation'. Got '%s'." % method
-        )
+        pad_value = int(cp.max(seed))
 
     # TODO: potentially allow int64 if seed image is too large for int32
     #       skimage currently only supports int32, though
@@ -236,3 +270,95 @@ def reconstruction(seed, mask, method="dilation", selem=None, offset=None):
     rec_img = value_map[value_rank]
     rec_img.shape = tuple(dims[1:])
     return rec_img[inside_slices]
+
+
+@memoize(for_each_device=True)
+def _get_reconstruction_kernel(method, ndim):
+    """Kernel performing one in-place geodesic dilation (or erosion) pass.
+
+    Each pixel takes the max (min) over its neighbors, ``nb``, clipped to the
+    mask. Because ``rec`` is updated in-place, values may travel more than
+    one pixel per launch. Any pixel whose value changes sets ``changed[0]``.
+    Neighbors outside of the image are ignored, which is equivalent to the
+    padding with the seed's min (max) used by the sequential algorithm.
+    """
+    if method == "dilation":
+        better, clip = ">", "min"
+    else:
+        better, clip = "<", "max"
+
+    code = """
+    T m = mask[i];
+    T v = rec[i];
+    if (v == m) continue;  // already limited by the mask
+    ptrdiff_t coords[{ndim}];
+    ptrdiff_t _i = i;
+    for (int d = {ndim} - 1; d >= 0; d--) {{
+        coords[d] = _i % shape[d];
+        _i /= shape[d];
+    }}
+    T best = v;
+    for (int k = 0; k < n_nb; k++) {{
+        ptrdiff_t j = 0;
+        bool inside = true;
+        for (int d = 0; d < {ndim}; d++) {{
+            ptrdiff_t c = coords[d] - nb[k * {ndim} + d];
+            if (c < 0 || c >= shape[d]) {{
+                inside = false;
+                break;
+            }}
+            j = j * shape[d] + c;
+        }}
+        if (inside) {{
+            T nval = rec[j];
+            if (nval {better} best) best = nval;
+        }}
+    }}
+    best = {clip}(best, m);
+    if (best != v) {{
+        rec[i] = best;
+        changed[0] = 1;
+    }}
+    """.format(
+        ndim=ndim, better=better, clip=clip
+    )
+    return cp.ElementwiseKernel(
+        "raw T mask, raw int64 shape, raw int64 nb, int32 n_nb",
+        "raw T rec, raw int32 changed",
+        code,
+        "cupyimg_skimage_reconstruction_{}_{}d".format(method, ndim),
+    )
+
+
+def _reconstruction_iterative(seed, mask, method, selem, offset, check_every):
+    """Morphological reconstruction by repeated in-place geodesic passes.
+
+    The device is only synchronized once every ``check_every`` passes to test
+    whether any pixel changed.
+    """
+    images_dtype = np.promote_types(seed.dtype, mask.dtype)
+    rec = cp.array(seed, dtype=images_dtype, order="C", copy=True)
+    mask = cp.ascontiguousarray(mask, dtype=images_dtype)
+    if rec.size == 0:
+        return rec
+
+    selem_mgrid = np.mgrid[
+        [slice(-o, d - o) for d, o in zip(selem.shape, offset)]
+    ]
+    nb = selem_mgrid[:, selem].transpose()
+    n_nb = nb.shape[0]
+    if n_nb == 0:
+        return rec
+    nb = cp.asarray(np.ascontiguousarray(nb, dtype=np.int64))
+    shape = cp.asarray(rec.shape, dtype=np.int64)
+
+    kernel = _get_reconstruction_kernel(method, rec.ndim)
+    check_every = max(int(check_every), 1)
+    changed = cp.zeros((1,), dtype=np.int32)
+    while True:
+        changed[0] = 0
+        for _ in range(check_every):
+            kernel(mask, shape, nb, n_nb, rec, changed, size=rec.size)
+        if not int(changed[0]):  # synchronize!
+            break
+    return rec
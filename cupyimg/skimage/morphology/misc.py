@@ -1,7 +1,13 @@
 """Miscellaneous morphology functions."""
 import cupy as cp
 import functools
+import os
+import tempfile
+
+import numpy as np
+
 from cupyimg.scipy import ndimage as ndi
+from cupyimg.scipy.ndimage import _tile_plan
 from .._shared.utils import warn
 from .selem import _default_selem
 
@@ -57,7 +63,9 @@ def _check_dtype_supported(ar):
         )
 
 
-def remove_small_objects(ar, min_size=64, connectivity=1, in_place=False):
+def remove_small_objects(
+    ar, min_size=64, connectivity=1, in_place=False, *, out=None
+):
     """Remove objects smaller than the specified size.
 
     Expects ar to be an array with labeled objects, and removes objects
@@ -69,7 +77,9 @@ def remove_small_objects(ar, min_size=64, connectivity=1, in_place=False):
     ----------
     ar : ndarray (arbitrary shape, int or bool type)
         The array containing the objects of interest. If the array type is
-        int, the ints must be non-negative.
+        int, the ints must be non-negative. Host arrays (e.g. a
+        ``numpy.memmap``) are processed block by block on the GPU, so they
+        need not fit in device memory.
     min_size : int, optional (default: 64)
         The smallest allowable object size.
     connectivity : int, {1, 2, ..., ar.ndim}, optional (default: 1)
@@ -78,6 +88,11 @@ def remove_small_objects(ar, min_size=64, connectivity=1, in_place=False):
     in_place : bool, optional (default: False)
         If ``True``, remove the objects in the input array itself.
         Otherwise, make a copy.
+    out : ndarray, optional
+        Host array (e.g. a ``numpy.memmap``) with the shape and dtype of a
+        host array `ar`, into which the result is written block by block.
+        A ``numpy.memmap`` input is never copied into host memory, so it
+        requires either `out` or ``in_place=True``.
 
     Raises
     ------
@@ -116,6 +131,13 @@ def remove_small_objects(ar, min_size=64, connectivity=1, in_place=False):
     # Raising type error if not int or bool
     _check_dtype_supported(ar)
 
+    if not isinstance(ar, cp.ndarray):
+        return _remove_small_objects_tiled(
+            ar, min_size, connectivity, in_place, out
+        )
+    if out is not None:
+        raise ValueError("out is only supported for host arrays")
+
     if in_place:
         out = ar
     else:
@@ -153,6 +175,88 @@ def remove_small_objects(ar, min_size=64, connectivity=1, in_place=False):
     return out
 
 
+def _remove_small_objects_tiled(
+    ar,
+    min_size,
+    connectivity,
+    in_place,
+    out=None,
+    max_block_bytes=256 * 1024 * 1024,
+):
+    """`remove_small_objects` for host arrays, one block at a time.
+
+    Boolean arrays are labeled with `ndi.tiled_label` into a temporary
+    memory-mapped file, which also provides the size of each object. The
+    input is only read block by block and the result is written to `out`.
+    """
+    if in_place:
+        if out is not None and out is not ar:
+            raise ValueError("out cannot be combined with in_place=True")
+        out = ar
+    elif out is None:
+        if isinstance(ar, np.memmap):
+            raise ValueError(
+                "memory-mapped input requires in_place=True or an out array, "
+                "so that it is not copied into host memory"
+            )
+        out = np.empty(ar.shape, ar.dtype)
+    elif out.shape != ar.shape or out.dtype != ar.dtype:
+        raise ValueError("out must have the same shape and dtype as ar")
+    if min_size == 0 or out.size == 0:
+        if out is not ar:
+            out[...] = ar
+        return out
+    block_shape = _tile_plan.choose_block_shape(
+        out.shape, 0, out.dtype.itemsize + 8, max_block_bytes
+    )
+    tiles = _tile_plan.plan_tiles(out.shape, 0, block_shape)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if out.dtype == bool:
+            selem = ndi.generate_binary_structure(out.ndim, connectivity)
+            ccs, _, component_sizes = ndi.tiled_label(
+                ar,
+                selem,
+                output=os.path.join(tmpdir, "labels.npy"),
+                block_shape=block_shape,
+                return_counts=True,
+            )
+        else:
+            ccs = ar
+            component_sizes = cp.zeros(0, dtype=cp.int64)
+            for tile in tiles:
+                block = cp.asarray(ccs[tile.output_slices])
+                try:
+                    counts = cp.bincount(block.ravel())
+                except ValueError:
+                    raise ValueError(
+                        "Negative value labels are not supported. Try "
+                        "relabeling the input with `scipy.ndimage.label` or "
+                        "`skimage.morphology.label`."
+                    )
+                if counts.size > component_sizes.size:
+                    counts[: component_sizes.size] += component_sizes
+                    component_sizes = counts
+                else:
+                    component_sizes[: counts.size] += counts
+            component_sizes = cp.asnumpy(component_sizes)
+
+        if len(component_sizes) == 2 and out.dtype != bool:
+            warn(
+                "Only one label was provided to `remove_small_objects`. "
+                "Did you mean to use a boolean array?"
+            )
+
+        too_small = cp.asarray(component_sizes < min_size)
+        for tile in tiles:
+            block = cp.asarray(ar[tile.output_slices])
+            block[too_small[cp.asarray(ccs[tile.output_slices])]] = 0
+            out[tile.output_slices] = cp.asnumpy(block)
+        # release the memory map before its file is removed
+        del ccs
+    return out
+
+
 def remove_small_holes(ar, area_threshold=64, connectivity=1, in_place=False):
     """Remove contiguous holes smaller than the specified size.
 
@@ -1,10 +1,56 @@
+import functools
+import math
+import numbers
+
 import cupy as cp
 import numpy as np
 from cupyimg.scipy import ndimage as ndi
 from .._shared.utils import deprecate_kwarg
 
 
-def square(width, dtype=np.uint8):
+def _check_decomposition(decomposition, allowed):
+    if decomposition is not None and decomposition not in allowed:
+        raise ValueError(
+            "Unrecognized decomposition: {}. Must be None or one of {}".format(
+                decomposition, allowed
+            )
+        )
+
+
+def _separable_selem(shape, dtype):
+    """Sequence of 1D lines whose Minkowski sum is ``ones(shape)``."""
+    sequence = []
+    for axis, length in enumerate(shape):
+        if length > 1:
+            line_shape = (
+                (1,) * axis + (length,) + (1,) * (len(shape) - axis - 1)
+            )
+            sequence.append((cp.ones(line_shape, dtype=dtype), 1))
+    if not sequence:
+        sequence.append((cp.ones((1,) * len(shape), dtype=dtype), 1))
+    return tuple(sequence)
+
+
+def _box_selem(shape, dtype, decomposition):
+    _check_decomposition(decomposition, ("separable", "sequence"))
+    if decomposition is None:
+        return cp.ones(shape, dtype=dtype)
+    if (
+        decomposition == "separable"
+        or any(n % 2 == 0 for n in shape)
+        or min(shape) == 1
+    ):
+        return _separable_selem(shape, dtype)
+    # unit boxes up to the shortest side, then lines for the remainder
+    n = min(shape)
+    sequence = [(cp.ones((3,) * len(shape), dtype=dtype), (n - 1) // 2)]
+    remainder = tuple(length - n + 1 for length in shape)
+    if max(remainder) > 1:
+        sequence += list(_separable_selem(remainder, dtype))
+    return tuple(sequence)
+
+
+def square(width, dtype=np.uint8, *, decomposition=None):
     """Generates a flat, square-shaped structuring element.
 
     Every pixel along the perimeter has a chessboard distance
@@ -19,21 +65,36 @@ def square(width, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'separable', 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. Applying this series of
+        smaller structuring elements gives the same result as the single,
+        larger one, but with better computational performance. With
+        'separable', the tuple holds a 1D line along each axis. See Notes.
 
     Returns
     -------
-    selem : ndarray
+    selem : ndarray or tuple
         A structuring element consisting only of ones, i.e. every
-        pixel belongs to the neighborhood.
+        pixel belongs to the neighborhood. A tuple of structuring elements
+        if `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is not None, each element of the returned tuple is
+    a 2-tuple of the form ``(ndarray, num_iter)`` that specifies a
+    structuring element and the number of times it is to be applied. Such
+    tuples are accepted by the morphology functions of this module and can
+    be converted to a single array with ``selem_from_sequence``.
 
     """
-    return cp.ones((width, width), dtype=dtype)
+    return _box_selem((width, width), dtype, decomposition)
 
 
 @deprecate_kwarg(
     {"height": "ncols", "width": "nrows"}, removed_version="0.20.0"
 )
-def rectangle(nrows, ncols, dtype=np.uint8):
+def rectangle(nrows, ncols, dtype=np.uint8, *, decomposition=None):
     """Generates a flat, rectangular-shaped structuring element.
 
     Every pixel in the rectangle generated for a given width and given height
@@ -50,23 +111,31 @@ def rectangle(nrows, ncols, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'separable', 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. Applying this series of
+        smaller structuring elements gives the same result as the single,
+        larger one, but with better computational performance. With
+        'separable', the tuple holds a 1D line along each axis. See Notes.
 
     Returns
     -------
-    selem : ndarray
+    selem : ndarray or tuple
         A structuring element consisting only of ones, i.e. every
-        pixel belongs to the neighborhood.
+        pixel belongs to the neighborhood. A tuple of structuring elements
+        if `decomposition` is not None.
 
     Notes
     -----
+    - When `decomposition` is not None, each element of the returned tuple
+      is a 2-tuple ``(ndarray, num_iter)``, see :func:`square`.
     - The use of ``width`` and ``height`` has been deprecated in
       scikit-image 0.18.0. Use ``nrows`` and ``ncols`` instead.
     """
-
-    return cp.ones((nrows, ncols), dtype=dtype)
+    return _box_selem((nrows, ncols), dtype, decomposition)
 
 
-def diamond(radius, dtype=np.uint8):
+def diamond(radius, dtype=np.uint8, *, decomposition=None):
     """Generates a flat, diamond-shaped structuring element.
 
     A pixel is part of the neighborhood (i.e. labeled 1) if
@@ -82,14 +151,30 @@ def diamond(radius, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. Applying this series
+        of smaller structuring elements gives the same result as the
+        single, larger one.
 
     Returns
     -------
 
-    selem : ndarray
+    selem : ndarray or tuple
         The structuring element where elements of the neighborhood
-        are 1 and 0 otherwise.
+        are 1 and 0 otherwise. A tuple of structuring elements if
+        `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is not None, each element of the returned tuple is
+    a 2-tuple ``(ndarray, num_iter)``, see :func:`square`.
     """
+    _check_decomposition(decomposition, ("sequence",))
+    if decomposition == "sequence":
+        if radius == 0:
+            return ((diamond(0, dtype), 1),)
+        return ((diamond(1, dtype), radius),)
     # as the grid is usually small, it should be faster to generate it in NumPy
     L = np.arange(0, radius * 2 + 1)
     I, J = np.meshgrid(L, L, sparse=True)
@@ -98,7 +183,7 @@ def diamond(radius, dtype=np.uint8):
     )
 
 
-def disk(radius, dtype=np.uint8):
+def disk(radius, dtype=np.uint8, *, decomposition=None):
     """Generates a flat, disk-shaped structuring element.
 
     A pixel is within the neighborhood if the Euclidean distance between
@@ -113,13 +198,31 @@ def disk(radius, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. This series of smaller
+        structuring elements gives a close approximation of the disk with
+        much fewer operations for large radii. See Notes.
 
     Returns
     -------
-    selem : ndarray
+    selem : ndarray or tuple
         The structuring element where elements of the neighborhood
-        are 1 and 0 otherwise.
+        are 1 and 0 otherwise. A tuple of structuring elements if
+        `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is 'sequence', each element of the returned tuple
+    is a 2-tuple ``(ndarray, num_iter)``, see :func:`square`. The sequence
+    combines a square (as two lines), ``diamond(1)`` and ``disk(3)``, whose
+    Minkowski sum is a 16-sided polygon of the same radius. The number of
+    repetitions of each element is chosen to minimize the number of pixels
+    that differ from the disk.
     """
+    _check_decomposition(decomposition, ("sequence",))
+    if decomposition == "sequence":
+        return _disk_sequence(radius, dtype)
     # as the grid is usually small, it should be faster to generate it in NumPy
     L = np.arange(-radius, radius + 1)
     X, Y = np.meshgrid(L, L, sparse=True)
@@ -173,7 +276,7 @@ def ellipse(width, height, dtype=np.uint8):
     return cp.asarray(selem)
 
 
-def cube(width, dtype=np.uint8):
+def cube(width, dtype=np.uint8, *, decomposition=None):
     """Generates a cube-shaped structuring element.
 
     This is the 3D equivalent of a square.
@@ -189,18 +292,30 @@ def cube(width, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'separable', 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. Applying this series of
+        smaller structuring elements gives the same result as the single,
+        larger one, but with better computational performance. With
+        'separable', the tuple holds a 1D line along each axis. See Notes.
 
     Returns
     -------
-    selem : ndarray
+    selem : ndarray or tuple
         A structuring element consisting only of ones, i.e. every
-        pixel belongs to the neighborhood.
+        pixel belongs to the neighborhood. A tuple of structuring elements
+        if `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is not None, each element of the returned tuple is
+    a 2-tuple ``(ndarray, num_iter)``, see :func:`square`.
 
     """
-    return cp.ones((width, width, width), dtype=dtype)
+    return _box_selem((width, width, width), dtype, decomposition)
 
 
-def octahedron(radius, dtype=np.uint8):
+def octahedron(radius, dtype=np.uint8, *, decomposition=None):
     """Generates a octahedron-shaped structuring element.
 
     This is the 3D equivalent of a diamond.
@@ -217,14 +332,32 @@ def octahedron(radius, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. Applying this series
+        of smaller structuring elements gives the same result as the
+        single, larger one. Requires an integer `radius`.
 
     Returns
     -------
 
-    selem : ndarray
+    selem : ndarray or tuple
         The structuring element where elements of the neighborhood
-        are 1 and 0 otherwise.
+        are 1 and 0 otherwise. A tuple of structuring elements if
+        `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is not None, each element of the returned tuple is
+    a 2-tuple ``(ndarray, num_iter)``, see :func:`square`.
     """
+    _check_decomposition(decomposition, ("sequence",))
+    if decomposition == "sequence":
+        if radius != int(radius):
+            raise ValueError("decomposition requires an integer radius")
+        if radius == 0:
+            return ((octahedron(0, dtype), 1),)
+        return ((octahedron(1, dtype), int(radius)),)
     # note that in contrast to diamond(), this method allows non-integer radii
     n = 2 * radius + 1
     Z, Y, X = np.ogrid[
@@ -236,7 +369,7 @@ def octahedron(radius, dtype=np.uint8):
     return cp.asarray(s <= radius, dtype=dtype)
 
 
-def ball(radius, dtype=np.uint8):
+def ball(radius, dtype=np.uint8, *, decomposition=None):
     """Generates a ball-shaped structuring element.
 
     This is the 3D equivalent of a disk.
@@ -252,13 +385,31 @@ def ball(radius, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. This series of smaller
+        structuring elements gives a close approximation of the ball with
+        much fewer operations for large radii. See Notes.
 
     Returns
     -------
-    selem : ndarray
+    selem : ndarray or tuple
         The structuring element where elements of the neighborhood
-        are 1 and 0 otherwise.
+        are 1 and 0 otherwise. A tuple of structuring elements if
+        `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is 'sequence', each element of the returned tuple
+    is a 2-tuple ``(ndarray, num_iter)``, see :func:`square`. The sequence
+    combines a cube (as three lines), ``octahedron(1)`` and the 3x3x3
+    element with connectivity 2, whose Minkowski sum is a polyhedron with
+    26 faces. The number of repetitions of each element is chosen to
+    minimize the number of voxels that differ from the ball.
     """
+    _check_decomposition(decomposition, ("sequence",))
+    if decomposition == "sequence":
+        return _ball_sequence(radius, dtype)
     n = 2 * radius + 1
     Z, Y, X = np.ogrid[
         -radius : radius : n * 1j,
@@ -269,7 +420,7 @@ def ball(radius, dtype=np.uint8):
     return cp.asarray(s <= radius * radius, dtype=dtype)
 
 
-def octagon(m, n, dtype=np.uint8):
+def octagon(m, n, dtype=np.uint8, *, decomposition=None):
     """Generates an octagon shaped structuring element.
 
     For a given size of (m) horizontal and vertical sides
@@ -288,14 +439,36 @@ def octagon(m, n, dtype=np.uint8):
     ----------------
     dtype : data-type
         The data type of the structuring element.
+    decomposition : {None, 'sequence'}, optional
+        If None, a single array is returned. For 'sequence', a tuple of
+        smaller structuring elements is returned. Applying this series
+        of smaller structuring elements gives the same result as the
+        single, larger one.
 
     Returns
     -------
-    selem : ndarray
+    selem : ndarray or tuple
         The structuring element where elements of the neighborhood
-        are 1 and 0 otherwise.
+        are 1 and 0 otherwise. A tuple of structuring elements if
+        `decomposition` is not None.
+
+    Notes
+    -----
+    When `decomposition` is not None, each element of the returned tuple is
+    a 2-tuple ``(ndarray, num_iter)``, see :func:`square`.
 
     """
+    _check_decomposition(decomposition, ("sequence",))
+    if decomposition == "sequence":
+        # the octagon is the Minkowski sum of a square and a diamond
+        sequence = []
+        if m > 1:
+            sequence += list(_separable_selem((m, m), dtype))
+        if n > 0:
+            sequence.append((diamond(1, dtype), n))
+        if not sequence:
+            sequence.append((square(1, dtype), 1))
+        return tuple(sequence)
     from skimage.morphology import convex_hull_image
 
     selem = np.zeros((m + 2 * n, m + 2 * n))
@@ -360,6 +533,165 @@ def star(a, dtype=np.uint8):
     return cp.asarray(selem.astype(dtype, copy=False))
 
 
+@functools.lru_cache(maxsize=None)
+def _disk_sequence_counts(radius):
+    """Numbers ``(a, b, e)`` of the disk decomposition, see :func:`disk`.
+
+    The Minkowski sum of a square of side ``2 * a + 1``, ``b`` copies of
+    ``diamond(1)`` and ``e`` copies of ``disk(3)`` is the 16-sided polygon
+    with extent ``a + b + 3 * e`` along the axes, ``radius + a + e`` along
+    the diagonals and ``2 * radius + a`` along the directions ``(2, 1)``.
+    """
+    L = np.arange(-radius, radius + 1)
+    X, Y = np.meshgrid(np.abs(L), np.abs(L), sparse=True)
+    target = (X * X + Y * Y) <= radius * radius
+    best = None
+    # only consider the polygons close to the disk
+    a_ideal = (math.sqrt(5) - 2) * radius
+    for a in range(max(int(a_ideal) - 2, 0), int(a_ideal) + 3):
+        e_ideal = (math.sqrt(2) - 1) * radius - a
+        for e in range(max(int(e_ideal) - 2, 0), int(e_ideal) + 3):
+            b = radius - a - 3 * e
+            if b < 0:
+                continue
+            h_diag = radius + a + e
+            h_knight = 2 * radius + a
+            poly = (X + Y <= h_diag) & (2 * X + Y <= h_knight)
+            poly &= X + 2 * Y <= h_knight
+            error = int(np.count_nonzero(poly != target))
+            # approximate number of comparisons per pixel
+            cost = 6 * (a > 0) + 5 * b + 29 * e
+            if best is None or (error, cost) < best[0]:
+                best = ((error, cost), (a, b, e))
+    return best[1]
+
+
+def _disk_sequence(radius, dtype):
+    if radius == 0:
+        return ((disk(0, dtype), 1),)
+    a, b, e = _disk_sequence_counts(radius)
+    sequence = []
+    if a > 0:
+        sequence += list(_separable_selem((2 * a + 1,) * 2, dtype))
+    if b > 0:
+        sequence.append((diamond(1, dtype), b))
+    if e > 0:
+        sequence.append((disk(3, dtype), e))
+    return tuple(sequence)
+
+
+@functools.lru_cache(maxsize=None)
+def _ball_sequence_counts(radius):
+    """Numbers ``(a, b, c)`` of the ball decomposition, see :func:`ball`.
+
+    The Minkowski sum of a cube of side ``2 * a + 1``, ``b`` copies of
+    ``octahedron(1)`` and ``c`` copies of the element with connectivity 2 has
+    extent ``a + b + c`` along the axes, ``radius + a + c`` along the
+    diagonals of the faces and ``radius + 2 * a + c`` along the diagonals of
+    the cube.
+    """
+    L = np.abs(np.arange(-radius, radius + 1))
+    Z, Y, X = np.meshgrid(L, L, L, indexing="ij", sparse=True)
+    target = (X * X + Y * Y + Z * Z) <= radius * radius
+    best = None
+    # only consider the polyhedra close to the ball
+    s2 = (math.sqrt(2) - 1) * radius
+    s3 = (math.sqrt(3) - 1) * radius
+    for a in range(radius + 1):
+        for c in range(radius + 1 - a):
+            if abs(a + c - s2) > 2 or abs(2 * a + c - s3) > 2:
+                continue
+            b = radius - a - c
+            h_face = radius + a + c
+            poly = (X + Y <= h_face) & (Y + Z <= h_face) & (X + Z <= h_face)
+            poly &= X + Y + Z <= radius + 2 * a + c
+            error = int(np.count_nonzero(poly != target))
+            # approximate number of comparisons per voxel
+            cost = 9 * (a > 0) + 7 * b + 19 * c
+            if best is None or (error, cost) < best[0]:
+                best = ((error, cost), (a, b, c))
+    return best[1]
+
+
+def _ball_sequence(radius, dtype):
+    if radius == 0:
+        return ((ball(0, dtype), 1),)
+    a, b, c = _ball_sequence_counts(radius)
+    sequence = []
+    if a > 0:
+        sequence += list(_separable_selem((2 * a + 1,) * 3, dtype))
+    if b > 0:
+        sequence.append((octahedron(1, dtype), b))
+    if c > 0:
+        conn2 = ndi.generate_binary_structure(3, 2).astype(dtype)
+        sequence.append((conn2, c))
+    return tuple(sequence)
+
+
+def _selem_is_sequence(selem):
+    """Whether ``selem`` is a sequence of ``(selem, num_iter)`` tuples."""
+    if hasattr(selem, "shape") or not isinstance(selem, (tuple, list)):
+        return False
+    return len(selem) > 0 and all(
+        isinstance(t, (tuple, list))
+        and len(t) == 2
+        and hasattr(t[0], "shape")
+        and isinstance(t[1], numbers.Integral)
+        for t in selem
+    )
+
+
+def _shape_from_sequence(selems):
+    """Shape of the structuring element equivalent to a sequence."""
+    ndim = selems[0][0].ndim
+    return tuple(
+        1 + sum((selem.shape[d] - 1) * num_iter for selem, num_iter in selems)
+        for d in range(ndim)
+    )
+
+
+def selem_from_sequence(selems):
+    """Convert a sequence of structuring elements into a single array.
+
+    Parameters
+    ----------
+    selems : tuple of 2-tuples
+        A sequence of ``(selem, num_iter)`` tuples as returned by the
+        structuring element functions of this module when a `decomposition`
+        is requested.
+
+    Returns
+    -------
+    selem : ndarray
+        The structuring element equivalent to applying each ``selem`` of the
+        sequence ``num_iter`` times, i.e. their Minkowski sum.
+    """
+    # the sum is computed in NumPy as the structuring elements are small
+    ndim = selems[0][0].ndim
+    dtype = selems[0][0].dtype
+    result = np.ones((1,) * ndim, dtype=bool)
+    origin = np.zeros(ndim, dtype=int)
+    for selem, num_iter in selems:
+        selem = cp.asnumpy(selem).astype(bool)
+        for _ in range(num_iter):
+            shape = tuple(n + m - 1 for n, m in zip(result.shape, selem.shape))
+            total = np.zeros(shape, dtype=bool)
+            for idx in np.argwhere(selem):
+                sl = tuple(slice(i, i + n) for i, n in zip(idx, result.shape))
+                total[sl] |= result
+            result = total
+            origin += np.asarray(selem.shape) // 2
+    # pad with zeros so that the origin is the center of the array
+    pad_width = []
+    for n, o in zip(result.shape, origin):
+        if o > n // 2:
+            pad_width.append((0, 2 * o - n + 1))
+        else:
+            pad_width.append((n - 2 * o - 1 if o < n // 2 else 0, 0))
+    result = np.pad(result, pad_width)
+    return cp.asarray(result, dtype=dtype)
+
+
 def _default_selem(ndim):
     """Generates a cross-shaped structuring element (connectivity=1).
 
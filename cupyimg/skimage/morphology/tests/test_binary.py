@@ -4,7 +4,7 @@ from cupy import testing
 
 from skimage import data
 from cupyimg.skimage import color
-from cupyimg.skimage.util import img_as_bool
+from cupyimg.skimage.util import PackedMask, img_as_bool, pack_mask
 from cupyimg.skimage.morphology import binary, grey, selem
 from cupyimg.scipy import ndimage as ndi
 
@@ -188,3 +188,59 @@ def test_binary_output_3d():
 
     np.testing.assert_equal(int_opened.dtype, cp.uint8)
     np.testing.assert_equal(int_closed.dtype, cp.uint8)
+
+
+@pytest.mark.parametrize(
+    "function",
+    ["binary_erosion", "binary_dilation", "binary_opening", "binary_closing"],
+)
+@pytest.mark.parametrize(
+    "selem_func, args",
+    [
+        (selem.square, (7,)),
+        (selem.diamond, (3,)),
+        (selem.octagon, (3, 2)),
+    ],
+)
+def test_selem_sequence(function, selem_func, args):
+    sequence = selem_func(*args, decomposition="sequence")
+    func = getattr(binary, function)
+    expected = func(bw_img, selem.selem_from_sequence(sequence))
+    testing.assert_array_equal(func(bw_img, sequence), expected)
+
+
+@pytest.mark.parametrize(
+    "function",
+    ["binary_erosion", "binary_dilation", "binary_opening", "binary_closing"],
+)
+@pytest.mark.parametrize(
+    "strel",
+    [
+        None,
+        selem.square(3),
+        selem.disk(4),
+        selem.square(9, decomposition="separable"),
+    ],
+)
+def test_packed_mask(function, strel):
+    func = getattr(binary, function)
+    image = bw_img[:200, :300]
+    expected = func(image, strel)
+    result = func(pack_mask(image), strel)
+    assert isinstance(result, PackedMask)
+    testing.assert_array_equal(result.unpack(), expected)
+    out = PackedMask.zeros(image.shape)
+    assert func(pack_mask(image), strel, out=out) is out
+    testing.assert_array_equal(out.unpack(), expected)
+    # packed output for an unpacked image
+    out = PackedMask.zeros(image.shape)
+    func(image, strel, out=out)
+    testing.assert_array_equal(out.unpack(), expected)
+
+
+def test_packed_mask_3d():
+    image = cp.random.RandomState(0).rand(8, 20, 40) > 0.4
+    expected = binary.binary_dilation(image)
+    result = binary.binary_dilation(pack_mask(image))
+    assert isinstance(result, PackedMask)
+    testing.assert_array_equal(result.unpack(), expected)
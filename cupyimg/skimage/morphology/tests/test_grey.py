@@ -328,3 +328,33 @@ def test_1d_erosion():
     expected = cp.array([1, 1, 2, 1, 1])
     eroded = grey.erosion(image)
     cp.testing.assert_array_equal(eroded, expected)
+
+
+@parametrize(
+    "function",
+    [
+        "erosion",
+        "dilation",
+        "opening",
+        "closing",
+        "white_tophat",
+        "black_tophat",
+    ],
+)
+@parametrize(
+    "selem_func, args",
+    [
+        (selem.square, (7,)),
+        (selem.rectangle, (5, 9)),
+        (selem.diamond, (3,)),
+        (selem.disk, (7,)),
+        (selem.octagon, (3, 2)),
+    ],
+)
+def test_selem_sequence(function, selem_func, args):
+    image = cp.asarray(data.camera()[::4, ::4])
+    decomposition = "separable" if selem_func is selem.rectangle else "sequence"
+    sequence = selem_func(*args, decomposition=decomposition)
+    func = getattr(grey, function)
+    expected = func(image, selem.selem_from_sequence(sequence))
+    cp.testing.assert_array_equal(func(image, sequence), expected)
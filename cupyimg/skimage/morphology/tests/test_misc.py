@@ -1,3 +1,4 @@
+import cupy as cp
 import numpy as np
 import pytest
 from cupyimg.skimage.morphology import remove_small_objects, remove_small_holes
@@ -245,3 +246,48 @@ def test_float_input_holes():
     float_test = np.random.rand(5, 5)
     with testing.raises(TypeError):
         remove_small_holes(float_test)
+
+
+def test_out_of_core_memmap(tmp_path):
+    from cupyimg.skimage.morphology.misc import _remove_small_objects_tiled
+
+    rng = np.random.RandomState(0)
+    image = np.lib.format.open_memmap(
+        str(tmp_path / "mask.npy"), mode="w+", dtype=bool, shape=(60, 70)
+    )
+    image[...] = rng.rand(60, 70) > 0.6
+    expected = remove_small_objects(cp.asarray(image), min_size=5)
+    # small blocks so that objects span several of them
+    observed = _remove_small_objects_tiled(
+        image, 5, 1, in_place=True, max_block_bytes=2000
+    )
+    assert observed is image
+    assert_array_equal(observed, cp.asnumpy(expected))
+
+
+def test_out_of_core_memmap_out(tmp_path):
+    from cupyimg.skimage.morphology.misc import _remove_small_objects_tiled
+
+    rng = np.random.RandomState(0)
+    image = np.lib.format.open_memmap(
+        str(tmp_path / "labels.npy"), mode="w+", dtype=np.int32, shape=(60, 70)
+    )
+    image[...] = rng.randint(0, 40, size=(60, 70))
+    original = np.array(image)
+    expected = remove_small_objects(cp.asarray(image), min_size=110)
+    out = np.lib.format.open_memmap(
+        str(tmp_path / "out.npy"), mode="w+", dtype=np.int32, shape=(60, 70)
+    )
+    observed = _remove_small_objects_tiled(
+        image, 110, 1, in_place=False, out=out, max_block_bytes=2000
+    )
+    assert observed is out
+    assert_array_equal(observed, cp.asnumpy(expected))
+    # the input is left untouched
+    assert_array_equal(image, original)
+
+    # memory maps are never copied implicitly
+    with testing.raises(ValueError):
+        remove_small_objects(image, min_size=110)
+    with testing.raises(ValueError):
+        remove_small_objects(cp.asarray(image), min_size=110, out=out)
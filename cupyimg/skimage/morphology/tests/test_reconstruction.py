@@ -44,7 +44,8 @@ def test_one_image_peak():
     assert_array_almost_equal(reconstruction(image, mask), 2)
 
 
-def test_two_image_peaks():
+@pytest.mark.parametrize("method_impl", ["iterative", "sequential"])
+def test_two_image_peaks(method_impl):
     """Test reconstruction with two peak pixels isolated by the mask"""
     # fmt: off
     image = cp.asarray([[1, 1, 1, 1, 1, 1, 1, 1],
@@ -68,7 +69,9 @@ def test_two_image_peaks():
                            [1, 1, 1, 1, 1, 3, 3, 3],
                            [1, 1, 1, 1, 1, 3, 3, 3]])
     # fmt: on
-    assert_array_almost_equal(reconstruction(image, mask), expected)
+    assert_array_almost_equal(
+        reconstruction(image, mask, method_impl=method_impl), expected
+    )
 
 
 def test_zero_image_one_mask():
@@ -77,11 +80,14 @@ def test_zero_image_one_mask():
     assert_array_almost_equal(result, 0)
 
 
-def test_fill_hole():
+@pytest.mark.parametrize("method_impl", ["iterative", "sequential"])
+def test_fill_hole(method_impl):
     """Test reconstruction by erosion, which should fill holes in mask."""
     seed = cp.asarray([0, 8, 8, 8, 8, 8, 8, 8, 8, 0])
     mask = cp.asarray([0, 3, 6, 2, 1, 1, 1, 4, 2, 0])
-    result = reconstruction(seed, mask, method="erosion")
+    result = reconstruction(
+        seed, mask, method="erosion", method_impl=method_impl
+    )
     assert_array_almost_equal(
         result, cp.asarray([0, 3, 6, 4, 4, 4, 4, 4, 2, 0])
     )
@@ -111,6 +117,8 @@ def test_invalid_method():
     mask = cp.asarray([0, 3, 6, 2, 1, 1, 1, 4, 2, 0])
     with pytest.raises(ValueError):
         reconstruction(seed, mask, method="foo")
+    with pytest.raises(ValueError):
+        reconstruction(seed, mask, method_impl="foo")
 
 
 def test_invalid_offset_not_none():
@@ -140,7 +148,8 @@ def test_invalid_offset_not_none():
         )
 
 
-def test_offset_not_none():
+@pytest.mark.parametrize("method_impl", ["iterative", "sequential"])
+def test_offset_not_none(method_impl):
     """Test reconstruction with valid offset parameter"""
     seed = cp.asarray([0, 3, 6, 2, 1, 1, 1, 4, 2, 0])
     mask = cp.asarray([0, 8, 6, 8, 8, 8, 8, 4, 4, 0])
@@ -153,6 +162,24 @@ def test_offset_not_none():
             method="dilation",
             selem=np.ones(3),
             offset=np.array([0]),
+            method_impl=method_impl,
         ),
         expected,
     )
+
+
+@pytest.mark.parametrize("method", ["dilation", "erosion"])
+@pytest.mark.parametrize("shape", [(64,), (48, 33), (12, 15, 9)])
+@pytest.mark.parametrize("dtype", [cp.uint8, cp.float32])
+def test_iterative_vs_sequential(method, shape, dtype):
+    rng = np.random.RandomState(5)
+    mask = cp.asarray(rng.randint(0, 100, shape).astype(dtype))
+    if method == "dilation":
+        seed = mask.copy()
+        seed[..., 1:] = mask.min()
+    else:
+        seed = mask.copy()
+        seed[..., 1:] = mask.max()
+    expected = reconstruction(seed, mask, method, method_impl="sequential")
+    result = reconstruction(seed, mask, method, method_impl="iterative")
+    assert_array_almost_equal(result, expected)
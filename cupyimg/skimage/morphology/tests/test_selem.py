@@ -8,6 +8,7 @@ Author: Damian Eads
 
 import cupy as cp
 import numpy as np
+import pytest
 from cupy.testing import assert_array_equal
 
 from cupyimg.skimage.morphology import selem
@@ -191,3 +192,68 @@ class TestSElem:
         actual_mask2 = selem.star(1)
         assert_array_equal(expected_mask1, actual_mask1)
         assert_array_equal(expected_mask2, actual_mask2)
+
+
+@pytest.mark.parametrize("decomposition", ["separable", "sequence"])
+@pytest.mark.parametrize("width", [1, 2, 3, 4, 7, 10])
+def test_box_decomposition(decomposition, width):
+    for func, args in [
+        (selem.square, (width,)),
+        (selem.rectangle, (width, 5)),
+        (selem.cube, (width,)),
+    ]:
+        expected = func(*args)
+        sequence = func(*args, decomposition=decomposition)
+        assert_array_equal(selem.selem_from_sequence(sequence), expected)
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2, 5])
+def test_diamond_octahedron_decomposition(radius):
+    sequence = selem.diamond(radius, decomposition="sequence")
+    assert_array_equal(
+        selem.selem_from_sequence(sequence), selem.diamond(radius)
+    )
+    sequence = selem.octahedron(radius, decomposition="sequence")
+    assert_array_equal(
+        selem.selem_from_sequence(sequence), selem.octahedron(radius)
+    )
+
+
+@pytest.mark.parametrize("m", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("n", [0, 1, 2, 3])
+def test_octagon_decomposition(m, n):
+    sequence = selem.octagon(m, n, decomposition="sequence")
+    assert_array_equal(selem.selem_from_sequence(sequence), selem.octagon(m, n))
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2, 3, 4, 7, 15, 30])
+def test_disk_decomposition(radius):
+    expected = selem.disk(radius)
+    sequence = selem.disk(radius, decomposition="sequence")
+    actual = selem.selem_from_sequence(sequence)
+    assert actual.shape == expected.shape
+    # exact for small radii, then a close approximation
+    if radius <= 4:
+        assert_array_equal(actual, expected)
+    assert int(cp.count_nonzero(actual != expected)) <= 0.03 * expected.sum()
+    # much fewer elements than the disk
+    n_elements = sum(int(s.sum()) * n for s, n in sequence)
+    assert n_elements < 0.1 * expected.sum() or radius < 15
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2, 5, 10])
+def test_ball_decomposition(radius):
+    expected = selem.ball(radius)
+    sequence = selem.ball(radius, decomposition="sequence")
+    actual = selem.selem_from_sequence(sequence)
+    assert actual.shape == expected.shape
+    assert int(cp.count_nonzero(actual != expected)) <= 0.15 * expected.sum()
+
+
+def test_invalid_decomposition():
+    with pytest.raises(ValueError):
+        selem.disk(5, decomposition="separable")
+    with pytest.raises(ValueError):
+        selem.square(5, decomposition="crosses")
+    with pytest.raises(ValueError):
+        selem.octahedron(2.5, decomposition="sequence")
@@ -0,0 +1,145 @@
+"""Separable polyphase resampling used by `resize` and friends.
+
+Each axis is resampled by a single call to `cupyimg.scipy.signal.upfirdn`
+with a filter bank that combines interpolation and anti-aliasing. The filter
+banks only depend on the input and output lengths along an axis and are cached
+on the host.
+"""
+import functools
+import math
+
+import cupy as cp
+import numpy as np
+
+from cupyimg.scipy.signal import upfirdn
+
+__all__ = ["polyphase_resize"]
+
+
+def _area_kernel(t, s):
+    # overlap of a box of width s centered at t with the unit pixel at 0
+    lo = np.maximum(t - s / 2, -0.5)
+    hi = np.minimum(t + s / 2, 0.5)
+    return np.clip(hi - lo, 0, None)
+
+
+def _bicubic_kernel(t, s, a=-0.5):
+    t = np.abs(t / s)
+    return np.where(
+        t <= 1,
+        ((a + 2) * t - (a + 3)) * t * t + 1,
+        np.where(t < 2, ((a * t - 5 * a) * t + 8 * a) * t - 4 * a, 0),
+    )
+
+
+def _lanczos_kernel(t, s, a=3):
+    t = t / s
+    return np.where(np.abs(t) < a, np.sinc(t) * np.sinc(t / a), 0)
+
+
+# kernel function and support radius (in input samples) for a scale s >= 1
+_kernels = {
+    "area": (_area_kernel, lambda s: (s + 1) / 2),
+    "bicubic": (_bicubic_kernel, lambda s: 2 * s),
+    "lanczos": (_lanczos_kernel, lambda s: 3 * s),
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _weight_table(n_in, n_out, method):
+    """Polyphase filter bank resampling n_in samples to n_out samples.
+
+    Output sample k is centered at input position (k + 0.5) * n_in / n_out -
+    0.5. Up and down factors are doubled so that this half-pixel shift falls
+    on the upsampled grid.
+
+    Returns
+    -------
+    h : ndarray
+        The filter to pass to ``upfirdn``.
+    up, down : int
+        The upsampling and downsampling factors.
+    offset : int
+        Index of the first wanted sample in the ``upfirdn`` output.
+
+    """
+    kernel, support = _kernels[method]
+    g = math.gcd(n_in, n_out)
+    up = 2 * (n_out // g)
+    down = 2 * (n_in // g)
+    scale = max(1.0, n_in / n_out)
+    radius = support(scale) * up  # kernel support on the upsampled grid
+
+    half = (down - up) // 2
+    offset = -(-(math.ceil(radius) + half) // down)
+    center = offset * down - half
+    j = np.arange(center + math.ceil(radius) + 1)
+    h = kernel((j - center) / up, scale)
+    h[np.abs(j - center) >= radius] = 0
+
+    # normalize each phase so that constant signals are preserved
+    for phase in range(up):
+        total = h[phase::up].sum()
+        if total != 0:
+            h[phase::up] /= total
+
+    # pad with zeros so that upfirdn produces all of the requested samples
+    n_full = ((n_in - 1) * up + h.size - 1) // down + 1
+    if n_full < offset + n_out:
+        h = np.concatenate((h, np.zeros((offset + n_out - n_full) * down)))
+    return h, up, down, offset
+
+
+def polyphase_resize(
+    image, output_shape, method="lanczos", mode="reflect", cval=0
+):
+    """Resample a floating point image to output_shape, one axis at a time.
+
+    Parameters
+    ----------
+    image : ndarray
+        Input image.
+    output_shape : tuple of int
+        Shape of the output. Must have one entry per axis of `image`.
+    method : {'lanczos', 'bicubic', 'area'}, optional
+        The resampling kernel. When down-sampling, the kernel is stretched by
+        the down-sampling factor so that it also acts as the anti-aliasing
+        filter.
+    mode : {'constant', 'edge', 'symmetric', 'reflect', 'wrap'}, optional
+        Points outside the boundaries of the input are filled according
+        to the given mode.  Modes match the behaviour of `numpy.pad`.
+    cval : float, optional
+        Used in conjunction with mode 'constant', the value outside
+        the image boundaries.
+
+    Returns
+    -------
+    resampled : ndarray
+        Resampled version of the input.
+
+    """
+    if method not in _kernels:
+        raise ValueError(
+            "polyphase method must be one of {}".format(sorted(_kernels))
+        )
+    output_shape = tuple(int(n) for n in output_shape)
+    if len(output_shape) != image.ndim:
+        raise ValueError("output_shape must have one entry per image axis")
+    axes = [
+        ax for ax in range(image.ndim) if output_shape[ax] != image.shape[ax]
+    ]
+    # shrink the axes with the largest reduction first to minimize work
+    axes.sort(key=lambda ax: output_shape[ax] / image.shape[ax])
+    if not axes:
+        return image.copy()
+    out = image
+    for ax in axes:
+        h, up, down, offset = _weight_table(
+            image.shape[ax], output_shape[ax], method
+        )
+        h = cp.asarray(h, dtype=out.real.dtype)
+        out = upfirdn(h, out, up, down, axis=ax, mode=mode, cval=cval)
+        sl = [slice(None)] * out.ndim
+        sl[ax] = slice(offset, offset + output_shape[ax])
+        out = out[tuple(sl)]
+    return cp.ascontiguousarray(out)
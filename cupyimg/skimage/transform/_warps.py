@@ -2,15 +2,18 @@ import math
 
 import numpy as np
 from cupyimg.scipy import ndimage as ndi
+from cupyimg.scipy.ndimage.interpolation import _mapped_transform
 import cupy as cp
 
 from ._geometric import (
     SimilarityTransform,
     AffineTransform,
     ProjectiveTransform,
+    PolynomialTransform,
     _to_ndimage_mode,
 )
 from ..measure import block_reduce
+from ._polyphase import polyphase_resize
 from .._shared.utils import (
     safe_as_int,
     warn,
@@ -20,6 +23,12 @@ from .._shared.utils import (
 
 # from .._shared.utils import get_bound_method_class
 
+# Largest number of channels that the interpolation kernels treat together
+# when the channel axis is guessed from the shapes. Each thread holds one
+# value per channel and each count compiles a kernel of its own, so larger
+# trailing axes are interpolated like any other axis.
+_MAX_CHANNELS_LAST = 4
+
 HOMOGRAPHY_TRANSFORMS = (
     SimilarityTransform,
     AffineTransform,
@@ -37,6 +46,8 @@ def resize(
     preserve_range=False,
     anti_aliasing=None,
     anti_aliasing_sigma=None,
+    *,
+    polyphase=None,
 ):
     """Resize image to match a certain size.
 
@@ -90,6 +101,12 @@ def resize(
         By default, this value is chosen as (s - 1) / 2 where s is the
         down-scaling factor, where s > 1. For the up-size case, s < 1, no
         anti-aliasing is performed prior to rescaling.
+    polyphase : {None, 'lanczos', 'bicubic', 'area'}, optional
+        If given, resample each axis in a single pass with the named kernel
+        instead of using spline interpolation. When down-sizing, the kernel is
+        stretched by the down-scaling factor so that it also suppresses
+        aliasing, so `order`, `anti_aliasing` and `anti_aliasing_sigma` are
+        ignored. Requires the fast_upfirdn package.
 
     Notes
     -----
@@ -99,6 +116,10 @@ def resize(
     symmetric, the result would be [0, 1, 2, 2, 1, 0, 0], while for reflect it
     would be [0, 1, 2, 1, 0, 1, 2].
 
+    When the number of channels along the last axis is preserved and is at
+    most 4, all channels of an output pixel are interpolated with the same
+    weights in a single kernel launch.
+
     Examples
     --------
     >>> from skimage import data
@@ -123,6 +144,12 @@ def resize(
             "len(output_shape) cannot be smaller than the image " "dimensions"
         )
 
+    if polyphase is not None:
+        image = convert_to_float(image, preserve_range)
+        out = polyphase_resize(image, output_shape, polyphase, mode, cval)
+        _clip_warp_output(image, out, 1, mode, cval, clip)
+        return out
+
     if anti_aliasing is None:
         anti_aliasing = not image.dtype == bool
 
@@ -224,6 +251,31 @@ def resize(
             preserve_range=preserve_range,
         )
 
+    elif (
+        len(output_shape) > 3
+        and output_shape[-1] == input_shape[-1]
+        and input_shape[-1] <= _MAX_CHANNELS_LAST
+    ):
+        # n-dimensional interpolation of an image with channels
+        order = _validate_interpolation_order(image.dtype, order)
+        image = convert_to_float(image, preserve_range)
+
+        # same coordinates as below, interpolating all channels with the
+        # same weights
+        ndi_mode = _to_ndimage_mode(mode)
+        out = ndi.affine_transform(
+            image,
+            factors[:-1],
+            offset=factors[:-1] / 2 - 0.5,
+            output_shape=output_shape[:-1],
+            order=order,
+            mode=ndi_mode,
+            cval=cval,
+            channels_last=True,
+        )
+
+        _clip_warp_output(image, out, order, mode, cval, clip)
+
     else:  # n-dimensional interpolation
         order = _validate_interpolation_order(image.dtype, order)
 
@@ -259,6 +311,8 @@ def rescale(
     multichannel=False,
     anti_aliasing=None,
     anti_aliasing_sigma=None,
+    *,
+    polyphase=None,
 ):
     """Scale image by a certain factor.
 
@@ -313,6 +367,10 @@ def rescale(
         Standard deviation for Gaussian filtering to avoid aliasing artifacts.
         By default, this value is chosen as (s - 1) / 2 where s is the
         down-scaling factor.
+    polyphase : {None, 'lanczos', 'bicubic', 'area'}, optional
+        If given, resample in a single pass per axis with the named kernel
+        instead of smoothing and interpolating. See
+        `skimage.transform.resize` for detail.
 
     Notes
     -----
@@ -358,6 +416,7 @@ def rescale(
         preserve_range=preserve_range,
         anti_aliasing=anti_aliasing,
         anti_aliasing_sigma=anti_aliasing_sigma,
+        polyphase=polyphase,
     )
 
 
@@ -742,7 +801,9 @@ def warp_coords(coord_map, shape, dtype=np.float64):
     return coords
 
 
-def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
+def _clip_warp_output(
+    input_image, output_image, order, mode, cval, clip, frames=False
+):
     """Clip output image to range of values of input image.
 
     Note that this function modifies the values of `output_image` in-place
@@ -750,8 +811,8 @@ def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
 
     Parameters
     ----------
-    input_image : ndarray
-        Input image.
+    input_image : ndarray or SplineCoefficients
+        Input image, or its spline coefficients.
     output_image : ndarray
         Output image, which is modified in-place.
 
@@ -770,13 +831,35 @@ def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
         Whether to clip the output to the range of values of the input image.
         This is enabled by default, since higher order interpolation may
         produce values outside the given input range.
+    frames : bool, optional
+        Whether the first axis indexes a stack of images, each of which is
+        clipped to its own range of values.
 
     """
-    if clip and order != 0:
-        min_val = input_image.min()
-        max_val = input_image.max()
+    if clip and order != 0 and frames:
+        axis = tuple(range(1, input_image.ndim))
+        min_val = input_image.min(axis=axis, keepdims=True)
+        max_val = input_image.max(axis=axis, keepdims=True)
+
+        preserve_cval = mode in ("constant", "grid-constant")
+        if preserve_cval:
+            cval_mask = output_image == cval
+            cval_mask &= (cval < min_val) | (cval > max_val)
+
+        cp.clip(output_image, min_val, max_val, out=output_image)
+
+        if preserve_cval:
+            output_image[cval_mask] = cval
+    elif clip and order != 0:
+        if isinstance(input_image, ndi.SplineCoefficients):
+            min_val, max_val = input_image.input_range
+        else:
+            min_val = input_image.min()
+            max_val = input_image.max()
 
-        preserve_cval = mode == "constant" and not (min_val <= cval <= max_val)
+        preserve_cval = mode in ("constant", "grid-constant") and not (
+            min_val <= cval <= max_val
+        )
 
         if preserve_cval:
             cval_mask = output_image == cval
@@ -787,6 +870,106 @@ def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
             output_image[cval_mask] = cval
 
 
+def _compiled_mapping(inverse_map, map_args):
+    """Return the ``(mapping, params)`` computing `inverse_map` in a kernel.
+
+    Projective and polynomial transforms and the swirl and polar mappings
+    used by `swirl` and `warp_polar` can be evaluated within the
+    interpolation kernel. ``None`` is returned for any other callable.
+    """
+    try:
+        if isinstance(inverse_map, ProjectiveTransform) and not map_args:
+            if inverse_map.params.shape == (3, 3):
+                return "projective", inverse_map.params
+        elif isinstance(inverse_map, PolynomialTransform) and not map_args:
+            return "polynomial", inverse_map.params
+        elif inverse_map is _swirl_mapping:
+            x0, y0 = map_args["center"]
+            # same decay of the swirl as in _swirl_mapping
+            radius = map_args["radius"] / 5 * math.log(2)
+            params = (
+                x0,
+                y0,
+                map_args["rotation"],
+                map_args["strength"],
+                radius,
+            )
+            return "swirl", [float(p) for p in params]
+        elif inverse_map in (_linear_polar_mapping, _log_polar_mapping):
+            params = (
+                map_args["k_angle"],
+                map_args["k_radius"],
+                *map_args["center"],
+            )
+            if inverse_map is _linear_polar_mapping:
+                mapping = "linear_polar"
+            else:
+                mapping = "log_polar"
+            return mapping, [float(p) for p in params]
+        elif (
+            getattr(inverse_map, "__name__", None) == "inverse"
+            and isinstance(
+                getattr(inverse_map, "__self__", None), ProjectiveTransform
+            )
+            and not map_args
+        ):
+            tform = inverse_map.__self__
+            if tform.params.shape == (3, 3):
+                return "projective", tform._inv_matrix
+    except (KeyError, TypeError, ValueError):
+        # unexpected map_args: evaluate the callable itself
+        pass
+    return None
+
+
+def _warp_frames(image, inverse_maps, output_shape, order, mode, cval):
+    """Warp each image of a stack with its own projective transform.
+
+    All frames are interpolated by a single kernel launch. `output_shape`
+    is the shape of a single frame, ``(rows, cols)``.
+    """
+    if image.ndim not in (3, 4) or len(inverse_maps) != image.shape[0]:
+        raise ValueError(
+            "A sequence of transforms requires a stack of 2-D images "
+            "(grayscale or color) with one transform per image."
+        )
+    matrices = []
+    for inverse_map in inverse_maps:
+        if isinstance(inverse_map, cp.ndarray) and inverse_map.shape == (3, 3):
+            inverse_map = ProjectiveTransform(matrix=inverse_map)
+        mapping = _compiled_mapping(inverse_map, {})
+        if mapping is None or mapping[0] != "projective":
+            raise ValueError(
+                "A sequence of transforms may only contain projective "
+                "transforms or (3, 3) matrices."
+            )
+        matrices.append(cp.asarray(mapping[1], dtype=np.float64))
+    matrices = cp.stack(matrices)
+    n_frames, n_channels = image.shape[0], image.shape[-1]
+    channels_last = image.ndim == 4 and n_channels <= _MAX_CHANNELS_LAST
+    fold_channels = image.ndim == 4 and not channels_last
+    if fold_channels:
+        # warp each band as a frame of its own, using its image's transform
+        image = cp.moveaxis(image, -1, 1).reshape((-1,) + image.shape[1:3])
+        matrices = cp.repeat(matrices, n_channels, axis=0)
+    warped = _mapped_transform(
+        image,
+        "projective",
+        matrices,
+        output_shape,
+        prefilter=order > 1,
+        mode=mode,
+        order=order,
+        cval=cval,
+        channels_last=channels_last,
+        batched=True,
+    )
+    if fold_channels:
+        warped = warped.reshape((n_frames, n_channels) + warped.shape[1:])
+        warped = cp.ascontiguousarray(cp.moveaxis(warped, 1, -1))
+    return warped
+
+
 def warp(
     image,
     inverse_map,
@@ -802,9 +985,15 @@ def warp(
 
     Parameters
     ----------
-    image : ndarray
-        Input image.
-    inverse_map : transformation object, callable ``cr = f(cr, **kwargs)``, or ndarray
+    image : ndarray or SplineCoefficients
+        Input image. To warp the same image many times, its spline
+        coefficients can be computed once with
+        `cupyimg.scipy.ndimage.SplineCoefficients` and passed instead. The
+        order, mode and cval of the coefficients are then used, `order`,
+        `mode`, `cval` and `preserve_range` are ignored, and the output is
+        clipped to the range of the image the coefficients were computed
+        from.
+    inverse_map : transformation object, callable ``cr = f(cr, **kwargs)``, ndarray or sequence
         Inverse coordinate map, which transforms coordinates in the output
         images into their corresponding coordinates in the input image.
 
@@ -830,6 +1019,11 @@ def warp(
            shape of the output image, and the first dimension contains the
            ``(row, col)`` coordinate in the input image.
            See `scipy.ndimage.map_coordinates` for further documentation.
+         - For a stack of 2-D images of shape ``(T, rows, cols[, bands])``,
+           you can pass a list or tuple of ``T`` projective transformation
+           objects or ``(3, 3)`` matrices, one per image. All images are
+           then warped in a single kernel launch, and each is clipped to its
+           own range of values. `image` must be an array in this case.
 
         Note, that a ``(3, 3)`` matrix is interpreted as a homogeneous
         transformation matrix, so you cannot interpolate values from a 3-D
@@ -942,13 +1136,19 @@ def warp(
     if image.size == 0:
         raise ValueError("Cannot warp empty image with dimensions", image.shape)
 
-    order = _validate_interpolation_order(image.dtype, order)
-
-    if image.dtype.kind == "c":
-        if not preserve_range:
-            raise NotImplementedError("TODO")
+    if isinstance(image, ndi.SplineCoefficients):
+        # interpolate the cached coefficients with their own parameters
+        order, mode, cval = image.order, image.mode, image.cval
+        ndi_mode = mode
     else:
-        image = convert_to_float(image, preserve_range)
+        order = _validate_interpolation_order(image.dtype, order)
+        ndi_mode = _to_ndimage_mode(mode)
+
+        if image.dtype.kind == "c":
+            if not preserve_range:
+                raise NotImplementedError("TODO")
+        else:
+            image = convert_to_float(image, preserve_range)
 
     input_shape = np.array(image.shape)
 
@@ -958,6 +1158,7 @@ def warp(
         output_shape = safe_as_int(output_shape)
 
     warped = None
+    frames = isinstance(inverse_map, (list, tuple))
 
     if order == 2:
         # When fixing this issue, make sure to fix the branches further
@@ -972,8 +1173,21 @@ def warp(
             "to use bi-linear or bi-cubic interpolation instead."
         )
 
+    if frames:
+        if isinstance(image, ndi.SplineCoefficients):
+            raise ValueError(
+                "a sequence of inverse maps requires an image array, not "
+                "SplineCoefficients"
+            )
+        # transform each image of a stack with its own matrix
+        if len(output_shape) > 2:
+            output_shape = output_shape[1:3]
+        warped = _warp_frames(
+            image, inverse_map, output_shape, order, ndi_mode, cval
+        )
+
     if warped is None:
-        # use ndi.map_coordinates
+        # determine the coordinates for ndi.map_coordinates
 
         if isinstance(inverse_map, cp.ndarray) and inverse_map.shape == (3, 3,):
             # inverse_map is a transformation matrix as numpy array,
@@ -1008,12 +1222,36 @@ def warp(
                     input_shape[2],
                 )
 
-            coords = warp_coords(coord_map, output_shape)
+            mapping = _compiled_mapping(inverse_map, map_args)
+            if mapping is not None:
+                # compute the coordinates within the interpolation kernel
+                # instead of allocating them with warp_coords
+                channels_last = (
+                    len(output_shape) == 3
+                    and output_shape[2] == input_shape[2]
+                    and input_shape[2] <= _MAX_CHANNELS_LAST
+                    and not isinstance(image, ndi.SplineCoefficients)
+                )
+                if channels_last:
+                    # interpolate all channels with the same weights
+                    output_shape = output_shape[:2]
+                warped = _mapped_transform(
+                    image,
+                    *mapping,
+                    output_shape,
+                    prefilter=order > 1,
+                    mode=ndi_mode,
+                    order=order,
+                    cval=cval,
+                    channels_last=channels_last,
+                )
+            else:
+                coords = warp_coords(coord_map, output_shape)
 
+    if warped is None:
         # Pre-filtering not necessary for order 0, 1 interpolation
         prefilter = order > 1
 
-        ndi_mode = _to_ndimage_mode(mode)
         warped = ndi.map_coordinates(
             image,
             coords,
@@ -1023,7 +1261,7 @@ def warp(
             cval=cval,
         )
 
-    _clip_warp_output(image, warped, order, mode, cval, clip)
+    _clip_warp_output(image, warped, order, mode, cval, clip, frames)
 
     return warped
 
@@ -33,6 +33,8 @@ def pyramid_reduce(
     cval=0,
     multichannel=False,
     preserve_range=False,
+    *,
+    polyphase=None,
 ):
     """Smooth and then downsample image.
 
@@ -61,6 +63,10 @@ def pyramid_reduce(
         Whether to keep the original range of values. Otherwise, the input
         image is converted according to the conventions of `img_as_float`.
         Also see https://scikit-image.org/docs/dev/user_guide/data_types.html
+    polyphase : {None, 'lanczos', 'bicubic', 'area'}, optional
+        If given, smooth and downsample in a single pass per axis with the
+        named kernel, in which case `sigma` and `order` are ignored. See
+        `skimage.transform.resize` for detail.
 
     Returns
     -------
@@ -80,6 +86,15 @@ def pyramid_reduce(
     if multichannel:
         out_shape = out_shape[:-1]
 
+    if polyphase is not None:
+        return resize(
+            image,
+            out_shape,
+            mode=mode,
+            cval=cval,
+            polyphase=polyphase,
+        )
+
     if sigma is None:
         # automatically determine sigma which covers > 99% of distribution
         sigma = 2 * downscale / 6.0
@@ -150,3 +150,15 @@ def test_pyramid_gaussian_dtype_support(dtype, expected):
     pyramid = pyramids.pyramid_gaussian(img)
 
     assert all([im.dtype == expected for im in pyramid])
+
+
+@pytest.mark.parametrize("polyphase", ["lanczos", "bicubic", "area"])
+def test_pyramid_reduce_polyphase(polyphase):
+    pytest.importorskip("fast_upfirdn")
+    rows, cols, dim = image.shape
+    out = pyramids.pyramid_reduce(
+        image, downscale=2, multichannel=True, polyphase=polyphase
+    )
+    assert_array_equal(out.shape, (rows / 2, cols / 2, dim))
+    assert float(out.min()) >= 0
+    assert float(out.max()) <= 1
@@ -11,10 +11,11 @@ from skimage._shared.testing import test_parallel
 from skimage._shared._warnings import expected_warnings
 
 from cupyimg.skimage.util.dtype import img_as_float
-from cupyimg.scipy.ndimage import map_coordinates
+from cupyimg.scipy.ndimage import map_coordinates, SplineCoefficients
 
 from cupyimg.skimage.transform._warps import (
     _stackcopy,
+    _swirl_mapping,
     _linear_polar_mapping,
     _log_polar_mapping,
     warp,
@@ -28,6 +29,7 @@ from cupyimg.skimage.transform._warps import (
 )
 from cupyimg.skimage.transform._geometric import (
     AffineTransform,
+    PolynomialTransform,
     ProjectiveTransform,
     SimilarityTransform,
 )
@@ -840,3 +842,149 @@ def test_bool_array_warnings():
 
     with expected_warnings(["Input image dtype is bool"]):
         warp(img, cp.eye(3), order=1)
+
+
+@pytest.mark.parametrize("order", [1, 3])
+def test_warp_spline_coefficients(order):
+    image = cp.asarray(astronaut()[:100, :120, 0]).astype(float) / 255
+    coefficients = SplineCoefficients(image, order=order, mode="mirror")
+    for angle in [5, 30]:
+        tform = SimilarityTransform(rotation=np.deg2rad(angle))
+        expected = warp(image, tform, order=order, mode="reflect")
+        warped = warp(coefficients, tform)
+        assert_array_almost_equal(warped, expected)
+
+
+def _warp_with_coords(image, inverse_map, map_args={}, **kwargs):
+    # reference warp evaluating the callable through warp_coords
+    def coord_map(xy):
+        return inverse_map(xy, **map_args)
+
+    output_shape = kwargs.pop("output_shape", image.shape)
+    output_shape = tuple(output_shape[:2]) + image.shape[2:]
+    coords = warp_coords(coord_map, output_shape)
+    return warp(image, coords, **kwargs)
+
+
+@pytest.mark.parametrize("order", [0, 1, 3])
+@pytest.mark.parametrize("mode", ["constant", "edge", "reflect", "wrap"])
+@pytest.mark.parametrize("multichannel", [False, True])
+def test_warp_compiled_mapping(order, mode, multichannel):
+    image = img_as_float(cp.asarray(astronaut()[:80, :90]))
+    if not multichannel:
+        image = image[..., 0]
+    center = np.asarray(image.shape[:2])[::-1] / 2
+    projective = ProjectiveTransform(
+        cp.asarray([[1.1, 0.2, -3], [-0.1, 0.9, 4], [0.0005, 0.001, 1]])
+    )
+    polynomial = PolynomialTransform(
+        cp.asarray(
+            [[2, 1.1, 0.1, 0.001, 0.0002, 0], [-3, 0.05, 0.95, 0, 0.001, 0]]
+        )
+    )
+    swirl_args = dict(center=center, rotation=0.2, strength=3, radius=50)
+    polar_args = dict(k_angle=40 / np.pi, k_radius=1.2, center=(40, 45))
+    log_polar_args = dict(k_angle=40 / np.pi, k_radius=20, center=(40, 45))
+    for inverse_map, map_args in [
+        (projective, {}),
+        (projective.inverse, {}),
+        (polynomial, {}),
+        (_swirl_mapping, swirl_args),
+        (_linear_polar_mapping, polar_args),
+        (_log_polar_mapping, log_polar_args),
+    ]:
+        kwargs = dict(order=order, mode=mode, cval=0.5, output_shape=(70, 60))
+        expected = _warp_with_coords(image, inverse_map, map_args, **kwargs)
+        warped = warp(image, inverse_map, map_args=map_args, **kwargs)
+        assert warped.shape == expected.shape
+        assert_array_almost_equal(warped, expected)
+
+
+@pytest.mark.parametrize("order", [0, 1, 3])
+@pytest.mark.parametrize("n_channels", [3, 6])
+def test_resize_nd_channels(order, n_channels):
+    # more than 4 channels are interpolated as an ordinary axis
+    rng = cp.random.RandomState(0)
+    image = rng.standard_normal((10, 12, 8, n_channels))
+    resized = resize(image, (15, 7, 5), order=order, anti_aliasing=False)
+    assert resized.shape == (15, 7, 5, n_channels)
+    for c in range(image.shape[-1]):
+        expected = resize(
+            image[..., c], (15, 7, 5), order=order, anti_aliasing=False
+        )
+        assert_array_almost_equal(resized[..., c], expected)
+
+
+@pytest.mark.parametrize("order", [0, 1, 3])
+@pytest.mark.parametrize("multichannel", [False, True])
+def test_warp_frames(order, multichannel):
+    image = img_as_float(cp.asarray(astronaut()[:60, :70]))
+    if not multichannel:
+        image = image[..., 0]
+    stack = cp.stack([image, image[::-1], image * 0.5])
+    tforms = [
+        SimilarityTransform(rotation=0.1, translation=(3, -2)),
+        AffineTransform(shear=0.2, scale=(1.1, 0.9)).inverse,
+        cp.asarray([[1.0, 0.1, 2], [0.05, 0.9, -1], [0.001, 0, 1]]),
+    ]
+    warped = warp(stack, tforms, output_shape=(50, 80), order=order)
+    assert warped.shape == (3, 50, 80) + image.shape[2:]
+    for frame, tform, out in zip(stack, tforms, warped):
+        expected = warp(frame, tform, output_shape=(50, 80), order=order)
+        assert_array_almost_equal(out, expected)
+
+    with pytest.raises(ValueError):
+        warp(stack, tforms[:2])
+    # per-frame transforms need the image array itself
+    with pytest.raises(ValueError):
+        warp(SplineCoefficients(stack, order=order), tforms)
+
+
+def test_warp_frames_many_bands():
+    # more than 4 bands are warped as separate frames
+    rng = cp.random.RandomState(0)
+    stack = rng.uniform(size=(2, 30, 40, 6))
+    tforms = [
+        SimilarityTransform(rotation=0.1, translation=(3, -2)),
+        cp.asarray([[1.0, 0.1, 2], [0.05, 0.9, -1], [0.001, 0, 1]]),
+    ]
+    warped = warp(stack, tforms, order=1)
+    assert warped.shape == stack.shape
+    for frame, tform, out in zip(stack, tforms, warped):
+        for band in range(stack.shape[-1]):
+            expected = warp(frame[..., band], tform, order=1)
+            assert_array_almost_equal(out[..., band], expected)
+
+
+@pytest.mark.parametrize("method", ["lanczos", "bicubic", "area"])
+@pytest.mark.parametrize("mode", ["reflect", "symmetric", "edge", "wrap"])
+def test_resize_polyphase(method, mode):
+    pytest.importorskip("fast_upfirdn")
+    # constant images are preserved for any combination of sizes
+    image = cp.full((30, 24, 3), 0.25)
+    for shape in [(10, 8), (17, 31), (30, 11), (45, 48)]:
+        resized = resize(image, shape, mode=mode, polyphase=method)
+        assert resized.shape == shape + (3,)
+        assert_array_almost_equal(resized, 0.25)
+
+    rng = cp.random.RandomState(0)
+    image = rng.uniform(size=(24, 36))
+    resized = rescale(image, 0.6, mode=mode, polyphase=method)
+    assert resized.shape == (14, 22)
+    assert float(resized.min()) >= float(image.min())
+    assert float(resized.max()) <= float(image.max())
+
+
+@pytest.mark.parametrize("factors", [(2, 2), (3, 4), (1, 3)])
+def test_resize_polyphase_area_integer_factor(factors):
+    pytest.importorskip("fast_upfirdn")
+    rng = cp.random.RandomState(0)
+    image = rng.uniform(size=(24, 36))
+    shape = (24 // factors[0], 36 // factors[1])
+    resized = resize(image, shape, polyphase="area")
+    assert_array_almost_equal(resized, downscale_local_mean(image, factors))
+
+
+def test_resize_polyphase_invalid():
+    with pytest.raises(ValueError):
+        resize(cp.ones((10, 10)), (5, 5), polyphase="nearest")
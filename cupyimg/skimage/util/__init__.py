@@ -13,6 +13,7 @@ from .noise import random_noise
 from .arraycrop import crop
 from ._invert import invert
 from ._map_array import map_array
+from ._packed import PackedMask, pack_mask, unpack_mask
 
 
 __all__ = [
@@ -30,4 +31,7 @@ __all__ = [
     "map_array",
     "random_noise",
     "invert",
+    "PackedMask",
+    "pack_mask",
+    "unpack_mask",
 ]
@@ -0,0 +1,208 @@
+"""Boolean images packed into 32-bit words."""
+import cupy as cp
+
+from cupyimg import memoize
+from cupyimg.scipy.ndimage import _morphology_packed
+
+
+@memoize(for_each_device=True)
+def _get_popcount_kernel():
+    return cp.ReductionKernel(
+        "uint32 w",
+        "int64 n",
+        "__popc(w)",
+        "a + b",
+        "n = a",
+        "0",
+        "cupyimg_skimage_popcount",
+    )
+
+
+class PackedMask(object):
+    """Boolean image storing 32 pixels per 32-bit word.
+
+    The image is packed along its last axis: bit ``j`` of word ``k`` holds
+    pixel ``32 * k + j`` of each line, so a mask takes one eighth of the
+    memory of a boolean array and the logical operators process 32 pixels
+    per operation. The unused bits of the last word of each line are always
+    zero.
+
+    Packed masks are accepted and returned by the binary morphology
+    functions of ``cupyimg.skimage.morphology`` and ``cupyimg.scipy.ndimage``.
+    Use `pack_mask` to create one from an array.
+
+    Parameters
+    ----------
+    words : cupy.ndarray of uint32
+        The packed words, of shape ``shape[:-1] + (ceil(shape[-1] / 32),)``.
+    shape : tuple of int
+        The shape of the unpacked image.
+
+    Attributes
+    ----------
+    words : cupy.ndarray of uint32
+        The packed words.
+    shape : tuple of int
+        The shape of the unpacked image.
+    """
+
+    def __init__(self, words, shape):
+        shape = tuple(int(s) for s in shape)
+        if len(shape) < 1:
+            raise ValueError("packed masks must have at least one dimension")
+        words_shape = shape[:-1] + (-(-shape[-1] // 32),)
+        if words.dtype != cp.uint32 or words.shape != words_shape:
+            raise ValueError(
+                "words must be a uint32 array of shape {}".format(words_shape)
+            )
+        self.words = cp.ascontiguousarray(words)
+        self.shape = shape
+
+    @classmethod
+    def zeros(cls, shape):
+        """Packed mask of the given shape with all pixels False."""
+        shape = tuple(shape)
+        words = cp.zeros(shape[:-1] + (-(-shape[-1] // 32),), cp.uint32)
+        return cls(words, shape)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        size = 1
+        for s in self.shape:
+            size *= s
+        return size
+
+    @property
+    def dtype(self):
+        """The dtype of the unpacked image (always bool)."""
+        return cp.dtype(cp.bool_)
+
+    @property
+    def nbytes(self):
+        """Memory used by the packed words."""
+        return self.words.nbytes
+
+    def copy(self):
+        return PackedMask(self.words.copy(), self.shape)
+
+    def unpack(self, out=None):
+        """Unpack into a boolean array (or ``out``). See `unpack_mask`."""
+        return unpack_mask(self, out)
+
+    def count_nonzero(self):
+        """Number of True pixels (as a 0-dimensional array)."""
+        return _get_popcount_kernel()(self.words)
+
+    def _check_other(self, other):
+        if not isinstance(other, PackedMask):
+            return False
+        if other.shape != self.shape:
+            raise ValueError(
+                "packed masks of shapes {} and {} do not match".format(
+                    self.shape, other.shape
+                )
+            )
+        return True
+
+    def __invert__(self):
+        words = _morphology_packed._copy_words(
+            self.words, self.shape[-1], invert=True
+        )
+        return PackedMask(words, self.shape)
+
+    def __and__(self, other):
+        if not self._check_other(other):
+            return NotImplemented
+        return PackedMask(cp.bitwise_and(self.words, other.words), self.shape)
+
+    def __or__(self, other):
+        if not self._check_other(other):
+            return NotImplemented
+        return PackedMask(cp.bitwise_or(self.words, other.words), self.shape)
+
+    def __xor__(self, other):
+        if not self._check_other(other):
+            return NotImplemented
+        return PackedMask(cp.bitwise_xor(self.words, other.words), self.shape)
+
+    def __iand__(self, other):
+        if not self._check_other(other):
+            return NotImplemented
+        cp.bitwise_and(self.words, other.words, out=self.words)
+        return self
+
+    def __ior__(self, other):
+        if not self._check_other(other):
+            return NotImplemented
+        cp.bitwise_or(self.words, other.words, out=self.words)
+        return self
+
+    def __ixor__(self, other):
+        if not self._check_other(other):
+            return NotImplemented
+        cp.bitwise_xor(self.words, other.words, out=self.words)
+        return self
+
+    def __repr__(self):
+        return "PackedMask(shape={})".format(self.shape)
+
+
+def pack_mask(image):
+    """Pack a boolean image into 32-bit words.
+
+    Parameters
+    ----------
+    image : ndarray
+        Image to pack along its last axis. Nonzero pixels are True.
+
+    Returns
+    -------
+    packed : PackedMask
+        The packed image. If `image` is already packed, it is returned
+        unchanged.
+
+    Examples
+    --------
+    >>> import cupy as cp
+    >>> mask = cp.zeros((4, 100), dtype=bool)
+    >>> mask[1:3, 10:90] = True
+    >>> packed = pack_mask(mask)
+    >>> packed.words.shape
+    (4, 4)
+    >>> int(packed.count_nonzero())
+    160
+    >>> bool((unpack_mask(packed) == mask).all())
+    True
+    """
+    if isinstance(image, PackedMask):
+        return image
+    if image.ndim < 1:
+        raise ValueError("image must have at least one dimension")
+    return PackedMask(_morphology_packed._pack_bits(image), image.shape)
+
+
+def unpack_mask(packed, out=None):
+    """Unpack a `PackedMask` into an array.
+
+    Parameters
+    ----------
+    packed : PackedMask
+        The packed image.
+    out : ndarray, optional
+        Array of shape ``packed.shape`` in which to store the result. Its
+        dtype need not be bool. By default, a new boolean array is created.
+
+    Returns
+    -------
+    image : ndarray
+        The unpacked image.
+    """
+    if out is None:
+        out = cp.empty(packed.shape, dtype=cp.bool_)
+    elif out.shape != packed.shape:
+        raise ValueError("out must have shape {}".format(packed.shape))
+    return _morphology_packed._unpack_bits(packed.words, packed.shape[-1], out)
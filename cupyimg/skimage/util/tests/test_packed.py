@@ -0,0 +1,48 @@
+import cupy as cp
+import pytest
+from cupy.testing import assert_array_equal
+
+from cupyimg.skimage.util import PackedMask, pack_mask, unpack_mask
+
+
+@pytest.mark.parametrize("shape", [(1,), (31,), (3, 32), (5, 7, 100)])
+def test_pack_unpack_roundtrip(shape):
+    rng = cp.random.RandomState(0)
+    image = rng.rand(*shape) > 0.5
+    packed = pack_mask(image)
+    assert packed.shape == shape
+    assert packed.words.shape == shape[:-1] + (-(-shape[-1] // 32),)
+    assert_array_equal(unpack_mask(packed), image)
+    assert int(packed.count_nonzero()) == int(cp.count_nonzero(image))
+    # non-boolean input and output
+    assert_array_equal(pack_mask(image.astype(cp.uint8)).words, packed.words)
+    out = cp.empty(shape, dtype=cp.float32)
+    assert_array_equal(packed.unpack(out), image.astype(cp.float32))
+    assert pack_mask(packed) is packed
+
+
+def test_packed_logic():
+    rng = cp.random.RandomState(0)
+    a = rng.rand(9, 45) > 0.5
+    b = rng.rand(9, 45) > 0.5
+    pa, pb = pack_mask(a), pack_mask(b)
+    assert_array_equal((~pa).unpack(), ~a)
+    # the padding bits of the last words remain cleared
+    assert int((~pa).count_nonzero()) == int(cp.count_nonzero(~a))
+    assert_array_equal((pa & pb).unpack(), a & b)
+    assert_array_equal((pa | pb).unpack(), a | b)
+    assert_array_equal((pa ^ pb).unpack(), a ^ b)
+    pc = pa.copy()
+    pc |= pb
+    assert_array_equal(pc.unpack(), a | b)
+    assert_array_equal(pa.unpack(), a)
+    assert_array_equal(PackedMask.zeros((9, 45)).unpack(), cp.zeros_like(a))
+
+
+def test_packed_invalid():
+    with pytest.raises(ValueError):
+        PackedMask(cp.zeros((4, 2), dtype=cp.uint32), (4, 65))
+    with pytest.raises(ValueError):
+        pack_mask(cp.zeros((4, 3), bool)) & pack_mask(cp.zeros((3, 4), bool))
+    with pytest.raises(ValueError):
+        unpack_mask(PackedMask.zeros((4, 3)), cp.empty((3, 4), bool))
@@ -0,0 +1,202 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from cupyimg import _kernel_cache, warmup
+
+
+class _Param(object):
+    def __init__(self, signature):
+        *prefix, self.ctype, self.name = signature.split()
+        self.raw = "raw" in prefix
+        self.dtype = None
+
+
+class _Kernel(object):
+    def __init__(
+        self, name, operation="y = x", in_params="T x", out_params="T y"
+    ):
+        self.name = name
+        self.operation = operation
+        self.in_params = tuple(_Param(p) for p in in_params.split(", "))
+        self.out_params = tuple(_Param(p) for p in out_params.split(", "))
+        self.preamble = ""
+        self.options = ("--std=c++11",)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CUPYIMG_CACHE_DIR", str(tmp_path))
+    return str(tmp_path)
+
+
+def test_kernel_source():
+    source = _kernel_cache._kernel_source(_Kernel("k"))
+    assert "T x" in source
+    assert "--std=c++11" in source
+    # kernels only differing in their parameters have different sources
+    for kwargs in [
+        dict(in_params="float32 x"),
+        dict(in_params="raw T x"),
+        dict(out_params="T y, int32 z"),
+    ]:
+        assert _kernel_cache._kernel_source(_Kernel("k", **kwargs)) != source
+    # memoized helpers returning plain values are not kernels
+    assert _kernel_cache._kernel_source((1, 2)) is None
+
+
+def test_registry_stats(cache_dir):
+    registry = _kernel_cache.KernelRegistry()
+    k1, k2 = _Kernel("k1"), _Kernel("k2")
+    registry._record_miss("f", (1,), {}, k1)
+    registry._record_miss("f", (2,), {}, k2)
+    # regenerated in the same process (e.g. after clear_memo): not on disk
+    registry._record_miss("f", (1,), {}, k1)
+    registry._record_hit("f")
+    registry._record_miss("g", (), {}, (1, 2))
+    stats = registry.stats()
+    assert stats["misses"] == 3
+    assert stats["disk_hits"] == 0
+    assert stats["memory_hits"] == 1
+    assert stats["generated"] == {"f": 3}
+
+    registry.save_index()
+    registry = _kernel_cache.KernelRegistry()
+    registry._record_miss("f", (1,), {}, k1)
+    registry._record_miss("f", (3,), {}, _Kernel("k3"))
+    stats = registry.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 1
+
+    registry.reset_stats()
+    stats = registry.stats()
+    assert stats["misses"] == stats["disk_hits"] == stats["memory_hits"] == 0
+    assert stats["generated"] == {}
+
+
+def test_index_save_load_merge(cache_dir):
+    r1 = _kernel_cache.KernelRegistry()
+    r2 = _kernel_cache.KernelRegistry()
+    r1._record_miss("f", (1,), {"mode": "reflect"}, _Kernel("k1"))
+    r2._record_miss("g", (2,), {}, _Kernel("k2"))
+    path = r1.save_index()
+    assert path == os.path.join(cache_dir, "index.json")
+    # the second process merges its entries with those already on disk
+    r2.save_index()
+    index = _kernel_cache.KernelRegistry().load_index()
+    assert sorted(v["factory"] for v in index.values()) == ["f", "g"]
+    assert sorted(v["name"] for v in index.values()) == ["k1", "k2"]
+    entry = [v for v in index.values() if v["factory"] == "f"][0]
+    assert entry["args"] == "(1,)"
+    assert "reflect" in entry["kwargs"]
+
+    # an explicit cache_dir only receives the entries of this process
+    other = os.path.join(cache_dir, "other")
+    r1.save_index(other)
+    assert len(r1.load_index(other)) == 1
+
+
+@pytest.mark.parametrize(
+    "content", ["{not json", json.dumps({"version": -1, "kernels": {"a": 1}})]
+)
+def test_corrupt_index(cache_dir, content):
+    path = os.path.join(cache_dir, "index.json")
+    with open(path, "w") as f:
+        f.write(content)
+    registry = _kernel_cache.KernelRegistry()
+    assert registry.load_index() == {}
+    registry._record_miss("f", (), {}, _Kernel("k"))
+    assert registry.stats()["misses"] == 1
+    # saving replaces the unreadable index
+    registry.save_index()
+    with open(path, "r") as f:
+        data = json.load(f)
+    assert data["version"] == _kernel_cache._INDEX_VERSION
+    assert len(data["kernels"]) == 1
+
+
+def test_memoize(cache_dir, monkeypatch):
+    registry = _kernel_cache.KernelRegistry()
+    monkeypatch.setattr(_kernel_cache, "registry", registry)
+    calls = []
+
+    @_kernel_cache.memoize()
+    def factory(ndim, mode="reflect"):
+        calls.append((ndim, mode))
+        return _Kernel("k{}_{}".format(ndim, mode))
+
+    k = factory(2)
+    assert factory(2) is k
+    factory(2, mode="wrap")
+    assert calls == [(2, "reflect"), (2, "wrap")]
+    stats = registry.stats()
+    name = "{}.{}".format(factory.__module__, factory.__qualname__)
+    assert stats["generated"] == {name: 2}
+    assert stats["misses"] == 2
+    assert stats["memory_hits"] == 1
+
+    factory.clear_memo()
+    factory(2)
+    assert len(calls) == 3
+
+
+def test_warmup_iter_calls():
+    workload = {
+        "function": "cupyimg.scipy.ndimage.uniform_filter",
+        "shapes": [[8, 8], [4, 4, 4]],
+        "dtypes": ["uint8", "float32"],
+        "modes": ["reflect", "wrap"],
+        "kwargs": {"size": [3, 5]},
+    }
+    calls = list(warmup._iter_calls(workload))
+    assert len(calls) == 16
+    assert calls[0] == ((8, 8), "uint8", None, {"size": 3, "mode": "reflect"})
+
+    footprint = warmup._footprint_array([3, 5], np)
+    assert footprint.shape == (3, 5)
+    assert footprint.all()
+    footprint = warmup._footprint_array([[0, 1], [1, 0]], np)
+    assert footprint.dtype == bool
+    assert footprint.sum() == 2
+
+    with pytest.raises(ValueError):
+        warmup._get_function("uniform_filter")
+
+
+def test_warmup_cli(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("cupy")
+    # main() sets both variables; monkeypatch restores them afterwards
+    monkeypatch.setenv("CUPY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("CUPYIMG_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        _kernel_cache, "registry", _kernel_cache.KernelRegistry()
+    )
+    workloads = [
+        {
+            "function": "cupyimg.scipy.ndimage.uniform_filter",
+            "shapes": [[8, 8]],
+            "dtypes": ["float32"],
+            "modes": ["reflect", "constant"],
+            "kwargs": {"size": [3]},
+        }
+    ]
+    config = str(tmp_path / "config.json")
+    with open(config, "w") as f:
+        json.dump(workloads, f)
+    cache_dir = str(tmp_path / "cache")
+
+    assert warmup.main(["--config", config, "--cache-dir", cache_dir]) == 0
+    out = capsys.readouterr().out
+    assert "uniform_filter: 2 calls" in out
+    with open(os.path.join(cache_dir, "index.json"), "r") as f:
+        index = json.load(f)["kernels"]
+    assert len(index) > 0
+
+    # failing calls are reported through the exit status
+    workloads[0]["kwargs"]["no_such_argument"] = [1]
+    with open(config, "w") as f:
+        json.dump(workloads, f)
+    assert warmup.main(["--config", config, "--cache-dir", cache_dir]) == 1
+    assert "failed" in capsys.readouterr().out
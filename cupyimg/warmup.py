@@ -0,0 +1,225 @@
+"""Ahead-of-time generation and compilation of cupyimg kernels.
+
+Kernel sources in cupyimg depend on the boundary mode, filter footprint,
+output shape (for interpolation) and dtypes, so short-lived processes
+otherwise pay for source generation and NVRTC compilation on their first
+calls. This module runs a declared set of workloads on small dummy arrays so
+that the compiled kernels end up in CuPy's on-disk cache and are listed in
+cupyimg's kernel index.
+
+Usage::
+
+    python -m cupyimg.warmup [--config CONFIG.json] [--cache-dir DIR]
+
+The configuration is a JSON list of workloads, for example::
+
+    [
+        {
+            "function": "cupyimg.scipy.ndimage.uniform_filter",
+            "shapes": [[512, 512]],
+            "dtypes": ["uint8", "float32"],
+            "modes": ["reflect", "constant"],
+            "kwargs": {"size": [3, 5]}
+        },
+        {
+            "function": "cupyimg.scipy.ndimage.minimum_filter",
+            "shapes": [[512, 512]],
+            "dtypes": ["float32"],
+            "footprints": [[[0, 1, 0], [1, 1, 1], [0, 1, 0]]]
+        }
+    ]
+
+Each workload calls ``function(input, **kwargs)`` for every combination of
+shape, dtype, mode (passed as ``mode=``), footprint (passed as the keyword
+given by ``footprint_arg``, default ``"footprint"``) and the cartesian product
+of the lists in ``kwargs``. A footprint may be given either as a nested list
+of values or as a shape, in which case an all-ones footprint is used. When no
+configuration is given, ``DEFAULT_WORKLOADS`` is used.
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+
+__all__ = ["DEFAULT_WORKLOADS", "run_workloads", "main"]
+
+_FILTER_MODES = ["reflect", "constant", "nearest", "mirror", "wrap"]
+
+DEFAULT_WORKLOADS = [
+    {
+        "function": "cupyimg.scipy.ndimage.gaussian_filter",
+        "shapes": [[64, 64], [16, 16, 16]],
+        "dtypes": ["uint8", "uint16", "float32"],
+        "modes": _FILTER_MODES,
+        "kwargs": {"sigma": [1.0, 2.0]},
+    },
+    {
+        "function": "cupyimg.scipy.ndimage.uniform_filter",
+        "shapes": [[64, 64], [16, 16, 16]],
+        "dtypes": ["uint8", "float32"],
+        "modes": _FILTER_MODES,
+        "kwargs": {"size": [3, 5]},
+    },
+    {
+        "function": "cupyimg.scipy.ndimage.minimum_filter",
+        "shapes": [[64, 64]],
+        "dtypes": ["uint8", "float32"],
+        "modes": ["reflect", "constant"],
+        "kwargs": {"size": [3, 5]},
+    },
+    {
+        "function": "cupyimg.scipy.ndimage.maximum_filter",
+        "shapes": [[64, 64]],
+        "dtypes": ["uint8", "float32"],
+        "modes": ["reflect", "constant"],
+        "kwargs": {"size": [3, 5]},
+    },
+    {
+        "function": "cupyimg.scipy.ndimage.median_filter",
+        "shapes": [[64, 64]],
+        "dtypes": ["uint8", "float32"],
+        "modes": ["reflect"],
+        "kwargs": {"size": [3, 5]},
+    },
+    {
+        "function": "cupyimg.scipy.ndimage.binary_erosion",
+        "shapes": [[64, 64], [16, 16, 16]],
+        "dtypes": ["bool"],
+    },
+]
+
+
+def _get_function(path):
+    module_name, _, func_name = path.rpartition(".")
+    if not module_name:
+        raise ValueError("function must be a fully qualified name")
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+def _footprint_array(footprint, xp):
+    arr = xp.asarray(footprint)
+    if arr.ndim == 1 and arr.dtype.kind in "iu" and arr.size > 1:
+        # interpret as the shape of an all-ones footprint
+        return xp.ones(tuple(int(s) for s in footprint), dtype=bool)
+    return arr.astype(bool) if arr.dtype.kind in "biu" else arr
+
+
+def _iter_calls(workload):
+    shapes = workload.get("shapes", [[64, 64]])
+    dtypes = workload.get("dtypes", ["float32"])
+    modes = workload.get("modes", [None])
+    footprints = workload.get("footprints", [None])
+    kwargs = workload.get("kwargs", {})
+    kw_names = list(kwargs.keys())
+    kw_values = [kwargs[k] for k in kw_names]
+    for shape, dtype, mode, footprint, values in itertools.product(
+        shapes, dtypes, modes, footprints, itertools.product(*kw_values)
+    ):
+        call_kwargs = dict(zip(kw_names, values))
+        if mode is not None:
+            call_kwargs["mode"] = mode
+        yield tuple(shape), dtype, footprint, call_kwargs
+
+
+def run_workloads(workloads, verbose=True, file=None):
+    """Run each workload on dummy data so that its kernels are compiled.
+
+    Returns the number of calls that failed.
+    """
+    import cupy
+
+    if file is None:
+        file = sys.stdout
+    n_failed = 0
+    for workload in workloads:
+        func = _get_function(workload["function"])
+        footprint_arg = workload.get("footprint_arg", "footprint")
+        n_calls = 0
+        tstart = time.perf_counter()
+        for shape, dtype, footprint, kwargs in _iter_calls(workload):
+            image = cupy.zeros(shape, dtype=dtype)
+            if footprint is not None:
+                kwargs[footprint_arg] = _footprint_array(footprint, cupy)
+            try:
+                func(image, **kwargs)
+            except Exception as err:  # report and continue with the rest
+                n_failed += 1
+                print(
+                    "  failed: {}(shape={}, dtype={}, {}): {}".format(
+                        workload["function"], shape, dtype, kwargs, err
+                    ),
+                    file=file,
+                )
+            n_calls += 1
+        cupy.cuda.Device().synchronize()
+        if verbose:
+            print(
+                "{}: {} calls in {:.2f} s".format(
+                    workload["function"], n_calls, time.perf_counter() - tstart
+                ),
+                file=file,
+            )
+    return n_failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m cupyimg.warmup",
+        description="Pre-generate and compile cupyimg kernels.",
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="JSON file with a list of workloads (default: built-in list)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "directory for both the CuPy kernel cache and the cupyimg kernel "
+            "index (sets CUPY_CACHE_DIR and CUPYIMG_CACHE_DIR)"
+        ),
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="only print the final summary"
+    )
+    args = parser.parse_args(argv)
+
+    if args.cache_dir is not None:
+        # must be set before any kernel is compiled
+        os.environ["CUPY_CACHE_DIR"] = args.cache_dir
+        os.environ["CUPYIMG_CACHE_DIR"] = args.cache_dir
+
+    if args.config is None:
+        workloads = DEFAULT_WORKLOADS
+    else:
+        with open(args.config, "r") as f:
+            workloads = json.load(f)
+
+    from cupyimg import _kernel_cache
+
+    _kernel_cache.registry.load_index()
+    n_failed = run_workloads(workloads, verbose=not args.quiet)
+    index_path = _kernel_cache.save_index()
+
+    stats = _kernel_cache.get_kernel_cache_stats()
+    print(
+        "kernels: {} new (compiled), {} already indexed, {} memory hits".format(
+            stats["misses"], stats["disk_hits"], stats["memory_hits"]
+        )
+    )
+    if not args.quiet:
+        for factory, count in sorted(stats["generated"].items()):
+            print("  {}: {}".format(factory, count))
+    print("index written to {}".format(index_path))
+    if n_failed:
+        print("{} calls failed".format(n_failed))
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@ import os
 import sys
 from setuptools import setup, find_packages
 
-PACKAGES = find_packages()
+PACKAGES = find_packages(exclude=["benchmarks", "benchmarks.*"])
 
 # Get version and release info, which is all stored in cupyimg/version.py
 ver_file = os.path.join("cupyimg", "version.py")